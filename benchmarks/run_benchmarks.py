@@ -0,0 +1,327 @@
+"""
+This module runs the benchmark suite on seeded synthetic data and writes the timings as JSON,
+so throughput can be tracked over time and regressions caught by comparing runs.
+Run it from the root of the repository:
+    python -m benchmarks.run_benchmarks --output benchmark_results.json
+
+Every benchmark replays a synthetic snapshot of 700 players over a 38 gameweek season through the Loader.
+The optimizer and planner benchmarks use a calculator reading a seeded table, so they measure the search rather than the calculator,
+while the calculator benchmark measures SimpleExpectedPointsCalculator reading the replayed snapshot.
+The import benchmarks time a fresh interpreter running each import statement, next to one running nothing.
+
+Available functions:
+- measure: Time a function, returning summary statistics of the time per call.
+- run_benchmarks: Run the benchmark suite and return its results.
+- main: Run the benchmark suite from the command line.
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+import numpy as np
+from fpl import (
+    ChipPlanner,
+    Loader,
+    Optimizer,
+    SimpleExpectedPointsCalculator,
+    TransferPlanner,
+    find_matching_players,
+)
+from benchmarks.synthetic import (
+    SyntheticCalculator,
+    make_candidates,
+    make_snapshot,
+    make_team,
+    replay,
+)
+
+CANDIDATE_COUNTS = (10, 50, 200)
+MAX_TRANSFERS = (1, 2, 3, 4)
+# exhaustive searches are only run where they finish in seconds, other searches use a beam
+EXHAUSTIVE_NODES = 2 * 10**4
+BEAM_WIDTH = 25
+# gameweeks planned by the transfer planner, with its default transfers per gameweek and beam
+PLANNER_HORIZON = 5
+# gameweeks the chip planner schedules every chip over, with its default transfers and beam
+CHIP_HORIZON = 6
+# statements timed in a fresh interpreter, "pass" being the cost of starting the interpreter
+IMPORT_STATEMENTS = (
+    "pass",
+    "import fpl",
+    "from fpl import Loader, Player, Team",
+    "from fpl import Optimizer",
+    "from fpl import find_matching_players",
+)
+
+
+def measure(
+    fn: Callable[[], Any], repeat: int = 5, number: int = 1
+) -> Dict[str, float]:
+    """Time a function, returning summary statistics of the time per call.
+
+    :param fn: Function taking no arguments.
+    :param repeat: Number of timings taken.
+    :param number: Number of calls in each timing.
+
+    :return: Dictionary with the minimum, median and mean seconds per call and the calls per second of the median.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        timings.append((time.perf_counter() - start) / number)
+    median = statistics.median(timings)
+    return {
+        "repeat": repeat,
+        "number": number,
+        "min_s": min(timings),
+        "median_s": median,
+        "mean_s": statistics.fmean(timings),
+        "ops_per_s": 1 / median if median > 0 else float("inf"),
+    }
+
+
+def _estimate_nodes(team, candidates, max_transfers: int) -> int:
+    """Estimate the number of teams an exhaustive search explores."""
+    squad = team.gkps | team.defs | team.mids | team.fwds
+    children = sum(sum(p.position == c.position for p in squad) for c in candidates)
+    return sum(children**i for i in range(1, max_transfers + 1))
+
+
+def _git_commit() -> Optional[str]:
+    """Return the commit the benchmarks are run on, None outside a git repository."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(
+    seed: int = 0, quick: bool = False, name_filter: str = ""
+) -> Dict[str, Any]:
+    """Run the benchmark suite and return its results.
+
+    :param seed: Seed of the synthetic data.
+    :param quick: Whether to run fewer repeats and skip the slowest configurations, e.g. for a smoke test.
+    :param name_filter: Only run benchmarks whose name contains this string.
+
+    :return: Dictionary with the metadata of the run and a list of results, each with the name, parameters and timings
+             of a benchmark.
+    """
+    repeat = 3 if quick else 7
+    snapshot = make_snapshot(seed)
+    epc = SyntheticCalculator(snapshot)
+    team = make_team(snapshot, seed)
+    results: List[Dict[str, Any]] = []
+
+    def record(name: str, params: Dict[str, Any], fn: Callable[[], Any], **kwargs):
+        if name_filter not in name:
+            return
+        results.append({"name": name, "params": params, **measure(fn, **kwargs)})
+
+    for statement in IMPORT_STATEMENTS:
+        record(
+            "import",
+            {"statement": statement},
+            lambda: subprocess.run(
+                [sys.executable, "-c", statement], capture_output=True, check=True
+            ),
+            repeat=repeat,
+        )
+
+    with replay(snapshot):
+        # warm the registry and the position information shared by every benchmark
+        Loader.get_player_registry()
+
+        record(
+            "optimizer.calc_optimal_formation",
+            {},
+            lambda: Optimizer.calc_optimal_formation(team, epc, 1),
+            repeat=repeat,
+            number=100,
+        )
+        for horizon in (1, 5, 38):
+            record(
+                "optimizer.calc_discounted_reward_team",
+                {"horizon": horizon},
+                lambda: Optimizer.calc_discounted_reward_team(
+                    team, epc, 1, horizon, gamma=0.9
+                ),
+                repeat=repeat,
+                number=20,
+            )
+
+        for n_candidates in CANDIDATE_COUNTS:
+            candidates = make_candidates(snapshot, team, n_candidates, seed)
+            for max_transfers in MAX_TRANSFERS:
+                if quick and max_transfers > 2:
+                    continue
+                beam_width = (
+                    None
+                    if _estimate_nodes(team, candidates, max_transfers)
+                    <= EXHAUSTIVE_NODES
+                    else BEAM_WIDTH
+                )
+                record(
+                    "optimizer.calc_optimal_teams",
+                    {
+                        "n_candidates": n_candidates,
+                        "max_transfers": max_transfers,
+                        "horizon": 3,
+                        "beam_width": beam_width,
+                    },
+                    lambda: Optimizer.calc_optimal_teams(
+                        team,
+                        candidates,
+                        epc,
+                        1,
+                        3,
+                        max_transfers,
+                        gamma=0.9,
+                        beam_width=beam_width,
+                    ),
+                    repeat=1 if quick else 3,
+                )
+
+        for n_candidates in CANDIDATE_COUNTS:
+            if quick and n_candidates > 50:
+                continue
+            candidates = make_candidates(snapshot, team, n_candidates, seed)
+            record(
+                "transfer_planner.calc_transfer_plan",
+                {"n_candidates": n_candidates, "horizon": PLANNER_HORIZON},
+                lambda: TransferPlanner.calc_transfer_plan(
+                    team, candidates, epc, 1, PLANNER_HORIZON, gamma=0.9
+                ),
+                repeat=1 if quick else 3,
+            )
+
+        for n_candidates in CANDIDATE_COUNTS:
+            if quick and n_candidates > 50:
+                continue
+            candidates = make_candidates(snapshot, team, n_candidates, seed)
+            record(
+                "chip_planner.calc_chip_schedule",
+                {"n_candidates": n_candidates, "horizon": CHIP_HORIZON},
+                lambda: ChipPlanner.calc_chip_schedule(
+                    team, candidates, epc, 1, CHIP_HORIZON, gamma=0.9
+                ),
+                repeat=1 if quick else 3,
+            )
+
+        rng = np.random.default_rng(seed)
+        elements = [info["id"] for info in snapshot.static_info["elements"]]
+        player_ids = rng.choice(elements, size=1000).tolist()
+        names = [
+            snapshot.static_info["elements"][i - 1]["web_name"] for i in player_ids[:20]
+        ]
+
+        def find_players():
+            for name in names:
+                find_matching_players(name)
+
+        record(
+            "utils.find_matching_players",
+            {"n_names": len(names)},
+            find_players,
+            repeat=repeat,
+        )
+
+        def lookup_basic_info():
+            Loader.get_player_basic_info.cache_clear()
+            for player_id in player_ids:
+                Loader.get_player_basic_info(player_id)
+
+        record(
+            "loader.get_player_basic_info",
+            {"n_lookups": len(player_ids)},
+            lookup_basic_info,
+            repeat=repeat,
+        )
+
+        def lookup_registry():
+            registry = Loader.get_player_registry()
+            for player_id in player_ids:
+                registry[player_id]
+
+        record(
+            "loader.get_player_registry",
+            {"n_lookups": len(player_ids)},
+            lookup_registry,
+            repeat=repeat,
+        )
+
+        def lookup_fixtures():
+            Loader.get_fixture_info.cache_clear()
+            for fixture_id in range(1, len(snapshot.fixtures) + 1):
+                Loader.get_fixture_info(fixture_id)
+
+        record(
+            "loader.get_fixture_info",
+            {"n_lookups": len(snapshot.fixtures)},
+            lookup_fixtures,
+            repeat=repeat,
+        )
+
+        def calc_expected_points():
+            for player_id in player_ids[:100]:
+                for gameweek in range(1, 6):
+                    SimpleExpectedPointsCalculator.get_expected_points(
+                        player_id, gameweek
+                    )
+
+        record(
+            "expected_points_calculator.SimpleExpectedPointsCalculator",
+            {"n_players": 100, "n_gameweeks": 5},
+            calc_expected_points,
+            repeat=repeat,
+        )
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "commit": _git_commit(),
+            "python": sys.version.split()[0],
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "seed": seed,
+            "quick": quick,
+        },
+        "results": results,
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    """Run the benchmark suite from the command line, printing a summary and writing the results as JSON.
+
+    :param argv: Command line arguments, defaults to sys.argv.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--quick", action="store_true")
+    parser.add_argument("--filter", default="", dest="name_filter")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.seed, args.quick, args.name_filter)
+    for result in report["results"]:
+        print(
+            "{:<60} {:<70} {:>12.6f}s".format(
+                result["name"], json.dumps(result["params"]), result["median_s"]
+            )
+        )
+    with open(args.output, "w") as fd:
+        json.dump(report, fd, indent=2)
+
+
+if __name__ == "__main__":
+    main()
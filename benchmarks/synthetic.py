@@ -0,0 +1,300 @@
+"""
+This module builds seeded synthetic snapshots of the FPL API for benchmarking, so timings do not depend on the network
+or on the state of the current season.
+A snapshot holds the bootstrap-static information of a full pool of players, a double round robin of fixtures over
+38 gameweeks and the element summary of every player, and can be replayed through the Loader.
+
+Available classes:
+- Snapshot: Synthetic responses of the FPL API endpoints used by the Loader.
+- SyntheticCalculator: Expected points calculator reading a seeded table, so benchmarks measure the optimizer rather than the calculator.
+
+Available functions:
+- make_snapshot: Build a seeded synthetic snapshot.
+- replay: Context manager answering Loader requests from a snapshot.
+- make_team: Pick a random feasible team from a snapshot.
+- make_candidates: Pick random candidates outside a team from a snapshot.
+"""
+
+import random
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List
+from unittest.mock import patch
+from fpl import ExpectedPointsCalculator, Loader, Player, Team
+
+# share of each position in the pool of players, roughly as in a real season
+POSITION_SHARES = {1: 0.1, 2: 0.33, 3: 0.4, 4: 0.17}
+SQUAD_SIZES = {1: 2, 2: 5, 3: 5, 4: 3}
+PLAY_LIMITS = {1: (1, 1), 2: (3, 5), 3: (2, 5), 4: (1, 3)}
+SYLLABLES = ["ka", "ro", "mi", "san", "to", "le", "va", "dor", "ne", "li", "bru", "ez"]
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """Synthetic responses of the FPL API endpoints used by the Loader.
+
+    static_info: The bootstrap-static information.
+    fixtures: Every fixture of the season.
+    element_summaries: The element summary of each player, keyed by the unique ID of the player.
+    exp_points: Seeded expected points of each player for each gameweek, keyed by the unique ID and the gameweek.
+    """
+
+    static_info: Dict[str, Any]
+    fixtures: List[Dict[str, Any]]
+    element_summaries: Dict[int, Dict[str, List[Dict[str, Any]]]]
+    exp_points: Dict[tuple, float]
+
+
+def _make_name(rng: random.Random) -> str:
+    """Return a random pronounceable name."""
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))).title()
+
+
+def _round_robin(n_clubs: int) -> List[List[tuple]]:
+    """Return the (home, away) pairs of each gameweek of a double round robin, with the circle method."""
+    clubs = list(range(1, n_clubs + 1))
+    rounds = []
+    for _ in range(n_clubs - 1):
+        rounds.append([(clubs[i], clubs[n_clubs - 1 - i]) for i in range(n_clubs // 2)])
+        clubs = [clubs[0], clubs[-1]] + clubs[1:-1]
+    return rounds + [[(away, home) for home, away in pairs] for pairs in rounds]
+
+
+def make_snapshot(seed: int = 0, n_players: int = 700, n_clubs: int = 20) -> Snapshot:
+    """Build a seeded synthetic snapshot with a full pool of players and a 38 gameweek season.
+
+    :param seed: Seed of the random number generator.
+    :param n_players: Number of players in the pool.
+    :param n_clubs: Number of clubs, must be even.
+
+    :return: The synthetic Snapshot.
+    """
+    rng = random.Random(seed)
+    rounds = _round_robin(n_clubs)
+    start = datetime(2024, 8, 16, 17, 30, tzinfo=timezone.utc)
+    events = [
+        {
+            "id": gameweek,
+            "name": "Gameweek {}".format(gameweek),
+            "deadline_time": (start + timedelta(weeks=gameweek - 1)).isoformat(),
+        }
+        for gameweek in range(1, len(rounds) + 1)
+    ]
+    teams = [
+        {
+            "id": club,
+            "name": _make_name(rng) + " FC",
+            "short_name": "C{:02d}".format(club),
+            "strength_overall_home": rng.randint(1000, 1350),
+            "strength_overall_away": rng.randint(1000, 1350),
+        }
+        for club in range(1, n_clubs + 1)
+    ]
+    element_types = [
+        {
+            "id": position,
+            "singular_name_short": ["GKP", "DEF", "MID", "FWD"][position - 1],
+            "squad_select": SQUAD_SIZES[position],
+            "squad_min_play": PLAY_LIMITS[position][0],
+            "squad_max_play": PLAY_LIMITS[position][1],
+        }
+        for position in range(1, 5)
+    ]
+
+    positions = rng.choices(
+        list(POSITION_SHARES), weights=list(POSITION_SHARES.values()), k=n_players
+    )
+    elements = []
+    for element, position in enumerate(positions, 1):
+        first_name, second_name = _make_name(rng), _make_name(rng)
+        points_per_game = round(rng.uniform(0, 8), 1)
+        elements.append(
+            {
+                "id": element,
+                "first_name": first_name,
+                "second_name": second_name,
+                "web_name": second_name,
+                "element_type": position,
+                "team": rng.randint(1, n_clubs),
+                "now_cost": rng.randint(40, 130),
+                "points_per_game": str(points_per_game),
+                "form": str(round(max(0.0, rng.gauss(points_per_game, 2)), 1)),
+            }
+        )
+
+    fixtures = []
+    for gameweek, pairs in enumerate(rounds, 1):
+        for home, away in pairs:
+            fixtures.append(
+                {
+                    "id": len(fixtures) + 1,
+                    "event": gameweek,
+                    "team_h": home,
+                    "team_a": away,
+                    "kickoff_time": events[gameweek - 1]["deadline_time"],
+                }
+            )
+
+    club_fixtures = {club: [] for club in range(1, n_clubs + 1)}
+    for fixture in fixtures:
+        for club, is_home in [(fixture["team_h"], True), (fixture["team_a"], False)]:
+            club_fixtures[club].append(
+                {
+                    "id": fixture["id"],
+                    "event": fixture["event"],
+                    "team_h": fixture["team_h"],
+                    "team_a": fixture["team_a"],
+                    "is_home": is_home,
+                }
+            )
+    element_summaries = {
+        info["id"]: {
+            "fixtures": club_fixtures[info["team"]],
+            "history": [],
+            "history_past": [],
+        }
+        for info in elements
+    }
+    exp_points = {
+        (info["id"], gameweek): max(0.0, rng.gauss(float(info["points_per_game"]), 1.5))
+        for info in elements
+        for gameweek in range(1, len(rounds) + 1)
+    }
+
+    static_info = {
+        "events": events,
+        "teams": teams,
+        "element_types": element_types,
+        "elements": elements,
+    }
+    return Snapshot(static_info, fixtures, element_summaries, exp_points)
+
+
+def _clear_loader_caches():
+    """Clear the caches of the Loader, so no results of another snapshot are kept."""
+    for name in [
+        "get_fixture_info",
+        "get_fixtures_for_gameweek",
+        "get_team_basic_info",
+        "get_player_basic_info",
+    ]:
+        getattr(Loader, name).cache_clear()
+    Loader._player_registry = (None, None)
+
+
+@contextmanager
+def replay(snapshot: Snapshot) -> Iterator[Snapshot]:
+    """Context manager answering Loader requests from a snapshot rather than the FPL API.
+
+    :param snapshot: The snapshot to replay.
+
+    :return: Context manager yielding the snapshot.
+    """
+    _clear_loader_caches()
+    with patch.object(
+        Loader, "get_static_info", lambda: snapshot.static_info
+    ), patch.object(Loader, "get_fixtures", lambda: snapshot.fixtures), patch.object(
+        Loader,
+        "get_player_detailed_info",
+        lambda player_id: snapshot.element_summaries[player_id],
+    ):
+        try:
+            yield snapshot
+        finally:
+            _clear_loader_caches()
+
+
+class SyntheticCalculator(ExpectedPointsCalculator):
+    """Expected points calculator reading the seeded table of a snapshot."""
+
+    def __init__(self, snapshot: Snapshot):
+        """Create a calculator for a snapshot.
+
+        :param snapshot: The snapshot whose expected points are returned.
+        """
+        self.exp_points = snapshot.exp_points
+
+    def get_expected_points(self, player_id: int, gameweek: int) -> float:
+        """Get the expected points for a player in a specific gameweek from the seeded table.
+
+        :param player_id: The unique ID of the player.
+        :param gameweek: The gameweek for which to get the expected points.
+
+        :return: The expected points for the player in the specified gameweek.
+        """
+        return self.exp_points.get((player_id, gameweek), 0.0)
+
+
+def _to_player(info: Dict[str, Any]) -> Player:
+    """Build the Player of an element of the static information."""
+    return Player(
+        info["id"],
+        info["web_name"],
+        info["element_type"],
+        info["team"],
+        info["now_cost"],
+    )
+
+
+def make_team(snapshot: Snapshot, seed: int = 0, budget: int = 1000) -> Team:
+    """Pick a random feasible team from a snapshot.
+
+    :param snapshot: The snapshot whose players are picked.
+    :param seed: Seed of the random number generator.
+    :param budget: Total money of the team, the money left over is in the bank.
+
+    :return: A feasible Team with one free transfer.
+    """
+    rng = random.Random(seed)
+    elements = list(snapshot.static_info["elements"])
+    while True:
+        rng.shuffle(elements)
+        squad, club_counts = [], {}
+        for position, size in SQUAD_SIZES.items():
+            # the cheapest players of each position keep the team within the budget
+            pool = sorted(
+                (info for info in elements if info["element_type"] == position),
+                key=lambda info: info["now_cost"],
+            )[: 4 * size]
+            rng.shuffle(pool)
+            picked = 0
+            for info in pool:
+                if picked == size:
+                    break
+                if club_counts.get(info["team"], 0) < 3:
+                    club_counts[info["team"]] = club_counts.get(info["team"], 0) + 1
+                    squad.append(_to_player(info))
+                    picked += 1
+        cost = sum(player.cost for player in squad)
+        if len(squad) == 15 and cost <= budget:
+            break
+    return Team(
+        money_in_bank=budget - cost,
+        free_transfers=1,
+        gkps=frozenset(p for p in squad if p.position == 1),
+        defs=frozenset(p for p in squad if p.position == 2),
+        mids=frozenset(p for p in squad if p.position == 3),
+        fwds=frozenset(p for p in squad if p.position == 4),
+    )
+
+
+def make_candidates(
+    snapshot: Snapshot, team: Team, n_candidates: int, seed: int = 0
+) -> List[Player]:
+    """Pick random candidates outside a team from a snapshot.
+
+    :param snapshot: The snapshot whose players are picked.
+    :param team: The team the candidates would be transferred into.
+    :param n_candidates: Number of candidates.
+    :param seed: Seed of the random number generator.
+
+    :return: List of candidates sorted by their unique ID.
+    """
+    in_team = {p.element for p in team.gkps | team.defs | team.mids | team.fwds}
+    pool = [
+        info for info in snapshot.static_info["elements"] if info["id"] not in in_team
+    ]
+    return sorted(
+        _to_player(info) for info in random.Random(seed).sample(pool, n_candidates)
+    )
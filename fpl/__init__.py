@@ -1,10 +1,73 @@
-from .loader import Loader
-from .player import Player
-from .team import Team
-from .formation import Formation
-from .expected_points_calculator import (
-    ExpectedPointsCalculator,
-    SimpleExpectedPointsCalculator,
-)
-from .optimizer import Optimizer
-from .utils import find_matching_players, compute_points_per_game, compute_form
+"""
+The fpl package. Its public names are imported from their modules on first access (PEP 562),
+so "import fpl" is fast and e.g. "from fpl import Team" does not import pandas, numpy or requests.
+"""
+
+import importlib
+
+# the module defining each public name of the package
+_LAZY_ATTRIBUTES = {
+    "Loader": "loader",
+    "Player": "player",
+    "PlayerRegistry": "player_registry",
+    "PlayerNameIndex": "player_name_index",
+    "NameMatch": "player_name_index",
+    "NameResolution": "player_name_index",
+    "Team": "team",
+    "Formation": "formation",
+    "CompactTeam": "compact_team",
+    "ExpectedPointsCalculator": "expected_points_calculator",
+    "SimpleExpectedPointsCalculator": "expected_points_calculator",
+    "FormationArrays": "formation_kernel",
+    "calc_optimal_formation_arrays": "formation_kernel",
+    "calc_optimal_formation_batch": "formation_kernel",
+    "FormationCache": "formation_cache",
+    "CacheStats": "formation_cache",
+    "IncrementalScorer": "incremental_scorer",
+    "OptimizerStats": "optimizer_stats",
+    "LayerStats": "optimizer_stats",
+    "Optimizer": "optimizer",
+    "ScoredTeam": "optimizer",
+    "SearchProgress": "optimizer",
+    "TransferPlanner": "transfer_planner",
+    "TransferPlan": "transfer_planner",
+    "GameweekPlan": "transfer_planner",
+    "ChipPlanner": "chip_planner",
+    "ChipSchedule": "chip_planner",
+    "BatchEvaluator": "batch_evaluator",
+    "BatchFormations": "batch_evaluator",
+    "ParameterSweep": "parameter_sweep",
+    "PicksTable": "league_picks",
+    "LivePoller": "live",
+    "LiveSquads": "live",
+    "LiveUpdate": "live",
+    "RequestScheduler": "request_scheduler",
+    "SchedulerStats": "request_scheduler",
+    "TeamCodec": "codec",
+    "FormationCodec": "codec",
+    "ResultsCodec": "codec",
+    "find_matching_players": "utils",
+    "resolve_players": "utils",
+    "resolve_candidates": "utils",
+    "compute_points_per_game": "utils",
+    "compute_form": "utils",
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name: str):
+    """Import a public name from its module on first access and keep it as an attribute of the package.
+
+    :raises AttributeError: If the name is not a public name of the package.
+    """
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+    value = getattr(importlib.import_module("." + module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
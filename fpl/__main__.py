@@ -0,0 +1,9 @@
+"""
+Entry point of the command line interface, run with python -m fpl, see the cli module.
+"""
+
+import sys
+from fpl.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,231 @@
+"""
+This module defines the BatchEvaluator class, which validates and scores many FPL squads at once,
+e.g. every squad of a mini-league, without building a Team or Formation for each of them.
+Squads are given as an array of element ids with one row of 15 players per squad.
+The expected points of every distinct player are queried once into a matrix shared by all squads,
+and the squads are scored in chunks with the batched formation kernel so memory stays bounded.
+
+Available classes:
+- BatchFormations: Validity and optimal formations of a batch of squads.
+- BatchEvaluator: Static class to validate and score many squads at once.
+
+Available functions:
+- validate_squads: Check every squad against the FPL rules at once.
+- calc_optimal_formations: Validate every squad and find the optimal formation of each valid squad for every gameweek.
+"""
+
+from typing import NamedTuple, Optional, Tuple
+import numpy as np
+from fpl import Loader, PlayerRegistry, ExpectedPointsCalculator
+from fpl.compact_team import SQUAD_SIZES, MAX_PLAYERS_PER_CLUB
+from fpl.formation_kernel import calc_optimal_formation_batch, get_valid_formations
+
+SQUAD_SIZE = sum(SQUAD_SIZES.values())
+
+
+class BatchFormations(NamedTuple):
+    """Validity and optimal formations of a batch of squads.
+
+    valid: Boolean array of shape (n_squads,), True where the squad satisfies the FPL rules.
+    mask: Boolean array of shape (n_squads, 15, n_gameweeks), True where the player in that column of the squad starts.
+    captain: Integer array of shape (n_squads, n_gameweeks) with the element id of the captain,
+             -1 if no player is expected to score or the squad is invalid.
+    total_exp_points: Float array of shape (n_squads, n_gameweeks) with the total expected points including the captain,
+                      NaN for invalid squads.
+    """
+
+    valid: np.ndarray
+    mask: np.ndarray
+    captain: np.ndarray
+    total_exp_points: np.ndarray
+
+
+class BatchEvaluator:
+    """Static class to validate and score many squads at once."""
+
+    @staticmethod
+    def _lookup_players(
+        squads: np.ndarray, registry: PlayerRegistry
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Look up the position and club of every player of every squad, querying each distinct player once.
+
+        :param squads: Array of shape (n_squads, 15) of element ids.
+        :param registry: Registry of the players.
+
+        :return: Tuple of the distinct element ids, the column of each squad player in the distinct element ids,
+                 and arrays of shape (n_squads, 15) of whether each player is known, their positions and their clubs.
+        """
+        elements, inverse = np.unique(squads, return_inverse=True)
+        inverse = inverse.reshape(squads.shape)
+        known = np.array([int(element) in registry for element in elements], dtype=bool)
+        positions = np.array(
+            [registry[int(e)].position if k else 0 for e, k in zip(elements, known)],
+            dtype=int,
+        )
+        # clubs are mapped to dense integers as they are only compared for equality
+        clubs = [registry[int(e)].club if k else None for e, k in zip(elements, known)]
+        club_ids = {club: i for i, club in enumerate(dict.fromkeys(clubs))}
+        clubs = np.array([club_ids[club] for club in clubs], dtype=int)
+        return (
+            elements,
+            inverse,
+            known[inverse],
+            positions[inverse],
+            clubs[inverse],
+        )
+
+    @staticmethod
+    def _check_shapes(
+        squads: np.ndarray, money_in_bank: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Convert the squads and money in the bank to arrays and check their shapes.
+
+        :param squads: Array like of shape (n_squads, 15) of element ids.
+        :param money_in_bank: Array like of shape (n_squads,) of money in the bank.
+
+        :return: Tuple of the squads and the money in the bank as arrays.
+
+        :raises ValueError: If the shapes are invalid.
+        """
+        squads = np.asarray(squads, dtype=int)
+        money_in_bank = np.asarray(money_in_bank)
+        if (
+            squads.ndim != 2
+            or squads.shape[1] != SQUAD_SIZE
+            or money_in_bank.shape != squads.shape[:1]
+        ):
+            raise ValueError(
+                "squads must have shape (n_squads, 15) and money_in_bank (n_squads,)"
+            )
+        return squads, money_in_bank
+
+    @staticmethod
+    def validate_squads(
+        squads: np.ndarray,
+        money_in_bank: np.ndarray,
+        registry: Optional[PlayerRegistry] = None,
+    ) -> np.ndarray:
+        """Check every squad against the FPL rules at once.
+        A squad is valid when every player is known, no player appears twice, there are 2 gkps, 5 defs, 5 mids and 3 fwds,
+        no more than 3 players come from one club and the money in the bank is not negative.
+
+        :param squads: Array of shape (n_squads, 15) of element ids.
+        :param money_in_bank: Array of shape (n_squads,) of the money in the bank of each squad.
+        :param registry: Registry of the players, defaults to Loader.get_player_registry().
+
+        :return: Boolean array of shape (n_squads,), True where the squad is valid.
+
+        :raises ValueError: If the shapes of the arrays are invalid.
+        """
+        squads, money_in_bank = BatchEvaluator._check_shapes(squads, money_in_bank)
+        if registry is None:
+            registry = Loader.get_player_registry()
+        _, _, known, positions, clubs = BatchEvaluator._lookup_players(squads, registry)
+        return BatchEvaluator._validate(squads, money_in_bank, known, positions, clubs)
+
+    @staticmethod
+    def _validate(
+        squads: np.ndarray,
+        money_in_bank: np.ndarray,
+        known: np.ndarray,
+        positions: np.ndarray,
+        clubs: np.ndarray,
+    ) -> np.ndarray:
+        """Check every squad against the FPL rules given the looked up players.
+
+        :param squads: Array of shape (n_squads, 15) of element ids.
+        :param money_in_bank: Array of shape (n_squads,) of the money in the bank of each squad.
+        :param known: Boolean array of shape (n_squads, 15), True where the player is in the registry.
+        :param positions: Array of shape (n_squads, 15) of the positions of the players.
+        :param clubs: Array of shape (n_squads, 15) of the clubs of the players.
+
+        :return: Boolean array of shape (n_squads,), True where the squad is valid.
+        """
+        valid = known.all(axis=1) & (money_in_bank >= 0)
+
+        sorted_squads = np.sort(squads, axis=1)
+        valid &= np.all(sorted_squads[:, 1:] != sorted_squads[:, :-1], axis=1)
+
+        position_counts = np.stack(
+            [(positions == position).sum(axis=1) for position in SQUAD_SIZES], axis=1
+        )
+        valid &= np.all(position_counts == list(SQUAD_SIZES.values()), axis=1)
+
+        # a club has too many players when a sorted run of clubs is longer than the limit
+        sorted_clubs = np.sort(clubs, axis=1)
+        valid &= ~np.any(
+            sorted_clubs[:, MAX_PLAYERS_PER_CLUB:]
+            == sorted_clubs[:, :-MAX_PLAYERS_PER_CLUB],
+            axis=1,
+        )
+        return valid
+
+    @staticmethod
+    def calc_optimal_formations(
+        squads: np.ndarray,
+        money_in_bank: np.ndarray,
+        epc: ExpectedPointsCalculator,
+        gameweek: int,
+        horizon: int,
+        registry: Optional[PlayerRegistry] = None,
+        chunk_size: int = 1024,
+    ) -> BatchFormations:
+        """Validate every squad and find the optimal formation of each valid squad for every gameweek.
+        The expected points of each distinct player of the valid squads are queried once.
+
+        :param squads: Array of shape (n_squads, 15) of element ids.
+        :param money_in_bank: Array of shape (n_squads,) of the money in the bank of each squad.
+        :param epc: Expected points calculator.
+        :param gameweek: The first gameweek to score.
+        :param horizon: The number of gameweeks to score.
+        :param registry: Registry of the players, defaults to Loader.get_player_registry().
+        :param chunk_size: Number of squads scored together, bounding the memory used by the kernel.
+
+        :return: BatchFormations containing the validity and optimal formations of each squad.
+
+        :raises ValueError: If the shapes of the arrays are invalid, or the horizon or chunk_size are not positive.
+        """
+        squads, money_in_bank = BatchEvaluator._check_shapes(squads, money_in_bank)
+        if horizon < 1:
+            raise ValueError("horizon must be a positive integer.")
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be a positive integer.")
+        if registry is None:
+            registry = Loader.get_player_registry()
+
+        elements, inverse, known, positions, clubs = BatchEvaluator._lookup_players(
+            squads, registry
+        )
+        valid = BatchEvaluator._validate(squads, money_in_bank, known, positions, clubs)
+
+        n_squads = len(squads)
+        mask = np.zeros((n_squads, SQUAD_SIZE, horizon), dtype=bool)
+        captain = np.full((n_squads, horizon), -1, dtype=int)
+        total_exp_points = np.full((n_squads, horizon), np.nan)
+
+        # expected points of each distinct player of the valid squads, shared by every squad
+        needed = np.zeros(len(elements), dtype=bool)
+        needed[inverse[valid].ravel()] = True
+        exp_points = np.zeros((len(elements), horizon))
+        for row in np.flatnonzero(needed):
+            exp_points[row] = [
+                epc.get_expected_points(int(elements[row]), gameweek + h)
+                for h in range(horizon)
+            ]
+
+        formations = get_valid_formations()
+        valid_rows = np.flatnonzero(valid)
+        for start in range(0, len(valid_rows), chunk_size):
+            rows = valid_rows[start : start + chunk_size]
+            chunk = calc_optimal_formation_batch(
+                exp_points[inverse[rows]], positions[rows], formations
+            )
+            mask[rows] = chunk.mask
+            captain[rows] = np.where(
+                chunk.captain >= 0,
+                np.take_along_axis(squads[rows], np.maximum(chunk.captain, 0), axis=1),
+                -1,
+            )
+            total_exp_points[rows] = chunk.total_exp_points
+
+        return BatchFormations(valid, mask, captain, total_exp_points)
@@ -0,0 +1,425 @@
+"""
+This module defines the ChipPlanner class, which schedules the remaining chips over a horizon of gameweeks.
+The gain of playing each chip in each gameweek is computed once from the optimal formations of the squads involved,
+and every assignment of chips to gameweeks is then evaluated from these shared results.
+Assignments which cannot beat the best schedule found so far, even if every remaining chip were played in its best gameweek,
+are pruned. The wildcard and free hit squads are searched for lazily: the points of the squads reachable with transfers
+are bounded by their best players and the best candidates, and a squad is only searched for when that bound could beat
+the best schedule found so far.
+
+The wildcard and free hit squads are approximated: rather than rebuilding the squad from scratch, each is the best squad
+reachable from the current squad with up to chip_transfers free transfers, found with calc_optimal_teams.
+Their gains are therefore lower bounds of the gains of a full rebuild.
+
+Chips are named as in the FPL API:
+- wildcard: The squad is replaced by the best squad within chip_transfers transfers for the rest of the horizon.
+- freehit: The squad is replaced by the best squad within chip_transfers transfers for a single gameweek.
+- bboost: Bench boost, all 15 players score.
+- 3xc: Triple captain, the captain's points are tripled rather than doubled.
+
+Available classes:
+- ChipSchedule: An assignment of chips to gameweeks.
+- ChipPlanner: Static class to schedule chips over several gameweeks.
+
+Available functions:
+- calc_chip_schedule: Find the assignment of chips to gameweeks maximizing the discounted reward.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from fpl import Player, Team, ExpectedPointsCalculator, Optimizer
+from fpl.formation_kernel import calc_optimal_formation_arrays
+
+CHIPS = ("wildcard", "freehit", "bboost", "3xc")
+N_STARTERS = 11
+
+
+@dataclass(frozen=True)
+class ChipSchedule:
+    """An assignment of chips to gameweeks.
+
+    discounted_reward: Discounted expected points over the horizon when the chips are played.
+    base_discounted_reward: Discounted expected points over the horizon when no chips are played.
+    chips: Mapping of each chip played to the gameweek it is played in.
+    wildcard_team: The squad picked with the wildcard, within chip_transfers transfers of the team, None if it is not played.
+    free_hit_team: The squad picked for the free hit gameweek, within chip_transfers transfers of the squad
+                   of that gameweek, None if it is not played.
+    """
+
+    discounted_reward: float
+    base_discounted_reward: float
+    chips: Dict[str, int]
+    wildcard_team: Optional[Team]
+    free_hit_team: Optional[Team]
+
+
+class ChipPlanner:
+    """Static class to schedule chips over several gameweeks."""
+
+    @staticmethod
+    def _calc_squad_gains(
+        team: Team, epc: ExpectedPointsCalculator, gameweek: int, horizon: int
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Return the points of a squad for each gameweek, with the gains of bench boost and triple captain.
+
+        :param team: The squad.
+        :param epc: Expected points calculator.
+        :param gameweek: The first gameweek.
+        :param horizon: The number of gameweeks.
+
+        :return: Tuple of arrays of shape (horizon,) with the optimal formation points,
+                 the points of the bench and the points of the captain,
+                 and the array of shape (15, horizon) of the expected points of each player.
+        """
+        players = sorted(team.gkps | team.defs | team.mids | team.fwds)
+        exp_points = Optimizer._calc_exp_points_matrix(players, epc, gameweek, horizon)
+        positions = np.array([player.position for player in players])
+        formation_arrays = calc_optimal_formation_arrays(exp_points, positions)
+        bench_points = np.where(formation_arrays.mask, 0, exp_points).sum(axis=0)
+        captain_points = np.where(
+            formation_arrays.captain >= 0,
+            exp_points[formation_arrays.captain, np.arange(horizon)],
+            0,
+        )
+        return (
+            formation_arrays.total_exp_points,
+            bench_points,
+            captain_points,
+            exp_points,
+        )
+
+    @staticmethod
+    def _calc_transfer_bounds(
+        exp_points: np.ndarray, candidate_points: np.ndarray, n_transfers: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Bound the points of the squads reachable from a squad with up to n_transfers transfers of candidates in.
+        Whatever the formation, the starters of such a squad are m candidates and 11 - m players of the squad
+        for some m <= n_transfers, so they score at most the best 11 - m players of the squad and the best m candidates.
+        Likewise the m players transferred out score at least the worst m players of the squad.
+
+        :param exp_points: Array of shape (15, horizon) of the expected points of the players of the squad.
+        :param candidate_points: Array of shape (n_candidates, horizon) of the expected points of the candidates.
+        :param n_transfers: Maximum number of transfers.
+
+        :return: Tuple of arrays of shape (horizon,) bounding the points of the starters and of the whole squad.
+        """
+        n_players, horizon = exp_points.shape
+        squad_sums = np.vstack(
+            [np.zeros(horizon), np.cumsum(-np.sort(-exp_points, axis=0), axis=0)]
+        )
+        candidate_sums = np.vstack(
+            [
+                np.zeros(horizon),
+                np.cumsum(-np.sort(-candidate_points, axis=0), axis=0),
+            ]
+        )
+        n_transfers = min(n_transfers, len(candidate_points), N_STARTERS)
+        starters = [
+            squad_sums[N_STARTERS - m] + candidate_sums[m]
+            for m in range(n_transfers + 1)
+        ]
+        squad = [
+            squad_sums[n_players - m] + candidate_sums[m]
+            for m in range(n_transfers + 1)
+        ]
+        return np.max(starters, axis=0), np.max(squad, axis=0)
+
+    @staticmethod
+    def _assign_chips(
+        gains: Dict[str, np.ndarray], used_gameweeks: set
+    ) -> Tuple[float, Dict[str, int]]:
+        """Assign chips to distinct gameweeks maximizing the sum of their gains.
+        Chips are assigned one at a time and a branch is pruned when even playing every remaining chip
+        in its best gameweek cannot beat the best assignment found so far.
+
+        :param gains: Mapping of each chip to its discounted gain in each gameweek of the horizon.
+        :param used_gameweeks: Offsets of gameweeks in which no chip can be played.
+
+        :return: Tuple of the total gain and the mapping of chips to gameweek offsets.
+        """
+        chips = list(gains)
+        # the best gain of each chip ignoring clashes bounds what the remaining chips can add
+        best_gains = [max(0.0, float(np.max(gains[chip]))) for chip in chips]
+        bounds = [sum(best_gains[i:]) for i in range(len(chips) + 1)]
+        best = [0.0, {}]
+
+        def search(i: int, total: float, assignment: Dict[str, int], used: set):
+            if total > best[0]:
+                best[0], best[1] = total, dict(assignment)
+            if i == len(chips) or total + bounds[i] <= best[0]:
+                return
+            chip = chips[i]
+            for h in np.argsort(-gains[chip], kind="stable"):
+                h = int(h)
+                if (
+                    gains[chip][h] <= 0
+                    or total + gains[chip][h] + bounds[i + 1] <= best[0]
+                ):
+                    break
+                if h in used:
+                    continue
+                assignment[chip] = h
+                used.add(h)
+                search(i + 1, total + float(gains[chip][h]), assignment, used)
+                used.remove(h)
+                del assignment[chip]
+            # the chip is not played
+            search(i + 1, total, assignment, used)
+
+        search(0, 0.0, {}, set(used_gameweeks))
+        return best[0], best[1]
+
+    @staticmethod
+    def calc_chip_schedule(
+        team: Team,
+        candidates: List[Player],
+        epc: ExpectedPointsCalculator,
+        gameweek: int,
+        horizon: int,
+        chips: Sequence[str] = CHIPS,
+        gamma: float = 1,
+        chip_transfers: int = 3,
+        beam_width: Optional[int] = 10,
+    ) -> ChipSchedule:
+        """Find the assignment of chips to gameweeks maximizing the discounted reward.
+        At most one chip is played per gameweek. The wildcard and free hit squads are approximated by
+        the best squads found with Optimizer.calc_optimal_teams using up to chip_transfers transfers of the candidates in,
+        so their gains are lower bounds of the gains of a full rebuild.
+        After a wildcard, the bench boost, triple captain and free hit gains are measured against the wildcard squad,
+        and the free hit squad is found from the wildcard squad.
+        The transfer adjustment of the optimizer is not applied.
+        Squads are only searched for when a bound on the reward using them can beat the best schedule found so far:
+        each wildcard gameweek is bounded before its squad is searched for, and a free hit squad is only searched for
+        once the best assignment plays the free hit in its gameweek, each being found once per squad and gameweek.
+
+        :param team: The team you wish to schedule chips for.
+        :param candidates: List of player candidates you wish to transfer in.
+        :param epc: Expected points calculator.
+        :param gameweek: The first gameweek of the horizon.
+        :param horizon: The number of gameweeks over which chips can be played.
+        :param chips: The chips remaining.
+        :param gamma: Discount factor.
+        :param chip_transfers: Maximum number of transfers from the squad used to build the wildcard and free hit squads.
+        :param beam_width: Beam width used to build the wildcard and free hit squads, None for exhaustive search,
+                           which may take minutes with many candidates.
+
+        :return: The best ChipSchedule found.
+
+        :raises ValueError: If a chip is unknown or repeated, or if the horizon is not positive.
+        """
+        if len(set(chips)) != len(chips) or any(chip not in CHIPS for chip in chips):
+            raise ValueError(
+                f"Invalid chips: {chips}. Must be distinct values of {CHIPS}."
+            )
+        if horizon < 1:
+            raise ValueError("horizon must be a positive integer.")
+
+        discount = gamma ** np.arange(horizon)
+
+        # squads replacing a squad, each found once and shared by every assignment
+        def calc_best_team(squad: Team, h: int, n_gameweeks: int) -> Team:
+            # candidates brought in by the wildcard are already in its squad
+            squad_elements = {
+                p.element for p in squad.gkps | squad.defs | squad.mids | squad.fwds
+            }
+            return Optimizer.calc_optimal_teams(
+                squad,
+                [c for c in candidates if c.element not in squad_elements],
+                epc,
+                gameweek + h,
+                n_gameweeks,
+                chip_transfers,
+                gamma,
+                wildcard=True,
+                k=1,
+                beam_width=beam_width,
+            )[0].team
+
+        # free hit squads and their points keyed by the squad they are found from and the gameweek offset
+        free_hits: Dict[Tuple[Team, int], Tuple[Team, float]] = {}
+
+        def calc_free_hit(squad: Team, h: int) -> Tuple[Team, float]:
+            if (squad, h) not in free_hits:
+                free_hit_team = calc_best_team(squad, h, 1)
+                free_hits[squad, h] = (
+                    free_hit_team,
+                    float(
+                        ChipPlanner._calc_squad_gains(
+                            free_hit_team, epc, gameweek + h, 1
+                        )[0][0]
+                    ),
+                )
+            return free_hits[squad, h]
+
+        # bounds on the points of the squads reachable with transfers, so squads are only searched for
+        # when they could beat the best schedule
+        candidate_points = Optimizer._calc_exp_points_matrix(
+            candidates, epc, gameweek, horizon
+        )
+        candidate_elements = np.array([c.element for c in candidates])
+
+        def calc_transfer_bounds(
+            squad: Team, exp_points: np.ndarray, captain: np.ndarray, h: int
+        ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+            squad_elements = [
+                p.element for p in squad.gkps | squad.defs | squad.mids | squad.fwds
+            ]
+            others = candidate_points[~np.isin(candidate_elements, squad_elements), h:]
+            starters, squad_points = [], []
+            for n_transfers in (chip_transfers, 2 * chip_transfers):
+                bounds = ChipPlanner._calc_transfer_bounds(
+                    exp_points, others, n_transfers
+                )
+                starters.append(bounds[0])
+                squad_points.append(bounds[1])
+            captain_bound = np.maximum(captain, others.max(axis=0, initial=0))
+            return (
+                starters[0] + captain_bound,
+                squad_points[0] - starters[0],
+                captain_bound,
+                starters[1] + captain_bound,
+            )
+
+        base_points, base_bench, base_captain, base_exp_points = (
+            ChipPlanner._calc_squad_gains(team, epc, gameweek, horizon)
+        )
+        base_discounted_reward = float(discount @ base_points)
+        (
+            transfer_points,
+            transfer_bench,
+            transfer_captain,
+            double_transfer_points,
+        ) = calc_transfer_bounds(team, base_exp_points, base_captain, 0)
+
+        def calc_gains(
+            points: np.ndarray,
+            bench: np.ndarray,
+            captain: np.ndarray,
+            free_hit_points: np.ndarray,
+        ) -> Dict[str, np.ndarray]:
+            gains = {}
+            if "freehit" in chips:
+                gains["freehit"] = discount * (free_hit_points - points)
+            if "bboost" in chips:
+                gains["bboost"] = discount * bench
+            if "3xc" in chips:
+                gains["3xc"] = discount * captain
+            return gains
+
+        best = [base_discounted_reward, {}, None, None]
+
+        def assign_chips(
+            w: Optional[int],
+            squads: List[Team],
+            points: np.ndarray,
+            bench: np.ndarray,
+            captain: np.ndarray,
+            free_hit_bounds: np.ndarray,
+        ):
+            # free hit squads are only searched for in the gameweek the assignment plays the free hit in,
+            # until that gameweek's points are exact rather than a bound
+            while True:
+                free_hit_points = np.array(
+                    [
+                        (
+                            free_hits[squads[h], h][1]
+                            if (squads[h], h) in free_hits
+                            else free_hit_bounds[h]
+                        )
+                        for h in range(horizon)
+                    ]
+                )
+                gain, assignment = ChipPlanner._assign_chips(
+                    calc_gains(points, bench, captain, free_hit_points),
+                    set() if w is None else {w},
+                )
+                reward = float(discount @ points) + gain
+                if reward <= best[0]:
+                    return
+                h = assignment.get("freehit")
+                if h is not None and (squads[h], h) not in free_hits:
+                    calc_free_hit(squads[h], h)
+                    continue
+                if w is not None:
+                    assignment["wildcard"] = w
+                best[:] = [
+                    reward,
+                    assignment,
+                    None if w is None else squads[w],
+                    None if h is None else free_hits[squads[h], h][0],
+                ]
+                return
+
+        # the free hit squad of the team is at most chip_transfers transfers away from it
+        gain, _ = ChipPlanner._assign_chips(
+            calc_gains(base_points, base_bench, base_captain, transfer_points), set()
+        )
+        bounds = [(base_discounted_reward + gain, None)]
+        if "wildcard" in chips:
+            # the wildcard squad is at most chip_transfers transfers away from the team and its free hit squad
+            # 2 * chip_transfers, which bounds the reward of each assignment playing the wildcard
+            for w in range(horizon):
+                after = np.arange(horizon) >= w
+                points = np.where(after, transfer_points, base_points)
+                gain, _ = ChipPlanner._assign_chips(
+                    calc_gains(
+                        points,
+                        np.where(after, transfer_bench, base_bench),
+                        np.where(after, transfer_captain, base_captain),
+                        np.where(after, double_transfer_points, transfer_points),
+                    ),
+                    {w},
+                )
+                bounds.append((float(discount @ points) + gain, w))
+
+        # the wildcard gameweeks with the highest bounds are searched first, so the others are more often pruned
+        for bound, w in sorted(bounds, key=lambda bound: -bound[0]):
+            if bound <= best[0]:
+                break
+            if w is None:
+                assign_chips(
+                    None,
+                    [team] * horizon,
+                    base_points,
+                    base_bench,
+                    base_captain,
+                    transfer_points,
+                )
+                continue
+            wildcard_team = calc_best_team(team, w, horizon - w)
+            if wildcard_team == team:
+                # the wildcard changes nothing
+                continue
+            (
+                wildcard_points,
+                wildcard_bench,
+                wildcard_captain,
+                wildcard_exp_points,
+            ) = ChipPlanner._calc_squad_gains(
+                wildcard_team, epc, gameweek + w, horizon - w
+            )
+            assign_chips(
+                w,
+                [team] * w + [wildcard_team] * (horizon - w),
+                np.concatenate([base_points[:w], wildcard_points]),
+                np.concatenate([base_bench[:w], wildcard_bench]),
+                np.concatenate([base_captain[:w], wildcard_captain]),
+                np.concatenate(
+                    [
+                        transfer_points[:w],
+                        calc_transfer_bounds(
+                            wildcard_team, wildcard_exp_points, wildcard_captain, w
+                        )[0],
+                    ]
+                ),
+            )
+
+        best_reward, best_chips, wildcard_team, free_hit_team = best
+        return ChipSchedule(
+            discounted_reward=best_reward,
+            base_discounted_reward=base_discounted_reward,
+            chips={chip: gameweek + h for chip, h in best_chips.items()},
+            wildcard_team=wildcard_team,
+            free_hit_team=free_hit_team,
+        )
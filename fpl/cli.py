@@ -0,0 +1,376 @@
+"""
+This module provides the command line interface of the package, run with python -m fpl, for automated runs such as cron jobs.
+Data is kept in a disk cache (see Loader.configure_cache), so that a run can prefetch the data once
+and later runs, possibly offline, read it from the cache.
+
+Commands:
+- prefetch: Fetch the static information, the fixtures and the detailed information of players missing from the cache.
+- refresh: Fetch the same data as prefetch, overwriting the data already in the cache.
+- optimize: Run Optimizer.calc_optimal_teams for one or many managers and write the results as JSON.
+- serve: Run a local HTTP service running optimization jobs in worker processes, see the service module.
+
+Manager files are JSON files of a team as returned by the my-team endpoint, like resources/my_team.json.
+Candidate files are JSON lists of element ids or player names, e.g. [328, "Salah", "Palmer"].
+
+Available functions:
+- load_candidates: Return the players of a candidate file.
+- load_calculator: Return the expected points calculator named by a "module:attribute" specification.
+- optimize_manager: Optimize the team of a manager file and return the JSON-safe results.
+- build_parser: Return the parser of the command line arguments.
+- main: Run the command line interface.
+"""
+
+import argparse
+import importlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+from fpl.loader import API_URL
+from fpl.request_scheduler import BULK
+from fpl import (
+    ExpectedPointsCalculator,
+    Loader,
+    Optimizer,
+    Player,
+    ResultsCodec,
+    resolve_candidates,
+)
+
+DEFAULT_CACHE_DIR = os.path.join("~", ".cache", "fpl-toolkit")
+DEFAULT_CALCULATOR = "fpl:SimpleExpectedPointsCalculator"
+
+
+def load_candidates(filename: str) -> List[Player]:
+    """Return the players of a candidate file, a JSON list of element ids or player names, see resolve_candidates.
+
+    :param filename: Path to the candidate file.
+
+    :return: List of candidate players in the order of the file.
+
+    :raises ValueError: If the file is not a list, or a name matches no player or several players equally well.
+    :raises KeyError: If an element id is not in the static information.
+    """
+    with open(filename) as fd:
+        entries = json.load(fd)
+    if not isinstance(entries, list):
+        raise ValueError("{} is not a JSON list of candidates.".format(filename))
+    return resolve_candidates(entries)
+
+
+def load_calculator(spec: str) -> ExpectedPointsCalculator:
+    """Return the expected points calculator named by a "module:attribute" specification.
+
+    :param spec: The module and the attribute of the calculator, e.g. "fpl:SimpleExpectedPointsCalculator".
+
+    :return: The calculator, a class with a static get_expected_points or an instance.
+
+    :raises ValueError: If the specification is not of the form "module:attribute".
+    :raises ImportError: If the module cannot be imported.
+    :raises AttributeError: If the module has no such attribute.
+    """
+    module_name, _, attribute = spec.partition(":")
+    if not module_name or not attribute:
+        raise ValueError(
+            "Invalid calculator {!r}, expected 'module:attribute'.".format(spec)
+        )
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+def optimize_manager(
+    team_file: str, candidates_file: str, options: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Optimize the team of a manager file and return the JSON-safe results.
+
+    :param team_file: Path to the manager file.
+    :param candidates_file: Path to the candidate file.
+    :param options: The keyword arguments of Optimizer.calc_optimal_teams other than team, candidates and epc,
+                    with the calculator given as a "module:attribute" specification under "epc".
+
+    :return: Dictionary with the files, the results encoded by ResultsCodec and the transfers of each result,
+             or the error if the manager could not be optimized.
+    """
+    output = {"team_file": team_file, "candidates_file": candidates_file}
+    try:
+        registry = Loader.get_player_registry()
+        team = Loader.get_my_team("", "", 0, how="local", filename=team_file)
+        candidates = load_candidates(candidates_file)
+        kwargs = dict(options)
+        epc = load_calculator(kwargs.pop("epc"))
+        results = Optimizer.calc_optimal_teams(team, candidates, epc, **kwargs)
+    except (OSError, ValueError, KeyError, ImportError, AttributeError) as e:
+        output["error"] = "{}: {}".format(type(e).__name__, e)
+        return output
+
+    encoded = ResultsCodec.to_dict(results, registry.snapshot_id, team)
+    output.update(encoded)
+    return output
+
+
+def _configure_loader(
+    api_url: str,
+    cache_dir: Optional[str],
+    offline: bool,
+    static_fields: Optional[Dict[str, Any]],
+):
+    """Configure the Loader of a worker process like the Loader of the main process."""
+    Loader.configure_api(api_url)
+    Loader.configure_cache(cache_dir, offline)
+    Loader.configure_static_info(static_fields is not None, static_fields)
+
+
+def _prefetch(args: argparse.Namespace) -> Dict[str, Any]:
+    """Fetch the static information, the fixtures and the detailed information of the selected players."""
+    static_info = Loader.get_static_info()
+    Loader.get_fixtures()
+    registry = Loader.get_player_registry()
+    if args.all_players:
+        elements = [info["id"] for info in static_info["elements"]]
+    else:
+        elements = set()
+        for team_file in args.teams:
+            team = Loader.get_my_team("", "", 0, how="local", filename=team_file)
+            squad = team.gkps | team.defs | team.mids | team.fwds
+            elements.update(player.element for player in squad)
+        for candidates_file in args.candidates:
+            elements.update(
+                player.element for player in load_candidates(candidates_file)
+            )
+        elements = sorted(elements)
+    for element in elements:
+        Loader.get_player_detailed_info(element)
+    return {"cache_dir": Loader._cache_dir, "players": len(elements)}
+
+
+def _optimize(args: argparse.Namespace) -> Dict[str, Any]:
+    """Optimize the team of each manager file, in parallel processes if more than one worker is requested."""
+    if len(args.candidates) not in {1, len(args.teams)}:
+        raise ValueError("Give one candidate file, or one per manager file.")
+    candidates_files = (
+        args.candidates * len(args.teams)
+        if len(args.candidates) == 1
+        else args.candidates
+    )
+    gameweek = Loader.get_next_gameweek() if args.gameweek is None else args.gameweek
+    options = {
+        "epc": args.epc,
+        "gameweek": gameweek,
+        "horizon": args.horizon,
+        "max_transfers": args.max_transfers,
+        "gamma": args.gamma,
+        "wildcard": args.wildcard,
+        "k": args.k,
+        "beam_width": args.beam_width,
+        "time_budget_s": args.time_budget,
+    }
+
+    n_options = [options] * len(args.teams)
+    if args.workers > 1 and len(args.teams) > 1:
+        # the workers share the disk cache, but not the in-memory caches, of this process
+        with ProcessPoolExecutor(
+            max_workers=args.workers,
+            initializer=_configure_loader,
+            initargs=(
+                Loader._api_url,
+                Loader._cache_dir,
+                Loader._offline,
+                Loader._static_fields,
+            ),
+        ) as executor:
+            managers = list(
+                executor.map(optimize_manager, args.teams, candidates_files, n_options)
+            )
+    else:
+        managers = list(map(optimize_manager, args.teams, candidates_files, n_options))
+    return {"gameweek": gameweek, "options": options, "managers": managers}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Return the parser of the command line arguments.
+
+    :return: ArgumentParser with the prefetch, refresh and optimize commands.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m fpl",
+        description="Fetch FPL data into a local cache and optimize teams from it.",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=os.environ.get("FPL_CACHE_DIR", DEFAULT_CACHE_DIR),
+        help="Directory of the cache of API responses (default: $FPL_CACHE_DIR or %(default)s).",
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Only read data from the cache and never query the API.",
+    )
+    parser.add_argument(
+        "--api-url",
+        default=API_URL,
+        help="Base URL of the FPL API, e.g. of a local stand-in (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--slim-static",
+        action="store_true",
+        help="Keep only the fields of the static information used by the package and the calculator, to save memory.",
+    )
+    parser.add_argument(
+        "--output", help="File to write the JSON output to (default: stdout)."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    for command, help_text in [
+        ("prefetch", "Fetch data missing from the cache."),
+        ("refresh", "Fetch data, overwriting the data in the cache."),
+    ]:
+        subparser = subparsers.add_parser(command, help=help_text)
+        subparser.add_argument(
+            "--all-players",
+            action="store_true",
+            help="Fetch the detailed information of every player.",
+        )
+        subparser.add_argument(
+            "--teams",
+            nargs="*",
+            default=[],
+            help="Manager files whose players' detailed information is fetched.",
+        )
+        subparser.add_argument(
+            "--candidates",
+            nargs="*",
+            default=[],
+            help="Candidate files whose players' detailed information is fetched.",
+        )
+
+    optimize = subparsers.add_parser(
+        "optimize", help="Find the best transfers for one or many managers."
+    )
+    optimize.add_argument("teams", nargs="+", help="Manager files.")
+    optimize.add_argument(
+        "--candidates",
+        nargs="+",
+        required=True,
+        help="One candidate file shared by every manager, or one per manager file.",
+    )
+    optimize.add_argument(
+        "--gameweek",
+        type=int,
+        help="The first gameweek to optimize (default: the next gameweek).",
+    )
+    optimize.add_argument("--horizon", type=int, default=3)
+    optimize.add_argument("--max-transfers", type=int, default=1)
+    optimize.add_argument("--gamma", type=float, default=1.0)
+    optimize.add_argument("--wildcard", action="store_true")
+    optimize.add_argument(
+        "--k", type=int, default=3, help="Number of teams returned for each manager."
+    )
+    optimize.add_argument(
+        "--beam-width", type=int, help="Use a beam search of this width."
+    )
+    optimize.add_argument(
+        "--time-budget", type=float, help="Seconds after which each search stops."
+    )
+    optimize.add_argument(
+        "--epc",
+        default=DEFAULT_CALCULATOR,
+        help="Expected points calculator as module:attribute (default: %(default)s).",
+    )
+    optimize.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of processes optimizing managers in parallel.",
+    )
+
+    serve = subparsers.add_parser(
+        "serve", help="Run a local HTTP service running optimization jobs."
+    )
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8000)
+    serve.add_argument(
+        "--workers", type=int, default=2, help="Number of worker processes."
+    )
+    serve.add_argument(
+        "--job-timeout",
+        type=float,
+        default=60.0,
+        help="Default and maximum seconds before a job stops with the best teams found.",
+    )
+    serve.add_argument(
+        "--epc",
+        default=DEFAULT_CALCULATOR,
+        help="Expected points calculator as module:attribute (default: %(default)s).",
+    )
+    return parser
+
+
+def _serve(args: argparse.Namespace):
+    """Run the optimization service until interrupted."""
+    from fpl.service import OptimizationService, make_server
+
+    service = OptimizationService(
+        args.epc,
+        args.workers,
+        args.job_timeout,
+        api_url=args.api_url,
+        cache_dir=Loader._cache_dir,
+        offline=args.offline,
+        slim_static=args.slim_static,
+    )
+    server = make_server(service, args.host, args.port)
+    print("Serving on http://{}:{}".format(*server.server_address), file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the command line interface.
+
+    :param argv: Command line arguments, defaults to sys.argv.
+
+    :return: Exit status, 0 on success and 1 if a command or the optimization of a manager failed.
+    """
+    args = build_parser().parse_args(argv)
+    try:
+        Loader.configure_api(args.api_url)
+        Loader.configure_cache(
+            os.path.expanduser(args.cache_dir),
+            offline=args.offline,
+            refresh=args.command == "refresh",
+        )
+        fields = None
+        if args.slim_static and args.command == "optimize":
+            fields = getattr(load_calculator(args.epc), "static_fields", None)
+        Loader.configure_static_info(args.slim_static, fields)
+        if args.command == "serve":
+            _serve(args)
+            return 0
+        if args.command == "optimize":
+            output = _optimize(args)
+        else:
+            # a prefetch makes many queries, which yield to any interactive query
+            with Loader.get_request_scheduler().priority(BULK):
+                output = _prefetch(args)
+    except (OSError, ValueError, KeyError, ImportError, AttributeError) as e:
+        print("error: {}".format(e), file=sys.stderr)
+        return 1
+
+    if args.output is None:
+        json.dump(output, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        with open(args.output, "w") as fd:
+            json.dump(output, fd, indent=2)
+    failed = [m for m in output.get("managers", []) if "error" in m]
+    for manager in failed:
+        print(
+            "error: {}: {}".format(manager["team_file"], manager["error"]),
+            file=sys.stderr,
+        )
+    return 1 if failed else 0
@@ -0,0 +1,434 @@
+"""
+This module provides compact codecs for teams, formations and optimizer results,
+so they can be passed between worker processes or stored per manager per gameweek.
+Squads are encoded as arrays of element ids, together with the cost of each player as selling prices differ from current costs,
+against the snapshot id of the PlayerRegistry they were built from. Decoding looks the players up in a registry,
+so the decoded players are the registry's shared instances.
+
+Each codec has two formats:
+- to_dict/from_dict: A JSON-safe dictionary.
+- to_bytes/from_bytes: A compact binary encoding.
+
+Available classes:
+- TeamCodec: Static class to encode and decode a Team.
+- FormationCodec: Static class to encode and decode a Formation.
+- ResultsCodec: Static class to encode and decode the list of ScoredTeam returned by Optimizer.calc_optimal_teams.
+"""
+
+import struct
+from typing import Any, Dict, List, Optional, Tuple
+from fpl import Player, PlayerRegistry, Team, Formation
+from fpl.optimizer import ScoredTeam
+
+VERSION = 1
+# the length of the snapshot id is packed in a single byte
+MAX_SNAPSHOT_BYTES = 255
+TEAM_TAG, FORMATION_TAG, RESULTS_TAG = b"T", b"F", b"R"
+
+
+def _check_snapshot(snapshot_id: Optional[str], registry: PlayerRegistry):
+    """Check data was encoded against the snapshot of the registry.
+
+    :param snapshot_id: Snapshot id the data was encoded against, None if unknown.
+    :param registry: Registry used to decode the data.
+
+    :raises ValueError: If the snapshot ids differ.
+    """
+    if snapshot_id is not None and snapshot_id != registry.snapshot_id:
+        raise ValueError(
+            f"Data encoded against snapshot {snapshot_id} cannot be decoded with snapshot {registry.snapshot_id}."
+        )
+
+
+def _squad_to_arrays(players) -> Tuple[List[int], List[int]]:
+    """Return the element ids and costs of players sorted by element id."""
+    squad = sorted(players)
+    return [p.element for p in squad], [p.cost for p in squad]
+
+
+def _squad_from_arrays(
+    elements: List[int], costs: List[int], registry: PlayerRegistry
+) -> List[Player]:
+    """Return the registry's players for element ids and costs."""
+    if len(elements) != len(costs):
+        raise ValueError("elements and costs must have the same length.")
+    return [registry.get(element, cost) for element, cost in zip(elements, costs)]
+
+
+def _describe_players(players) -> List[Dict[str, Any]]:
+    """Return the element id and name of players ordered by element id."""
+    return [
+        {"element": p.element, "name": p.name}
+        for p in sorted(players, key=lambda p: p.element)
+    ]
+
+
+def _pack_header(tag: bytes, snapshot_id: Optional[str]) -> bytes:
+    """Pack the tag, version and snapshot id at the start of an encoding.
+
+    :raises ValueError: If the snapshot id is longer than MAX_SNAPSHOT_BYTES bytes in UTF-8.
+    """
+    snapshot = b"" if snapshot_id is None else snapshot_id.encode()
+    if len(snapshot) > MAX_SNAPSHOT_BYTES:
+        raise ValueError(
+            f"Snapshot id is {len(snapshot)} bytes in UTF-8, the binary encoding allows at most {MAX_SNAPSHOT_BYTES}."
+        )
+    return tag + struct.pack("<BB", VERSION, len(snapshot)) + snapshot
+
+
+def _unpack_header(tag: bytes, data: bytes) -> Tuple[Optional[str], int]:
+    """Unpack the header of an encoding.
+
+    :return: Tuple of the snapshot id and the offset of the rest of the encoding.
+
+    :raises ValueError: If the data is not an encoding of the expected type and version.
+    """
+    if data[:1] != tag:
+        raise ValueError(f"Data is not an encoding of type {tag.decode()}.")
+    version, snapshot_length = struct.unpack_from("<BB", data, 1)
+    if version != VERSION:
+        raise ValueError(f"Unsupported encoding version {version}.")
+    offset = 3 + snapshot_length
+    snapshot_id = data[3:offset].decode() if snapshot_length else None
+    return snapshot_id, offset
+
+
+def _pack_squad(money_in_bank: int, free_transfers: int, players) -> bytes:
+    """Pack the money in the bank, free transfers, element ids and costs of a squad."""
+    elements, costs = _squad_to_arrays(players)
+    n = len(elements)
+    return struct.pack(
+        f"<ihB{n}H{n}H", money_in_bank, free_transfers, n, *elements, *costs
+    )
+
+
+def _unpack_squad(
+    data: bytes, offset: int
+) -> Tuple[int, int, List[int], List[int], int]:
+    """Unpack a squad packed by _pack_squad.
+
+    :return: Tuple of the money in the bank, free transfers, element ids, costs and the offset after the squad.
+    """
+    money_in_bank, free_transfers, n = struct.unpack_from("<ihB", data, offset)
+    offset += struct.calcsize("<ihB")
+    values = struct.unpack_from(f"<{2 * n}H", data, offset)
+    return (
+        money_in_bank,
+        free_transfers,
+        list(values[:n]),
+        list(values[n:]),
+        offset + 4 * n,
+    )
+
+
+def _team_from_squad(
+    money_in_bank: int, free_transfers: int, players: List[Player]
+) -> Team:
+    """Build a Team from the players of a squad, validating it with the public constructor."""
+    return Team(
+        money_in_bank=money_in_bank,
+        free_transfers=free_transfers,
+        gkps=frozenset(p for p in players if p.position == 1),
+        defs=frozenset(p for p in players if p.position == 2),
+        mids=frozenset(p for p in players if p.position == 3),
+        fwds=frozenset(p for p in players if p.position == 4),
+    )
+
+
+class TeamCodec:
+    """Static class to encode and decode a Team."""
+
+    @staticmethod
+    def to_dict(team: Team, snapshot_id: Optional[str] = None) -> Dict[str, Any]:
+        """Encode a team as a JSON-safe dictionary.
+
+        :param team: The team to encode.
+        :param snapshot_id: Snapshot id of the registry the players belong to.
+
+        :return: Dictionary with the snapshot id, money in bank, free transfers, element ids and costs of the squad.
+        """
+        elements, costs = _squad_to_arrays(
+            team.gkps | team.defs | team.mids | team.fwds
+        )
+        return {
+            "snapshot_id": snapshot_id,
+            "money_in_bank": team.money_in_bank,
+            "free_transfers": team.free_transfers,
+            "elements": elements,
+            "costs": costs,
+        }
+
+    @staticmethod
+    def from_dict(data: Dict[str, Any], registry: PlayerRegistry) -> Team:
+        """Decode a team encoded by to_dict.
+
+        :param data: The encoded team.
+        :param registry: Registry of the snapshot the team was encoded against.
+
+        :return: The decoded Team.
+
+        :raises ValueError: If the snapshot ids differ.
+        :raises KeyError: If a player is not in the registry.
+        """
+        _check_snapshot(data["snapshot_id"], registry)
+        return _team_from_squad(
+            data["money_in_bank"],
+            data["free_transfers"],
+            _squad_from_arrays(data["elements"], data["costs"], registry),
+        )
+
+    @staticmethod
+    def to_bytes(team: Team, snapshot_id: Optional[str] = None) -> bytes:
+        """Encode a team as bytes.
+
+        :param team: The team to encode.
+        :param snapshot_id: Snapshot id of the registry the players belong to.
+
+        :return: The encoded team.
+
+        :raises ValueError: If the snapshot id is longer than MAX_SNAPSHOT_BYTES bytes in UTF-8.
+        """
+        return _pack_header(TEAM_TAG, snapshot_id) + _pack_squad(
+            team.money_in_bank,
+            team.free_transfers,
+            team.gkps | team.defs | team.mids | team.fwds,
+        )
+
+    @staticmethod
+    def from_bytes(data: bytes, registry: PlayerRegistry) -> Team:
+        """Decode a team encoded by to_bytes.
+
+        :param data: The encoded team.
+        :param registry: Registry of the snapshot the team was encoded against.
+
+        :return: The decoded Team.
+
+        :raises ValueError: If the data is not an encoded team or the snapshot ids differ.
+        :raises KeyError: If a player is not in the registry.
+        """
+        snapshot_id, offset = _unpack_header(TEAM_TAG, data)
+        _check_snapshot(snapshot_id, registry)
+        money_in_bank, free_transfers, elements, costs, _ = _unpack_squad(data, offset)
+        return _team_from_squad(
+            money_in_bank,
+            free_transfers,
+            _squad_from_arrays(elements, costs, registry),
+        )
+
+
+class FormationCodec:
+    """Static class to encode and decode a Formation."""
+
+    @staticmethod
+    def to_dict(
+        formation: Formation, snapshot_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Encode a formation as a JSON-safe dictionary.
+
+        :param formation: The formation to encode.
+        :param snapshot_id: Snapshot id of the registry the players belong to.
+
+        :return: Dictionary with the snapshot id, total expected points, element ids and costs of the starting eleven
+                 and the element id of the captain, None if there is no captain.
+        """
+        elements, costs = _squad_to_arrays(
+            formation.gkps | formation.defs | formation.mids | formation.fwds
+        )
+        return {
+            "snapshot_id": snapshot_id,
+            "total_exp_points": float(formation.total_exp_points),
+            "elements": elements,
+            "costs": costs,
+            "captain": None if formation.captain is None else formation.captain.element,
+        }
+
+    @staticmethod
+    def _build(
+        total_exp_points: float, players: List[Player], captain: Optional[int]
+    ) -> Formation:
+        """Build a decoded formation, which was valid when it was encoded."""
+        captain_player = None
+        if captain is not None:
+            captain_player = next(p for p in players if p.element == captain)
+        return Formation._from_validated(
+            total_exp_points=total_exp_points,
+            gkps=frozenset(p for p in players if p.position == 1),
+            defs=frozenset(p for p in players if p.position == 2),
+            mids=frozenset(p for p in players if p.position == 3),
+            fwds=frozenset(p for p in players if p.position == 4),
+            captain=captain_player,
+        )
+
+    @staticmethod
+    def from_dict(data: Dict[str, Any], registry: PlayerRegistry) -> Formation:
+        """Decode a formation encoded by to_dict.
+
+        :param data: The encoded formation.
+        :param registry: Registry of the snapshot the formation was encoded against.
+
+        :return: The decoded Formation.
+
+        :raises ValueError: If the snapshot ids differ.
+        :raises KeyError: If a player is not in the registry.
+        """
+        _check_snapshot(data["snapshot_id"], registry)
+        return FormationCodec._build(
+            data["total_exp_points"],
+            _squad_from_arrays(data["elements"], data["costs"], registry),
+            data["captain"],
+        )
+
+    @staticmethod
+    def to_bytes(formation: Formation, snapshot_id: Optional[str] = None) -> bytes:
+        """Encode a formation as bytes.
+
+        :param formation: The formation to encode.
+        :param snapshot_id: Snapshot id of the registry the players belong to.
+
+        :return: The encoded formation.
+
+        :raises ValueError: If the snapshot id is longer than MAX_SNAPSHOT_BYTES bytes in UTF-8.
+        """
+        captain = -1 if formation.captain is None else formation.captain.element
+        return (
+            _pack_header(FORMATION_TAG, snapshot_id)
+            + struct.pack("<di", float(formation.total_exp_points), captain)
+            + _pack_squad(
+                0, 0, formation.gkps | formation.defs | formation.mids | formation.fwds
+            )
+        )
+
+    @staticmethod
+    def from_bytes(data: bytes, registry: PlayerRegistry) -> Formation:
+        """Decode a formation encoded by to_bytes.
+
+        :param data: The encoded formation.
+        :param registry: Registry of the snapshot the formation was encoded against.
+
+        :return: The decoded Formation.
+
+        :raises ValueError: If the data is not an encoded formation or the snapshot ids differ.
+        :raises KeyError: If a player is not in the registry.
+        """
+        snapshot_id, offset = _unpack_header(FORMATION_TAG, data)
+        _check_snapshot(snapshot_id, registry)
+        total_exp_points, captain = struct.unpack_from("<di", data, offset)
+        _, _, elements, costs, _ = _unpack_squad(data, offset + struct.calcsize("<di"))
+        return FormationCodec._build(
+            total_exp_points,
+            _squad_from_arrays(elements, costs, registry),
+            None if captain < 0 else captain,
+        )
+
+
+class ResultsCodec:
+    """Static class to encode and decode the list of ScoredTeam returned by Optimizer.calc_optimal_teams."""
+
+    @staticmethod
+    def to_dict(
+        results: List[ScoredTeam],
+        snapshot_id: Optional[str] = None,
+        team: Optional[Team] = None,
+    ) -> Dict[str, Any]:
+        """Encode optimizer results as a JSON-safe dictionary.
+
+        :param results: List of scored teams.
+        :param snapshot_id: Snapshot id of the registry the players belong to.
+        :param team: The optimized team, to also list the players transferred out and in by each result.
+                     The transfers are for reading only and are ignored by from_dict.
+
+        :return: Dictionary with the snapshot id and the score and encoded team of each result in order.
+        """
+        encoded = []
+        squad = None if team is None else team.gkps | team.defs | team.mids | team.fwds
+        for score, result_team in results:
+            team_dict = TeamCodec.to_dict(result_team)
+            del team_dict["snapshot_id"]
+            encoded.append({"score": float(score), **team_dict})
+            if squad is not None:
+                result_squad = (
+                    result_team.gkps
+                    | result_team.defs
+                    | result_team.mids
+                    | result_team.fwds
+                )
+                encoded[-1]["transfers_out"] = _describe_players(squad - result_squad)
+                encoded[-1]["transfers_in"] = _describe_players(result_squad - squad)
+        return {"snapshot_id": snapshot_id, "results": encoded}
+
+    @staticmethod
+    def from_dict(data: Dict[str, Any], registry: PlayerRegistry) -> List[ScoredTeam]:
+        """Decode optimizer results encoded by to_dict.
+
+        :param data: The encoded results.
+        :param registry: Registry of the snapshot the results were encoded against.
+
+        :return: List of scored teams in the order they were encoded.
+
+        :raises ValueError: If the snapshot ids differ.
+        :raises KeyError: If a player is not in the registry.
+        """
+        _check_snapshot(data["snapshot_id"], registry)
+        return [
+            ScoredTeam(
+                result["score"],
+                TeamCodec.from_dict({**result, "snapshot_id": None}, registry),
+            )
+            for result in data["results"]
+        ]
+
+    @staticmethod
+    def to_bytes(results: List[ScoredTeam], snapshot_id: Optional[str] = None) -> bytes:
+        """Encode optimizer results as bytes.
+
+        :param results: List of scored teams.
+        :param snapshot_id: Snapshot id of the registry the players belong to.
+
+        :return: The encoded results.
+
+        :raises ValueError: If the snapshot id is longer than MAX_SNAPSHOT_BYTES bytes in UTF-8.
+        """
+        parts = [
+            _pack_header(RESULTS_TAG, snapshot_id),
+            struct.pack("<H", len(results)),
+        ]
+        for score, team in results:
+            parts.append(struct.pack("<d", score))
+            parts.append(
+                _pack_squad(
+                    team.money_in_bank,
+                    team.free_transfers,
+                    team.gkps | team.defs | team.mids | team.fwds,
+                )
+            )
+        return b"".join(parts)
+
+    @staticmethod
+    def from_bytes(data: bytes, registry: PlayerRegistry) -> List[ScoredTeam]:
+        """Decode optimizer results encoded by to_bytes.
+
+        :param data: The encoded results.
+        :param registry: Registry of the snapshot the results were encoded against.
+
+        :return: List of scored teams in the order they were encoded.
+
+        :raises ValueError: If the data is not encoded results or the snapshot ids differ.
+        :raises KeyError: If a player is not in the registry.
+        """
+        snapshot_id, offset = _unpack_header(RESULTS_TAG, data)
+        _check_snapshot(snapshot_id, registry)
+        (n_results,) = struct.unpack_from("<H", data, offset)
+        offset += struct.calcsize("<H")
+        results = []
+        for _ in range(n_results):
+            (score,) = struct.unpack_from("<d", data, offset)
+            money_in_bank, free_transfers, elements, costs, offset = _unpack_squad(
+                data, offset + struct.calcsize("<d")
+            )
+            team = _team_from_squad(
+                money_in_bank,
+                free_transfers,
+                _squad_from_arrays(elements, costs, registry),
+            )
+            results.append(ScoredTeam(score, team))
+        return results
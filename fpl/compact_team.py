@@ -0,0 +1,234 @@
+"""
+This module defines the CompactTeam class, a compact encoding of a Fantasy Premier League (FPL) team used internally by searches.
+The squad is held as a sorted tuple of element ids together with the money in the bank and free transfers as integers,
+so hashing is O(1) once computed and a transfer only copies 15 integers.
+Teams created with from_team also carry the number of players of each club and position, which transfer_player updates
+for the two players swapped, so is_feasible and can_transfer are constant time.
+Otherwise player details are looked up in a mapping of element ids to Player instances shared by every team of a search.
+A CompactTeam is converted back to a Team at the boundary of the public API.
+
+Available functions:
+- from_team: Create a CompactTeam from a Team.
+- to_team: Convert the CompactTeam back to a Team.
+- __eq__: Checks if two compact teams are equal based on their attributes.
+- __lt__: Compares two compact teams based on their money in the bank and free transfers.
+- __hash__: Returns the hash of the compact team, computed once.
+- __contains__: Checks if a player is in the squad.
+- is_feasible: Checks if the team is feasible based on FPL rules.
+- can_transfer: Checks if a transfer keeps the team within reach of a feasible team.
+- transfer_player: Transfers a player in and out of the team and returns a new compact team.
+"""
+
+from bisect import bisect_left, insort
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import total_ordering
+from typing import Dict, Optional, Tuple
+from fpl.player import Player
+from fpl.team import Team
+
+# number of players needed in each position of a squad
+SQUAD_SIZES = {1: 2, 2: 5, 3: 5, 4: 3}
+# maximum number of players of a squad from a single club
+MAX_PLAYERS_PER_CLUB = 3
+
+
+@total_ordering
+@dataclass(frozen=True)
+class CompactTeam:
+    elements: Tuple[int, ...]  # sorted element ids of the squad
+    money_in_bank: int
+    free_transfers: int
+    # number of players of each club and position, None when not tracked
+    club_counts: Optional[Dict[int, int]] = field(
+        default=None, repr=False, compare=False
+    )
+    position_counts: Optional[Dict[int, int]] = field(
+        default=None, repr=False, compare=False
+    )
+    # number of players above the limit of their club summed over clubs
+    club_excess: int = field(default=0, repr=False, compare=False)
+    _hash: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        """Compute the hash of the team once."""
+        object.__setattr__(
+            self,
+            "_hash",
+            hash((self.elements, self.money_in_bank, self.free_transfers)),
+        )
+
+    @classmethod
+    def from_team(cls, team: Team) -> "CompactTeam":
+        """Create a CompactTeam from a Team, counting the players of each club and position.
+
+        :param team: The team to encode.
+
+        :return: A CompactTeam with the element ids of the squad, money in bank, and free transfers of the team.
+        """
+        squad = team.gkps | team.defs | team.mids | team.fwds
+        club_counts = dict(Counter(player.club for player in squad))
+        return cls(
+            tuple(sorted(player.element for player in squad)),
+            team.money_in_bank,
+            team.free_transfers,
+            club_counts=club_counts,
+            position_counts=dict(Counter(player.position for player in squad)),
+            club_excess=sum(
+                max(0, n_players - MAX_PLAYERS_PER_CLUB)
+                for n_players in club_counts.values()
+            ),
+        )
+
+    def to_team(self, players: Dict[int, Player]) -> Team:
+        """Convert the CompactTeam back to a Team.
+
+        :param players: Mapping of element ids to Player instances, containing every player of the squad.
+
+        :return: A Team with the same squad, money in bank, and free transfers.
+        """
+        squad = [players[element] for element in self.elements]
+        return Team(
+            money_in_bank=self.money_in_bank,
+            free_transfers=self.free_transfers,
+            gkps=frozenset(player for player in squad if player.position == 1),
+            defs=frozenset(player for player in squad if player.position == 2),
+            mids=frozenset(player for player in squad if player.position == 3),
+            fwds=frozenset(player for player in squad if player.position == 4),
+        )
+
+    def __eq__(self, other: "CompactTeam") -> bool:
+        """Check if two compact teams are equal based on their squads, money in bank, and free transfers.
+
+        :param other: Another CompactTeam instance to compare with.
+
+        :return: True if the teams have the same squads, money in bank, and free transfers, False otherwise.
+        """
+        return (
+            self._hash == other._hash
+            and self.elements == other.elements
+            and self.money_in_bank == other.money_in_bank
+            and self.free_transfers == other.free_transfers
+        )
+
+    def __lt__(self, other: "CompactTeam") -> bool:
+        """Compare two compact teams based on their money in the bank and free transfers, as Team does.
+
+        :param other: Another CompactTeam instance to compare with.
+
+        :return: True if this team's money in the bank is less than the other team's, or if they are equal,
+                 if this team's free transfers are less than the other team's, False otherwise.
+        """
+        return (self.money_in_bank, self.free_transfers) < (
+            other.money_in_bank,
+            other.free_transfers,
+        )
+
+    def __hash__(self) -> int:
+        """Return the hash of the compact team, computed once.
+
+        :return: The hash of the squad, money in bank, and free transfers.
+        """
+        return self._hash
+
+    def __contains__(self, element: int) -> bool:
+        """Check if a player is in the squad.
+
+        :param element: The unique ID of the player.
+
+        :return: True if the player is in the squad, False otherwise.
+        """
+        i = bisect_left(self.elements, element)
+        return i < len(self.elements) and self.elements[i] == element
+
+    def is_feasible(self, players: Optional[Dict[int, Player]] = None) -> bool:
+        """Return whether an FPL team is feasible or not.
+        Constant time when the players of each club and position are tracked.
+
+        :param players: Mapping of element ids to Player instances containing every player of the squad,
+                        only needed when the players of each club and position are not tracked.
+
+        :return: bool indicating whether the team has enough money, players in one club < 3,
+                 and the correct number of players in each position.
+        """
+        if self.money_in_bank < 0:
+            return False
+        if self.club_counts is None:
+            squad = [players[element] for element in self.elements]
+            club_counts = Counter(p.club for p in squad)
+            if any(
+                n_players > MAX_PLAYERS_PER_CLUB for n_players in club_counts.values()
+            ):
+                return False
+            return Counter(p.position for p in squad) == SQUAD_SIZES
+        return self.club_excess == 0 and self.position_counts == SQUAD_SIZES
+
+    def can_transfer(
+        self, out_player: Player, in_player: Player, remaining_transfers: int = 0
+    ) -> bool:
+        """Check in constant time if a transfer keeps the team within reach of a feasible team.
+        Each further transfer can remove at most one player above the limit of a club, and the money in the bank
+        is only checked when no further transfers can be made.
+        Requires the players of each club to be tracked.
+
+        :param out_player: Player to be transferred out.
+        :param in_player: Player to be transferred in.
+        :param remaining_transfers: Number of transfers which can still be made after this one.
+
+        :return: False if no team reached from the transfer with the remaining transfers can be feasible.
+        """
+        if (
+            remaining_transfers == 0
+            and self.money_in_bank + out_player.cost - in_player.cost < 0
+        ):
+            return False
+        club_excess = self.club_excess
+        if out_player.club != in_player.club:
+            if self.club_counts[out_player.club] > MAX_PLAYERS_PER_CLUB:
+                club_excess -= 1
+            if self.club_counts.get(in_player.club, 0) >= MAX_PLAYERS_PER_CLUB:
+                club_excess += 1
+        return club_excess <= remaining_transfers
+
+    def transfer_player(self, out_player: Player, in_player: Player) -> "CompactTeam":
+        """Make a single transfer, giving a new compact team.
+        The players of each club are updated for the two players swapped only.
+
+        :param out_player: Player to be transferred out.
+        :param in_player: Player to be transferred in.
+
+        :return: A copy of the team with the updated squad, money in bank, and free transfers.
+
+        :raises ValueError: If the positions of the players being transferred do not match,
+                            or if the player transferred out is not in the squad.
+        """
+        if out_player.position != in_player.position:
+            raise ValueError("Both players must have the same position for a transfer.")
+        if out_player.element not in self:
+            raise ValueError("Player transferred out must be in the squad.")
+
+        elements = list(self.elements)
+        del elements[bisect_left(elements, out_player.element)]
+        insort(elements, in_player.element)
+
+        club_counts, club_excess = self.club_counts, self.club_excess
+        if club_counts is not None and out_player.club != in_player.club:
+            club_counts = dict(club_counts)
+            if club_counts[out_player.club] > MAX_PLAYERS_PER_CLUB:
+                club_excess -= 1
+            club_counts[out_player.club] -= 1
+            if club_counts[out_player.club] == 0:
+                del club_counts[out_player.club]
+            n_players = club_counts.get(in_player.club, 0)
+            if n_players >= MAX_PLAYERS_PER_CLUB:
+                club_excess += 1
+            club_counts[in_player.club] = n_players + 1
+
+        return CompactTeam(
+            tuple(elements),
+            self.money_in_bank + out_player.cost - in_player.cost,
+            self.free_transfers - 1,
+            club_counts=club_counts,
+            position_counts=self.position_counts,
+            club_excess=club_excess,
+        )
@@ -10,12 +10,17 @@ Available functions:
 """
 
 from abc import ABC, abstractmethod
+from typing import Dict, Tuple
 from fpl import Loader
 
 
 class ExpectedPointsCalculator(ABC):
     """Class to calculate the points that a particular player will get."""
 
+    # fields of the static information read by the calculator by section, e.g. {"elements": ("ict_index",)},
+    # kept by the slim projection of the static information, see Loader.configure_static_info
+    static_fields: Dict[str, Tuple[str, ...]] = {}
+
     @staticmethod
     @abstractmethod
     def get_expected_points(player_id: int, gameweek: int) -> float:
@@ -39,6 +44,10 @@ class SimpleExpectedPointsCalculator(ExpectedPointsCalculator):
     points per game, and fixture difficulty.
     """
 
+    static_fields = {
+        "elements": ("points_per_game", "form"),
+        "teams": ("strength_overall_home", "strength_overall_away"),
+    }
     alpha = 5.9697
     beta_form = 0.1202
     beta_points_per_game = 0.4604
@@ -5,6 +5,7 @@ It also provides post initialization checking to see that the team is indeed the
 
 Available functions:
 - __post_init__: Validates the the formation after initialization.
+- _from_validated: Creates a formation without validating it, for formations known to be valid.
 - __str__: Return a string representation of the formation.
 """
 
@@ -53,14 +54,17 @@ class Formation:
                 f"Total number of players must be 11, but got {total_players}"
             )
 
-        min_play_gkps = Loader.get_position_info(1)["squad_min_play"]
-        max_play_gkps = Loader.get_position_info(1)["squad_max_play"]
-        min_play_defs = Loader.get_position_info(2)["squad_min_play"]
-        max_play_defs = Loader.get_position_info(2)["squad_max_play"]
-        min_play_mids = Loader.get_position_info(3)["squad_min_play"]
-        max_play_mids = Loader.get_position_info(3)["squad_max_play"]
-        min_play_fwds = Loader.get_position_info(4)["squad_min_play"]
-        max_play_fwds = Loader.get_position_info(4)["squad_max_play"]
+        position_info = {
+            position: Loader.get_position_info(position) for position in range(1, 5)
+        }
+        min_play_gkps = position_info[1]["squad_min_play"]
+        max_play_gkps = position_info[1]["squad_max_play"]
+        min_play_defs = position_info[2]["squad_min_play"]
+        max_play_defs = position_info[2]["squad_max_play"]
+        min_play_mids = position_info[3]["squad_min_play"]
+        max_play_mids = position_info[3]["squad_max_play"]
+        min_play_fwds = position_info[4]["squad_min_play"]
+        max_play_fwds = position_info[4]["squad_max_play"]
 
         if not (min_play_gkps <= len(self.gkps) <= max_play_gkps):
             raise ValueError(
@@ -82,6 +86,39 @@ class Formation:
                 f"Total number of forwards ({len(self.fwds)}) is out of range ({min_play_fwds}-{max_play_fwds})"
             )
 
+    @classmethod
+    def _from_validated(
+        cls,
+        total_exp_points: float,
+        gkps: FrozenSet[Player],
+        defs: FrozenSet[Player],
+        mids: FrozenSet[Player],
+        fwds: FrozenSet[Player],
+        captain: Player,
+    ) -> "Formation":
+        """Create a formation without validating it.
+        Only to be used for formations known to be valid, e.g. the optimal formation of a validated team.
+
+        :param total_exp_points: Total expected points of the formation including the captain.
+        :param gkps: FrozenSet of the starting goalkeepers.
+        :param defs: FrozenSet of the starting defenders.
+        :param mids: FrozenSet of the starting midfielders.
+        :param fwds: FrozenSet of the starting forwards.
+        :param captain: The captain, None if no player is expected to score.
+
+        :return: A Formation instance with the specified attributes.
+        """
+        formation = object.__new__(cls)
+        formation.__dict__.update(
+            total_exp_points=total_exp_points,
+            gkps=gkps,
+            defs=defs,
+            mids=mids,
+            fwds=fwds,
+            captain=captain,
+        )
+        return formation
+
     def __str__(self):
         """Return a string representation of the formation.
 
@@ -0,0 +1,178 @@
+"""
+This module defines the FormationCache class, which memoizes optimal formation totals across the teams of a single run,
+e.g. every team scored by a transfer search or plan.
+Teams derived from one another by transfers mostly share their squads, and always share the players of the positions
+no transfer touched, so the cache works at three levels, each keyed by gameweek:
+- the expected points of each player, so each (player, gameweek) pair is passed to the expected points calculator once,
+- the sorted expected points of the players of a position, reused by every squad sharing those players,
+- the optimal formation total of a squad, reused by every team with the same squad.
+A cache is only valid for a single expected points calculator, so a new one should be created for each run.
+
+Available classes:
+- CacheStats: Number of hits and misses of each level of a FormationCache.
+- FormationCache: Class memoizing optimal formation totals by squad and gameweek.
+
+Available functions:
+- get_total_exp_points: Return the total expected points of the optimal formation of a team for a gameweek.
+- stats: Return the number of hits and misses of each level of the cache.
+- clear: Remove every memoized value and reset the hits and misses.
+"""
+
+from itertools import accumulate
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Tuple
+from fpl import Player, Team, ExpectedPointsCalculator
+from fpl.formation_kernel import get_valid_formations
+
+
+class CacheStats(NamedTuple):
+    """Number of hits and misses of each level of a FormationCache."""
+
+    formation_hits: int
+    formation_misses: int
+    position_hits: int
+    position_misses: int
+    points_hits: int
+    points_misses: int
+
+    @staticmethod
+    def _rate(hits: int, misses: int) -> float:
+        return hits / (hits + misses) if hits + misses else 0.0
+
+    @property
+    def formation_hit_rate(self) -> float:
+        """Fraction of formation lookups answered from the cache."""
+        return self._rate(self.formation_hits, self.formation_misses)
+
+    @property
+    def position_hit_rate(self) -> float:
+        """Fraction of position lookups answered from the cache."""
+        return self._rate(self.position_hits, self.position_misses)
+
+    @property
+    def points_hit_rate(self) -> float:
+        """Fraction of expected points lookups answered from the cache."""
+        return self._rate(self.points_hits, self.points_misses)
+
+
+class FormationCache:
+    """Class memoizing optimal formation totals by squad and gameweek, sharing per-position results between squads."""
+
+    def __init__(
+        self,
+        epc: ExpectedPointsCalculator,
+        formations: Optional[List[Tuple[int, int, int, int]]] = None,
+    ):
+        """Create an empty cache.
+
+        :param epc: Expected points calculator.
+        :param formations: Allowed numbers of players in each position, defaults to get_valid_formations().
+        """
+        self.epc = epc
+        self.formations = get_valid_formations() if formations is None else formations
+        self._points: Dict[Tuple[int, int], float] = {}
+        # cumulative sums of the sorted expected points of a position, starting from 0, and the best expected points
+        self._positions: Dict[
+            Tuple[FrozenSet[Player], int], Tuple[List[float], float]
+        ] = {}
+        self._totals: Dict[Tuple[FrozenSet[Player], ...], float] = {}
+        self._fitting: Dict[Tuple[int, ...], List[Tuple[int, int, int, int]]] = {}
+        self._counts = [0] * 6
+
+    def _get_points(self, element: int, gameweek: int) -> float:
+        """Return the expected points of a player for a gameweek, querying the calculator once."""
+        key = (element, gameweek)
+        points = self._points.get(key)
+        if points is None:
+            self._counts[5] += 1
+            points = self.epc.get_expected_points(element, gameweek)
+            self._points[key] = points
+        else:
+            self._counts[4] += 1
+        return points
+
+    def _get_position(
+        self, players: FrozenSet[Player], gameweek: int
+    ) -> Tuple[List[float], float]:
+        """Return the cumulative sums of the sorted expected points of the players of a position and the best expected points."""
+        key = (players, gameweek)
+        position = self._positions.get(key)
+        if position is None:
+            self._counts[3] += 1
+            points = sorted(
+                (self._get_points(player.element, gameweek) for player in players),
+                reverse=True,
+            )
+            position = (
+                list(accumulate(points, initial=0.0)),
+                points[0] if points else float("-inf"),
+            )
+            self._positions[key] = position
+        else:
+            self._counts[2] += 1
+        return position
+
+    def _get_fitting_formations(
+        self, squad_counts: Tuple[int, ...]
+    ) -> List[Tuple[int, int, int, int]]:
+        """Return the formations which can be fielded with the given number of players in each position."""
+        formations = self._fitting.get(squad_counts)
+        if formations is None:
+            formations = [
+                formation
+                for formation in self.formations
+                if all(count <= n for count, n in zip(formation, squad_counts))
+            ]
+            self._fitting[squad_counts] = formations
+        return formations
+
+    def get_total_exp_points(self, team: Team, gameweek: int) -> float:
+        """Return the total expected points of the optimal formation of a team for a gameweek, including the captain.
+        The result only depends on the squad, so it is shared by teams with different money in the bank or free transfers.
+
+        :param team: The team.
+        :param gameweek: The gameweek.
+
+        :return: Total expected points of the optimal formation.
+
+        :raises ValueError: If the squad cannot field any valid formation.
+        """
+        key = (team.gkps, team.defs, team.mids, team.fwds, gameweek)
+        total = self._totals.get(key)
+        if total is not None:
+            self._counts[0] += 1
+            return total
+        self._counts[1] += 1
+
+        gkps, defs, mids, fwds = positions = [
+            self._get_position(players, gameweek)
+            for players in (team.gkps, team.defs, team.mids, team.fwds)
+        ]
+        formations = self._get_fitting_formations(
+            tuple(len(sums) - 1 for sums, _ in positions)
+        )
+        if not formations:
+            raise ValueError("Squad cannot field a valid formation.")
+        best_total = max(
+            gkps[0][n_gkps] + defs[0][n_defs] + mids[0][n_mids] + fwds[0][n_fwds]
+            for n_gkps, n_defs, n_mids, n_fwds in formations
+        )
+        # every position starts at least one player so the captain is the best player of the squad,
+        # and their points are doubled only if they are expected to score
+        captain_points = max(best for _, best in positions)
+        total = best_total + max(captain_points, 0)
+        self._totals[key] = total
+        return total
+
+    def stats(self) -> CacheStats:
+        """Return the number of hits and misses of each level of the cache.
+
+        :return: CacheStats with the hits, misses and hit rates of the formation, position and expected points levels.
+        """
+        return CacheStats(*self._counts)
+
+    def clear(self):
+        """Remove every memoized value and reset the hits and misses."""
+        self._points.clear()
+        self._positions.clear()
+        self._totals.clear()
+        self._counts = [0] * 6
@@ -0,0 +1,213 @@
+"""
+This module provides a numeric kernel for finding the optimal formation of an FPL squad.
+Rather than sorting lists of players and building a Formation object for every gameweek,
+the kernel works on a matrix of expected points with one row per player and one column per gameweek,
+and finds the optimal starting eleven, captain and total expected points for all gameweeks at once.
+Many squads can be handled at once by adding a leading batch axis to the matrix.
+
+Available functions:
+- get_valid_formations: Return every allowed number of gkps, defs, mids and fwds in a starting eleven.
+- calc_optimal_formation_arrays: Find the optimal formation of a squad for every gameweek in one vectorized call.
+- calc_optimal_formation_batch: Find the optimal formations of many squads for every gameweek in one vectorized call.
+"""
+
+from typing import List, NamedTuple, Optional, Tuple
+import numpy as np
+from fpl import Loader
+
+
+class FormationArrays(NamedTuple):
+    """Optimal formations of a squad over several gameweeks.
+    For a batch of squads every array has an extra leading axis of length n_squads.
+
+    mask: Boolean array of shape (n_players, n_gameweeks), True where the player starts.
+    captain: Integer array of shape (n_gameweeks,) with the row of the captain, -1 if no player is expected to score.
+    total_exp_points: Float array of shape (n_gameweeks,) with the total expected points including the captain.
+    """
+
+    mask: np.ndarray
+    captain: np.ndarray
+    total_exp_points: np.ndarray
+
+
+def get_valid_formations() -> List[Tuple[int, int, int, int]]:
+    """Return every allowed number of gkps, defs, mids and fwds in a starting eleven.
+
+    :return: List of tuples with the number of players in each of the four positions.
+    """
+    ranges = []
+    for position in range(1, 5):
+        position_info = Loader.get_position_info(position)
+        ranges.append(
+            range(position_info["squad_min_play"], position_info["squad_max_play"] + 1)
+        )
+    return [
+        (gkps, defs, mids, fwds)
+        for gkps in ranges[0]
+        for defs in ranges[1]
+        for mids in ranges[2]
+        for fwds in ranges[3]
+        if gkps + defs + mids + fwds == 11
+    ]
+
+
+def calc_optimal_formation_arrays(
+    exp_points: np.ndarray,
+    positions: np.ndarray,
+    formations: Optional[List[Tuple[int, int, int, int]]] = None,
+) -> FormationArrays:
+    """Find the optimal formation of a squad for every gameweek in one vectorized call.
+    For each position the expected points are sorted and summed cumulatively,
+    so the total of every valid formation is a sum of four lookups and the best one is an argmax.
+
+    :param exp_points: Array of shape (n_players, n_gameweeks) of expected points.
+    :param positions: Array of shape (n_players,) of positions 1 = GKP, 2 = DEF, 3 = MID, 4 = FWD.
+    :param formations: Allowed numbers of players in each position, defaults to get_valid_formations().
+
+    :return: FormationArrays containing the starting mask, captain rows and total expected points.
+
+    :raises ValueError: If the arrays have inconsistent shapes or the squad cannot field any valid formation.
+    """
+    exp_points = np.asarray(exp_points, dtype=float)
+    positions = np.asarray(positions)
+    if exp_points.ndim != 2 or positions.shape != exp_points.shape[:1]:
+        raise ValueError(
+            "exp_points must have shape (n_players, n_gameweeks) and positions (n_players,)"
+        )
+    if formations is None:
+        formations = get_valid_formations()
+
+    n_players, n_gameweeks = exp_points.shape
+    columns = np.arange(n_gameweeks)
+
+    # for each position sort the expected points in decreasing order and sum cumulatively
+    rows, ranks, top_sums = [], [], []
+    for position in range(1, 5):
+        position_rows = np.flatnonzero(positions == position)
+        position_points = exp_points[position_rows]
+        order = np.argsort(-position_points, axis=0, kind="stable")
+        rank = np.empty_like(order)
+        np.put_along_axis(rank, order, np.arange(len(position_rows))[:, None], axis=0)
+        sums = np.zeros((len(position_rows) + 1, n_gameweeks))
+        np.cumsum(
+            np.take_along_axis(position_points, order, axis=0), axis=0, out=sums[1:]
+        )
+        rows.append(position_rows)
+        ranks.append(rank)
+        top_sums.append(sums)
+
+    counts = np.array(
+        [
+            formation
+            for formation in formations
+            if all(count < len(sums) for count, sums in zip(formation, top_sums))
+        ],
+        dtype=int,
+    ).reshape(-1, 4)
+    if len(counts) == 0:
+        raise ValueError("Squad cannot field a valid formation.")
+
+    # total of each formation for each gameweek, with shape (n_formations, n_gameweeks)
+    totals = sum(top_sums[p][counts[:, p]] for p in range(4))
+    best = np.argmax(totals, axis=0)
+    total_exp_points = totals[best, columns]
+
+    mask = np.zeros((n_players, n_gameweeks), dtype=bool)
+    for p in range(4):
+        mask[rows[p]] = ranks[p] < counts[best, p]
+
+    # need to double the captain's points, only if the captain is expected to score
+    captain = np.argmax(np.where(mask, exp_points, -np.inf), axis=0)
+    captain_points = exp_points[captain, columns]
+    captain = np.where(captain_points > 0, captain, -1)
+    total_exp_points = total_exp_points + np.maximum(captain_points, 0)
+
+    return FormationArrays(mask, captain, total_exp_points)
+
+
+def calc_optimal_formation_batch(
+    exp_points: np.ndarray,
+    positions: np.ndarray,
+    formations: Optional[List[Tuple[int, int, int, int]]] = None,
+) -> FormationArrays:
+    """Find the optimal formations of many squads for every gameweek in one vectorized call.
+    The rows of each squad are grouped by position, then for each position the expected points are sorted
+    and summed cumulatively, so the total of every valid formation is a sum of four lookups and the best one is an argmax.
+    Memory grows with n_squads * n_formations * n_gameweeks, so large batches should be split into chunks.
+
+    :param exp_points: Array of shape (n_squads, n_players, n_gameweeks) of expected points.
+    :param positions: Array of shape (n_squads, n_players) of positions 1 = GKP, 2 = DEF, 3 = MID, 4 = FWD.
+    :param formations: Allowed numbers of players in each position, defaults to get_valid_formations().
+
+    :return: FormationArrays containing the starting masks, captain rows and total expected points of each squad.
+
+    :raises ValueError: If the arrays have inconsistent shapes, the squads do not all have the same number of players
+                        in each position, or the squads cannot field any valid formation.
+    """
+    exp_points = np.asarray(exp_points, dtype=float)
+    positions = np.asarray(positions)
+    if exp_points.ndim != 3 or positions.shape != exp_points.shape[:2]:
+        raise ValueError(
+            "exp_points must have shape (n_squads, n_players, n_gameweeks) and positions (n_squads, n_players)"
+        )
+    if formations is None:
+        formations = get_valid_formations()
+
+    n_squads, n_players, n_gameweeks = exp_points.shape
+
+    # group the rows of each squad by position, so each position is the same slice of every squad
+    by_position = np.argsort(positions, axis=1, kind="stable")
+    sorted_positions = np.take_along_axis(positions, by_position, axis=1)
+    if n_squads and np.any(sorted_positions != sorted_positions[:1]):
+        raise ValueError(
+            "Every squad must have the same number of players in each position."
+        )
+    sorted_points = np.take_along_axis(exp_points, by_position[:, :, None], axis=1)
+    position_rows = sorted_positions[0] if n_squads else np.zeros(0, dtype=int)
+
+    # for each position sort the expected points in decreasing order and sum cumulatively
+    slices, ranks, top_sums = [], [], []
+    for position in range(1, 5):
+        rows = np.flatnonzero(position_rows == position)
+        start, stop = (rows[0], rows[-1] + 1) if len(rows) else (0, 0)
+        position_points = sorted_points[:, start:stop]
+        order = np.argsort(-position_points, axis=1, kind="stable")
+        rank = np.empty_like(order)
+        np.put_along_axis(rank, order, np.arange(stop - start)[None, :, None], axis=1)
+        sums = np.zeros((n_squads, stop - start + 1, n_gameweeks))
+        np.cumsum(
+            np.take_along_axis(position_points, order, axis=1), axis=1, out=sums[:, 1:]
+        )
+        slices.append(slice(start, stop))
+        ranks.append(rank)
+        top_sums.append(sums)
+
+    counts = np.array(
+        [
+            formation
+            for formation in formations
+            if all(count < sums.shape[1] for count, sums in zip(formation, top_sums))
+        ],
+        dtype=int,
+    ).reshape(-1, 4)
+    if len(counts) == 0:
+        raise ValueError("Squad cannot field a valid formation.")
+
+    # total of each formation for each squad and gameweek, with shape (n_squads, n_formations, n_gameweeks)
+    totals = sum(top_sums[p][:, counts[:, p]] for p in range(4))
+    best = np.argmax(totals, axis=1)
+    total_exp_points = np.take_along_axis(totals, best[:, None], axis=1)[:, 0]
+
+    sorted_mask = np.zeros((n_squads, n_players, n_gameweeks), dtype=bool)
+    for p in range(4):
+        sorted_mask[:, slices[p]] = ranks[p] < counts[best, p][:, None]
+    mask = np.empty_like(sorted_mask)
+    np.put_along_axis(mask, by_position[:, :, None], sorted_mask, axis=1)
+
+    # need to double the captain's points, only if the captain is expected to score
+    captain = np.argmax(np.where(mask, exp_points, -np.inf), axis=1)
+    captain_points = np.take_along_axis(exp_points, captain[:, None], axis=1)[:, 0]
+    captain = np.where(captain_points > 0, captain, -1)
+    total_exp_points = total_exp_points + np.maximum(captain_points, 0)
+
+    return FormationArrays(mask, captain, total_exp_points)
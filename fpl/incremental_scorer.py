@@ -0,0 +1,303 @@
+"""
+This module defines the IncrementalScorer class, which scores an FPL team over a horizon of gameweeks
+and derives the score of teams one transfer away from it without rescoring them from scratch.
+For each gameweek the scorer keeps the expected points of each position sorted, so a single transfer
+only needs one removal and one insertion per gameweek before the optimal formation is re-derived.
+
+Available functions:
+- transfer_player: Make a single transfer, giving the scorer of the new team.
+- total_exp_points: Return the total expected points of the optimal formation for a gameweek.
+- captain: Return the element id of the captain of the optimal formation for a gameweek.
+- calc_optimal_formation: Return the optimal formation for a gameweek as a Formation object.
+- calc_discounted_reward: Calculate the discounted reward of the team over the horizon.
+"""
+
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional, Tuple
+from fpl import Player, Team, Formation, ExpectedPointsCalculator
+from fpl.compact_team import CompactTeam
+from fpl.formation_kernel import get_valid_formations
+
+
+class IncrementalScorer:
+    """Class holding the per-gameweek, per-position sorted expected points of a team.
+    Scorers of teams derived by a transfer share the expected points cache of their parent,
+    so each (player, gameweek) pair is only ever passed to the expected points calculator once.
+    Derived scorers hold their team as a CompactTeam and only build the Team when it is asked for.
+    """
+
+    def __init__(
+        self,
+        team: Optional[Team],
+        epc: ExpectedPointsCalculator,
+        gameweek: int,
+        horizon: int,
+        _points_cache: Optional[Dict[Tuple[int, int], float]] = None,
+        _formations: Optional[List[Tuple[int, int, int, int]]] = None,
+        _sorted_points: Optional[List[Dict[int, List[Tuple[float, int]]]]] = None,
+        _compact_team: Optional[CompactTeam] = None,
+        _players: Optional[Dict[int, Player]] = None,
+    ):
+        """Build the sorted expected points of each position for every gameweek in the horizon.
+
+        :param team: The team to be scored, None when the compact team of a derived scorer is given instead.
+        :param epc: Expected points calculator.
+        :param gameweek: The gameweek from which to start accumulating the reward.
+        :param horizon: The number of gameweeks over which to accumulate the reward.
+        """
+        self._team = team
+        self.compact_team = (
+            CompactTeam.from_team(team) if _compact_team is None else _compact_team
+        )
+        if _players is None:
+            _players = {
+                player.element: player
+                for player in team.gkps | team.defs | team.mids | team.fwds
+            }
+        self._players = _players
+        self.epc = epc
+        self.gameweek = gameweek
+        self.horizon = horizon
+        self._points_cache = {} if _points_cache is None else _points_cache
+        self._formations = (
+            get_valid_formations() if _formations is None else _formations
+        )
+
+        if _sorted_points is None:
+            positions = {1: team.gkps, 2: team.defs, 3: team.mids, 4: team.fwds}
+            _sorted_points = [
+                {
+                    position: sorted(
+                        (
+                            self._get_expected_points(player.element, gameweek + h),
+                            player.element,
+                        )
+                        for player in players
+                    )
+                    for position, players in positions.items()
+                }
+                for h in range(horizon)
+            ]
+        self._sorted_points = _sorted_points
+        self._results = [self._calc_optimal_counts(h) for h in range(horizon)]
+
+    @property
+    def team(self) -> Team:
+        """The scored team, built from the compact team the first time it is needed."""
+        if self._team is None:
+            self._team = self.compact_team.to_team(self._players)
+        return self._team
+
+    def _get_expected_points(self, element: int, gameweek: int) -> float:
+        """Get the expected points of a player in a gameweek, querying the calculator at most once.
+
+        :param element: The unique ID of the player.
+        :param gameweek: The gameweek for which to get the expected points.
+
+        :return: The expected points for the player in the specified gameweek.
+        """
+        key = (element, gameweek)
+        if key not in self._points_cache:
+            self._points_cache[key] = self.epc.get_expected_points(element, gameweek)
+        return self._points_cache[key]
+
+    def _calc_optimal_counts(
+        self, h: int
+    ) -> Tuple[float, Tuple[int, int, int, int], Optional[int]]:
+        """Find the formation maximizing expected points for the h-th gameweek of the horizon.
+        Each position list is sorted in increasing order so the best n players are the last n.
+
+        :param h: Offset of the gameweek from the first gameweek of the horizon.
+
+        :return: Tuple of total expected points including the captain, the number of players
+                 in each position and the element id of the captain.
+
+        :raises ValueError: If the team cannot field any valid formation.
+        """
+        sorted_points = self._sorted_points[h]
+        top_sums = {}
+        for position, points in sorted_points.items():
+            sums = [0]
+            for exp_points, _ in reversed(points):
+                sums.append(sums[-1] + exp_points)
+            top_sums[position] = sums
+
+        best_total, best_counts = None, None
+        for counts in self._formations:
+            if any(
+                count >= len(top_sums[position])
+                for position, count in zip(range(1, 5), counts)
+            ):
+                continue
+            total = sum(
+                top_sums[position][count]
+                for position, count in zip(range(1, 5), counts)
+            )
+            if best_total is None or total > best_total:
+                best_total, best_counts = total, counts
+
+        if best_counts is None:
+            raise ValueError("Team cannot field a valid formation.")
+
+        # the best player of each position always starts so the captain is the best of these
+        max_exp_points, captain = 0, None
+        for points in sorted_points.values():
+            if points and points[-1][0] > max_exp_points:
+                max_exp_points, captain = points[-1]
+
+        # need to double the captain's points
+        return best_total + max_exp_points, best_counts, captain
+
+    def transfer_player(
+        self, out_player: Player, in_player: Player
+    ) -> "IncrementalScorer":
+        """Make a single transfer, giving the scorer of the new team.
+        Only the position list of the transferred players is updated for each gameweek.
+
+        :param out_player: Player to be transferred out.
+        :param in_player: Player to be transferred in.
+
+        :return: Scorer of the team with the transfer made.
+
+        :raises ValueError: If the positions of the players being transferred do not match,
+                            or if the player transferred out is not in the team.
+        """
+        new_compact_team = self.compact_team.transfer_player(out_player, in_player)
+        self._players.setdefault(in_player.element, in_player)
+        position = out_player.position
+        new_sorted_points = []
+        for h in range(self.horizon):
+            points = list(self._sorted_points[h][position])
+            out_entry = (
+                self._get_expected_points(out_player.element, self.gameweek + h),
+                out_player.element,
+            )
+            del points[bisect_left(points, out_entry)]
+            insort(
+                points,
+                (
+                    self._get_expected_points(in_player.element, self.gameweek + h),
+                    in_player.element,
+                ),
+            )
+            new_sorted_points.append({**self._sorted_points[h], position: points})
+
+        return IncrementalScorer(
+            None,
+            self.epc,
+            self.gameweek,
+            self.horizon,
+            _points_cache=self._points_cache,
+            _formations=self._formations,
+            _sorted_points=new_sorted_points,
+            _compact_team=new_compact_team,
+            _players=self._players,
+        )
+
+    def total_exp_points(self, h: int) -> float:
+        """Return the total expected points of the optimal formation for a gameweek.
+
+        :param h: Offset of the gameweek from the first gameweek of the horizon.
+
+        :return: Total expected points of the optimal formation including the captain.
+        """
+        return self._results[h][0]
+
+    def captain(self, h: int) -> Optional[int]:
+        """Return the element id of the captain of the optimal formation for a gameweek.
+
+        :param h: Offset of the gameweek from the first gameweek of the horizon.
+
+        :return: Element id of the captain or None if no player is expected to score.
+        """
+        return self._results[h][2]
+
+    def calc_optimal_formation(self, h: int) -> Formation:
+        """Return the optimal formation for a gameweek as a Formation object.
+
+        :param h: Offset of the gameweek from the first gameweek of the horizon.
+
+        :return: Optimal Formation object containing gkps, defs, mids, fwds, captain, expected points.
+        """
+        total_exp_points, counts, captain_element = self._results[h]
+        players = self._players
+        starters = []
+        for position, count in zip(range(1, 5), counts):
+            points = self._sorted_points[h][position]
+            starters.append(
+                frozenset(
+                    players[element] for _, element in points[len(points) - count :]
+                )
+            )
+
+        return Formation._from_validated(
+            total_exp_points=total_exp_points,
+            gkps=starters[0],
+            defs=starters[1],
+            mids=starters[2],
+            fwds=starters[3],
+            captain=None if captain_element is None else players[captain_element],
+        )
+
+    def calc_discounted_reward(
+        self, transfer_adjustment: float, gamma: float = 1
+    ) -> float:
+        """Calculate the discounted reward of the team over the horizon.
+
+        :param transfer_adjustment: Points added to each gameweek to account for free transfers.
+        :param gamma: Discount factor.
+
+        :return: Discounted reward of the team over the horizon, including the transfer adjustment.
+        """
+        discounted_reward = 0
+        discount_factor = 1
+        for h in range(self.horizon):
+            discounted_reward += discount_factor * (
+                self.total_exp_points(h) + transfer_adjustment
+            )
+            discount_factor *= gamma
+
+        return discounted_reward
+
+    def calc_optimistic_reward(
+        self,
+        candidates: List[Player],
+        n_transfers: int,
+        transfer_adjustment: float,
+        gamma: float = 1,
+    ) -> float:
+        """Calculate an optimistic estimate of the discounted reward reachable with further transfers.
+        Transferring a candidate in can add at most its expected points to the starting eleven
+        and the same again as captain, so each gameweek is credited twice the points of the best
+        n_transfers candidates not already in the team. No further transfer adjustment is applied.
+
+        :param candidates: List of player candidates which could be transferred in.
+        :param n_transfers: Number of transfers which could still be made.
+        :param transfer_adjustment: Points added to each gameweek to account for free transfers.
+        :param gamma: Discount factor.
+
+        :return: Optimistic discounted reward of the team over the horizon.
+        """
+        outsiders = [c for c in candidates if c.element not in self.compact_team]
+
+        discounted_reward = 0
+        discount_factor = 1
+        for h in range(self.horizon):
+            gains = sorted(
+                (
+                    max(
+                        0,
+                        self._get_expected_points(c.element, self.gameweek + h),
+                    )
+                    for c in outsiders
+                ),
+                reverse=True,
+            )
+            discounted_reward += discount_factor * (
+                self.total_exp_points(h)
+                + transfer_adjustment
+                + 2 * sum(gains[:n_transfers])
+            )
+            discount_factor *= gamma
+
+        return discounted_reward
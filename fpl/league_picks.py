@@ -0,0 +1,292 @@
+"""
+This module defines the PicksTable class, a compact columnar table of the picks of many managers over many gameweeks,
+e.g. every manager of a mini-league, for league-wide analysis such as effective ownership.
+Picks are stored as manager x gameweek x 15 arrays of element ids and multipliers rather than one dictionary per response,
+so thousands of managers fit in a few megabytes and aggregates are computed with numpy over the whole table.
+
+Available classes:
+- PicksTable: Columnar table of the picks of many managers over many gameweeks.
+
+Available functions of PicksTable:
+- fetch: Fetch the picks of every pair of managers and gameweeks concurrently, at the bulk priority of the request scheduler.
+- from_picks: Build a table from picks responses keyed by manager id and gameweek.
+- ownership: Return the percentage of managers owning each element in each gameweek.
+- effective_ownership: Return the effective ownership of each element in each gameweek.
+- captaincy: Return the percentage of managers captaining each element in each gameweek.
+- select: Return the table restricted to some managers, e.g. the rivals of a manager.
+- save: Save the table to a compressed .npz file.
+- load: Load a table saved with save.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Optional, Tuple
+import numpy as np
+from fpl.loader import Loader
+from fpl.request_scheduler import BULK
+
+SQUAD_SIZE = 15
+
+
+class PicksTable:
+    """Class holding the picks of many managers over many gameweeks as numpy arrays.
+
+    :ivar manager_ids: Sorted manager ids, shape (M,).
+    :ivar gameweeks: Sorted gameweeks, shape (G,).
+    :ivar elements: Element ids by manager, gameweek and position of the pick, 0 where there is no pick, shape (M, G, 15).
+    :ivar multipliers: Multipliers of the picks, 0 on the bench, 2 for the captain and 3 for a triple captain, shape (M, G, 15).
+    :ivar points: Points of each manager in each gameweek after transfer costs, shape (M, G).
+    :ivar active_chips: Chip played by each manager in each gameweek, "" if none, shape (M, G).
+    :ivar available: Whether the picks of a manager are known for a gameweek, shape (M, G).
+    :ivar errors: Error of each pair of manager and gameweek whose picks could not be fetched, not saved with the table.
+    """
+
+    def __init__(
+        self,
+        manager_ids: np.ndarray,
+        gameweeks: np.ndarray,
+        elements: np.ndarray,
+        multipliers: np.ndarray,
+        points: np.ndarray,
+        active_chips: np.ndarray,
+        available: np.ndarray,
+        errors: Optional[Dict[Tuple[int, int], str]] = None,
+    ):
+        """Build a table from its arrays, see the instance variables of the class.
+
+        :raises ValueError: If the shapes of the arrays do not match.
+        """
+        shape = (len(manager_ids), len(gameweeks))
+        if (
+            elements.shape != shape + (SQUAD_SIZE,)
+            or multipliers.shape != elements.shape
+        ):
+            raise ValueError(
+                "Picks must have the shape {}.".format(shape + (SQUAD_SIZE,))
+            )
+        if (
+            points.shape != shape
+            or active_chips.shape != shape
+            or available.shape != shape
+        ):
+            raise ValueError(
+                "Points, chips and availability must have the shape {}.".format(shape)
+            )
+        self.manager_ids = manager_ids
+        self.gameweeks = gameweeks
+        self.elements = elements
+        self.multipliers = multipliers
+        self.points = points
+        self.active_chips = active_chips
+        self.available = available
+        self.errors = {} if errors is None else errors
+
+    @classmethod
+    def from_picks(
+        cls,
+        picks: Dict[Tuple[int, int], Dict[str, Any]],
+        manager_ids: Optional[Iterable[int]] = None,
+        gameweeks: Optional[Iterable[int]] = None,
+    ) -> "PicksTable":
+        """Build a table from picks responses keyed by manager id and gameweek.
+
+        :param picks: Dictionary from (manager id, gameweek) to the response of Loader.get_manager_picks.
+        :param manager_ids: Managers of the table, defaults to the managers of the responses.
+        :param gameweeks: Gameweeks of the table, defaults to the gameweeks of the responses.
+
+        :return: PicksTable where pairs without a response are not available.
+        """
+        manager_ids = np.unique(
+            np.array(
+                [m for m, _ in picks] if manager_ids is None else list(manager_ids),
+                dtype=np.int64,
+            )
+        )
+        gameweeks = np.unique(
+            np.array(
+                [g for _, g in picks] if gameweeks is None else list(gameweeks),
+                dtype=np.int16,
+            )
+        )
+        shape = (len(manager_ids), len(gameweeks))
+        elements = np.zeros(shape + (SQUAD_SIZE,), dtype=np.int16)
+        multipliers = np.zeros(shape + (SQUAD_SIZE,), dtype=np.int8)
+        points = np.zeros(shape, dtype=np.int16)
+        active_chips = np.full(shape, "", dtype="<U16")
+        available = np.zeros(shape, dtype=bool)
+
+        for (manager_id, gameweek), response in picks.items():
+            m = np.searchsorted(manager_ids, manager_id)
+            g = np.searchsorted(gameweeks, gameweek)
+            if (
+                m == len(manager_ids)
+                or manager_ids[m] != manager_id
+                or g == len(gameweeks)
+                or gameweeks[g] != gameweek
+            ):
+                continue
+            for pick in response["picks"]:
+                # the assistant manager chip adds a 16th pick, which is not a player
+                if pick["position"] <= SQUAD_SIZE:
+                    elements[m, g, pick["position"] - 1] = pick["element"]
+                    multipliers[m, g, pick["position"] - 1] = pick["multiplier"]
+            history = response.get("entry_history") or {}
+            points[m, g] = history.get("points", 0) - history.get(
+                "event_transfers_cost", 0
+            )
+            active_chips[m, g] = response.get("active_chip") or ""
+            available[m, g] = True
+        return cls(
+            manager_ids,
+            gameweeks,
+            elements,
+            multipliers,
+            points,
+            active_chips,
+            available,
+        )
+
+    @classmethod
+    def fetch(
+        cls,
+        manager_ids: Iterable[int],
+        gameweeks: Iterable[int],
+        max_workers: int = 8,
+    ) -> "PicksTable":
+        """Fetch the picks of every pair of managers and gameweeks concurrently with Loader.get_manager_picks.
+        Pairs whose picks cannot be fetched, e.g. gameweeks before a manager joined, are not available
+        and their errors are kept in the errors of the table rather than stopping the other requests.
+        The requests have the bulk priority of the request scheduler of the Loader, which limits their rate.
+
+        :param manager_ids: Managers to fetch, e.g. from Loader.get_league_managers.
+        :param gameweeks: Past or current gameweeks to fetch.
+        :param max_workers: Number of threads making requests.
+
+        :return: PicksTable of the managers and gameweeks.
+        """
+        manager_ids = list(manager_ids)
+        gameweeks = list(gameweeks)
+        pairs = [(m, g) for m in manager_ids for g in gameweeks]
+        scheduler = Loader.get_request_scheduler()
+
+        def fetch_pair(pair: Tuple[int, int]):
+            try:
+                with scheduler.priority(BULK):
+                    return Loader.get_manager_picks(*pair), None
+            except (OSError, ValueError, KeyError) as e:
+                # RequestException is an OSError
+                return None, "{}: {}".format(type(e).__name__, e)
+
+        picks = {}
+        errors = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for pair, (response, error) in zip(pairs, executor.map(fetch_pair, pairs)):
+                if error is None:
+                    picks[pair] = response
+                else:
+                    errors[pair] = error
+        table = cls.from_picks(picks, manager_ids, gameweeks)
+        table.errors = errors
+        return table
+
+    def _aggregate(self, weights: np.ndarray, n_elements: Optional[int]) -> np.ndarray:
+        """Return the sum of the weights of the picks of each element in each gameweek,
+        as a percentage of the managers available in the gameweek, with shape (G, n_elements).
+        """
+        n = int(self.elements.max(initial=0)) + 1 if n_elements is None else n_elements
+        n_gameweeks = len(self.gameweeks)
+        keys = np.arange(n_gameweeks)[None, :, None] * n + self.elements
+        totals = np.bincount(
+            keys.ravel(), weights=weights.ravel(), minlength=n_gameweeks * n
+        ).reshape(n_gameweeks, n)
+        # element 0 marks missing picks
+        totals[:, 0] = 0
+        managers = self.available.sum(axis=0)
+        return 100 * totals / np.maximum(managers, 1)[:, None]
+
+    def ownership(self, n_elements: Optional[int] = None) -> np.ndarray:
+        """Return the percentage of managers owning each element, on the pitch or on the bench, in each gameweek.
+
+        :param n_elements: Number of columns of the result, defaults to the largest element id picked plus 1.
+
+        :return: Array of shape (G, n_elements) indexed by gameweek index and element id.
+        """
+        return self._aggregate(self.elements > 0, n_elements)
+
+    def effective_ownership(self, n_elements: Optional[int] = None) -> np.ndarray:
+        """Return the effective ownership of each element in each gameweek, the percentage of managers
+        scoring the points of the element: benched picks count 0, captains 2 and triple captains 3 times.
+
+        :param n_elements: Number of columns of the result, defaults to the largest element id picked plus 1.
+
+        :return: Array of shape (G, n_elements) indexed by gameweek index and element id.
+        """
+        return self._aggregate(self.multipliers, n_elements)
+
+    def captaincy(self, n_elements: Optional[int] = None) -> np.ndarray:
+        """Return the percentage of managers captaining each element in each gameweek.
+
+        :param n_elements: Number of columns of the result, defaults to the largest element id picked plus 1.
+
+        :return: Array of shape (G, n_elements) indexed by gameweek index and element id.
+        """
+        return self._aggregate(self.multipliers >= 2, n_elements)
+
+    def select(self, manager_ids: Iterable[int]) -> "PicksTable":
+        """Return the table restricted to some managers, e.g. the rivals of a manager.
+
+        :param manager_ids: Managers to keep.
+
+        :return: PicksTable of the managers, in the order of the table.
+
+        :raises KeyError: If a manager is not in the table.
+        """
+        selected = set(manager_ids)
+        missing = selected - set(self.manager_ids.tolist())
+        if missing:
+            raise KeyError("Managers not in the table: {}.".format(sorted(missing)))
+        keep = np.isin(self.manager_ids, np.array(sorted(selected), dtype=np.int64))
+        return PicksTable(
+            self.manager_ids[keep],
+            self.gameweeks,
+            self.elements[keep],
+            self.multipliers[keep],
+            self.points[keep],
+            self.active_chips[keep],
+            self.available[keep],
+            {pair: e for pair, e in self.errors.items() if pair[0] in selected},
+        )
+
+    def save(self, filename: str):
+        """Save the table to a compressed .npz file.
+
+        :param filename: Path of the file.
+        """
+        np.savez_compressed(
+            filename,
+            manager_ids=self.manager_ids,
+            gameweeks=self.gameweeks,
+            elements=self.elements,
+            multipliers=self.multipliers,
+            points=self.points,
+            active_chips=self.active_chips,
+            available=self.available,
+        )
+
+    @classmethod
+    def load(cls, filename: str) -> "PicksTable":
+        """Load a table saved with save.
+
+        :param filename: Path of the file.
+
+        :return: PicksTable without errors.
+        """
+        with np.load(filename) as data:
+            return cls(
+                data["manager_ids"],
+                data["gameweeks"],
+                data["elements"],
+                data["multipliers"],
+                data["points"],
+                data["active_chips"],
+                data["available"],
+            )
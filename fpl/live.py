@@ -0,0 +1,368 @@
+"""
+This module provides live points during the matches of a gameweek for many squads at once.
+A LivePoller polls the event/{gameweek}/live endpoint of the FPL API at an interval, diffs each poll against the previous one
+and pushes only the players whose points, minutes or fixtures changed to its subscribers.
+LiveSquads keeps the picks of many squads as arrays and, on each poll, rescores only the squads holding a changed player,
+applying automatic substitutions, the vice captain, bench boost and triple captain like the FPL game.
+
+Available classes:
+- LiveUpdate: Changes of one poll, pushed to the subscribers of a LivePoller.
+- LiveSquads: Live totals of many squads, updated incrementally.
+- LivePoller: Poller of the live stats of a gameweek.
+"""
+
+import threading
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+import numpy as np
+from fpl.loader import Loader
+from fpl.player_registry import PlayerRegistry
+
+SQUAD_SIZE = 15
+STARTERS = 11
+
+
+class LiveUpdate(NamedTuple):
+    """Changes of one poll of the live stats of a gameweek.
+
+    gameweek: The gameweek polled.
+    elements: Element ids of the players whose points, minutes or fixtures changed since the previous poll.
+    points: Live points of these players.
+    minutes: Minutes played by these players.
+    squad_ids: Ids of the squads whose live totals changed.
+    totals: Live totals of these squads.
+    """
+
+    gameweek: int
+    elements: np.ndarray
+    points: np.ndarray
+    minutes: np.ndarray
+    squad_ids: np.ndarray
+    totals: np.ndarray
+
+
+class LiveSquads:
+    """Class holding the picks of many squads for a gameweek and their live totals.
+
+    :ivar squad_ids: Id of each squad, e.g. the manager id, shape (S,).
+    :ivar elements: Element ids of the picks in the order of the picks, starters first, shape (S, 15).
+    :ivar positions: Positions of the picks, 1 for goalkeepers to 4 for forwards, shape (S, 15).
+    :ivar captain: Pick index of the captain of each squad, shape (S,).
+    :ivar vice_captain: Pick index of the vice captain of each squad, shape (S,).
+    :ivar active_chips: Chip played by each squad, "" if none, shape (S,).
+    :ivar multipliers: Live multipliers of the picks after automatic substitutions and captaincy, shape (S, 15).
+    :ivar totals: Live total points of each squad, before transfer costs, shape (S,).
+    """
+
+    def __init__(
+        self,
+        squad_ids: np.ndarray,
+        elements: np.ndarray,
+        positions: np.ndarray,
+        captain: np.ndarray,
+        vice_captain: np.ndarray,
+        active_chips: np.ndarray,
+    ):
+        """Build the squads from their arrays, see the instance variables of the class.
+
+        :raises ValueError: If the shapes of the arrays do not match.
+        """
+        n_squads = len(squad_ids)
+        if (
+            elements.shape != (n_squads, SQUAD_SIZE)
+            or positions.shape != elements.shape
+        ):
+            raise ValueError(
+                "Picks must have the shape {}.".format((n_squads, SQUAD_SIZE))
+            )
+        if (
+            captain.shape != (n_squads,)
+            or vice_captain.shape != (n_squads,)
+            or active_chips.shape != (n_squads,)
+        ):
+            raise ValueError(
+                "Captains and chips must have the shape {}.".format((n_squads,))
+            )
+        self.squad_ids = squad_ids
+        self.elements = elements
+        self.positions = positions
+        self.captain = captain
+        self.vice_captain = vice_captain
+        self.active_chips = active_chips
+        self.multipliers = np.zeros(elements.shape, dtype=np.int8)
+        self.totals = np.zeros(n_squads, dtype=np.int32)
+        self._min_play = np.zeros(5, dtype=np.int64)
+        for position in range(1, 5):
+            self._min_play[position] = Loader.get_position_info(position)[
+                "squad_min_play"
+            ]
+
+    @classmethod
+    def from_picks(
+        cls,
+        picks: Dict[int, Dict[str, Any]],
+        registry: Optional[PlayerRegistry] = None,
+    ) -> "LiveSquads":
+        """Build the squads from picks responses of the FPL API.
+
+        :param picks: Dictionary from squad id, e.g. the manager id, to the response of Loader.get_manager_picks for the gameweek.
+        :param registry: Registry giving the positions of players missing from the picks, defaults to Loader.get_player_registry().
+
+        :return: LiveSquads in the order of the dictionary.
+        """
+        n_squads = len(picks)
+        elements = np.zeros((n_squads, SQUAD_SIZE), dtype=np.int64)
+        positions = np.zeros((n_squads, SQUAD_SIZE), dtype=np.int8)
+        captain = np.zeros(n_squads, dtype=np.int64)
+        vice_captain = np.zeros(n_squads, dtype=np.int64)
+        active_chips = np.full(n_squads, "", dtype="<U16")
+        for row, response in enumerate(picks.values()):
+            for pick in response["picks"]:
+                # the assistant manager chip adds a 16th pick, which is not a player
+                if pick["position"] > SQUAD_SIZE:
+                    continue
+                index = pick["position"] - 1
+                elements[row, index] = pick["element"]
+                if "element_type" in pick:
+                    positions[row, index] = pick["element_type"]
+                else:
+                    if registry is None:
+                        registry = Loader.get_player_registry()
+                    positions[row, index] = registry[pick["element"]].position
+                if pick["is_captain"]:
+                    captain[row] = index
+                if pick["is_vice_captain"]:
+                    vice_captain[row] = index
+            active_chips[row] = response.get("active_chip") or ""
+        return cls(
+            np.array(list(picks)),
+            elements,
+            positions,
+            captain,
+            vice_captain,
+            active_chips,
+        )
+
+    def update(
+        self,
+        points: np.ndarray,
+        minutes: np.ndarray,
+        finished: np.ndarray,
+        changed: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """Rescore the squads holding a changed player.
+
+        :param points: Live points indexed by element id.
+        :param minutes: Minutes played indexed by element id.
+        :param finished: Whether every fixture of the club of a player is finished, indexed by element id.
+                         A finished player without minutes is substituted.
+        :param changed: Element ids whose values changed since the previous update, None to rescore every squad.
+
+        :return: Rows of the squads whose totals changed.
+        """
+        if changed is None:
+            rows = np.arange(len(self.squad_ids))
+        else:
+            rows = np.flatnonzero(np.isin(self.elements, changed).any(axis=1))
+        if len(rows) == 0:
+            return rows
+        multipliers, totals = self._score(rows, points, minutes, finished)
+        self.multipliers[rows] = multipliers
+        updated = rows[totals != self.totals[rows]]
+        self.totals[rows] = totals
+        return updated
+
+    def _score(
+        self,
+        rows: np.ndarray,
+        points: np.ndarray,
+        minutes: np.ndarray,
+        finished: np.ndarray,
+    ):
+        """Return the live multipliers and totals of some squads, applying automatic substitutions and captaincy."""
+        elements = self.elements[rows]
+        positions = self.positions[rows]
+        absent = (minutes[elements] == 0) & finished[elements]
+        n_rows = len(rows)
+        squads = np.arange(n_rows)
+        bench_boost = self.active_chips[rows] == "bboost"
+        playing = np.zeros((n_rows, SQUAD_SIZE), dtype=bool)
+        playing[:, :STARTERS] = True
+        playing[bench_boost] = True
+
+        # the goalkeeper can only be replaced by the substitute goalkeeper
+        swap = ~bench_boost & absent[:, 0] & ~absent[:, STARTERS]
+        playing[swap, 0] = False
+        playing[swap, STARTERS] = True
+
+        # each absent outfield starter, in the order of the picks, is replaced by the first
+        # outfield substitute who played and keeps a valid formation
+        counts = np.zeros((n_rows, 5), dtype=np.int64)
+        for position in range(2, 5):
+            counts[:, position] = (positions[:, 1:STARTERS] == position).sum(axis=1)
+        used = np.zeros((n_rows, SQUAD_SIZE), dtype=bool)
+        for starter in range(1, STARTERS):
+            pending = ~bench_boost & absent[:, starter]
+            out_position = positions[:, starter]
+            for bench in range(STARTERS + 1, SQUAD_SIZE):
+                in_position = positions[:, bench]
+                valid = (in_position == out_position) | (
+                    counts[squads, out_position] > self._min_play[out_position]
+                )
+                sub = pending & ~used[:, bench] & ~absent[:, bench] & valid
+                playing[sub, starter] = False
+                playing[sub, bench] = True
+                used[sub, bench] = True
+                counts[squads[sub], out_position[sub]] -= 1
+                counts[squads[sub], in_position[sub]] += 1
+                pending &= ~sub
+
+        # the vice captain takes the armband of an absent captain if they play
+        captain = self.captain[rows]
+        vice_captain = self.vice_captain[rows]
+        vice_takes_over = (
+            absent[squads, captain]
+            & playing[squads, vice_captain]
+            & ~absent[squads, vice_captain]
+        )
+        armband = np.where(vice_takes_over, vice_captain, captain)
+        multipliers = playing.astype(np.int8)
+        multipliers[squads, armband] *= np.where(
+            self.active_chips[rows] == "3xc", 3, 2
+        ).astype(np.int8)
+        totals = (points[elements] * multipliers).sum(axis=1)
+        return multipliers, totals
+
+
+class LivePoller:
+    """Class polling the live stats of a gameweek and pushing the changes to its subscribers."""
+
+    def __init__(
+        self,
+        gameweek: int,
+        squads: Optional[LiveSquads] = None,
+        interval_s: float = 60.0,
+        registry: Optional[PlayerRegistry] = None,
+    ):
+        """Build a poller, without polling yet.
+
+        :param gameweek: Gameweek from 1 to 38.
+        :param squads: Squads whose live totals are updated on each poll, if any.
+        :param interval_s: Seconds between two polls of run.
+        :param registry: Registry giving the club of each player, defaults to Loader.get_player_registry().
+        """
+        self.gameweek = gameweek
+        self.squads = squads
+        self.interval_s = interval_s
+        self.last_error: Optional[Exception] = None
+        registry = Loader.get_player_registry() if registry is None else registry
+        n_elements = max(player.element for player in registry) + 1
+        self._clubs = np.zeros(n_elements, dtype=np.int64)
+        for player in registry:
+            self._clubs[player.element] = player.club
+        self._points = np.zeros(n_elements, dtype=np.int64)
+        self._minutes = np.zeros(n_elements, dtype=np.int64)
+        self._finished = np.zeros(n_elements, dtype=bool)
+        self._polled = False
+        self._subscribers: List[Callable[[LiveUpdate], None]] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def subscribe(self, callback: Callable[[LiveUpdate], None]):
+        """Call a function with the LiveUpdate of every poll with changes.
+
+        :param callback: Function taking a LiveUpdate.
+        """
+        self._subscribers.append(callback)
+
+    def poll(self) -> LiveUpdate:
+        """Fetch the live stats and the fixtures of the gameweek once, update the squads and notify the subscribers if anything changed.
+
+        :return: LiveUpdate with the changes since the previous poll, every player with points or minutes on the first poll.
+
+        :raises requests.exceptions.RequestException: If there is an error querying the API.
+        """
+        live = Loader.get_live_gameweek(self.gameweek)
+        fixtures = Loader.get_live_fixtures(self.gameweek)
+        n_elements = len(self._points)
+        points = np.zeros(n_elements, dtype=np.int64)
+        minutes = np.zeros(n_elements, dtype=np.int64)
+        for info in live["elements"]:
+            if info["id"] < n_elements:
+                points[info["id"]] = info["stats"]["total_points"]
+                minutes[info["id"]] = info["stats"]["minutes"]
+        # clubs without a fixture in the gameweek are finished from the start
+        club_finished = np.ones(self._clubs.max() + 1, dtype=bool)
+        for fixture in fixtures:
+            done = fixture.get("finished_provisional") or fixture.get("finished")
+            for club in (fixture["team_h"], fixture["team_a"]):
+                if club < len(club_finished):
+                    club_finished[club] &= bool(done)
+        finished = club_finished[self._clubs]
+
+        changed = np.flatnonzero(
+            (points != self._points)
+            | (minutes != self._minutes)
+            | (finished != self._finished)
+        )
+        first_poll = not self._polled
+        self._points, self._minutes, self._finished = points, minutes, finished
+        self._polled = True
+
+        rows = np.zeros(0, dtype=np.int64)
+        if self.squads is not None:
+            rows = self.squads.update(
+                points, minutes, finished, None if first_poll else changed
+            )
+        if first_poll:
+            changed = np.flatnonzero((points != 0) | (minutes != 0))
+        update = LiveUpdate(
+            gameweek=self.gameweek,
+            elements=changed,
+            points=points[changed],
+            minutes=minutes[changed],
+            squad_ids=(
+                self.squads.squad_ids[rows]
+                if self.squads is not None
+                else np.zeros(0, dtype=np.int64)
+            ),
+            totals=(
+                self.squads.totals[rows]
+                if self.squads is not None
+                else np.zeros(0, dtype=np.int32)
+            ),
+        )
+        if len(update.elements) or len(update.squad_ids):
+            for callback in self._subscribers:
+                callback(update)
+        return update
+
+    def run(self, max_polls: Optional[int] = None):
+        """Poll every interval_s seconds until stop is called or after max_polls polls.
+        Errors querying the API are kept in last_error and polling goes on.
+
+        :param max_polls: Maximum number of polls, None to poll until stop is called.
+        """
+        polls = 0
+        while not self._stop.is_set() and (max_polls is None or polls < max_polls):
+            try:
+                self.poll()
+                self.last_error = None
+            except (OSError, ValueError, KeyError) as e:
+                # RequestException is an OSError
+                self.last_error = e
+            polls += 1
+            if max_polls is None or polls < max_polls:
+                self._stop.wait(self.interval_s)
+
+    def start(self):
+        """Run the poller in a daemon thread until stop is called."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the poller and wait for its thread to finish."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
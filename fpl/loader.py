@@ -8,26 +8,79 @@ Available functions:
 - get_fixtures: Return a list of fixtures from the FPL API.
 - get_fixture_info: Return the information for a particular fixture.
 - get_fixtures_for_gameweek: Return the fixtures from FPL for a particular gameweek.
+- get_live_fixtures: Return the fixtures of a gameweek as they are now, without caching.
+- get_live_gameweek: Return the live stats of every player for a gameweek, without caching.
 - get_team_basic_info: Return the information for a particular team given their team id.
 - get_my_team: Get team information of current fpl team either from the api or locally.
 - get_next_gameweek: Get the id of the next gameweek as an integer as of a particular UTC timestamp.
 - get_my_historical_team_from_gameweek: Returns the historical team a manager used for a particular gameweek.
+- get_manager_picks: Return the picks of a manager for a past or current gameweek.
+- get_league_managers: Return the manager ids of a classic league.
 - get_player_basic_info: Get the basic information of a player so far this season and based on the most recent gameweek.
 - get_player_detailed_info: Returns a player’s detailed information.
 - get_player_historical_info_for_gameweek: Return a player's information for a particular gameweek where the information is known.
 - get_player_future_info_for_gameweek: Return a player's information for a particular gameweek where the information is unknown.
 - get_position_info: Get the information regarding a particular position.
+- get_player_registry: Return the registry of players built from the current static information.
+- get_player_name_index: Return the name index of players built from the current static information.
+- parse_my_team: Return the Team of a response of the my-team endpoint.
+- configure_api: Configure the base URL of the FPL API.
+- configure_requests: Configure the scheduler every query to the FPL API goes through.
+- get_request_scheduler: Return the scheduler every query to the FPL API goes through.
+- configure_static_info: Configure whether get_static_info returns a slim projection of the static information.
+- configure_cache: Configure the disk cache of API responses and whether to run offline from it.
+- clear_cache: Clear the in-memory caches of every method.
 """
 
-import requests
-from typing import List, Dict, Any, Tuple, Set
-import pandas as pd
+from typing import (
+    List,
+    Dict,
+    Any,
+    Tuple,
+    Set,
+    Union,
+    Optional,
+    Iterable,
+    Mapping,
+    TYPE_CHECKING,
+)
+from datetime import datetime, timezone
 from functools import lru_cache
+from urllib.parse import urlsplit
+import os
+import re
+import tempfile
 import warnings
 import json
-import time
+from fpl.request_scheduler import INTERACTIVE, RequestScheduler
 from fpl.team import Team
 from fpl.player import Player
+from fpl.player_registry import PlayerRegistry
+
+API_URL = "https://fantasy.premierleague.com/api/"
+
+if TYPE_CHECKING:
+    # imported when first needed as it depends on numpy and fuzzywuzzy
+    from fpl.player_name_index import PlayerNameIndex
+
+
+def _parse_utc_timestamp(timestamp: Union[str, datetime]) -> datetime:
+    """Return a timestamp as a timezone aware datetime in UTC, naive timestamps being in UTC.
+
+    :param timestamp: An ISO 8601 string, e.g. "2024-08-16 17:00:00" or "2024-08-16T17:30:00Z", or a datetime.
+
+    :return: The timestamp in UTC.
+
+    :raises ValueError: If the string is not a valid ISO 8601 timestamp.
+    """
+    if isinstance(timestamp, str):
+        # fromisoformat only accepts a trailing Z from Python 3.11
+        if timestamp.endswith(("Z", "z")):
+            timestamp = timestamp[:-1] + "+00:00"
+        timestamp = datetime.fromisoformat(timestamp)
+    if timestamp.tzinfo is None:
+        return timestamp.replace(tzinfo=timezone.utc)
+    return timestamp.astimezone(timezone.utc)
 
 
 class Loader:
@@ -35,27 +88,205 @@ class Loader:
     Some methods maintain a cache of results to avoid querying the API multiple times.
     """
 
+    # the static information the player registry was built from, and the registry
+    _player_registry: Tuple[Any, Any] = (None, None)
+    # the static information the player name index was built from, and the index
+    _player_name_index: Tuple[Any, Any] = (None, None)
+    # base URL of the endpoints of the FPL API
+    _api_url: str = API_URL
+    # directory of the disk cache of API responses, None to not cache responses on disk
+    _cache_dir: Optional[str] = None
+    # whether responses are only read from the disk cache
+    _offline: bool = False
+    # whether responses are queried and stored even when they are in the disk cache
+    _refresh: bool = False
+    # fields of the slim projection of the static information by section, None to keep the raw static information
+    _static_fields: Optional[Dict[str, Optional[Tuple[str, ...]]]] = None
+    # scheduler every query to the FPL API goes through
+    _scheduler: RequestScheduler = RequestScheduler()
+
     @staticmethod
-    @lru_cache(maxsize=1)
-    def get_static_info() -> Dict[str, Any]:
-        """Return the static information from the FPL API.
-        The result is cached to avoid multiple API calls.
+    def configure_api(api_url: str = API_URL):
+        """Configure the base URL of the FPL API, e.g. to query a local stand-in for the API in tests.
+        The in-memory caches are cleared so the next calls query the new API.
+
+        :param api_url: The base URL of the endpoints, e.g. "http://127.0.0.1:8000/api/".
+        """
+        Loader._api_url = api_url if api_url.endswith("/") else api_url + "/"
+        Loader.clear_cache()
+
+    @staticmethod
+    def configure_cache(
+        cache_dir: Optional[str] = None, offline: bool = False, refresh: bool = False
+    ):
+        """Configure the disk cache of API responses and whether to run offline from it.
+        With a cache directory, each response is stored as a JSON file and read back instead of querying the API again,
+        e.g. by a later process. The in-memory caches are cleared so the next calls use the new configuration.
+
+        :param cache_dir: Directory of the disk cache, created if missing, None to not cache responses on disk.
+        :param offline: Whether to only read responses from the disk cache and never query the API.
+        :param refresh: Whether to query the API and overwrite the disk cache even for responses already in it.
+
+        :raises ValueError: If offline without a cache directory, or both offline and refresh.
+        """
+        if offline and cache_dir is None:
+            raise ValueError("A cache directory is required to run offline.")
+        if offline and refresh:
+            raise ValueError("Cannot refresh the cache while offline.")
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+        Loader._cache_dir = cache_dir
+        Loader._offline = offline
+        Loader._refresh = refresh
+        Loader.clear_cache()
+
+    @staticmethod
+    def configure_requests(
+        rate: float = 10.0,
+        burst: int = 20,
+        max_retries: int = 4,
+        backoff_s: float = 1.0,
+    ) -> RequestScheduler:
+        """Configure the scheduler every query to the FPL API goes through, replacing the current scheduler and its stats.
+
+        :param rate: Maximum sustained number of requests per second.
+        :param burst: Number of requests that can be sent at once after a quiet period.
+        :param max_retries: Number of times a query answered 429 Too Many Requests is retried.
+        :param backoff_s: Pause after a first 429 response without a Retry-After header, doubled for each retry.
+
+        :return: The new RequestScheduler.
+
+        :raises ValueError: If the rate or the burst is not positive.
+        """
+        Loader._scheduler = RequestScheduler(rate, burst, max_retries, backoff_s)
+        return Loader._scheduler
+
+    @staticmethod
+    def get_request_scheduler() -> RequestScheduler:
+        """Return the scheduler every query to the FPL API goes through, e.g. to read its stats or set the priority of a thread.
+
+        :return: The current RequestScheduler.
+        """
+        return Loader._scheduler
 
-        :return: A dictionary containing the static information from the FPL API.
+    @staticmethod
+    def configure_static_info(
+        slim: bool = False, fields: Optional[Dict[str, Iterable[str]]] = None
+    ):
+        """Configure whether get_static_info returns the raw static information or a slim projection of it, see SlimStaticInfo.
+        The projection keeps the fields of DEFAULT_FIELDS in the static_columns module and the given fields as typed columns
+        and discards the raw dictionaries, so each process, e.g. each worker of the service, holds much less memory.
+        The in-memory caches are cleared so the next calls use the new configuration.
+
+        :param slim: Whether to project the static information.
+        :param fields: Extra fields to keep by section, e.g. the static_fields of the calculators used, ignored unless slim.
+        """
+        if not slim:
+            Loader._static_fields = None
+        else:
+            from fpl.static_columns import DEFAULT_FIELDS
+
+            static_fields = dict(DEFAULT_FIELDS)
+            for section, section_fields in (fields or {}).items():
+                kept = static_fields.get(section, ())
+                if kept is not None:
+                    static_fields[section] = tuple(
+                        dict.fromkeys((*kept, *section_fields))
+                    )
+            Loader._static_fields = static_fields
+        Loader.clear_cache()
+
+    @staticmethod
+    def clear_cache():
+        """Clear the in-memory caches of every method, so the next calls read the disk cache or query the API again."""
+        for method in [
+            Loader.get_static_info,
+            Loader.get_fixtures,
+            Loader.get_fixture_info,
+            Loader.get_fixtures_for_gameweek,
+            Loader.get_team_basic_info,
+            Loader.get_my_team,
+            Loader.get_my_historical_team_from_gameweek,
+            Loader.get_player_basic_info,
+            Loader.get_player_detailed_info,
+        ]:
+            method.cache_clear()
 
+    @staticmethod
+    def _cache_path(url: str) -> str:
+        """Return the file of the disk cache holding the response of a URL, e.g. fixtures_event_3.json."""
+        parts = urlsplit(url)
+        name = parts.path.strip("/")
+        if name.startswith("api/"):
+            name = name[len("api/") :]
+        if parts.query:
+            name += "_" + parts.query
+        return os.path.join(
+            Loader._cache_dir, re.sub(r"[^A-Za-z0-9.-]+", "_", name) + ".json"
+        )
+
+    @staticmethod
+    def _request_json(
+        url: str, cache: bool = True, priority: Optional[int] = None
+    ) -> Any:
+        """Return the decoded JSON response of an endpoint of the FPL API, going through the disk cache if configured.
+        Queries go through the request scheduler, so they are rate limited and retried when the API answers 429.
+        requests is imported on the first query so that running from cached or local data does not pay for importing it.
+
+        :param url: The URL of the endpoint.
+        :param cache: Whether to go through the disk cache, False for data changing within minutes such as live points.
+        :param priority: Priority of the query in the request scheduler, defaults to the priority of the current thread.
+
+        :return: The decoded JSON response.
+
+        :raises FileNotFoundError: If offline and the response is not in the disk cache.
         :raises requests.exceptions.RequestException: If there is an error querying the API.
         """
-        time.sleep(1)
-        try:
-            response = requests.get(
-                "https://fantasy.premierleague.com/api/bootstrap-static/"
+        path = (
+            None if Loader._cache_dir is None or not cache else Loader._cache_path(url)
+        )
+        if path is not None and not Loader._refresh and os.path.exists(path):
+            with open(path) as fd:
+                return json.load(fd)
+        if Loader._offline:
+            raise FileNotFoundError(
+                "No cached response for {} in {}".format(url, Loader._cache_dir)
             )
+
+        import requests
+
+        try:
+            response = Loader._scheduler.request(lambda: requests.get(url), priority)
             response.raise_for_status()
         except requests.exceptions.RequestException:
             raise requests.exceptions.RequestException("Error querying API")
-
         result = response.json()
+
+        if path is not None:
+            # write to a temporary file first so that concurrent processes never read a partial response
+            fd, tmp_path = tempfile.mkstemp(dir=Loader._cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w") as tmp:
+                json.dump(result, tmp)
+            os.replace(tmp_path, path)
+        return result
+
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def get_static_info() -> Mapping[str, Any]:
+        """Return the static information from the FPL API.
+        The result is cached to avoid multiple API calls.
+        If configured with configure_static_info, only a slim projection of it is kept.
+
+        :return: A dictionary containing the static information from the FPL API, or a SlimStaticInfo.
+
+        :raises requests.exceptions.RequestException: If there is an error querying the API.
+        """
+        result = Loader._request_json(Loader._api_url + "bootstrap-static/")
         assert len(result) > 0
+        if Loader._static_fields is not None:
+            from fpl.static_columns import SlimStaticInfo
+
+            result = SlimStaticInfo(result, Loader._static_fields)
         return result
 
     @staticmethod
@@ -69,14 +300,7 @@ class Loader:
 
         :raises requests.exceptions.RequestException: If there is an error querying the API.
         """
-        time.sleep(1)
-        try:
-            response = requests.get("https://fantasy.premierleague.com/api/fixtures/")
-            response.raise_for_status()
-        except requests.exceptions.RequestException:
-            raise requests.exceptions.RequestException("Error querying API")
-
-        result = response.json()
+        result = Loader._request_json(Loader._api_url + "fixtures/")
         assert len(result) > 0
         return result
 
@@ -128,20 +352,53 @@ class Loader:
             raise KeyError(
                 "Gameweek {} is not between 1 and 38 inclusive".format(gameweek)
             )
-        try:
-            response = requests.get(
-                "https://fantasy.premierleague.com/api/fixtures/?event={}".format(
-                    gameweek
-                )
-            )
-            response.raise_for_status()
-        except requests.exceptions.RequestException:
-            raise requests.exceptions.RequestException("Error querying API")
-
-        result = response.json()
+        result = Loader._request_json(
+            Loader._api_url + "fixtures/?event={}".format(gameweek)
+        )
         assert len(result) > 0
         return result
 
+    @staticmethod
+    def get_live_fixtures(gameweek: int) -> List[Dict]:
+        """Return the fixtures of a gameweek as they are now, e.g. whether they have started or finished.
+        Unlike get_fixtures_for_gameweek the result is neither cached in memory nor on disk.
+
+        :param gameweek: Gameweek from 1 to 38.
+
+        :return: List of fixtures of the gameweek.
+
+        :raises KeyError: If the gameweek is not between 1 and 38 inclusive.
+        :raises requests.exceptions.RequestException: If there is an error querying the API.
+        """
+        if not (1 <= gameweek <= 38):
+            raise KeyError(
+                "Gameweek {} is not between 1 and 38 inclusive".format(gameweek)
+            )
+        return Loader._request_json(
+            Loader._api_url + "fixtures/?event={}".format(gameweek), cache=False
+        )
+
+    @staticmethod
+    def get_live_gameweek(gameweek: int) -> Dict[str, Any]:
+        """Return the live stats of every player for a gameweek, updated during the matches.
+        The result is neither cached in memory nor on disk. See LivePoller to poll it.
+
+        :param gameweek: Gameweek from 1 to 38.
+
+        :return: Dictionary whose "elements" hold the id, the "stats" (e.g. minutes and total_points)
+                 and the "explain" by fixture of each player.
+
+        :raises KeyError: If the gameweek is not between 1 and 38 inclusive.
+        :raises requests.exceptions.RequestException: If there is an error querying the API.
+        """
+        if not (1 <= gameweek <= 38):
+            raise KeyError(
+                "Gameweek {} is not between 1 and 38 inclusive".format(gameweek)
+            )
+        return Loader._request_json(
+            Loader._api_url + "event/{}/live/".format(gameweek), cache=False
+        )
+
     @staticmethod
     @lru_cache(maxsize=20)
     def get_team_basic_info(team_id: int) -> Dict:
@@ -189,6 +446,8 @@ class Loader:
             raise ValueError("You must specify a filename when 'how' is 'local'.")
 
         if how == "api":
+            import requests
+
             headers = {
                 "User-Agent": "Dalvik/2.1.0 (Linux; U; Android 5.1; PRO 5 Build/LMY47D)",
                 "accept-language": "en",
@@ -200,14 +459,17 @@ class Loader:
                 "redirect_uri": "https://fantasy.premierleague.com/a/login",
             }
             url = "https://users.premierleague.com/accounts/login/"
-            team_url = "https://fantasy.premierleague.com/api/my-team/{}/".format(
-                manager_id
-            )
+            team_url = Loader._api_url + "my-team/{}/".format(manager_id)
 
             try:
                 session = requests.session()
-                res = session.post(url, data=data, headers=headers)
-                res = session.get(team_url)
+                res = Loader._scheduler.request(
+                    lambda: session.post(url, data=data, headers=headers),
+                    INTERACTIVE,
+                )
+                res = Loader._scheduler.request(
+                    lambda: session.get(team_url), INTERACTIVE
+                )
                 d = json.loads(
                     res.content
                 )  # Dictionary with three sections picks, chips, transfers
@@ -222,16 +484,25 @@ class Loader:
                     fd
                 )  # Dictionary with three sections picks, chips, transfers
 
-        picks = d["picks"]
+        return Loader.parse_my_team(d)
+
+    @staticmethod
+    def parse_my_team(my_team: Dict[str, Any]) -> Team:
+        """Return the Team of a response of the my-team endpoint, e.g. the contents of resources/my_team.json.
+        Players are bought at their selling price.
+
+        :param my_team: Dictionary with the picks and transfers sections of the response.
+
+        :return: Team object
+
+        :raises KeyError: If a section is missing or a player is not in the static information.
+        :raises ValueError: If the picks are not a valid team.
+        """
+        picks = my_team["picks"]
+        registry = Loader.get_player_registry()
         gkps, defs, mids, fwds = set(), set(), set(), set()
         for pick in picks:
-            player = Player(
-                element=pick["element"],
-                name=Loader.get_player_basic_info(pick["element"])["web_name"],
-                position=Loader.get_player_basic_info(pick["element"])["element_type"],
-                club=Loader.get_player_basic_info(pick["element"])["team"],
-                cost=pick["selling_price"],
-            )
+            player = registry.get(pick["element"], cost=pick["selling_price"])
             if player.position == 1:
                 gkps.add(player)
             if player.position == 2:
@@ -241,9 +512,11 @@ class Loader:
             if player.position == 4:
                 fwds.add(player)
 
-        money_in_bank = d["transfers"]["bank"]
+        money_in_bank = my_team["transfers"]["bank"]
         free_transfers = (
-            0 if d["transfers"]["limit"] is None else d["transfers"]["limit"]
+            0
+            if my_team["transfers"]["limit"] is None
+            else my_team["transfers"]["limit"]
         )
         team = Team(
             money_in_bank,
@@ -256,22 +529,29 @@ class Loader:
         return team
 
     @staticmethod
-    def get_next_gameweek(as_of_ts: str = "now") -> int:
+    def get_next_gameweek(as_of_ts: Union[str, datetime] = "now") -> int:
         """Get the id of the next gameweek as an integer as of a particular UTC timestamp.
+        The next gameweek is the one with the earliest deadline after the timestamp.
 
-        :param as_of_ts: provide input as in https://pandas.pydata.org/docs/reference/api/pandas.Timestamp.html
+        :param as_of_ts: "now", an ISO 8601 string such as "2024-08-16 17:00:00" or a datetime, naive timestamps being in UTC.
 
         :return: Id of the next gameweek.
+
+        :raises ValueError: If the timestamp is invalid or no deadline is after it.
         """
         if as_of_ts == "now":
-            as_of_ts = pd.Timestamp.now("UTC")
+            as_of = datetime.now(timezone.utc)
         else:
-            as_of_ts = pd.Timestamp(as_of_ts, tz="UTC")
+            as_of = _parse_utc_timestamp(as_of_ts)
 
-        df = pd.DataFrame(Loader.get_static_info()["events"])
-        df["deadline_time"] = pd.to_datetime(df["deadline_time"])
-        df = df[df["deadline_time"] > as_of_ts]
-        return int(df.nsmallest(1, "deadline_time").iloc[0]["id"])
+        deadlines = [
+            (_parse_utc_timestamp(event["deadline_time"]), event["id"])
+            for event in Loader.get_static_info()["events"]
+        ]
+        upcoming = [deadline for deadline in deadlines if deadline[0] > as_of]
+        if not upcoming:
+            raise ValueError("No gameweek deadline after {}".format(as_of.isoformat()))
+        return int(min(upcoming)[1])
 
     @staticmethod
     @lru_cache(maxsize=None)
@@ -300,16 +580,50 @@ class Loader:
         if not (0 < gameweek < Loader.get_next_gameweek()):
             raise ValueError("Gameweek integer needs to be in valid range")
 
-        url = "https://fantasy.premierleague.com/api/entry/{0}/event/{1}/picks/".format(
-            manager_id, gameweek
+        return Loader.get_manager_picks(manager_id, gameweek)
+
+    @staticmethod
+    def get_manager_picks(manager_id: int, gameweek: int) -> Dict[str, Any]:
+        """Return the picks of a manager for a past or current gameweek.
+        The result is not cached in memory, so that many managers can be fetched, but goes through the disk cache.
+        See PicksTable.fetch to fetch the picks of many managers and gameweeks concurrently.
+
+        :param manager_id: Manager id, also called entry id.
+        :param gameweek: Gameweek between 1 and 38 inclusive.
+
+        :return: Dictionary with the picks, the active chip, the automatic substitutions and the entry history.
+
+        :raises requests.exceptions.RequestException: If there is an error querying the API,
+                                                      e.g. the manager did not play in the gameweek.
+        """
+        return Loader._request_json(
+            Loader._api_url + "entry/{0}/event/{1}/picks/".format(manager_id, gameweek)
         )
-        try:
-            response = requests.get(url)
-            response.raise_for_status()
-        except requests.exceptions.RequestException:
-            raise requests.exceptions.RequestException("Error querying API")
 
-        return response.json()
+    @staticmethod
+    def get_league_managers(league_id: int) -> List[int]:
+        """Return the manager ids of a classic league, e.g. a mini-league, in the order of the standings.
+        Every page of the standings is fetched.
+
+        :param league_id: The id of the classic league.
+
+        :return: List of manager ids.
+
+        :raises requests.exceptions.RequestException: If there is an error querying the API.
+        """
+        managers = []
+        page = 1
+        while True:
+            standings = Loader._request_json(
+                Loader._api_url
+                + "leagues-classic/{}/standings/?page_standings={}".format(
+                    league_id, page
+                )
+            )["standings"]
+            managers.extend(result["entry"] for result in standings["results"])
+            if not standings["has_next"]:
+                return managers
+            page += 1
 
     @staticmethod
     @lru_cache(maxsize=100)
@@ -344,16 +658,9 @@ class Loader:
 
         :raises requests.exceptions.RequestException: If there is an error querying the API.
         """
-        try:
-            response = requests.get(
-                "https://fantasy.premierleague.com/api/element-summary/{}/".format(
-                    player_id
-                )
-            )
-        except requests.exceptions.RequestException:
-            raise requests.exceptions.RequestException("Error querying API")
-
-        return response.json()
+        return Loader._request_json(
+            Loader._api_url + "element-summary/{}/".format(player_id)
+        )
 
     @staticmethod
     def get_player_historical_info_for_gameweek(
@@ -411,3 +718,39 @@ class Loader:
                 return position
 
         raise KeyError("Position id {} not found in map".format(position_id))
+
+    @staticmethod
+    def get_player_registry() -> PlayerRegistry:
+        """Return the registry of players built from the current static information.
+        The registry is built once per snapshot of the static information, so every caller shares the same Player instances.
+
+        :return: PlayerRegistry of every player in the static information.
+
+        :raises requests.exceptions.RequestException: If there is an error querying the API.
+        """
+        static_info = Loader.get_static_info()
+        snapshot, registry = Loader._player_registry
+        if snapshot is not static_info:
+            registry = PlayerRegistry(static_info["elements"])
+            Loader._player_registry = (static_info, registry)
+        return registry
+
+    @staticmethod
+    def get_player_name_index() -> "PlayerNameIndex":
+        """Return the name index of players built from the current static information.
+        The index is built once per snapshot of the static information, with the players of get_player_registry.
+
+        :return: PlayerNameIndex of every player in the static information.
+
+        :raises requests.exceptions.RequestException: If there is an error querying the API.
+        """
+        static_info = Loader.get_static_info()
+        snapshot, name_index = Loader._player_name_index
+        if snapshot is not static_info:
+            from fpl.player_name_index import PlayerNameIndex
+
+            name_index = PlayerNameIndex(
+                static_info["elements"], Loader.get_player_registry()
+            )
+            Loader._player_name_index = (static_info, name_index)
+        return name_index
@@ -3,19 +3,128 @@ This module defines the Optimizer class, which provides methods to optimize FPL
 The Optimizer class includes methods to calculate optimal formations, discounted rewards, and optimized teams.
 
 Available functions:
+- calc_optimal_formation_arrays: Return the optimal formations of an FPL team for every gameweek of a horizon as arrays.
+- materialise_formation: Build the Formation object for a single gameweek of the arrays returned by calc_optimal_formation_arrays.
 - calc_optimal_formation: Return the optimal formation of an FPL team for a particular gameweek.
 - calc_discounted_reward_player: Calculate the discounted reward you can expect from a player over a particular horizon.
 - calc_discounted_reward_team: Calculate the discounted reward you can expect from your team over a particular horizon.
-- calc_optimal_teams: Find the top three optimized teams based on the given parameters.
+- iter_optimal_teams: Search for the top k optimized teams, yielding the best teams found so far whenever they improve.
+- calc_optimal_teams: Find the top k optimized teams based on the given parameters.
 """
 
-from fpl import Player, Team, Formation, ExpectedPointsCalculator, Loader
+from fpl import (
+    Player,
+    Team,
+    CompactTeam,
+    Formation,
+    ExpectedPointsCalculator,
+    FormationCache,
+    IncrementalScorer,
+)
+from fpl.optimizer_stats import (
+    CountingCache,
+    CountingCalculator,
+    LayerStats,
+    OptimizerStats,
+)
+from fpl.formation_kernel import FormationArrays, calc_optimal_formation_arrays
+from typing import Callable, Iterator, NamedTuple, Optional
 import heapq
+import time
+import numpy as np
+
+
+class ScoredTeam(NamedTuple):
+    """A team together with its discounted reward."""
+
+    score: float
+    team: Team
+
+
+class SearchProgress(NamedTuple):
+    """The state of a team search after a number of teams have been explored."""
+
+    nodes_explored: int
+    results: list[ScoredTeam]
 
 
 class Optimizer:
     """Static class providing methods to optimize an FPL team."""
 
+    @staticmethod
+    def _calc_exp_points_matrix(
+        players: list[Player],
+        epc: ExpectedPointsCalculator,
+        gameweek: int,
+        horizon: int,
+    ) -> np.ndarray:
+        """Return the expected points of each player for each gameweek of a horizon.
+
+        :param players: Players making up the rows of the matrix.
+        :param epc: Expected points calculator.
+        :param gameweek: The gameweek making up the first column of the matrix.
+        :param horizon: The number of gameweeks making up the columns of the matrix.
+
+        :return: Array of shape (len(players), horizon) of expected points.
+        """
+        return np.array(
+            [
+                [
+                    epc.get_expected_points(player.element, gameweek + h)
+                    for h in range(horizon)
+                ]
+                for player in players
+            ],
+            dtype=float,
+        ).reshape(len(players), horizon)
+
+    @staticmethod
+    def calc_optimal_formation_arrays(
+        team: Team, epc: ExpectedPointsCalculator, gameweek: int, horizon: int
+    ) -> tuple[list[Player], FormationArrays]:
+        """Return the optimal formations of an FPL team for every gameweek of a horizon as arrays.
+        No Formation objects are built, use materialise_formation to build one for a gameweek.
+
+        :param team: The team for which the optimal formations are to be calculated.
+        :param epc: Expected points calculator.
+        :param gameweek: The first gameweek for which the optimal formation is to be calculated.
+        :param horizon: The number of gameweeks for which the optimal formation is to be calculated.
+
+        :return: Tuple of the players in the order of the rows of the arrays, and the FormationArrays
+                 containing the starting mask, captain rows and total expected points of each gameweek.
+        """
+        players = sorted(team.gkps | team.defs | team.mids | team.fwds)
+        exp_points = Optimizer._calc_exp_points_matrix(players, epc, gameweek, horizon)
+        positions = np.array([player.position for player in players])
+        return players, calc_optimal_formation_arrays(exp_points, positions)
+
+    @staticmethod
+    def materialise_formation(
+        players: list[Player], formation_arrays: FormationArrays, h: int
+    ) -> Formation:
+        """Build the Formation object for a single gameweek of the arrays returned by calc_optimal_formation_arrays.
+
+        :param players: Players in the order of the rows of the arrays.
+        :param formation_arrays: Optimal formations of the players over several gameweeks.
+        :param h: Column of the gameweek for which the Formation is to be built.
+
+        :return: Optimal Formation object containing gkps, defs, mids, fwds, captain, expected points.
+        """
+        starters = [
+            player
+            for player, starts in zip(players, formation_arrays.mask[:, h])
+            if starts
+        ]
+        captain = int(formation_arrays.captain[h])
+        return Formation._from_validated(
+            total_exp_points=float(formation_arrays.total_exp_points[h]),
+            gkps=frozenset(player for player in starters if player.position == 1),
+            defs=frozenset(player for player in starters if player.position == 2),
+            mids=frozenset(player for player in starters if player.position == 3),
+            fwds=frozenset(player for player in starters if player.position == 4),
+            captain=None if captain < 0 else players[captain],
+        )
+
     @staticmethod
     def calc_optimal_formation(
         team: Team, epc: ExpectedPointsCalculator, gameweek: int
@@ -28,114 +137,10 @@ class Optimizer:
 
         :return: Optimal Formation object containing gkps, defs, mids, fwds, captain, expected points.
         """
-
-        def pop_n_elements(lst, n):
-            popped_elements = set()
-            for _ in range(n):
-                try:
-                    popped_elements.add(lst.pop())
-                except IndexError:  # The list is empty
-                    break
-            return popped_elements
-
-        # for each position create a list in increasing size of expected points
-        gkps_sorted_list = sorted(
-            [
-                (player, epc.get_expected_points(player.element, gameweek))
-                for player in team.gkps
-            ],
-            key=lambda x: x[1],
-        )
-        defs_sorted_list = sorted(
-            [
-                (player, epc.get_expected_points(player.element, gameweek))
-                for player in team.defs
-            ],
-            key=lambda x: x[1],
-        )
-        mids_sorted_list = sorted(
-            [
-                (player, epc.get_expected_points(player.element, gameweek))
-                for player in team.mids
-            ],
-            key=lambda x: x[1],
-        )
-        fwds_sorted_list = sorted(
-            [
-                (player, epc.get_expected_points(player.element, gameweek))
-                for player in team.fwds
-            ],
-            key=lambda x: x[1],
-        )
-
-        # fill up the minimal number of players for each position
-        gkps, defs, mids, fwds = set(), set(), set(), set()
-        remaining_list = []
-        gkps = pop_n_elements(
-            gkps_sorted_list, Loader.get_position_info(1)["squad_min_play"]
-        )
-        defs = pop_n_elements(
-            defs_sorted_list, Loader.get_position_info(2)["squad_min_play"]
-        )
-        mids = pop_n_elements(
-            mids_sorted_list, Loader.get_position_info(3)["squad_min_play"]
-        )
-        fwds = pop_n_elements(
-            fwds_sorted_list, Loader.get_position_info(4)["squad_min_play"]
-        )
-
-        # for the remaining players we pick the best
-        remaining_list.extend(
-            gkps_sorted_list + defs_sorted_list + mids_sorted_list + fwds_sorted_list
-        )
-        remaining_list = sorted(remaining_list, key=lambda x: x[1])
-        i = len(remaining_list) - 1
-        while len(gkps) + len(defs) + len(mids) + len(fwds) < 11:
-            player, exp_points = remaining_list[i]
-            if (
-                player.position == 1
-                and len(gkps) < Loader.get_position_info(1)["squad_max_play"]
-            ):
-                gkps.add((player, exp_points))
-            elif (
-                player.position == 2
-                and len(defs) < Loader.get_position_info(2)["squad_max_play"]
-            ):
-                defs.add((player, exp_points))
-            elif (
-                player.position == 3
-                and len(mids) < Loader.get_position_info(3)["squad_max_play"]
-            ):
-                mids.add((player, exp_points))
-            elif (
-                player.position == 4
-                and len(fwds) < Loader.get_position_info(4)["squad_max_play"]
-            ):
-                fwds.add((player, exp_points))
-            i -= 1
-
-        # compute the total expected points and find the captain
-        total_exp_points, max_exp_points, captain = 0, 0, None
-        for player, exp_points in gkps | defs | mids | fwds:
-            if exp_points > max_exp_points:
-                captain = player
-                max_exp_points = exp_points
-
-            total_exp_points += exp_points
-
-        # need to double the captain's points
-        total_exp_points += max_exp_points
-
-        formation = Formation(
-            total_exp_points=total_exp_points,
-            gkps=frozenset(x[0] for x in gkps),
-            defs=frozenset(x[0] for x in defs),
-            mids=frozenset(x[0] for x in mids),
-            fwds=frozenset(x[0] for x in fwds),
-            captain=captain,
+        players, formation_arrays = Optimizer.calc_optimal_formation_arrays(
+            team, epc, gameweek, 1
         )
-
-        return formation
+        return Optimizer.materialise_formation(players, formation_arrays, 0)
 
     @staticmethod
     def calc_discounted_reward_player(
@@ -166,6 +171,27 @@ class Optimizer:
 
         return discounted_reward
 
+    @staticmethod
+    def _calc_transfer_adjustment(free_transfers: int, wildcard: bool = False) -> float:
+        """Calculate the points added to each gameweek to account for the free transfers a team has.
+
+        :param free_transfers: Number of free transfers, negative when points hits have been taken.
+        :param wildcard: Whether you are wildcarding or not, this is a switch to turn off the transfer adjustment.
+
+        :return: Transfer adjustment applied to every gameweek of the horizon.
+        """
+        # unlimited transfers
+        if wildcard:
+            return 0
+
+        # draw a graph - each free transfer is roughly worth 0.8 points
+        if free_transfers <= -1:
+            return 4 * free_transfers
+        elif free_transfers >= 4:
+            return 0
+        else:
+            return -4 + (free_transfers + 1) * 0.8
+
     @staticmethod
     def calc_discounted_reward_team(
         team: Team,
@@ -174,6 +200,7 @@ class Optimizer:
         horizon: int,
         gamma: float = 1,
         wildcard: bool = False,
+        cache: Optional[FormationCache] = None,
     ) -> float:
         """Calculate the discounted reward you can expect from your team over a particular horizon.
         The discounted reward of a team is not the sum of the players.
@@ -185,37 +212,57 @@ class Optimizer:
         :param horizon: The number of gameweeks over which to accumulate the reward.
         :param gamma: Discount factor.
         :param wildcard: Whether you are wildcarding or not, this is a switch to turn off the transfer adjustment.
+        :param cache: FormationCache of the run, built with the same expected points calculator,
+                      to reuse the optimal formations of squads scored before. None to score the team from scratch.
 
         :return: Discounted reward of your team over a particular horizon, including a transfer adjustment.
         """
-        # draw a graph - each free transfer is roughly worth 0.8 points
-        transfer_adjustment = 0
-        if team.free_transfers <= -1:
-            transfer_adjustment = 4 * team.free_transfers
-        elif team.free_transfers >= 4:
-            transfer_adjustment = 0
-        else:
-            transfer_adjustment = -4 + (team.free_transfers + 1) * 0.8
-
-        # unlimited transfers
-        if wildcard:
-            transfer_adjustment = 0
+        transfer_adjustment = Optimizer._calc_transfer_adjustment(
+            team.free_transfers, wildcard
+        )
 
+        if cache is None:
+            _, formation_arrays = Optimizer.calc_optimal_formation_arrays(
+                team, epc, gameweek, horizon
+            )
+            total_exp_points = formation_arrays.total_exp_points.tolist()
+        else:
+            total_exp_points = [
+                cache.get_total_exp_points(team, gameweek + h) for h in range(horizon)
+            ]
         discounted_reward = 0
         discount_factor = 1
         for h in range(horizon):
-            formation = Optimizer.calc_optimal_formation(team, epc, gameweek + h)
             # transfer adjustment should be applied every week
             # having one less transfer this week -> on average you'll have one less next week
             discounted_reward += discount_factor * (
-                formation.total_exp_points + transfer_adjustment
+                total_exp_points[h] + transfer_adjustment
             )
             discount_factor *= gamma
 
         return discounted_reward
 
     @staticmethod
-    def calc_optimal_teams(
+    def _validate_candidates(team: Team, candidates: list[Player]) -> None:
+        """Check the candidates can be transferred into the team.
+
+        :param team: The team you wish to optimize.
+        :param candidates: List of player candidates you wish to transfer in.
+
+        :raises ValueError: If one of the candidates is already in the team or has an invalid position.
+        """
+        team_player_ids = set(
+            [p.element for p in team.gkps | team.defs | team.mids | team.fwds]
+        )
+        valid_positions = set([1, 2, 3, 4])
+        for candidate in candidates:
+            if candidate.element in team_player_ids:
+                raise ValueError("Candidate already in team.")
+            if candidate.position not in valid_positions:
+                raise ValueError("Invalid player position.")
+
+    @staticmethod
+    def iter_optimal_teams(
         team: Team,
         candidates: list[Player],
         epc: ExpectedPointsCalculator,
@@ -224,8 +271,19 @@ class Optimizer:
         max_transfers: int,
         gamma: float = 1,
         wildcard: bool = False,
-    ) -> list[Team]:
-        """Find the top three optimized teams.
+        k: int = 3,
+        beam_width: Optional[int] = None,
+        rank_by: str = "score",
+        time_budget_s: Optional[float] = None,
+        node_budget: Optional[int] = None,
+        stats: Optional[OptimizerStats] = None,
+        stop: Optional[Callable[[], bool]] = None,
+    ) -> Iterator[SearchProgress]:
+        """Search for the top k optimized teams, yielding the best teams found so far whenever they improve.
+        The search can be stopped early by no longer iterating over the generator.
+        By default every team with up to max_transfers transfers is explored. In beam search mode only
+        the best beam_width teams of each layer are expanded with a further transfer, and the search
+        stops when the time or node budget runs out, so the best teams found so far are returned.
 
         :param team: The team you wish to optimize.
         :param candidates: List of player candidates you wish to transfer in.
@@ -235,64 +293,293 @@ class Optimizer:
         :param max_transfers: Maximum number of transfers you wish to take on.
         :param gamma: Discount factor.
         :param wildcard: Whether you are wildcarding or not.
-
-        :return: List of the top three teams based on score.
-
-        :raises ValueError: If one of the candidates is already in the team or has an invalid position.
+        :param k: Number of teams to keep.
+        :param beam_width: Number of teams of each layer to expand, None to expand every team.
+        :param rank_by: 'score' or 'bound' indicating whether teams of a layer are ranked for the beam
+                        by their score or by an optimistic bound on the score reachable with the remaining transfers.
+        :param time_budget_s: Wall-clock time in seconds after which the search stops, None for no limit.
+        :param node_budget: Number of teams explored after which the search stops, None for no limit.
+        :param stats: OptimizerStats to fill in with the counts and timings of the search, None to not record them.
+        :param stop: Function checked with the budgets, which stops the search when it returns True,
+                     e.g. to cancel the search from another thread or process, None to never stop early.
+
+        :return: Generator of SearchProgress containing the number of teams explored so far
+                 and the top k teams found so far ordered from best to worst.
+                 The last SearchProgress is yielded once the search finishes or the budget runs out.
+
+        :raises ValueError: If one of the candidates is already in the team or has an invalid position,
+                            or if k, beam_width or rank_by are invalid.
         """
+        Optimizer._validate_candidates(team, candidates)
+        if k < 1:
+            raise ValueError("k must be a positive integer.")
+        if beam_width is not None and beam_width < 1:
+            raise ValueError("beam_width must be a positive integer.")
+        if rank_by not in {"score", "bound"}:
+            raise ValueError(
+                f"Invalid value for 'rank_by': {rank_by}. Must be 'score' or 'bound'."
+            )
 
-        team_player_ids = set(
-            [p.element for p in team.gkps | team.defs | team.mids | team.fwds]
+        deadline = (
+            None if time_budget_s is None else time.perf_counter() + time_budget_s
         )
-        valid_positions = set([1, 2, 3, 4])
-        for candidate in candidates:
-            if candidate.element in team_player_ids:
-                raise ValueError("Candidate already in team.")
-            if candidate.position not in valid_positions:
-                raise ValueError("Invalid player position.")
+        if stats is not None:
+            search_start = time.perf_counter()
+            epc = CountingCalculator(epc, stats)
+
+        def progress():
+            return SearchProgress(
+                nodes_explored,
+                [
+                    ScoredTeam(score, to_team(compact_team))
+                    for score, compact_team in sorted(top_k, reverse=True)
+                ],
+            )
 
-        top_three = [
+        def out_of_budget():
+            if node_budget is not None and nodes_explored >= node_budget:
+                return True
+            if stop is not None and stop():
+                return True
+            return deadline is not None and time.perf_counter() >= deadline
+
+        # each team is scored incrementally from the team it was derived from and is held
+        # as a CompactTeam during the search, only the top k teams are converted back to Team
+        scorer = IncrementalScorer(
+            team,
+            epc,
+            gameweek,
+            horizon,
+            _points_cache=None if stats is None else CountingCache(stats),
+        )
+        players = {
+            player.element: player
+            for player in team.gkps | team.defs | team.mids | team.fwds
+        }
+        players.update((candidate.element, candidate) for candidate in candidates)
+        teams = {scorer.compact_team: team}
+
+        def to_team(compact_team: CompactTeam) -> Team:
+            if compact_team not in teams:
+                teams[compact_team] = compact_team.to_team(players)
+            return teams[compact_team]
+
+        top_k = [
             (
-                Optimizer.calc_discounted_reward_team(
-                    team, epc, gameweek, horizon, gamma, wildcard
+                scorer.calc_discounted_reward(
+                    Optimizer._calc_transfer_adjustment(team.free_transfers, wildcard),
+                    gamma,
                 ),
-                team,
+                scorer.compact_team,
             )
         ]
-        heapq.heapify(top_three)
-        heap_set = set([team])
-
-        currLayer = [team]
+        heapq.heapify(top_k)
+        heap_set = set([scorer.compact_team])
+        nodes_explored = 1
+        if stats is not None:
+            stats._add_phase_time("setup", time.perf_counter() - search_start)
+        yield progress()
+
+        # once the budget runs out every loop breaks and the final results are yielded
+        currLayer = [scorer]
         for i in range(max_transfers):
+            if out_of_budget():
+                break
             nextLayer = []
-            for u_team in currLayer:
+            nextLayerScores = []
+            layer_stats = None
+            if stats is not None:
+                layer_stats = LayerStats(i + 1)
+                layer_seen = set()
+                layer_start = time.perf_counter()
+            for u_scorer in currLayer:
+                if out_of_budget():
+                    break
+                u_team = u_scorer.compact_team
                 for candidate in candidates:
-                    out_players = None
-                    if candidate.position == 1:
-                        out_players = u_team.gkps
-                    elif candidate.position == 2:
-                        out_players = u_team.defs
-                    elif candidate.position == 3:
-                        out_players = u_team.mids
-                    elif candidate.position == 4:
-                        out_players = u_team.fwds
-                    if candidate not in out_players:
-                        for out_player in out_players:
-                            v_team = u_team.transfer_player(out_player, candidate)
-                            v_score = Optimizer.calc_discounted_reward_team(
-                                v_team, epc, gameweek, horizon, gamma, wildcard
-                            )
-                            if v_team.is_feasible and (v_team not in heap_set):
-                                if len(top_three) < 3:
-                                    heapq.heappush(top_three, (v_score, v_team))
-                                    heap_set.add(v_team)
-                                else:
-                                    _, team_popped = heapq.heappushpop(
-                                        top_three, (v_score, v_team)
-                                    )
-                                    heap_set.add(v_team)
-                                    heap_set.remove(team_popped)
-                            nextLayer.append(v_team)
+                    if out_of_budget():
+                        break
+                    if candidate.element in u_team:
+                        continue
+                    for out_element in u_team.elements:
+                        out_player = players[out_element]
+                        if out_player.position != candidate.position:
+                            continue
+                        if out_of_budget():
+                            break
+                        # skip transfers from which no feasible team can be reached
+                        if not u_team.can_transfer(
+                            out_player, candidate, max_transfers - i - 1
+                        ):
+                            if layer_stats is not None:
+                                layer_stats.nodes_pruned += 1
+                            continue
+                        v_scorer = u_scorer.transfer_player(out_player, candidate)
+                        v_team = v_scorer.compact_team
+                        v_score = v_scorer.calc_discounted_reward(
+                            Optimizer._calc_transfer_adjustment(
+                                v_team.free_transfers, wildcard
+                            ),
+                            gamma,
+                        )
+                        nodes_explored += 1
+                        if layer_stats is not None:
+                            layer_stats.nodes_generated += 1
+                            if v_team.is_feasible():
+                                layer_stats.nodes_feasible += 1
+                            if v_team in layer_seen:
+                                layer_stats.dedup_hits += 1
+                            else:
+                                layer_seen.add(v_team)
+                        if v_team.is_feasible() and (v_team not in heap_set):
+                            if len(top_k) < k:
+                                heapq.heappush(top_k, (v_score, v_team))
+                                heap_set.add(v_team)
+                                yield progress()
+                            else:
+                                _, team_popped = heapq.heappushpop(
+                                    top_k, (v_score, v_team)
+                                )
+                                heap_set.add(v_team)
+                                heap_set.remove(team_popped)
+                                if team_popped is not v_team:
+                                    yield progress()
+                        nextLayer.append(v_scorer)
+                        nextLayerScores.append(v_score)
+            if layer_stats is not None:
+                layer_stats.wall_time_s = time.perf_counter() - layer_start
+            if beam_width is not None:
+                beam_start = time.perf_counter()
+                nextLayer = Optimizer._select_beam(
+                    nextLayer,
+                    nextLayerScores,
+                    beam_width,
+                    rank_by,
+                    candidates,
+                    max_transfers - i - 1,
+                    gamma,
+                    wildcard,
+                )
+                if layer_stats is not None:
+                    layer_stats.beam_time_s = time.perf_counter() - beam_start
+            if layer_stats is not None:
+                layer_stats.nodes_expanded = len(nextLayer)
+                stats._add_phase_time("search", layer_stats.wall_time_s)
+                if beam_width is not None:
+                    stats._add_phase_time("beam_selection", layer_stats.beam_time_s)
+                stats._finish_layer(layer_stats)
             currLayer = nextLayer
 
-        return top_three
+        if stats is not None:
+            stats._add_phase_time("total", time.perf_counter() - search_start)
+        yield progress()
+
+    @staticmethod
+    def _select_beam(
+        layer: list[IncrementalScorer],
+        scores: list[float],
+        beam_width: int,
+        rank_by: str,
+        candidates: list[Player],
+        remaining_transfers: int,
+        gamma: float,
+        wildcard: bool,
+    ) -> list[IncrementalScorer]:
+        """Keep the best distinct teams of a layer of the search.
+
+        :param layer: Scorers of the teams of the layer.
+        :param scores: Discounted rewards of the teams of the layer.
+        :param beam_width: Number of teams to keep.
+        :param rank_by: 'score' or 'bound' indicating how the teams are ranked.
+        :param candidates: List of player candidates you wish to transfer in.
+        :param remaining_transfers: Number of transfers which can still be made after this layer.
+        :param gamma: Discount factor.
+        :param wildcard: Whether you are wildcarding or not.
+
+        :return: Scorers of the kept teams.
+        """
+        ranked = {}
+        for v_scorer, v_score in zip(layer, scores):
+            if v_scorer.compact_team in ranked:
+                continue
+            if rank_by == "bound":
+                v_score = v_scorer.calc_optimistic_reward(
+                    candidates,
+                    remaining_transfers,
+                    Optimizer._calc_transfer_adjustment(
+                        v_scorer.compact_team.free_transfers, wildcard
+                    ),
+                    gamma,
+                )
+            ranked[v_scorer.compact_team] = (v_score, v_scorer)
+
+        best = heapq.nlargest(
+            beam_width,
+            ranked.values(),
+            key=lambda score_and_scorer: score_and_scorer[0],
+        )
+        return [v_scorer for _, v_scorer in best]
+
+    @staticmethod
+    def calc_optimal_teams(
+        team: Team,
+        candidates: list[Player],
+        epc: ExpectedPointsCalculator,
+        gameweek: int,
+        horizon: int,
+        max_transfers: int,
+        gamma: float = 1,
+        wildcard: bool = False,
+        k: int = 3,
+        beam_width: Optional[int] = None,
+        rank_by: str = "score",
+        time_budget_s: Optional[float] = None,
+        node_budget: Optional[int] = None,
+        stats: Optional[OptimizerStats] = None,
+        stop: Optional[Callable[[], bool]] = None,
+    ) -> list[ScoredTeam]:
+        """Find the top k optimized teams.
+        See iter_optimal_teams for the beam search mode and the search budgets.
+
+        :param team: The team you wish to optimize.
+        :param candidates: List of player candidates you wish to transfer in.
+        :param epc: Expected points calculator.
+        :param gameweek: The gameweek for which you want to start optimizing.
+        :param horizon: The number of gameweeks over which to optimize.
+        :param max_transfers: Maximum number of transfers you wish to take on.
+        :param gamma: Discount factor.
+        :param wildcard: Whether you are wildcarding or not.
+        :param k: Number of teams to return.
+        :param beam_width: Number of teams of each layer to expand, None to expand every team.
+        :param rank_by: 'score' or 'bound' indicating how teams of a layer are ranked for the beam.
+        :param time_budget_s: Wall-clock time in seconds after which the search stops, None for no limit.
+        :param node_budget: Number of teams explored after which the search stops, None for no limit.
+        :param stats: OptimizerStats to fill in with the counts and timings of the search, None to not record them.
+        :param stop: Function checked with the budgets, which stops the search when it returns True,
+                     e.g. to cancel the search from another thread or process, None to never stop early.
+
+        :return: List of the top k teams and their scores ordered from best to worst.
+
+        :raises ValueError: If one of the candidates is already in the team or has an invalid position,
+                            or if k, beam_width or rank_by are invalid.
+        """
+        results = []
+        for progress in Optimizer.iter_optimal_teams(
+            team,
+            candidates,
+            epc,
+            gameweek,
+            horizon,
+            max_transfers,
+            gamma,
+            wildcard,
+            k,
+            beam_width,
+            rank_by,
+            time_budget_s,
+            node_budget,
+            stats,
+            stop,
+        ):
+            results = progress.results
+        return results
@@ -0,0 +1,165 @@
+"""
+This module provides opt-in instrumentation of the team search of the Optimizer.
+An OptimizerStats passed to Optimizer.iter_optimal_teams or calc_optimal_teams is filled in as the search runs
+with the number of teams generated, pruned, feasible and deduplicated in each layer of transfers,
+the calls made to the expected points calculator and their latencies, the hit rate of the expected points cache
+and the wall time of each phase of the search. A callback can be given to emit each layer as soon as it finishes,
+e.g. to a production log, and to_dict returns everything as JSON-safe values.
+
+Available classes:
+- LayerStats: Counts and wall time of a single layer of the search.
+- CountingCache: Expected points cache counting its lookups.
+- CountingCalculator: Expected points calculator counting and timing the calls made to another calculator.
+- OptimizerStats: Statistics of a search of the Optimizer.
+
+Available functions:
+- to_dict: Return the statistics as a JSON-safe dictionary.
+"""
+
+import time
+from bisect import bisect_right
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+from fpl import ExpectedPointsCalculator
+
+# upper edges in seconds of the buckets of the latency histogram, the last bucket is unbounded
+LATENCY_BUCKETS = (1e-6, 1e-5, 1e-4, 1e-3, 1e-2, 1e-1)
+LATENCY_LABELS = ("<1us", "<10us", "<100us", "<1ms", "<10ms", "<100ms", ">=100ms")
+
+
+@dataclass
+class LayerStats:
+    """Counts and wall time of a single layer of the search, the layer of teams made with n_transfers transfers.
+
+    nodes_generated: Teams scored in the layer.
+    nodes_pruned: Transfers skipped because no feasible team can be reached from them.
+    nodes_feasible: Teams of the layer which are feasible.
+    dedup_hits: Teams of the layer equal to a team generated earlier in the layer, reached by another order of transfers.
+    nodes_expanded: Teams of the layer kept to be expanded with a further transfer.
+    wall_time_s: Wall time in seconds spent generating and scoring the layer.
+    beam_time_s: Wall time in seconds spent selecting the beam of the layer.
+    """
+
+    n_transfers: int
+    nodes_generated: int = 0
+    nodes_pruned: int = 0
+    nodes_feasible: int = 0
+    dedup_hits: int = 0
+    nodes_expanded: int = 0
+    wall_time_s: float = 0.0
+    beam_time_s: float = 0.0
+
+
+class CountingCache(dict):
+    """Expected points cache of IncrementalScorer counting its lookups, each lookup being a membership test."""
+
+    def __init__(self, stats: "OptimizerStats"):
+        """Create an empty cache.
+
+        :param stats: The OptimizerStats recording the lookups.
+        """
+        super().__init__()
+        self.stats = stats
+
+    def __contains__(self, key) -> bool:
+        self.stats.points_cache_lookups += 1
+        return super().__contains__(key)
+
+
+class CountingCalculator(ExpectedPointsCalculator):
+    """Expected points calculator counting and timing the calls made to another calculator."""
+
+    def __init__(self, epc: ExpectedPointsCalculator, stats: "OptimizerStats"):
+        """Wrap an expected points calculator.
+
+        :param epc: The expected points calculator whose calls are counted.
+        :param stats: The OptimizerStats recording the calls.
+        """
+        self.epc = epc
+        self.stats = stats
+
+    def get_expected_points(self, player_id: int, gameweek: int) -> float:
+        """Return the expected points of the wrapped calculator, recording the call and its latency.
+
+        :param player_id: The unique ID of the player.
+        :param gameweek: The gameweek for which to get the expected points.
+
+        :return: The expected points for the player in the specified gameweek.
+        """
+        start = time.perf_counter()
+        exp_points = self.epc.get_expected_points(player_id, gameweek)
+        self.stats._record_epc_call(time.perf_counter() - start)
+        return exp_points
+
+
+@dataclass
+class OptimizerStats:
+    """Statistics of a search of the Optimizer, filled in while the search runs.
+
+    layers: Statistics of each layer of the search, one per number of transfers.
+    phase_times_s: Wall time in seconds of the setup, search, beam selection and the whole search.
+                   As the search is a generator, the times include the time the caller spends handling progress updates.
+    epc_calls: Number of calls made to the expected points calculator.
+    epc_time_s: Wall time in seconds spent in the expected points calculator.
+    epc_latency_histogram: Number of calls to the expected points calculator in each latency bucket.
+    points_cache_lookups: Number of expected points looked up, each call to the calculator is a cache miss.
+    on_layer: Optional callback called with the LayerStats of each layer as soon as the layer is finished.
+    """
+
+    layers: List[LayerStats] = field(default_factory=list)
+    phase_times_s: Dict[str, float] = field(default_factory=dict)
+    epc_calls: int = 0
+    epc_time_s: float = 0.0
+    epc_latency_histogram: Dict[str, int] = field(
+        default_factory=lambda: dict.fromkeys(LATENCY_LABELS, 0)
+    )
+    points_cache_lookups: int = 0
+    on_layer: Optional[Callable[[LayerStats], None]] = field(
+        default=None, repr=False, compare=False
+    )
+
+    def _record_epc_call(self, latency_s: float):
+        """Record a call to the expected points calculator and its latency in seconds."""
+        self.epc_calls += 1
+        self.epc_time_s += latency_s
+        self.epc_latency_histogram[
+            LATENCY_LABELS[bisect_right(LATENCY_BUCKETS, latency_s)]
+        ] += 1
+
+    def _add_phase_time(self, phase: str, seconds: float):
+        """Add wall time in seconds to a phase of the search."""
+        self.phase_times_s[phase] = self.phase_times_s.get(phase, 0.0) + seconds
+
+    def _finish_layer(self, layer: LayerStats):
+        """Record a finished layer and emit it through the callback."""
+        self.layers.append(layer)
+        if self.on_layer is not None:
+            self.on_layer(layer)
+
+    @property
+    def nodes_generated(self) -> int:
+        """Number of teams scored over every layer."""
+        return sum(layer.nodes_generated for layer in self.layers)
+
+    @property
+    def points_cache_hit_rate(self) -> float:
+        """Fraction of expected points looked up without calling the calculator."""
+        if self.points_cache_lookups == 0:
+            return 0.0
+        return 1 - self.epc_calls / self.points_cache_lookups
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the statistics as a JSON-safe dictionary, e.g. for structured logging.
+
+        :return: Dictionary of the statistics, including the derived totals and hit rate.
+        """
+        return {
+            "layers": [asdict(layer) for layer in self.layers],
+            "phase_times_s": dict(self.phase_times_s),
+            "epc_calls": self.epc_calls,
+            "epc_time_s": self.epc_time_s,
+            "epc_latency_histogram": dict(self.epc_latency_histogram),
+            "points_cache_lookups": self.points_cache_lookups,
+            "nodes_generated": self.nodes_generated,
+            "points_cache_hit_rate": self.points_cache_hit_rate,
+        }
@@ -0,0 +1,146 @@
+"""
+This module defines the ParameterSweep class, which scores teams for a whole grid of discount factors, horizons
+and transfer adjustments at once, to tune the parameters of Optimizer.calc_discounted_reward_team and calc_optimal_teams.
+The optimal formation total of every team for every gameweek only depends on the squad, so it is computed once
+for the longest horizon. The discounted reward of each setting is then a dot product of those totals with the discount
+factors of the setting, plus the transfer adjustment multiplied by the sum of the discount factors.
+
+Available classes:
+- ParameterSweep: Static class to score teams for a grid of parameter settings.
+
+Available functions:
+- calc_total_exp_points_matrix: Return the optimal formation total of each team for each gameweek of a horizon.
+- sweep_discounted_rewards: Calculate the discounted reward and rank of each team for every parameter setting.
+"""
+
+from typing import List, Sequence
+import numpy as np
+import pandas as pd
+from fpl import Team, ExpectedPointsCalculator, Optimizer
+from fpl.formation_kernel import calc_optimal_formation_batch
+
+
+class ParameterSweep:
+    """Static class to score teams for a grid of parameter settings."""
+
+    @staticmethod
+    def calc_total_exp_points_matrix(
+        teams: List[Team], epc: ExpectedPointsCalculator, gameweek: int, horizon: int
+    ) -> np.ndarray:
+        """Return the optimal formation total of each team for each gameweek of a horizon.
+        The expected points of each distinct player are queried once and every team is scored in one batched call.
+
+        :param teams: The teams, which must all have the same number of players in each position.
+        :param epc: Expected points calculator.
+        :param gameweek: The first gameweek.
+        :param horizon: The number of gameweeks.
+
+        :return: Array of shape (len(teams), horizon) of optimal formation totals including the captain.
+
+        :raises ValueError: If the teams do not all have the same number of players in each position,
+                            or cannot field any valid formation.
+        """
+        squads = [sorted(t.gkps | t.defs | t.mids | t.fwds) for t in teams]
+        rows = {}
+        for squad in squads:
+            for player in squad:
+                rows.setdefault(player.element, len(rows))
+        exp_points = np.array(
+            [
+                [epc.get_expected_points(element, gameweek + h) for h in range(horizon)]
+                for element in rows
+            ],
+            dtype=float,
+        ).reshape(len(rows), horizon)
+        if not squads:
+            return np.zeros((0, horizon))
+        if len(set(map(len, squads))) > 1:
+            raise ValueError(
+                "Every squad must have the same number of players in each position."
+            )
+        squad_rows = np.array([[rows[p.element] for p in squad] for squad in squads])
+        positions = np.array([[p.position for p in squad] for squad in squads])
+        return calc_optimal_formation_batch(
+            exp_points[squad_rows], positions
+        ).total_exp_points
+
+    @staticmethod
+    def sweep_discounted_rewards(
+        teams: List[Team],
+        epc: ExpectedPointsCalculator,
+        gameweek: int,
+        gammas: Sequence[float],
+        horizons: Sequence[int],
+        transfer_adjustment_scales: Sequence[float] = (1.0,),
+        wildcard: bool = False,
+    ) -> pd.DataFrame:
+        """Calculate the discounted reward and rank of each team for every parameter setting.
+        For a scale of 1 the rewards equal Optimizer.calc_discounted_reward_team, a scale of 0 ignores the free transfers
+        of the teams as when wildcarding. To tune calc_optimal_teams, sweep the teams it returns for the longest horizon
+        with a large k.
+
+        :param teams: The teams to score, which must all have the same number of players in each position.
+        :param epc: Expected points calculator.
+        :param gameweek: The gameweek from which to start accumulating the reward.
+        :param gammas: Discount factors to sweep.
+        :param horizons: Numbers of gameweeks over which to accumulate the reward to sweep.
+        :param transfer_adjustment_scales: Multipliers of the transfer adjustment to sweep.
+        :param wildcard: Whether you are wildcarding or not, this is a switch to turn off the transfer adjustment.
+
+        :return: DataFrame with one row per setting and team, with columns gamma, horizon, transfer_adjustment_scale,
+                 team (the index of the team in teams), discounted_reward and rank (1 for the best team of the setting).
+
+        :raises ValueError: If a horizon is not positive, or the teams cannot be scored together.
+        """
+        if any(horizon < 1 for horizon in horizons):
+            raise ValueError("horizons must be positive integers.")
+        max_horizon = max(horizons, default=0)
+        totals = ParameterSweep.calc_total_exp_points_matrix(
+            teams, epc, gameweek, max_horizon
+        )
+        adjustments = np.array(
+            [
+                Optimizer._calc_transfer_adjustment(team.free_transfers, wildcard)
+                for team in teams
+            ],
+            dtype=float,
+        )
+
+        # one row of discount factors per setting, zero beyond the horizon of the setting
+        gamma_grid, horizon_grid, scale_grid = (
+            grid.ravel()
+            for grid in np.meshgrid(
+                np.asarray(gammas, dtype=float),
+                np.asarray(horizons, dtype=int),
+                np.asarray(transfer_adjustment_scales, dtype=float),
+                indexing="ij",
+            )
+        )
+        h = np.arange(max_horizon)
+        weights = np.where(
+            h < horizon_grid[:, None], gamma_grid[:, None] ** h, 0.0
+        ).reshape(-1, max_horizon)
+
+        # discounted rewards with shape (n_settings, n_teams)
+        rewards = weights @ totals.T + np.outer(
+            scale_grid * weights.sum(axis=1), adjustments
+        )
+        ranks = np.empty_like(rewards, dtype=int)
+        np.put_along_axis(
+            ranks,
+            np.argsort(-rewards, axis=1, kind="stable"),
+            np.arange(1, len(teams) + 1)[None, :],
+            axis=1,
+        )
+
+        n_settings, n_teams = rewards.shape
+        return pd.DataFrame(
+            {
+                "gamma": np.repeat(gamma_grid, n_teams),
+                "horizon": np.repeat(horizon_grid, n_teams),
+                "transfer_adjustment_scale": np.repeat(scale_grid, n_teams),
+                "team": np.tile(np.arange(n_teams), n_settings),
+                "discounted_reward": rewards.ravel(),
+                "rank": ranks.ravel(),
+            }
+        )
@@ -2,10 +2,13 @@
 This module defines the Player class, which represents a player in the Fantasy Premier League (FPL).
 The Player class includes attributes such as the player's unique ID, name, position, club, and cost.
 It also provides methods for comparing players and creating player instances with minimal information.
+Players are slotted so they carry no instance dictionary, PlayerRegistry hands out one shared instance per player.
 
 Available functions:
 - __eq__: Checks if two players are equal based on their unique ID.
 - __lt__: Compares two players based on their unique ID.
+- __hash__: Returns the hash of the player's unique ID.
+- index: Dense integer index of the player in its PlayerRegistry, -1 if the player was not built by a registry.
 - from_min_info: Creates a Player instance with minimal information, using the player's unique ID as the name.
 """
 
@@ -14,26 +17,50 @@ from dataclasses import dataclass
 
 @dataclass(frozen=True)
 class Player:
-    element: int # this is the unique id of the player
+    __slots__ = ("element", "name", "position", "club", "cost", "_index")
+    element: int  # this is the unique id of the player
     name: str
-    position: int # 1 = GKP, 2 = DEF, 3 = MID, 4 = FWD
+    position: int  # 1 = GKP, 2 = DEF, 3 = MID, 4 = FWD
     club: int
     cost: int
 
+    def __post_init__(self):
+        """Mark the player as not belonging to a registry."""
+        object.__setattr__(self, "_index", -1)
+
+    def __reduce__(self):
+        """Support pickling, frozen slotted instances cannot restore their state attribute by attribute."""
+        return (
+            _restore_player,
+            (self.element, self.name, self.position, self.club, self.cost, self._index),
+        )
+
     def __eq__(self, other: "Player") -> bool:
         """Check if two players are equal based on their unique ID.
         We need this defined so we can sort players.
-        
+
         :param other: Another Player instance to compare with.
 
         :return: True if the players have the same unique ID, False otherwise.
         """
-        return self.element == other.element
+        return self is other or self.element == other.element
+
+    def __hash__(self) -> int:
+        """Return the hash of the player's unique ID, consistent with __eq__.
+
+        :return: The hash of the unique ID.
+        """
+        return hash(self.element)
+
+    @property
+    def index(self) -> int:
+        """Dense integer index of the player in its PlayerRegistry, -1 if the player was not built by a registry."""
+        return self._index
 
     def __lt__(self, other: "Player") -> bool:
         """Compare two players based on their unique ID.
         We need this defined so we can sort players.
-        
+
         :param other: Another Player instance to compare with.
 
         :return: True if this player's unique ID is less than the other player's unique ID, False otherwise.
@@ -46,7 +73,7 @@ class Player:
     ) -> "Player":
         """Create a Player instance with minimal information, using the player's unique ID as the name.
         Allows players to be constructed without needing to specify a name
-        
+
         :param element: The unique ID of the player.
         :param position: The position of the player.
         :param club: The club ID of the player.
@@ -56,3 +83,12 @@ class Player:
         """
         name = str(element)
         return cls(element, name, position, club, cost)
+
+
+def _restore_player(
+    element: int, name: str, position: int, club: int, cost: int, index: int
+) -> Player:
+    """Rebuild a pickled player together with its registry index."""
+    player = Player(element, name, position, club, cost)
+    object.__setattr__(player, "_index", index)
+    return player
@@ -0,0 +1,339 @@
+"""
+This module defines the PlayerNameIndex class, which finds players by name without fuzzy matching every player on each search.
+The first, second and web names of each player are normalised, with accents stripped and case folded, and split into
+trigrams held in an inverted index. A search shortlists the names sharing the most trigrams with the query,
+and only the shortlist is scored with fuzzy matching, so searches are fast enough for autocomplete.
+Many names, e.g. a list of candidates, can be resolved in one call, with the shortlists of every name found in one vectorized pass.
+The index of the current static information is available from Loader.get_player_name_index.
+
+Available classes:
+- NameMatch: A player matching a search, with their full name and the score of the match.
+- NameResolution: The resolution of a name to a player, with the ambiguity of the match.
+- PlayerNameIndex: Class indexing the names of the players of a snapshot of the FPL static information.
+
+Available functions:
+- normalise_name: Return a name in lower case without accents or punctuation.
+- search: Return the players whose names best match a query.
+- resolve: Resolve many names to players at once, optionally with club and position hints.
+"""
+
+import heapq
+import unicodedata
+from collections import Counter
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+import numpy as np
+from fuzzywuzzy import fuzz
+from fpl.player import Player
+from fpl.player_registry import PlayerRegistry
+
+POSITION_NAMES = {"GKP": 1, "DEF": 2, "MID": 3, "FWD": 4}
+
+
+class NameMatch(NamedTuple):
+    """A player matching a search, with their full name and the score of the match from 0 to 100."""
+
+    player: Player
+    full_name: str
+    score: int
+
+
+def normalise_name(name: str) -> str:
+    """Return a name in lower case without accents or punctuation, e.g. "Ødegaard" and "odegaard" are the same.
+
+    :param name: The name to normalise.
+
+    :return: The normalised name, with words separated by single spaces.
+    """
+    # letters which do not decompose into a base letter and an accent
+    name = name.replace("ø", "o").replace("Ø", "O").replace("ß", "ss")
+    decomposed = unicodedata.normalize("NFKD", name)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(
+        "".join(c if c.isalnum() else " " for c in stripped.casefold()).split()
+    )
+
+
+def _trigrams(name: str) -> set:
+    """Return the trigrams of a normalised name padded with a space at each end."""
+    padded = " {} ".format(name)
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class NameResolution(NamedTuple):
+    """The resolution of a name to a player.
+
+    query: The name as given.
+    player: The best matching player, None if no player matches above the threshold.
+    full_name: The full name of the best matching player.
+    score: The score of the best match from 0 to 100, 0 if there is no match.
+    ambiguity: The score of the second best match divided by the score of the best match,
+               1 when two players match equally well and 0 when only one player matches.
+    alternatives: The other players matching above the threshold from the best to the worst score.
+    """
+
+    query: str
+    player: Optional[Player]
+    full_name: Optional[str]
+    score: int
+    ambiguity: float
+    alternatives: Tuple[NameMatch, ...]
+
+
+def _parse_position(position: Optional[Union[int, str]]) -> Optional[int]:
+    """Return a position hint as an integer from 1 to 4.
+
+    :raises ValueError: If the position is invalid.
+    """
+    if position is None:
+        return None
+    if isinstance(position, str):
+        position = POSITION_NAMES.get(position.upper())
+    if position not in {1, 2, 3, 4}:
+        raise ValueError("Invalid player position.")
+    return position
+
+
+class PlayerNameIndex:
+    """Class indexing the normalised first, second and web names of the players of a snapshot by trigram."""
+
+    def __init__(
+        self,
+        elements: List[Dict[str, Any]],
+        registry: Optional[PlayerRegistry] = None,
+    ):
+        """Build the index of a snapshot.
+
+        :param elements: The "elements" of the static information from the FPL API.
+        :param registry: Registry of the same snapshot providing the Player instances, built from the elements if None.
+        """
+        if registry is None:
+            registry = PlayerRegistry(elements)
+        self.snapshot_id = registry.snapshot_id
+        self._players: List[Player] = []
+        self._full_names: List[str] = []
+        # each entry is a distinct normalised name of a player
+        self._entry_names: List[str] = []
+        self._entry_players: List[int] = []
+        self._entry_sizes: List[int] = []
+        self._postings: Dict[str, List[int]] = {}
+        # arrays of the postings and the size, club and position of each entry, built on the first resolve
+        self._posting_arrays: Optional[Dict[str, np.ndarray]] = None
+        self._entry_arrays: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+        for info in elements:
+            player_index = len(self._players)
+            self._players.append(registry[info["id"]])
+            first_name = info.get("first_name", "")
+            second_name = info.get("second_name", "")
+            full_name = "{} {}".format(first_name, second_name).strip()
+            self._full_names.append(full_name or info["web_name"])
+            names = {
+                normalise_name(name)
+                for name in [info["web_name"], first_name, second_name, full_name]
+            }
+            names.discard("")
+            for name in sorted(names):
+                entry = len(self._entry_names)
+                self._entry_names.append(name)
+                self._entry_players.append(player_index)
+                trigrams = _trigrams(name)
+                self._entry_sizes.append(len(trigrams))
+                for trigram in trigrams:
+                    self._postings.setdefault(trigram, []).append(entry)
+
+    def __len__(self) -> int:
+        """Return the number of players in the index."""
+        return len(self._players)
+
+    def _query_trigrams(self, query: str) -> Iterable[str]:
+        """Return the trigrams of a normalised query looked up in the inverted index."""
+        if len(query) > 1:
+            return _trigrams(query)
+        # a single letter has no trigram of its own, so match the names with a word starting with it
+        return [t for t in self._postings if t.startswith(" " + query)]
+
+    def _score_entries(
+        self, query: str, entries: Iterable[int], threshold: int
+    ) -> List[NameMatch]:
+        """Score shortlisted names against a normalised query with fuzzy matching.
+
+        :param query: The normalised query.
+        :param entries: The shortlisted names.
+        :param threshold: The minimum score for a match to be returned, from 0 to 100.
+
+        :return: The best match of each player above the threshold, ordered from the best to the worst score,
+                 ties ordered by unique ID.
+        """
+        scores: Dict[int, int] = {}
+        for entry in entries:
+            name = self._entry_names[entry]
+            if len(name) < len(query):
+                score = fuzz.ratio(query, name)
+            elif query in name:
+                # a substring always has a perfect partial match
+                score = 100
+            else:
+                score = fuzz.partial_ratio(query, name)
+            player_index = self._entry_players[entry]
+            if score >= threshold and score > scores.get(player_index, -1):
+                scores[player_index] = score
+
+        best = sorted(
+            scores.items(), key=lambda e: (-e[1], self._players[e[0]].element)
+        )
+        return [
+            NameMatch(self._players[i], self._full_names[i], score) for i, score in best
+        ]
+
+    def search(
+        self, query: str, limit: int = 10, threshold: int = 0, shortlist: int = 10
+    ) -> List[NameMatch]:
+        """Return the players whose names best match a query.
+        Names sharing the most trigrams with the query are shortlisted, shorter names first between equal counts,
+        then scored with fuzzy matching, and each player is scored by their best matching name.
+        Names at least as long as the query are scored by partial matching, so a prefix or part of a name scores 100,
+        and shorter names by full matching, so a short name does not score 100 against a longer query containing it.
+
+        :param query: The name to search for, e.g. part of a web name or a full name.
+        :param limit: Maximum number of players returned.
+        :param threshold: The minimum score for a match to be returned, from 0 to 100.
+        :param shortlist: Number of names scored with fuzzy matching.
+
+        :return: List of matches ordered from the best to the worst score, ties ordered by unique ID.
+        """
+        query = normalise_name(query)
+        if not query:
+            return []
+        overlaps = Counter()
+        for trigram in self._query_trigrams(query):
+            overlaps.update(self._postings.get(trigram, ()))
+        candidates = heapq.nlargest(
+            shortlist,
+            overlaps.items(),
+            key=lambda e: (e[1], -self._entry_sizes[e[0]], -e[0]),
+        )
+        return self._score_entries(query, (e for e, _ in candidates), threshold)[:limit]
+
+    def resolve(
+        self,
+        names: Sequence[str],
+        clubs: Optional[Sequence[Optional[int]]] = None,
+        positions: Optional[Sequence[Optional[Union[int, str]]]] = None,
+        threshold: int = 80,
+        shortlist: int = 10,
+    ) -> List[NameResolution]:
+        """Resolve many names to players at once, e.g. a list of candidates pasted from an article.
+        The trigram overlaps of every name with every indexed name are counted in one vectorized pass,
+        names outside the club or position hints are excluded, and only the shortlist of each name is fuzzy scored.
+        Repeated names with the same hints are resolved once.
+
+        :param names: The names to resolve.
+        :param clubs: Optional club id of each name, None where unknown.
+        :param positions: Optional position of each name as 1 to 4 or "GKP", "DEF", "MID", "FWD", None where unknown.
+        :param threshold: The minimum score for a match, from 0 to 100.
+        :param shortlist: Number of names scored with fuzzy matching for each name.
+
+        :return: A NameResolution for each name in order, with the best matching player, None if no player
+                 scores above the threshold, and the ambiguity of the match.
+
+        :raises ValueError: If the hints do not have one entry per name, or a position is invalid.
+        """
+        n_names = len(names)
+        clubs = [None] * n_names if clubs is None else list(clubs)
+        positions = [None] * n_names if positions is None else list(positions)
+        if len(clubs) != n_names or len(positions) != n_names:
+            raise ValueError("clubs and positions must have one entry per name.")
+        positions = [_parse_position(position) for position in positions]
+
+        # resolve each distinct normalised name and hints once
+        keys = [
+            (normalise_name(name), club, position)
+            for name, club, position in zip(names, clubs, positions)
+        ]
+        unique_keys = list(dict.fromkeys(key for key in keys if key[0]))
+        matches = dict(
+            zip(unique_keys, self._resolve_unique(unique_keys, threshold, shortlist))
+        )
+
+        resolutions = []
+        for name, key in zip(names, keys):
+            key_matches = matches.get(key, [])
+            if not key_matches:
+                resolutions.append(NameResolution(name, None, None, 0, 0.0, ()))
+                continue
+            best = key_matches[0]
+            ambiguity = (
+                key_matches[1].score / best.score if len(key_matches) > 1 else 0.0
+            )
+            resolutions.append(
+                NameResolution(
+                    name,
+                    best.player,
+                    best.full_name,
+                    best.score,
+                    ambiguity,
+                    tuple(key_matches[1:]),
+                )
+            )
+        return resolutions
+
+    def _resolve_unique(
+        self,
+        keys: List[Tuple[str, Optional[int], Optional[int]]],
+        threshold: int,
+        shortlist: int,
+    ) -> List[List[NameMatch]]:
+        """Return the matches of distinct normalised names and hints, counting trigram overlaps of all names at once."""
+        if not keys:
+            return []
+        n_entries = len(self._entry_names)
+        if self._posting_arrays is None:
+            self._posting_arrays = {
+                trigram: np.array(entries, dtype=np.int64)
+                for trigram, entries in self._postings.items()
+            }
+            players = [self._players[i] for i in self._entry_players]
+            self._entry_arrays = (
+                np.array(self._entry_sizes),
+                np.array([player.club for player in players]),
+                np.array([player.position for player in players]),
+            )
+        sizes, entry_clubs, entry_positions = self._entry_arrays
+
+        # overlaps of each name with each indexed name from one bincount over the postings of all trigrams
+        flat = [
+            self._posting_arrays[trigram] + row * n_entries
+            for row, (query, _, _) in enumerate(keys)
+            for trigram in self._query_trigrams(query)
+            if trigram in self._posting_arrays
+        ]
+        overlaps = np.bincount(
+            np.concatenate(flat) if flat else np.zeros(0, dtype=np.int64),
+            minlength=len(keys) * n_entries,
+        ).reshape(len(keys), n_entries)
+        for row, (_, club, position) in enumerate(keys):
+            if club is not None:
+                overlaps[row, entry_clubs != club] = 0
+            if position is not None:
+                overlaps[row, entry_positions != position] = 0
+
+        # most overlapping names first, shorter names first between equal overlaps
+        ranking = overlaps * (sizes.max() + 1) - sizes
+        shortlists = np.argsort(-ranking, axis=1, kind="stable")[:, :shortlist]
+        return [
+            self._score_entries(
+                query,
+                (int(e) for e in entries if overlaps[row, e] > 0),
+                threshold,
+            )
+            for row, ((query, _, _), entries) in enumerate(zip(keys, shortlists))
+        ]
@@ -0,0 +1,115 @@
+"""
+This module defines the PlayerRegistry class, which builds a Player for every element of a snapshot of the FPL static information once
+and hands out the same instance every time a player is asked for.
+The registry of the current static information is available from Loader.get_player_registry.
+Each player of a registry has a dense integer index, from 0 to the number of players minus 1,
+so algorithms can keep per-player data in arrays rather than dictionaries.
+
+Available functions:
+- get: Return the player with the given unique ID, optionally with a different cost such as a selling price.
+- __getitem__: Return the player with the given unique ID.
+- __contains__: Check if a unique ID belongs to a player of the registry.
+- __len__: Return the number of players in the registry.
+- __iter__: Iterate over the players in the order of their index.
+- by_index: Return the player with the given dense index.
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from fpl.player import Player
+
+
+class PlayerRegistry:
+    """Class holding one shared Player instance per element of a snapshot of the FPL static information."""
+
+    def __init__(
+        self, elements: List[Dict[str, Any]], snapshot_id: Optional[str] = None
+    ):
+        """Build the players of a snapshot.
+
+        :param elements: The "elements" of the static information from the FPL API.
+        :param snapshot_id: Identifier of the snapshot, defaults to a digest of the players' ids, positions, clubs and costs.
+        """
+        self._players: List[Player] = []
+        self._by_element: Dict[int, Player] = {}
+        self._by_element_and_cost: Dict[Tuple[int, int], Player] = {}
+        for index, info in enumerate(sorted(elements, key=lambda info: info["id"])):
+            player = Player(
+                element=info["id"],
+                name=info["web_name"],
+                position=info["element_type"],
+                club=info["team"],
+                cost=info["now_cost"],
+            )
+            object.__setattr__(player, "_index", index)
+            self._players.append(player)
+            self._by_element[player.element] = player
+
+        if snapshot_id is None:
+            signature = [(p.element, p.position, p.club, p.cost) for p in self._players]
+            snapshot_id = hashlib.sha1(json.dumps(signature).encode()).hexdigest()
+        self.snapshot_id = snapshot_id
+
+    def get(self, element: int, cost: Optional[int] = None) -> Player:
+        """Return the player with the given unique ID, optionally with a different cost such as a selling price.
+        Players with a different cost are also built once and share the index of the registered player.
+
+        :param element: The unique ID of the player.
+        :param cost: Cost of the player if it differs from the current cost, e.g. the selling price of a player you own.
+
+        :return: The shared Player instance.
+
+        :raises KeyError: If the element is not found.
+        """
+        player = self[element]
+        if cost is None or cost == player.cost:
+            return player
+        key = (element, cost)
+        if key not in self._by_element_and_cost:
+            priced_player = Player(
+                player.element, player.name, player.position, player.club, cost
+            )
+            object.__setattr__(priced_player, "_index", player.index)
+            self._by_element_and_cost[key] = priced_player
+        return self._by_element_and_cost[key]
+
+    def __getitem__(self, element: int) -> Player:
+        """Return the player with the given unique ID.
+
+        :param element: The unique ID of the player.
+
+        :return: The shared Player instance.
+
+        :raises KeyError: If the element is not found.
+        """
+        try:
+            return self._by_element[element]
+        except KeyError:
+            raise KeyError("Player id {} not found in registry".format(element))
+
+    def __contains__(self, element: int) -> bool:
+        """Check if a unique ID belongs to a player of the registry.
+
+        :param element: The unique ID of the player.
+
+        :return: True if the player is in the registry, False otherwise.
+        """
+        return element in self._by_element
+
+    def __len__(self) -> int:
+        """Return the number of players in the registry."""
+        return len(self._players)
+
+    def __iter__(self) -> Iterator[Player]:
+        """Iterate over the players in the order of their index."""
+        return iter(self._players)
+
+    def by_index(self, index: int) -> Player:
+        """Return the player with the given dense index.
+
+        :param index: Index of the player, from 0 to the number of players minus 1.
+
+        :return: The shared Player instance.
+        """
+        return self._players[index]
@@ -0,0 +1,203 @@
+"""
+This module defines the RequestScheduler class, which every query of the Loader to the FPL API goes through.
+Requests are let through by a token bucket, so bursts are served immediately while the sustained rate stays under a limit,
+and waiting requests are served by priority: interactive requests, such as fetching your team, before normal requests,
+and normal requests before bulk requests, such as prefetching the data of every player.
+When the API answers 429 Too Many Requests, every request is paused for the Retry-After delay or an exponential backoff,
+the rate is halved and the request is retried. The rate then recovers gradually with each successful request.
+
+Available classes:
+- SchedulerStats: Number of requests and queueing delays by priority of a RequestScheduler.
+- RequestScheduler: Class scheduling the requests to the FPL API.
+
+Available functions of RequestScheduler:
+- priority: Context manager setting the priority of the requests made by the current thread.
+- acquire: Wait until a request may be sent and return the time waited.
+- request: Send a request when the scheduler allows it, retrying it when rate limited.
+- stats: Return the number of requests and the queueing delays by priority.
+- reset_stats: Reset the number of requests and the queueing delays.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, NamedTuple, Optional, Tuple
+
+INTERACTIVE = 0
+NORMAL = 1
+BULK = 2
+PRIORITIES = ("interactive", "normal", "bulk")
+
+TOO_MANY_REQUESTS = 429
+
+
+class SchedulerStats(NamedTuple):
+    """Number of requests and queueing delays by priority of a RequestScheduler, each tuple indexed by priority."""
+
+    requests: Tuple[int, ...]
+    total_queue_delay_s: Tuple[float, ...]
+    max_queue_delay_s: Tuple[float, ...]
+    throttled: int
+    rate: float
+
+    def mean_queue_delay_s(self, priority: int) -> float:
+        """Mean seconds a request of a priority waited before being sent."""
+        count = self.requests[priority]
+        return self.total_queue_delay_s[priority] / count if count else 0.0
+
+
+class RequestScheduler:
+    """Class scheduling the requests to the FPL API with a token bucket, priorities and adaptive backoff."""
+
+    def __init__(
+        self,
+        rate: float = 10.0,
+        burst: int = 20,
+        max_retries: int = 4,
+        backoff_s: float = 1.0,
+        max_backoff_s: float = 60.0,
+    ):
+        """Build a scheduler with a full bucket.
+
+        :param rate: Maximum sustained number of requests per second.
+        :param burst: Number of requests that can be sent at once after a quiet period.
+        :param max_retries: Number of times a rate limited request is retried before its 429 response is returned.
+        :param backoff_s: Pause after the first 429 response without a Retry-After header, doubled for each retry.
+        :param max_backoff_s: Maximum pause after a 429 response.
+
+        :raises ValueError: If the rate or the burst is not positive.
+        """
+        if rate <= 0 or burst < 1:
+            raise ValueError("The rate and the burst must be positive.")
+        self.max_rate = rate
+        self.burst = burst
+        self.max_retries = max_retries
+        self.backoff_s = backoff_s
+        self.max_backoff_s = max_backoff_s
+        self._rate = rate
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._condition = threading.Condition()
+        # heap of the (priority, sequence number) of the waiting requests
+        self._waiting = []
+        self._sequence = itertools.count()
+        self._local = threading.local()
+        self.reset_stats()
+
+    @contextmanager
+    def priority(self, priority: int) -> Iterator[None]:
+        """Context manager setting the priority of the requests made by the current thread, e.g. BULK for a prefetch.
+
+        :param priority: INTERACTIVE, NORMAL or BULK.
+        """
+        previous = getattr(self._local, "priority", NORMAL)
+        self._local.priority = priority
+        try:
+            yield
+        finally:
+            self._local.priority = previous
+
+    def _refill(self, now: float):
+        """Add the tokens earned since the last refill, none while paused."""
+        if now > self._paused_until:
+            elapsed = now - max(self._updated, self._paused_until)
+            self._tokens = min(self.burst, self._tokens + elapsed * self._rate)
+        self._updated = now
+
+    def acquire(self, priority: Optional[int] = None) -> float:
+        """Wait until a request may be sent, after every waiting request of a higher priority.
+
+        :param priority: INTERACTIVE, NORMAL or BULK, defaults to the priority of the current thread.
+
+        :return: Seconds waited.
+        """
+        if priority is None:
+            priority = getattr(self._local, "priority", NORMAL)
+        start = time.monotonic()
+        ticket = (priority, next(self._sequence))
+        with self._condition:
+            heapq.heappush(self._waiting, ticket)
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                timeout = None
+                if self._waiting[0] == ticket:
+                    timeout = max(
+                        self._paused_until - now, (1 - self._tokens) / self._rate
+                    )
+                    if timeout <= 0:
+                        heapq.heappop(self._waiting)
+                        self._tokens -= 1
+                        break
+                self._condition.wait(timeout)
+            delay = now - start
+            self._requests[priority] += 1
+            self._total_delay[priority] += delay
+            self._max_delay[priority] = max(self._max_delay[priority], delay)
+            # the next waiting request is now at the head of the queue
+            self._condition.notify_all()
+        return delay
+
+    def request(self, send: Callable[[], Any], priority: Optional[int] = None) -> Any:
+        """Send a request when the scheduler allows it, retrying it when rate limited.
+
+        :param send: Function sending the request and returning a response with a status_code, e.g. lambda: requests.get(url).
+        :param priority: INTERACTIVE, NORMAL or BULK, defaults to the priority of the current thread.
+
+        :return: The response, a 429 response once the retries are exhausted.
+        """
+        for attempt in range(self.max_retries + 1):
+            self.acquire(priority)
+            response = send()
+            if getattr(response, "status_code", None) != TOO_MANY_REQUESTS:
+                self._recover()
+                return response
+            if attempt < self.max_retries:
+                self._throttle(response, attempt)
+        return response
+
+    def _throttle(self, response: Any, attempt: int):
+        """Pause every request and halve the rate after a 429 response."""
+        try:
+            pause = float(response.headers.get("Retry-After"))
+        except (AttributeError, TypeError, ValueError):
+            pause = self.backoff_s * 2**attempt
+        pause = min(pause, self.max_backoff_s)
+        with self._condition:
+            now = time.monotonic()
+            self._refill(now)
+            self._paused_until = max(self._paused_until, now + pause)
+            self._tokens = 0.0
+            self._rate = max(self._rate / 2, self.max_rate / 64)
+            self._throttled += 1
+            self._condition.notify_all()
+
+    def _recover(self):
+        """Increase the rate back towards the maximum rate after a successful request."""
+        if self._rate < self.max_rate:
+            with self._condition:
+                self._rate = min(self.max_rate, self._rate + self.max_rate / 16)
+
+    def stats(self) -> SchedulerStats:
+        """Return the number of requests and the queueing delays by priority.
+
+        :return: SchedulerStats since the scheduler was built or the stats were reset.
+        """
+        with self._condition:
+            return SchedulerStats(
+                requests=tuple(self._requests),
+                total_queue_delay_s=tuple(self._total_delay),
+                max_queue_delay_s=tuple(self._max_delay),
+                throttled=self._throttled,
+                rate=self._rate,
+            )
+
+    def reset_stats(self):
+        """Reset the number of requests and the queueing delays."""
+        self._requests = [0] * len(PRIORITIES)
+        self._total_delay = [0.0] * len(PRIORITIES)
+        self._max_delay = [0.0] * len(PRIORITIES)
+        self._throttled = 0
@@ -0,0 +1,478 @@
+"""
+This module provides a local HTTP service running optimizations in a pool of worker processes, run with python -m fpl serve.
+Each worker process keeps the static information and the expected points it has calculated between jobs,
+so only the first job of a snapshot pays for loading the data and querying the expected points calculator.
+Identical requests submitted while a job is in flight are coalesced into that job.
+Every job has a deadline after which its search stops with the best teams found so far, and jobs can be cancelled.
+
+Endpoints:
+- POST /jobs: Submit an optimization job, see OptimizationService.submit for the request.
+- GET /jobs/<job_id>: Return the status and results of a job, waiting up to ?wait=<seconds> for it to finish.
+- DELETE /jobs/<job_id>: Cancel a job.
+- GET /health: Return the number of workers and of jobs in flight.
+
+Available classes:
+- Job: An optimization job and its status.
+- ServiceBusy: Raised when too many jobs are in flight to accept another one.
+- OptimizationService: Runs optimization jobs in a pool of worker processes.
+
+Available functions:
+- make_server: Return an HTTP server exposing an OptimizationService.
+"""
+
+import json
+import logging
+import multiprocessing
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+from fpl import (
+    ExpectedPointsCalculator,
+    Loader,
+    Optimizer,
+    ResultsCodec,
+    TeamCodec,
+    resolve_candidates,
+)
+from fpl.loader import API_URL
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CALCULATOR = "fpl:SimpleExpectedPointsCalculator"
+# keyword arguments of Optimizer.iter_optimal_teams accepted in a request, with their types and defaults
+OPTIONS = {
+    "gameweek": (int, None),
+    "horizon": (int, 3),
+    "max_transfers": (int, 1),
+    "gamma": (float, 1.0),
+    "wildcard": (bool, False),
+    "k": (int, 3),
+    "beam_width": (int, None),
+    "rank_by": (str, "score"),
+    "node_budget": (int, None),
+}
+FINISHED = {"done", "timed_out", "cancelled", "failed"}
+
+
+@dataclass
+class Job:
+    """An optimization job and its status.
+
+    job_id: Unique id of the job.
+    key: The canonical request of the job, identical requests having the same key.
+    deadline: Wall time (as returned by time.time) after which the search stops.
+    slot: Index of the cancellation flag of the job shared with the workers.
+    status: One of pending, running, done, timed_out (finished with the best teams found before the deadline),
+            cancelled or failed.
+    result: The results encoded by ResultsCodec, with the transfers of each team and the number of teams explored.
+    error: The error of a failed job.
+    """
+
+    job_id: str
+    key: str
+    deadline: float
+    slot: int
+    submitted_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+    status: str = "pending"
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    future: Optional[Future] = field(default=None, repr=False, compare=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the job as a JSON-safe dictionary.
+
+        :return: Dictionary with the id, status, times, and the result or error of the job once finished.
+        """
+        data = {
+            "job_id": self.job_id,
+            "status": self.status,
+            "submitted_at": self.submitted_at,
+            "deadline": self.deadline,
+            "finished_at": self.finished_at,
+        }
+        if self.result is not None:
+            data["result"] = self.result
+        if self.error is not None:
+            data["error"] = self.error
+        return data
+
+
+class ServiceBusy(Exception):
+    """Raised when too many jobs are in flight to accept another one."""
+
+
+class _ResidentCalculator(ExpectedPointsCalculator):
+    """Expected points calculator memoizing another calculator for the lifetime of a worker process."""
+
+    def __init__(self, epc: ExpectedPointsCalculator):
+        self.epc = epc
+        self.snapshot_id: Optional[str] = None
+        self.exp_points: Dict[Tuple[int, int], float] = {}
+
+    def get_expected_points(self, player_id: int, gameweek: int) -> float:
+        key = (player_id, gameweek)
+        if key not in self.exp_points:
+            self.exp_points[key] = self.epc.get_expected_points(player_id, gameweek)
+        return self.exp_points[key]
+
+
+# state of a worker process: its calculator and the cancellation flags shared with the service
+_worker: Dict[str, Any] = {}
+
+
+def _init_worker(
+    api_url: str,
+    cache_dir: Optional[str],
+    offline: bool,
+    slim_static: bool,
+    epc: str,
+    cancel_flags,
+):
+    """Configure a worker process and load the static information it keeps between jobs."""
+    from fpl.cli import load_calculator
+
+    calculator = load_calculator(epc)
+    Loader.configure_api(api_url)
+    Loader.configure_cache(cache_dir, offline)
+    Loader.configure_static_info(
+        slim_static, getattr(calculator, "static_fields", None)
+    )
+    _worker["epc"] = _ResidentCalculator(calculator)
+    _worker["cancel_flags"] = cancel_flags
+    try:
+        Loader.get_player_registry()
+    except (OSError, ValueError):
+        # the first job loads the static information again and reports the error
+        pass
+
+
+def _run_job(request: Dict[str, Any], deadline: float, slot: int) -> Dict[str, Any]:
+    """Run the search of a job in a worker process until it finishes, is cancelled or reaches its deadline.
+
+    :return: Dictionary with the status of the job and its encoded results.
+    """
+    cancel_flags = _worker["cancel_flags"]
+    epc = _worker["epc"]
+    registry = Loader.get_player_registry()
+    if epc.snapshot_id != registry.snapshot_id:
+        epc.exp_points.clear()
+        epc.snapshot_id = registry.snapshot_id
+    team = TeamCodec.from_dict(request["team"], registry)
+    candidates = [registry[element] for element in request["candidates"]]
+
+    progress = None
+    if not cancel_flags[slot] and time.time() < deadline:
+        for progress in Optimizer.iter_optimal_teams(
+            team,
+            candidates,
+            epc,
+            time_budget_s=max(deadline - time.time(), 0),
+            stop=lambda: cancel_flags[slot] != 0,
+            **request["options"],
+        ):
+            pass
+    if cancel_flags[slot]:
+        status = "cancelled"
+    elif progress is None or time.time() >= deadline:
+        status = "timed_out"
+    else:
+        status = "done"
+    if progress is None:
+        return {"status": status, "result": None}
+    result = ResultsCodec.to_dict(progress.results, registry.snapshot_id, team)
+    result["nodes_explored"] = progress.nodes_explored
+    return {"status": status, "result": result}
+
+
+class OptimizationService:
+    """Runs optimization jobs in a pool of worker processes, coalescing identical jobs in flight."""
+
+    def __init__(
+        self,
+        epc: str = DEFAULT_CALCULATOR,
+        workers: int = 2,
+        job_timeout_s: float = 60.0,
+        max_jobs_in_flight: int = 256,
+        max_finished_jobs: int = 1024,
+        api_url: str = API_URL,
+        cache_dir: Optional[str] = None,
+        offline: bool = False,
+        slim_static: bool = False,
+    ):
+        """Start the pool of worker processes.
+
+        :param epc: Expected points calculator of the workers as a "module:attribute" specification.
+        :param workers: Number of worker processes.
+        :param job_timeout_s: Default and maximum seconds from the submission of a job to its deadline.
+        :param max_jobs_in_flight: Number of pending and running jobs after which new jobs are refused.
+        :param max_finished_jobs: Number of finished jobs kept to be queried, the oldest being forgotten first.
+        :param api_url: The base URL of the FPL API, e.g. of a local stand-in.
+        :param cache_dir: Directory of the disk cache of API responses shared by the service and the workers.
+        :param offline: Whether to only read API responses from the disk cache.
+        :param slim_static: Whether the service and the workers keep a slim projection of the static information,
+                            with the static_fields of the calculator, see Loader.configure_static_info.
+
+        :raises ValueError: If offline without a cache directory.
+        """
+        Loader.configure_api(api_url)
+        Loader.configure_cache(cache_dir, offline)
+        Loader.configure_static_info(slim_static)
+        self.workers = workers
+        self.job_timeout_s = job_timeout_s
+        self.max_finished_jobs = max_finished_jobs
+        self._jobs: Dict[str, Job] = {}
+        self._in_flight: Dict[str, Job] = {}
+        self._finished: List[str] = []
+        self._free_slots = list(range(max_jobs_in_flight))
+        self._lock = threading.Lock()
+        self._finished_condition = threading.Condition(self._lock)
+        self._cancel_flags = multiprocessing.RawArray("b", max_jobs_in_flight)
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(
+                api_url,
+                cache_dir,
+                offline,
+                slim_static,
+                epc,
+                self._cancel_flags,
+            ),
+        )
+
+    def _canonical_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Return a request with the team encoded against the registry, the candidates as element ids and every option.
+
+        :raises ValueError: If the request is invalid.
+        """
+        if not isinstance(request, dict):
+            raise ValueError("The request must be a JSON object.")
+        unknown = set(request) - set(OPTIONS) - {"team", "candidates", "timeout_s"}
+        if unknown:
+            raise ValueError("Unknown fields: {}.".format(", ".join(sorted(unknown))))
+        try:
+            team = Loader.parse_my_team(request["team"])
+            candidates = resolve_candidates(request["candidates"])
+        except KeyError as e:
+            raise ValueError("Invalid team or candidates: {}".format(e))
+        options = {}
+        for name, (option_type, default) in OPTIONS.items():
+            value = request.get(name, default)
+            # bool is a subclass of int, so true and false are not numbers here
+            if value is not None and (
+                not isinstance(value, option_type)
+                or (option_type is not bool and isinstance(value, bool))
+            ):
+                if option_type is float and type(value) is int:
+                    value = float(value)
+                else:
+                    raise ValueError(
+                        "{} must be of type {}.".format(name, option_type.__name__)
+                    )
+            options[name] = value
+        if options["gameweek"] is None:
+            options["gameweek"] = Loader.get_next_gameweek()
+        registry = Loader.get_player_registry()
+        return {
+            "team": TeamCodec.to_dict(team, registry.snapshot_id),
+            "candidates": [candidate.element for candidate in candidates],
+            "options": options,
+        }
+
+    def submit(self, request: Dict[str, Any]) -> Tuple[Job, bool]:
+        """Submit an optimization job, or join the identical job in flight.
+
+        :param request: Dictionary with the team as returned by the my-team endpoint (like resources/my_team.json),
+                        the candidates as element ids or player names, optionally the timeout_s of the job,
+                        and optionally the keyword arguments of Optimizer.iter_optimal_teams in OPTIONS.
+                        The gameweek defaults to the next gameweek.
+
+        :return: The job and whether it was coalesced with an identical job in flight.
+
+        :raises ValueError: If the request is invalid.
+        :raises ServiceBusy: If too many jobs are in flight.
+        """
+        canonical = self._canonical_request(request)
+        timeout_s = request.get("timeout_s", self.job_timeout_s)
+        if (
+            not isinstance(timeout_s, (int, float))
+            or isinstance(timeout_s, bool)
+            or timeout_s <= 0
+        ):
+            raise ValueError("timeout_s must be a positive number.")
+        timeout_s = min(timeout_s, self.job_timeout_s)
+        key = json.dumps({**canonical, "timeout_s": timeout_s}, sort_keys=True)
+
+        with self._lock:
+            job = self._in_flight.get(key)
+            if job is not None:
+                return job, True
+            if not self._free_slots:
+                raise ServiceBusy("Too many jobs in flight.")
+            slot = self._free_slots.pop()
+            self._cancel_flags[slot] = 0
+            job = Job(uuid.uuid4().hex, key, time.time() + timeout_s, slot)
+            self._jobs[job.job_id] = job
+            self._in_flight[key] = job
+            job.future = self._executor.submit(_run_job, canonical, job.deadline, slot)
+        job.future.add_done_callback(lambda future: self._finish(job, future))
+        return job, False
+
+    def _finish(self, job: Job, future: Future):
+        """Record the outcome of a job once its future is done and release its slot."""
+        with self._lock:
+            if future.cancelled():
+                job.status = "cancelled"
+            elif future.exception() is not None:
+                error = future.exception()
+                job.status = "failed"
+                job.error = "{}: {}".format(type(error).__name__, error)
+            else:
+                outcome = future.result()
+                job.status = outcome["status"]
+                job.result = outcome["result"]
+            job.finished_at = time.time()
+            # a cancelled job has already made way for an identical job
+            if self._in_flight.get(job.key) is job:
+                self._in_flight.pop(job.key, None)
+            self._free_slots.append(job.slot)
+            self._finished.append(job.job_id)
+            while len(self._finished) > self.max_finished_jobs:
+                self._jobs.pop(self._finished.pop(0), None)
+            self._finished_condition.notify_all()
+
+    def get(self, job_id: str, wait_s: float = 0) -> Optional[Job]:
+        """Return a job, waiting for it to finish.
+
+        :param job_id: The id of the job.
+        :param wait_s: Maximum seconds to wait for the job to finish.
+
+        :return: The job, None if there is no such job or it has been forgotten.
+        """
+        end = time.time() + wait_s
+        with self._lock:
+            job = self._jobs.get(job_id)
+            while job is not None and job.status not in FINISHED:
+                remaining = end - time.time()
+                if remaining <= 0:
+                    break
+                self._finished_condition.wait(remaining)
+            if job is not None and job.status == "pending" and job.future.running():
+                job.status = "running"
+            return job
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """Cancel a job, including for the requests coalesced into it.
+        A pending job is cancelled at once, a running job stops at the next team it explores.
+        Identical requests submitted after the cancellation start a new job.
+
+        :param job_id: The id of the job.
+
+        :return: The job, None if there is no such job or it has been forgotten.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status in FINISHED:
+                return job
+            self._cancel_flags[job.slot] = 1
+            if self._in_flight.get(job.key) is job:
+                del self._in_flight[job.key]
+        job.future.cancel()
+        return job
+
+    def health(self) -> Dict[str, Any]:
+        """Return the number of workers and of jobs in flight."""
+        with self._lock:
+            return {
+                "status": "ok",
+                "workers": self.workers,
+                "jobs_in_flight": len(self._in_flight),
+            }
+
+    def close(self):
+        """Cancel every job in flight and stop the worker processes."""
+        with self._lock:
+            jobs = list(self._in_flight.values())
+        for job in jobs:
+            self.cancel(job.job_id)
+        self._executor.shutdown(wait=True)
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """Handler of the HTTP requests to the endpoints of an OptimizationService."""
+
+    server: "ThreadingHTTPServer"
+
+    def _send_json(self, status: int, data: Dict[str, Any]):
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _job_id(self) -> Optional[str]:
+        parts = urlsplit(self.path).path.strip("/").split("/")
+        return parts[1] if len(parts) == 2 and parts[0] == "jobs" else None
+
+    def do_POST(self):
+        service = self.server.service
+        if urlsplit(self.path).path.rstrip("/") != "/jobs":
+            return self._send_json(404, {"error": "Not found."})
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            job, coalesced = service.submit(json.loads(self.rfile.read(length)))
+        except ServiceBusy as e:
+            return self._send_json(503, {"error": str(e)})
+        except (ValueError, KeyError) as e:
+            return self._send_json(400, {"error": str(e)})
+        except OSError as e:
+            # the FPL API or the disk cache could not be read
+            return self._send_json(502, {"error": str(e)})
+        self._send_json(202, {**job.to_dict(), "coalesced": coalesced})
+
+    def do_GET(self):
+        service = self.server.service
+        if urlsplit(self.path).path.rstrip("/") == "/health":
+            return self._send_json(200, service.health())
+        job_id = self._job_id()
+        try:
+            wait_s = float(parse_qs(urlsplit(self.path).query).get("wait", [0])[0])
+        except ValueError:
+            return self._send_json(400, {"error": "wait must be a number."})
+        job = None if job_id is None else service.get(job_id, wait_s)
+        if job is None:
+            return self._send_json(404, {"error": "Not found."})
+        self._send_json(200, job.to_dict())
+
+    def do_DELETE(self):
+        job_id = self._job_id()
+        job = None if job_id is None else self.server.service.cancel(job_id)
+        if job is None:
+            return self._send_json(404, {"error": "Not found."})
+        self._send_json(200, job.to_dict())
+
+    def log_message(self, format: str, *args):
+        logger.info("%s - %s", self.address_string(), format % args)
+
+
+def make_server(
+    service: OptimizationService, host: str = "127.0.0.1", port: int = 8000
+) -> ThreadingHTTPServer:
+    """Return an HTTP server exposing an OptimizationService, to be run with serve_forever.
+
+    :param service: The service answering the requests.
+    :param host: The host to listen on.
+    :param port: The port to listen on, 0 for any free port.
+
+    :return: ThreadingHTTPServer handling each request in a thread, with the service as its service attribute.
+    """
+    server = ThreadingHTTPServer((host, port), _RequestHandler)
+    server.service = service
+    return server
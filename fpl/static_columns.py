@@ -0,0 +1,197 @@
+"""
+This module defines a slim projection of the static information of the FPL API (the bootstrap-static endpoint).
+The raw static information holds around 90 fields for each of the 700 or so players, plus the clubs, the gameweeks and more,
+as Python dictionaries kept by every process. The projection keeps only the fields the package and its calculators read,
+stores the players, clubs and gameweeks as typed numpy columns with interned strings, and discards the raw dictionaries.
+Rows are read through dictionary-like views, so code written against the raw static information works unchanged.
+See Loader.configure_static_info to make Loader.get_static_info return the projection.
+
+Available classes:
+- RowView: Read-only dictionary-like view of one row of a ColumnTable.
+- ColumnTable: Read-only sequence of records stored as typed columns.
+- SlimStaticInfo: Read-only dictionary-like projection of the static information.
+"""
+
+import sys
+from collections.abc import Mapping, Sequence
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+import numpy as np
+
+# the fields kept by section, None to keep a section as it is
+DEFAULT_FIELDS: Dict[str, Optional[Tuple[str, ...]]] = {
+    "elements": (
+        "id",
+        "web_name",
+        "first_name",
+        "second_name",
+        "element_type",
+        "team",
+        "now_cost",
+        "points_per_game",
+        "form",
+        "total_points",
+        "minutes",
+        "status",
+        "chance_of_playing_next_round",
+    ),
+    "teams": (
+        "id",
+        "name",
+        "short_name",
+        "strength",
+        "strength_overall_home",
+        "strength_overall_away",
+        "strength_attack_home",
+        "strength_attack_away",
+        "strength_defence_home",
+        "strength_defence_away",
+    ),
+    "events": (
+        "id",
+        "name",
+        "deadline_time",
+        "finished",
+        "is_current",
+        "is_next",
+    ),
+    "element_types": None,
+}
+
+_INT32 = np.iinfo(np.int32)
+
+
+def _to_column(values: List[Any]) -> np.ndarray:
+    """Return the values of a field as the most compact of a bool, int32, int64, float64 or object array."""
+    types = {type(value) for value in values}
+    if types <= {bool}:
+        return np.array(values, dtype=bool)
+    if types <= {int}:
+        in_range = all(_INT32.min <= value <= _INT32.max for value in values)
+        return np.array(values, dtype=np.int32 if in_range else np.int64)
+    if types <= {int, float}:
+        return np.array(values, dtype=np.float64)
+    column = np.empty(len(values), dtype=object)
+    column[:] = [sys.intern(value) if type(value) is str else value for value in values]
+    return column
+
+
+class RowView(Mapping):
+    """Read-only dictionary-like view of one row of a ColumnTable, returning Python values."""
+
+    __slots__ = ("_table", "_row")
+
+    def __init__(self, table: "ColumnTable", row: int):
+        self._table = table
+        self._row = row
+
+    def __getitem__(self, field: str) -> Any:
+        value = self._table._columns[field][self._row]
+        return value.item() if isinstance(value, np.generic) else value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._table._columns)
+
+    def __len__(self) -> int:
+        return len(self._table._columns)
+
+    def __repr__(self) -> str:
+        return "RowView({!r})".format(dict(self))
+
+
+class ColumnTable(Sequence):
+    """Read-only sequence of records, e.g. the players of the static information, stored as one typed column per field."""
+
+    def __init__(self, records: List[Dict[str, Any]], fields: Iterable[str]):
+        """Build the columns of the fields present in the records.
+
+        :param records: List of dictionaries, e.g. the "elements" of the static information.
+        :param fields: Fields to keep. Fields missing from every record are skipped, fields missing from some records are None there.
+        """
+        self._columns: Dict[str, np.ndarray] = {}
+        for field in fields:
+            if any(field in record for record in records):
+                column = _to_column([record.get(field) for record in records])
+                column.flags.writeable = False
+                self._columns[field] = column
+        self._rows: Dict[Any, int] = {}
+        if "id" in self._columns:
+            self._rows = {
+                row_id: row for row, row_id in enumerate(self._columns["id"].tolist())
+            }
+        self._length = len(records)
+
+    @property
+    def fields(self) -> List[str]:
+        """The fields of the table."""
+        return list(self._columns)
+
+    def column(self, field: str) -> np.ndarray:
+        """Return the read-only column of a field.
+
+        :param field: Name of the field, e.g. "now_cost".
+
+        :return: Array with one value per row.
+
+        :raises KeyError: If the field is not in the table.
+        """
+        return self._columns[field]
+
+    def find(self, row_id: Any) -> RowView:
+        """Return the row with the given id, without a linear search.
+
+        :param row_id: Value of the "id" field.
+
+        :return: RowView of the row.
+
+        :raises KeyError: If no row has the id.
+        """
+        return RowView(self, self._rows[row_id])
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [RowView(self, row) for row in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("ColumnTable index out of range")
+        return RowView(self, index)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def nbytes(self) -> int:
+        """Return the number of bytes of the columns, not counting the strings referenced by object columns."""
+        return sum(column.nbytes for column in self._columns.values())
+
+
+class SlimStaticInfo(Mapping):
+    """Read-only dictionary-like projection of the static information keeping only some sections and fields."""
+
+    def __init__(
+        self,
+        static_info: Dict[str, Any],
+        fields: Optional[Dict[str, Optional[Iterable[str]]]] = None,
+    ):
+        """Project the static information. Sections missing from the fields are discarded.
+
+        :param static_info: The static information from the FPL API.
+        :param fields: Fields kept by section, None to keep a section as it is, defaults to DEFAULT_FIELDS.
+        """
+        fields = DEFAULT_FIELDS if fields is None else fields
+        self._sections: Dict[str, Any] = {}
+        for section, section_fields in fields.items():
+            if section not in static_info:
+                continue
+            value = static_info[section]
+            if section_fields is not None and isinstance(value, list):
+                value = ColumnTable(value, section_fields)
+            self._sections[section] = value
+
+    def __getitem__(self, section: str) -> Any:
+        return self._sections[section]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._sections)
+
+    def __len__(self) -> int:
+        return len(self._sections)
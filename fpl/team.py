@@ -5,7 +5,9 @@ It also provides methods for comparing teams, checking team feasibility, and tra
 
 Available functions:
 - __post_init__: Validates the types of the attributes after the object is initialized.
+- _from_validated: Creates a team without validating its attributes, for teams derived from validated ones.
 - __eq__: Checks if two teams are equal based on their attributes.
+- __hash__: Returns the hash of the team, computed once.
 - __lt__: Compares two teams based on their money in the bank and free transfers.
 - __str__: Returns a string representation of the team.
 - is_feasible: Checks if the team is feasible based on FPL rules.
@@ -14,10 +16,11 @@ Available functions:
 
 from collections import defaultdict
 from typing import FrozenSet
-from dataclasses import dataclass, replace
+from dataclasses import dataclass
 from functools import total_ordering
 from fpl.player import Player
 
+
 @total_ordering
 @dataclass(frozen=True)
 class Team:
@@ -30,7 +33,7 @@ class Team:
 
     def __post_init__(self):
         """Validate the types of the attributes after the object is initialized.
-        
+
         :raises TypeError: If any of the attributes are not of the expected type.
         """
         if not isinstance(self.money_in_bank, int):
@@ -54,14 +57,49 @@ class Team:
         ):
             raise TypeError("fwds must be a FrozenSet of Player instances")
 
+    @classmethod
+    def _from_validated(
+        cls,
+        money_in_bank: int,
+        free_transfers: int,
+        gkps: FrozenSet[Player],
+        defs: FrozenSet[Player],
+        mids: FrozenSet[Player],
+        fwds: FrozenSet[Player],
+    ) -> "Team":
+        """Create a team without validating the types of its attributes.
+        Only to be used for teams derived from already validated ones, e.g. by a transfer.
+
+        :param money_in_bank: Money in the bank.
+        :param free_transfers: Number of free transfers.
+        :param gkps: FrozenSet of the goalkeepers.
+        :param defs: FrozenSet of the defenders.
+        :param mids: FrozenSet of the midfielders.
+        :param fwds: FrozenSet of the forwards.
+
+        :return: A Team instance with the specified attributes.
+        """
+        team = object.__new__(cls)
+        team.__dict__.update(
+            money_in_bank=money_in_bank,
+            free_transfers=free_transfers,
+            gkps=gkps,
+            defs=defs,
+            mids=mids,
+            fwds=fwds,
+        )
+        return team
+
     def __eq__(self, other: "Team") -> bool:
         """Check if two teams are equal based on their sets of players, money in bank, and free transfers.
         Teams are equal when their sets of players, money in bank, free transfers are equal.
-        
+
         :param other: Another Team instance to compare with.
 
         :return: True if the teams have the same sets of players, money in bank, and free transfers, False otherwise.
         """
+        if self is other:
+            return True
         if self.gkps != other.gkps:
             return False
         if self.defs != other.defs:
@@ -74,14 +112,34 @@ class Team:
             self.free_transfers == other.free_transfers
         )
 
+    def __hash__(self) -> int:
+        """Return the hash of the team, computed once as teams are immutable.
+
+        :return: The hash of the sets of players, money in bank, and free transfers.
+        """
+        team_hash = self.__dict__.get("_hash")
+        if team_hash is None:
+            team_hash = hash(
+                (
+                    self.money_in_bank,
+                    self.free_transfers,
+                    self.gkps,
+                    self.defs,
+                    self.mids,
+                    self.fwds,
+                )
+            )
+            self.__dict__["_hash"] = team_hash
+        return team_hash
+
     def __lt__(self, other: "Team") -> bool:
         """Compare two teams based on their money in the bank and free transfers.
         One team is worse than the the other when its money in the bank is less than the other.
         If the money in the bank is equal, then it goes to free transfers.
-        
+
         :param other: Another Team instance to compare with.
 
-        :return: True if this team's money in the bank is less than the other team's, or if they are equal, 
+        :return: True if this team's money in the bank is less than the other team's, or if they are equal,
                  if this team's free transfers are less than the other team's, False otherwise.
         """
         return (self.money_in_bank, self.free_transfers) < (
@@ -126,7 +184,7 @@ class Team:
     def is_feasible(self) -> bool:
         """Return whether an FPL team is feasible or not.
 
-        :return: bool indicating whether the team has enough money, players in one club < 3, 
+        :return: bool indicating whether the team has enough money, players in one club < 3,
                  and the correct number of players in each position.
         """
         if self.money_in_bank < 0:
@@ -163,53 +221,30 @@ class Team:
 
         :return: A copy of the team with the updated squad, money in bank, and free transfers.
 
+        :raises TypeError: If the player transferred in is not a Player instance.
         :raises ValueError: If the positions of the players being transferred do not match.
         """
+        if not isinstance(in_player, Player):
+            raise TypeError("in_player must be a Player instance")
         if out_player.position != in_player.position:
             raise ValueError("Both players must have the same position for a transfer.")
 
+        # the team is already validated so only the player transferred in needs checking
         new_money_in_bank = self.money_in_bank + out_player.cost - in_player.cost
         new_free_transfers = self.free_transfers - 1
+        gkps, defs, mids, fwds = self.gkps, self.defs, self.mids, self.fwds
 
         if out_player.position == 1:
-            new_gkps = frozenset(
-                player for player in self.gkps if player != out_player
-            ) | frozenset([in_player])
-            return replace(
-                self,
-                gkps=new_gkps,
-                money_in_bank=new_money_in_bank,
-                free_transfers=new_free_transfers,
-            )
+            gkps = gkps - {out_player} | {in_player}
         elif out_player.position == 2:
-            new_defs = frozenset(
-                player for player in self.defs if player != out_player
-            ) | frozenset([in_player])
-            return replace(
-                self,
-                defs=new_defs,
-                money_in_bank=new_money_in_bank,
-                free_transfers=new_free_transfers,
-            )
+            defs = defs - {out_player} | {in_player}
         elif out_player.position == 3:
-            new_mids = frozenset(
-                player for player in self.mids if player != out_player
-            ) | frozenset([in_player])
-            return replace(
-                self,
-                mids=new_mids,
-                money_in_bank=new_money_in_bank,
-                free_transfers=new_free_transfers,
-            )
+            mids = mids - {out_player} | {in_player}
         elif out_player.position == 4:
-            new_fwds = frozenset(
-                player for player in self.fwds if player != out_player
-            ) | frozenset([in_player])
-            return replace(
-                self,
-                fwds=new_fwds,
-                money_in_bank=new_money_in_bank,
-                free_transfers=new_free_transfers,
-            )
+            fwds = fwds - {out_player} | {in_player}
         else:
             raise ValueError("Invalid player position.")
+
+        return Team._from_validated(
+            new_money_in_bank, new_free_transfers, gkps, defs, mids, fwds
+        )
@@ -0,0 +1,379 @@
+"""
+This module defines the TransferPlanner class, which plans which transfers to make in which gameweek over a horizon.
+Unlike Optimizer.calc_optimal_teams, which makes every transfer now and approximates the value of free transfers
+with a fixed adjustment, the planner tracks the free transfers banked, the points hits taken and the money in the bank
+gameweek by gameweek. The search is a dynamic program over gameweek states, where each state is a CompactTeam,
+so paths reaching the same squad with the same money in the bank and free transfers are merged.
+The teams reachable in a gameweek are pruned with CompactTeam.can_transfer and scored with an IncrementalScorer,
+and teams which cannot make the beam are skipped before any Team or GameweekPlan is built.
+
+Available classes:
+- GameweekPlan: The transfers made in a single gameweek of a plan.
+- TransferPlan: A plan of transfers over a horizon of gameweeks.
+- TransferPlanner: Static class to plan transfers over several gameweeks.
+
+Available functions:
+- calc_transfer_plan: Find the plan of transfers maximizing the discounted reward over the horizon.
+"""
+
+from dataclasses import dataclass, replace
+from typing import Dict, FrozenSet, Iterator, List, Optional, Tuple
+import heapq
+from fpl import Player, Team, ExpectedPointsCalculator
+from fpl.compact_team import CompactTeam
+from fpl.formation_kernel import get_valid_formations
+from fpl.incremental_scorer import IncrementalScorer
+
+
+@dataclass(frozen=True)
+class GameweekPlan:
+    """The transfers made in a single gameweek of a plan.
+
+    gameweek: The gameweek the transfers are made for.
+    transfers_out: Players transferred out before the deadline of the gameweek.
+    transfers_in: Players transferred in before the deadline of the gameweek.
+    free_transfers: Free transfers available before making the transfers.
+    hits: Points deducted for transfers made beyond the free transfers.
+    team: The team after the transfers, its free transfers are the ones left over.
+    exp_points: Expected points of the optimal formation of the team for the gameweek, before hits.
+    """
+
+    gameweek: int
+    transfers_out: FrozenSet[Player]
+    transfers_in: FrozenSet[Player]
+    free_transfers: int
+    hits: int
+    team: Team
+    exp_points: float
+
+
+@dataclass(frozen=True)
+class TransferPlan:
+    """A plan of transfers over a horizon of gameweeks.
+
+    discounted_reward: Discounted expected points of the plan over the horizon, net of hits.
+    gameweeks: The plan for each gameweek of the horizon in order.
+    """
+
+    discounted_reward: float
+    gameweeks: Tuple[GameweekPlan, ...]
+
+
+class TransferPlanner:
+    """Static class to plan transfers over several gameweeks."""
+
+    @staticmethod
+    def _next_free_transfers(free_transfers_left: int, max_free_transfers: int) -> int:
+        """Return the free transfers available in the next gameweek.
+        Unused free transfers are banked and one more is gained every gameweek, up to a maximum.
+
+        :param free_transfers_left: Free transfers left after this gameweek's transfers, negative when hits were taken.
+        :param max_free_transfers: Maximum number of free transfers which can be banked.
+
+        :return: Free transfers available in the next gameweek.
+        """
+        return min(max(free_transfers_left, 0) + 1, max_free_transfers)
+
+    @staticmethod
+    def _make_scorer(
+        compact_team: CompactTeam,
+        players: Dict[int, Player],
+        epc: ExpectedPointsCalculator,
+        gameweek: int,
+        points_cache: Dict[Tuple[int, int], float],
+        formations: List[Tuple[int, int, int, int]],
+    ) -> IncrementalScorer:
+        """Return the scorer of a team for a single gameweek, without building a Team.
+
+        :param compact_team: The team to be scored.
+        :param players: Mapping of element ids to Player instances, containing every player of the team.
+        :param epc: Expected points calculator.
+        :param gameweek: The gameweek to be scored.
+        :param points_cache: Expected points of each (player, gameweek) pair, containing every player of the team.
+        :param formations: Valid formations, shared by every scorer of the search.
+
+        :return: IncrementalScorer of the team with a horizon of one gameweek.
+        """
+        sorted_points = {position: [] for position in range(1, 5)}
+        for element in compact_team.elements:
+            sorted_points[players[element].position].append(
+                (points_cache[element, gameweek], element)
+            )
+        for points in sorted_points.values():
+            points.sort()
+        return IncrementalScorer(
+            None,
+            epc,
+            gameweek,
+            1,
+            _points_cache=points_cache,
+            _formations=formations,
+            _sorted_points=[sorted_points],
+            _compact_team=compact_team,
+            _players=players,
+        )
+
+    @staticmethod
+    def _transfers(
+        scorer: IncrementalScorer,
+        out_players: List[Player],
+        candidates: List[Player],
+        points: Dict[int, float],
+        start: int,
+        remaining_transfers: int,
+        min_gain: float = float("-inf"),
+    ) -> Iterator[Tuple[int, Player, IncrementalScorer]]:
+        """Yield the scorers of the teams one transfer away from the team of a scorer.
+        Transfers which cannot lead to a feasible team with the remaining transfers are skipped.
+        Transfers within a gameweek are made together so only the final team needs to be feasible,
+        and candidates are taken from start onwards so each set of transfers is generated in a single order.
+        Transfers which cannot add min_gain expected points are skipped before being scored: the optimal formation gains
+        at most the points of the candidate above those of the player transferred out, who could start in its place,
+        and the points of the candidate above those of the captain.
+
+        :param scorer: Scorer of the team before the transfer.
+        :param out_players: Players of the team at the start of the gameweek which have not been transferred out yet.
+        :param candidates: List of player candidates you wish to transfer in, by decreasing expected points.
+        :param points: Expected points of every player of the team and candidate in the gameweek of the scorer.
+        :param start: Index of the first candidate which may be transferred in.
+        :param remaining_transfers: Number of transfers which can still be made after this one.
+        :param min_gain: Expected points a transfer must be able to add to be scored.
+
+        :return: Iterator of the index of the candidate transferred in, the player transferred out
+                 and the scorer of the team after the transfer.
+        """
+        if not out_players:
+            return
+        compact_team = scorer.compact_team
+        captain = scorer.captain(0)
+        captain_points = 0 if captain is None else points[captain]
+        min_out_points = min(points[player.element] for player in out_players)
+        for i in range(start, len(candidates)):
+            candidate = candidates[i]
+            in_points = points[candidate.element]
+            # the candidates are sorted, so no later candidate can add min_gain either
+            if (
+                max(0, in_points - min_out_points) + max(0, in_points - captain_points)
+                < min_gain
+            ):
+                return
+            if candidate.element in compact_team:
+                continue
+            for out_player in out_players:
+                if out_player.position != candidate.position:
+                    continue
+                gain = max(0, in_points - points[out_player.element]) + max(
+                    0, in_points - captain_points
+                )
+                if gain >= min_gain and compact_team.can_transfer(
+                    out_player, candidate, remaining_transfers
+                ):
+                    yield i, out_player, scorer.transfer_player(out_player, candidate)
+
+    @staticmethod
+    def calc_transfer_plan(
+        team: Team,
+        candidates: List[Player],
+        epc: ExpectedPointsCalculator,
+        gameweek: int,
+        horizon: int,
+        max_transfers_per_gameweek: int = 2,
+        gamma: float = 1,
+        max_free_transfers: int = 5,
+        hit_cost: int = 4,
+        beam_width: Optional[int] = 100,
+    ) -> TransferPlan:
+        """Find the plan of transfers maximizing the discounted reward over the horizon.
+        Each gameweek the optimal formation of the team is played and a points hit is taken
+        for every transfer beyond the free transfers available.
+        Every team one transfer away from a state is scored, and the beam_width-th best value among them
+        is a bound the teams reached with further transfers must beat to make the beam. Those teams are only scored
+        if the points the candidates have above the players transferred out and the captain could lift them above it.
+        Team and GameweekPlan objects are only built for the plan returned.
+
+        :param team: The team you wish to plan for, with the free transfers available for the first gameweek.
+        :param candidates: List of player candidates you wish to transfer in.
+        :param epc: Expected points calculator.
+        :param gameweek: The first gameweek of the plan.
+        :param horizon: The number of gameweeks to plan.
+        :param max_transfers_per_gameweek: Maximum number of transfers made in a single gameweek.
+        :param gamma: Discount factor.
+        :param max_free_transfers: Maximum number of free transfers which can be banked.
+        :param hit_cost: Points deducted for each transfer beyond the free transfers.
+        :param beam_width: Number of best states kept after each gameweek, None to keep every state.
+
+        :return: The best TransferPlan found.
+
+        :raises ValueError: If one of the candidates is already in the team or has an invalid position,
+                            or if the horizon or beam_width are not positive.
+        """
+        team_player_ids = set(
+            p.element for p in team.gkps | team.defs | team.mids | team.fwds
+        )
+        for candidate in candidates:
+            if candidate.element in team_player_ids:
+                raise ValueError("Candidate already in team.")
+            if candidate.position not in {1, 2, 3, 4}:
+                raise ValueError("Invalid player position.")
+        if horizon < 1:
+            raise ValueError("horizon must be a positive integer.")
+        if beam_width is not None and beam_width < 1:
+            raise ValueError("beam_width must be a positive integer.")
+
+        players = {
+            player.element: player
+            for player in team.gkps | team.defs | team.mids | team.fwds
+        }
+        players.update((candidate.element, candidate) for candidate in candidates)
+        # expected points and valid formations are shared by every scorer of the search
+        points_cache: Dict[Tuple[int, int], float] = {}
+        formations = get_valid_formations()
+
+        # each state maps the team at the start of a gameweek to the value and number of transfers
+        # of the best path leading to it, preferring fewer transfers between equal values, and to the last step of the path.
+        # A step is a tuple of the previous step, the team at the start of the gameweek, the team after the transfers,
+        # the hits and the expected points, so GameweekPlan objects are only built for the best path
+        states: Dict[CompactTeam, Tuple[float, int, Optional[tuple]]] = {
+            CompactTeam.from_team(team): (0.0, 0, None)
+        }
+        discount_factor = 1
+        for h in range(horizon):
+            next_states: Dict[CompactTeam, Tuple[float, int, Optional[tuple]]] = {}
+            points = {
+                element: epc.get_expected_points(element, gameweek + h)
+                for element in players
+            }
+            points_cache.update(
+                ((element, gameweek + h), p) for element, p in points.items()
+            )
+            ranked_candidates = sorted(
+                candidates, key=lambda candidate: -points[candidate.element]
+            )
+
+            def add_child(u_team, u_state, v_scorer):
+                v_team = v_scorer.compact_team
+                if not v_team.is_feasible():
+                    return
+                u_value, u_transfers, u_step = u_state
+                hits = hit_cost * max(0, -v_team.free_transfers)
+                exp_points = v_scorer.total_exp_points(0)
+                value = u_value + discount_factor * (exp_points - hits)
+                transfers = u_transfers + u_team.free_transfers - v_team.free_transfers
+                next_team = replace(
+                    v_team,
+                    free_transfers=TransferPlanner._next_free_transfers(
+                        v_team.free_transfers, max_free_transfers
+                    ),
+                )
+                if next_team in next_states and (value, -transfers) <= (
+                    next_states[next_team][0],
+                    -next_states[next_team][1],
+                ):
+                    return
+                step = (u_step, u_team, v_team, hits, exp_points)
+                next_states[next_team] = (value, transfers, step)
+
+            # the team itself and the teams one transfer away from each state
+            expansions = []
+            for u_team, u_state in states.items():
+                u_scorer = TransferPlanner._make_scorer(
+                    u_team, players, epc, gameweek + h, points_cache, formations
+                )
+                add_child(u_team, u_state, u_scorer)
+                if max_transfers_per_gameweek < 1:
+                    continue
+                out_players = [players[element] for element in u_team.elements]
+                for i, out_player, v_scorer in TransferPlanner._transfers(
+                    u_scorer,
+                    out_players,
+                    ranked_candidates,
+                    points,
+                    0,
+                    max_transfers_per_gameweek - 1,
+                ):
+                    add_child(u_team, u_state, v_scorer)
+                    expansions.append(
+                        (u_team, u_state, out_players, v_scorer, i, (out_player,))
+                    )
+
+            # a team can only make the beam if its value beats the beam_width-th best value of the teams scored so far
+            threshold = float("-inf")
+            if beam_width is not None and len(next_states) >= beam_width:
+                threshold = heapq.nlargest(
+                    beam_width, (value for value, _, _ in next_states.values())
+                )[-1]
+            # each transfer adds at most twice the expected points of a candidate, as a starter and as captain
+            top_points = [
+                max(0, points[candidate.element]) for candidate in ranked_candidates
+            ]
+            # teams with further transfers, each set of transfers being made in the order of the candidates
+            while expansions:
+                u_team, u_state, out_players, scorer, i, outs = expansions.pop()
+                n_transfers = len(outs)
+                if n_transfers == max_transfers_per_gameweek:
+                    continue
+                # gain the next transfer must be able to add for it, or a team reached from it, to make the beam
+                min_gain = float("-inf")
+                if discount_factor > 0:
+                    further_transfers = max_transfers_per_gameweek - n_transfers - 1
+                    min_gain = (
+                        (threshold - u_state[0]) / discount_factor
+                        - scorer.total_exp_points(0)
+                        - 2 * sum(top_points[i + 2 : i + 2 + further_transfers])
+                        + hit_cost * max(0, n_transfers + 1 - u_team.free_transfers)
+                    )
+                for j, out_player, v_scorer in TransferPlanner._transfers(
+                    scorer,
+                    [player for player in out_players if player not in outs],
+                    ranked_candidates,
+                    points,
+                    i + 1,
+                    max_transfers_per_gameweek - n_transfers - 1,
+                    min_gain,
+                ):
+                    add_child(u_team, u_state, v_scorer)
+                    expansions.append(
+                        (
+                            u_team,
+                            u_state,
+                            out_players,
+                            v_scorer,
+                            j,
+                            outs + (out_player,),
+                        )
+                    )
+
+            if beam_width is not None and len(next_states) > beam_width:
+                next_states = dict(
+                    heapq.nlargest(
+                        beam_width,
+                        next_states.items(),
+                        key=lambda item: (item[1][0], -item[1][1]),
+                    )
+                )
+            states = next_states
+            discount_factor *= gamma
+
+        best_value, _, step = max(
+            states.values(), key=lambda state: (state[0], -state[1])
+        )
+        plans = []
+        while step is not None:
+            step, u_team, v_team, hits, exp_points = step
+            u_elements, v_elements = set(u_team.elements), set(v_team.elements)
+            plans.append(
+                GameweekPlan(
+                    gameweek=gameweek + horizon - 1 - len(plans),
+                    transfers_out=frozenset(
+                        players[e] for e in u_elements - v_elements
+                    ),
+                    transfers_in=frozenset(players[e] for e in v_elements - u_elements),
+                    free_transfers=u_team.free_transfers,
+                    hits=hits,
+                    team=v_team.to_team(players),
+                    exp_points=exp_points,
+                )
+            )
+        return TransferPlan(
+            discounted_reward=best_value, gameweeks=tuple(reversed(plans))
+        )
@@ -4,53 +4,104 @@ This module provides a collection of utility functions designed to support vario
 Functions included in this module cover a range of operations, such as data manipulation, computation, and other helper tasks that streamline and simplify the development process.
 
 Available functions:
-- find_matching_players: Search for players whose web names partially match the search_name using fuzzy matching.
+- find_matching_players: Search for players whose names partially match the search_name using fuzzy matching.
+- resolve_players: Resolve many names to players at once, optionally with club and position hints.
+- resolve_candidates: Return the players of a list of element ids and player names, e.g. a list of candidates.
 - compute_points_per_game: Compute points per game a player would have had right before a particular as_of_gameweek occured.
 - compute_form: Compute form a player would have had right before a particular as_of_gameweek occured.
 """
 
 import pandas as pd
-from fuzzywuzzy import fuzz
-from fuzzywuzzy import process
-from fpl import Loader, Player
+from typing import Optional, Sequence, Union
+from fpl import Loader, Player, NameResolution
 
 
 def find_matching_players(
     search_name: str, threshold: int = 80
 ) -> list[tuple[Player, str]]:
-    """Search for players whose web names partially match the search_name using fuzzy matching.
+    """Search for players whose names partially match the search_name using fuzzy matching.
+    The search uses the name index of the current static information, so accents and case are ignored
+    and first and second names match as well as web names.
 
     :param search_name: The name to search for.
     :param threshold: The minimum score for a match to be considered valid (default is 80).
 
-    :return: A list of tuples, each containing a Player object and the full name as a string.
+    :return: A list of tuples of at most the 5 best matching players, each containing a Player object
+             and the full name as a string, ordered by unique ID.
 
     :raises ValueError: If no matching players are found.
     """
-    elements = Loader.get_static_info()["elements"]
-    web_names = [p["web_name"] for p in elements]
-    matches = process.extract(search_name, web_names, scorer=fuzz.partial_ratio)
-    filtered_matches = [match for match in matches if match[1] >= threshold]
-    matched_ids = [
-        p["id"]
-        for p in elements
-        if p["web_name"] in [match[0] for match in filtered_matches]
-    ]
-    if not matched_ids:
+    matches = Loader.get_player_name_index().search(
+        search_name, limit=5, threshold=threshold
+    )
+    if not matches:
         raise ValueError("No matching players found.")
-    players = []
-    for i in matched_ids:
-        basic_info = Loader.get_player_basic_info(i)
-        player = Player(
-            element=i,
-            name=basic_info["web_name"],
-            position=basic_info["element_type"],
-            club=basic_info["team"],
-            cost=basic_info["now_cost"],
-        )
-        full_name = f"{basic_info['first_name']} {basic_info['second_name']}"
-        players.append((player, full_name))
-    return players
+    return [
+        (match.player, match.full_name)
+        for match in sorted(matches, key=lambda match: match.player.element)
+    ]
+
+
+def resolve_players(
+    names: Sequence[str],
+    clubs: Optional[Sequence[Optional[int]]] = None,
+    positions: Optional[Sequence[Optional[Union[int, str]]]] = None,
+    threshold: int = 80,
+) -> list[NameResolution]:
+    """Resolve many names to players at once, optionally with club and position hints.
+    The players of the resolutions can be passed as candidates to the optimizer,
+    e.g. [r.player for r in resolutions if r.player is not None and r.ambiguity < 1].
+
+    :param names: The names to resolve.
+    :param clubs: Optional club id of each name, None where unknown.
+    :param positions: Optional position of each name as 1 to 4 or "GKP", "DEF", "MID", "FWD", None where unknown.
+    :param threshold: The minimum score for a match to be considered valid (default is 80).
+
+    :return: A NameResolution for each name in order, with the best matching player and the ambiguity of the match.
+
+    :raises ValueError: If the hints do not have one entry per name, or a position is invalid.
+    """
+    return Loader.get_player_name_index().resolve(names, clubs, positions, threshold)
+
+
+def resolve_candidates(entries: Sequence[Union[int, str]]) -> list[Player]:
+    """Return the players of a list of element ids and player names, e.g. a list of candidates.
+    Names are resolved with resolve_players and must match a single player.
+
+    :param entries: Element ids and player names, e.g. [328, "Salah", "Palmer"].
+
+    :return: List of players in the order of the entries.
+
+    :raises ValueError: If a name matches no player, or several players equally well.
+    :raises KeyError: If an element id is not in the static information.
+    """
+    registry = Loader.get_player_registry()
+    names = [entry for entry in entries if isinstance(entry, str)]
+    resolutions = iter(resolve_players(names))
+    candidates = []
+    for entry in entries:
+        if not isinstance(entry, str):
+            candidates.append(registry[entry])
+            continue
+        resolution = next(resolutions)
+        if resolution.player is None:
+            raise ValueError("No player matches the candidate {!r}.".format(entry))
+        if resolution.ambiguity == 1:
+            tied = [(resolution.full_name, resolution.player)] + [
+                (match.full_name, match.player)
+                for match in resolution.alternatives
+                if match.score == resolution.score
+            ]
+            raise ValueError(
+                "The candidate {!r} is ambiguous, use the element id of one of: {}.".format(
+                    entry,
+                    ", ".join(
+                        "{} ({})".format(name, player.element) for name, player in tied
+                    ),
+                )
+            )
+        candidates.append(resolution.player)
+    return candidates
 
 
 def compute_points_per_game(player_id: int, as_of_gameweek: int) -> float:
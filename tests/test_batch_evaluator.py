@@ -0,0 +1,166 @@
+"""
+Unit tests for the batch_evaluator module.
+Test cases:
+- TestBatchEvaluatorValidateSquads: Unit tests for the validate_squads method of the BatchEvaluator class.
+- TestBatchEvaluatorCalcOptimalFormations: Unit tests for the calc_optimal_formations method of the BatchEvaluator class.
+"""
+
+import random
+import unittest
+from unittest.mock import patch
+import numpy as np
+from fpl import (
+    BatchEvaluator,
+    ExpectedPointsCalculator,
+    Optimizer,
+    PlayerRegistry,
+    Team,
+)
+
+
+def position_info_side_effect(position_id: int) -> dict:
+    """Function to provide the side_effect for the mock of fpl.Loader.get_position_info"""
+    return {
+        1: {"squad_min_play": 1, "squad_max_play": 1},
+        2: {"squad_min_play": 3, "squad_max_play": 5},
+        3: {"squad_min_play": 2, "squad_max_play": 5},
+        4: {"squad_min_play": 1, "squad_max_play": 3},
+    }[position_id]
+
+
+def make_registry() -> PlayerRegistry:
+    """Registry of 40 players, 8 goalkeepers and 8 forwards, 12 defenders and 12 midfielders, over 10 clubs."""
+    positions = [1] * 8 + [2] * 12 + [3] * 12 + [4] * 8
+    return PlayerRegistry(
+        [
+            {
+                "id": element,
+                "web_name": str(element),
+                "element_type": position,
+                "team": element % 10,
+                "now_cost": 50,
+            }
+            for element, position in enumerate(positions, 1)
+        ]
+    )
+
+
+def make_squad(rng: random.Random) -> list:
+    """Random squad of 15 distinct players with the right number of players in each position."""
+    return (
+        rng.sample(range(1, 9), 2)
+        + rng.sample(range(9, 21), 5)
+        + rng.sample(range(21, 33), 5)
+        + rng.sample(range(33, 41), 3)
+    )
+
+
+VALID_SQUAD = [1, 2, 9, 10, 11, 12, 13, 23, 24, 25, 26, 27, 34, 35, 36]
+
+
+class TestBatchEvaluatorValidateSquads(unittest.TestCase):
+    """Unit tests for the validate_squads method of the BatchEvaluator class."""
+
+    def test_validate_squads(self):
+        registry = make_registry()
+        duplicate = VALID_SQUAD[:-1] + [VALID_SQUAD[0]]
+        wrong_shape = VALID_SQUAD[:-1] + [28]
+        unknown = VALID_SQUAD[:-1] + [99]
+        # players 1, 11, 21 and 31 all play for club 1
+        too_many_from_club = [1, 2, 9, 10, 11, 12, 13, 21, 31, 25, 26, 27, 34, 35, 36]
+        squads = np.array(
+            [
+                VALID_SQUAD,
+                VALID_SQUAD,
+                duplicate,
+                wrong_shape,
+                unknown,
+                too_many_from_club,
+            ]
+        )
+        valid = BatchEvaluator.validate_squads(squads, [0, -1, 0, 0, 0, 0], registry)
+        np.testing.assert_array_equal(valid, [True, False, False, False, False, False])
+
+    def test_invalid_shapes(self):
+        registry = make_registry()
+        with self.assertRaises(ValueError):
+            BatchEvaluator.validate_squads([VALID_SQUAD[:14]], [0], registry)
+        with self.assertRaises(ValueError):
+            BatchEvaluator.validate_squads([VALID_SQUAD], [0, 0], registry)
+
+
+class TestBatchEvaluatorCalcOptimalFormations(unittest.TestCase):
+    """Unit tests for the calc_optimal_formations method of the BatchEvaluator class."""
+
+    def setUp(self):
+        patcher = patch("fpl.Loader.get_position_info")
+        self.addCleanup(patcher.stop)
+        patcher.start().side_effect = position_info_side_effect
+
+        rng = random.Random(0)
+        points = {
+            (element, gameweek): float(rng.randint(-1, 10))
+            for element in range(1, 41)
+            for gameweek in range(1, 4)
+        }
+        self.calls = []
+
+        class MockCalculator(ExpectedPointsCalculator):
+            def get_expected_points(player_id: int, gameweek: int) -> float:
+                self.calls.append((player_id, gameweek))
+                return points[(player_id, gameweek)]
+
+        self.epc = MockCalculator
+        self.registry = make_registry()
+
+    def test_matches_optimal_formation(self):
+        rng = random.Random(1)
+        squads = np.array([make_squad(rng) for _ in range(25)])
+        money_in_bank = np.zeros(len(squads), dtype=int)
+        valid = BatchEvaluator.validate_squads(squads, money_in_bank, self.registry)
+        result = BatchEvaluator.calc_optimal_formations(
+            squads, money_in_bank, self.epc, 1, 3, self.registry, chunk_size=4
+        )
+        np.testing.assert_array_equal(result.valid, valid)
+        self.assertTrue(valid.any())
+        self.assertLessEqual(len(set(self.calls)), 40 * 3)
+        self.assertEqual(
+            len(self.calls), len(set(self.calls)), "Each player queried once"
+        )
+
+        for squad, is_valid, mask, captain, total in zip(squads, *result):
+            if not is_valid:
+                self.assertTrue(np.all(np.isnan(total)))
+                self.assertFalse(mask.any())
+                continue
+            players = [self.registry[int(element)] for element in squad]
+            team = Team(
+                money_in_bank=0,
+                free_transfers=1,
+                gkps=frozenset(p for p in players if p.position == 1),
+                defs=frozenset(p for p in players if p.position == 2),
+                mids=frozenset(p for p in players if p.position == 3),
+                fwds=frozenset(p for p in players if p.position == 4),
+            )
+            for h in range(3):
+                formation = Optimizer.calc_optimal_formation(team, self.epc, 1 + h)
+                self.assertAlmostEqual(total[h], formation.total_exp_points)
+                self.assertEqual(mask[:, h].sum(), 11)
+                if formation.captain is None:
+                    self.assertEqual(captain[h], -1)
+                else:
+                    # captains may differ between players with equal expected points
+                    self.assertEqual(
+                        self.epc.get_expected_points(int(captain[h]), 1 + h),
+                        self.epc.get_expected_points(formation.captain.element, 1 + h),
+                    )
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            BatchEvaluator.calc_optimal_formations(
+                [VALID_SQUAD], [0], self.epc, 1, 0, self.registry
+            )
+        with self.assertRaises(ValueError):
+            BatchEvaluator.calc_optimal_formations(
+                [VALID_SQUAD], [0], self.epc, 1, 1, self.registry, chunk_size=0
+            )
@@ -0,0 +1,159 @@
+"""
+Unit tests for the chip_planner module.
+Test cases:
+- TestChipPlannerCalcChipSchedule: Unit tests for the calc_chip_schedule method of the ChipPlanner class.
+"""
+
+import unittest
+from unittest.mock import patch
+from fpl import ExpectedPointsCalculator, Team, Player, ChipPlanner, Optimizer
+
+
+def position_info_side_effect(position_id: int) -> dict:
+    """Function to provide the side_effect for the mock of fpl.Loader.get_position_info"""
+    return {
+        1: {"squad_min_play": 1, "squad_max_play": 1},
+        2: {"squad_min_play": 3, "squad_max_play": 5},
+        3: {"squad_min_play": 2, "squad_max_play": 5},
+        4: {"squad_min_play": 1, "squad_max_play": 3},
+    }[position_id]
+
+
+class TestChipPlannerCalcChipSchedule(unittest.TestCase):
+    """Unit tests for the calc_chip_schedule method of the ChipPlanner class."""
+
+    def setUp(self):
+        patcher = patch("fpl.Loader.get_position_info")
+        self.addCleanup(patcher.stop)
+        patcher.start().side_effect = position_info_side_effect
+
+        players = [
+            Player.from_min_info(element=i, position=position, club=i, cost=50)
+            for i, position in enumerate([1] * 2 + [2] * 5 + [3] * 5 + [4] * 3, 1)
+        ]
+        self.team = Team(
+            money_in_bank=0,
+            free_transfers=1,
+            gkps=frozenset(players[0:2]),
+            defs=frozenset(players[2:7]),
+            mids=frozenset(players[7:12]),
+            fwds=frozenset(players[12:15]),
+        )
+        self.star = Player.from_min_info(element=100, position=4, club=20, cost=50)
+        self.other_star = Player.from_min_info(
+            element=200, position=3, club=19, cost=50
+        )
+
+    def schedule(self, points, **kwargs):
+        class MockCalculator(ExpectedPointsCalculator):
+            def get_expected_points(player_id: int, gameweek: int) -> float:
+                return points(player_id, gameweek)
+
+        arguments = dict(
+            team=self.team,
+            candidates=[self.star, self.other_star],
+            epc=MockCalculator,
+            gameweek=1,
+            horizon=3,
+        )
+        arguments.update(kwargs)
+        return ChipPlanner.calc_chip_schedule(**arguments)
+
+    def test_bench_boost_and_triple_captain_in_distinct_gameweeks(self):
+        # both chips are best in the last gameweek, but only one chip can be played per gameweek
+        schedule = self.schedule(
+            lambda player_id, gameweek: 0 if player_id >= 100 else gameweek,
+            chips=("bboost", "3xc"),
+        )
+        self.assertEqual(schedule.chips, {"bboost": 3, "3xc": 2})
+        self.assertAlmostEqual(schedule.base_discounted_reward, 12 * (1 + 2 + 3))
+        self.assertAlmostEqual(schedule.discounted_reward, 72 + 4 * 3 + 2)
+        self.assertIsNone(schedule.wildcard_team)
+        self.assertIsNone(schedule.free_hit_team)
+
+    def test_free_hit(self):
+        def points(player_id, gameweek):
+            if player_id == 100:
+                return 20 if gameweek == 2 else 0
+            return 1
+
+        schedule = self.schedule(points, chips=("freehit",), chip_transfers=1)
+        self.assertEqual(schedule.chips, {"freehit": 2})
+        self.assertIn(self.star, schedule.free_hit_team.fwds)
+        self.assertAlmostEqual(schedule.discounted_reward, 12 + (10 + 2 * 20) + 12)
+
+    def test_wildcard(self):
+        def points(player_id, gameweek):
+            if player_id >= 100:
+                return 10 if gameweek >= 2 else 0
+            return 1
+
+        schedule = self.schedule(points, chips=("wildcard",), chip_transfers=2)
+        self.assertIn("wildcard", schedule.chips)
+        self.assertIn(self.star, schedule.wildcard_team.fwds)
+        self.assertIn(self.other_star, schedule.wildcard_team.mids)
+        self.assertAlmostEqual(schedule.discounted_reward, 12 + 2 * (9 + 10 + 20))
+
+    def test_free_hit_after_wildcard(self):
+        # the free hit squad keeps the star brought in by the wildcard
+        def points(player_id, gameweek):
+            if player_id == 100:
+                return 10
+            if player_id == 200:
+                return 20 if gameweek == 3 else 0
+            return 1
+
+        schedule = self.schedule(
+            points, chips=("wildcard", "freehit"), chip_transfers=1
+        )
+        self.assertEqual(schedule.chips, {"wildcard": 1, "freehit": 3})
+        self.assertIn(self.star, schedule.wildcard_team.fwds)
+        self.assertIn(self.star, schedule.free_hit_team.fwds)
+        self.assertIn(self.other_star, schedule.free_hit_team.mids)
+        self.assertAlmostEqual(schedule.discounted_reward, 30 + 30 + (40 + 10 + 9))
+
+    def test_no_chips_played_when_nothing_gained(self):
+        schedule = self.schedule(lambda player_id, gameweek: 0)
+        self.assertEqual(schedule.chips, {})
+        self.assertEqual(schedule.discounted_reward, 0)
+
+    def test_squads_only_searched_when_they_can_gain(self):
+        def points(player_id, gameweek):
+            if player_id == 100:
+                return 20 if gameweek == 2 else 0
+            return 1
+
+        with patch.object(
+            Optimizer, "calc_optimal_teams", wraps=Optimizer.calc_optimal_teams
+        ) as calc_optimal_teams:
+            self.schedule(lambda player_id, gameweek: 0)
+            self.assertEqual(calc_optimal_teams.call_count, 0)
+            # only the free hit in the gameweek the star plays can gain
+            schedule = self.schedule(points, chips=("freehit",), chip_transfers=1)
+            self.assertEqual(calc_optimal_teams.call_count, 1)
+        self.assertEqual(schedule.chips, {"freehit": 2})
+
+    def test_all_chips(self):
+        def points(player_id, gameweek):
+            if player_id >= 100:
+                return 10 if gameweek >= 2 else 0
+            return gameweek
+
+        schedule = self.schedule(points, chip_transfers=2, gamma=0.9)
+        gameweeks = list(schedule.chips.values())
+        self.assertEqual(len(gameweeks), len(set(gameweeks)))
+        for chips in [("wildcard",), ("freehit",), ("bboost",), ("3xc",)]:
+            self.assertGreaterEqual(
+                schedule.discounted_reward,
+                self.schedule(
+                    points, chip_transfers=2, gamma=0.9, chips=chips
+                ).discounted_reward,
+            )
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            self.schedule(lambda player_id, gameweek: 0, chips=("bboost", "bboost"))
+        with self.assertRaises(ValueError):
+            self.schedule(lambda player_id, gameweek: 0, chips=("benchboost",))
+        with self.assertRaises(ValueError):
+            self.schedule(lambda player_id, gameweek: 0, horizon=0)
@@ -0,0 +1,206 @@
+"""
+Unit tests for the cli module.
+Test cases:
+- TestCli: Unit tests for the prefetch, refresh and optimize commands.
+"""
+
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+from fpl import Loader
+from fpl.cli import main
+
+NAMES = [
+    "Raya", "Flekken", "Saliba", "Gabriel", "Gvardiol", "Van Dijk", "Robinson",
+    "Saka", "Palmer", "Mbeumo", "Rogers", "Kluivert", "Haaland", "Isak", "Wood",
+    "Sanchez", "Munoz", "Semenyo", "Watkins",
+]  # fmt: skip
+POSITIONS = [1] * 2 + [2] * 5 + [3] * 5 + [4] * 3 + [1, 2, 3, 4]
+
+
+def static_info():
+    return {
+        "elements": [
+            {
+                "id": i,
+                "web_name": name,
+                "first_name": "",
+                "second_name": name,
+                "element_type": position,
+                # three players of the team in each club, the candidates in another club
+                "team": min((i - 1) // 3 + 1, 6),
+                "now_cost": 50,
+            }
+            for i, (name, position) in enumerate(zip(NAMES, POSITIONS), 1)
+        ],
+        "element_types": [
+            {"id": 1, "squad_select": 2, "squad_min_play": 1, "squad_max_play": 1},
+            {"id": 2, "squad_select": 5, "squad_min_play": 3, "squad_max_play": 5},
+            {"id": 3, "squad_select": 5, "squad_min_play": 2, "squad_max_play": 5},
+            {"id": 4, "squad_select": 3, "squad_min_play": 1, "squad_max_play": 3},
+        ],
+        "events": [{"id": 1, "deadline_time": "2024-08-16T17:30:00Z"}],
+    }
+
+
+def fake_get(url: str) -> MagicMock:
+    """Return the response of the FPL API to a URL."""
+    if url.endswith("bootstrap-static/"):
+        payload = static_info()
+    elif url.endswith("fixtures/"):
+        payload = [{"id": 1}]
+    else:
+        payload = {"fixtures": [], "history": [], "history_past": []}
+    response = MagicMock()
+    response.json.return_value = payload
+    return response
+
+
+class ElementCalculator:
+    """Expected points calculator returning the element id, so candidates are transferred in."""
+
+    @staticmethod
+    def get_expected_points(player_id: int, gameweek: int) -> float:
+        return float(player_id)
+
+
+class TestCli(unittest.TestCase):
+    """Unit tests for the prefetch, refresh and optimize commands."""
+
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.addCleanup(Loader.configure_cache)
+        self.addCleanup(Loader.configure_static_info)
+        self.cache_dir = os.path.join(tmp_dir.name, "cache")
+        self.team_file = os.path.join(tmp_dir.name, "team.json")
+        self.candidates_file = os.path.join(tmp_dir.name, "candidates.json")
+        self.output_file = os.path.join(tmp_dir.name, "output.json")
+        with open(self.team_file, "w") as fd:
+            json.dump(
+                {
+                    "picks": [
+                        {"element": i, "selling_price": 50} for i in range(1, 16)
+                    ],
+                    "transfers": {"bank": 0, "limit": 1},
+                },
+                fd,
+            )
+        with open(self.candidates_file, "w") as fd:
+            json.dump([16, 17, "Semenyo", "watkins"], fd)
+
+    def run_cli(self, *args: str) -> int:
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(
+            io.StringIO()
+        ):
+            return main(
+                ["--cache-dir", self.cache_dir, "--output", self.output_file, *args]
+            )
+
+    def prefetch(self, *args: str):
+        with patch("requests.get", side_effect=fake_get) as mock_get, patch(
+            "time.sleep"
+        ):
+            self.assertEqual(self.run_cli(*args), 0)
+        return mock_get
+
+    def test_prefetch(self):
+        mock_get = self.prefetch("prefetch", "--teams", self.team_file)
+        self.assertEqual(mock_get.call_count, 17)
+        self.assertTrue(
+            os.path.exists(os.path.join(self.cache_dir, "bootstrap-static.json"))
+        )
+        self.assertTrue(
+            os.path.exists(os.path.join(self.cache_dir, "element-summary_15.json"))
+        )
+        with open(self.output_file) as fd:
+            self.assertEqual(json.load(fd)["players"], 15)
+
+        # a second prefetch reads the cache, a refresh queries the API again
+        self.assertEqual(self.prefetch("prefetch").call_count, 0)
+        self.assertEqual(self.prefetch("refresh").call_count, 2)
+
+    def test_offline_without_cache(self):
+        with patch("requests.get") as mock_get:
+            self.assertEqual(self.run_cli("--offline", "prefetch"), 1)
+        mock_get.assert_not_called()
+
+    def test_optimize_offline(self):
+        self.prefetch("prefetch")
+        with patch("requests.get") as mock_get:
+            status = self.run_cli(
+                "--offline",
+                "optimize",
+                self.team_file,
+                self.team_file,
+                "--candidates",
+                self.candidates_file,
+                "--gameweek",
+                "1",
+                "--epc",
+                "tests.test_cli:ElementCalculator",
+                "--k",
+                "2",
+                "--workers",
+                "2",
+            )
+        mock_get.assert_not_called()
+        self.assertEqual(status, 0)
+        with open(self.output_file) as fd:
+            output = json.load(fd)
+        self.assertEqual(output["gameweek"], 1)
+        self.assertEqual(len(output["managers"]), 2)
+        for manager in output["managers"]:
+            self.assertEqual(len(manager["results"]), 2)
+            best = manager["results"][0]
+            # the candidate goalkeeper replaces the goalkeeper with the fewest points
+            self.assertEqual(best["transfers_out"], [{"element": 1, "name": "Raya"}])
+            self.assertEqual(best["transfers_in"], [{"element": 16, "name": "Sanchez"}])
+            self.assertIn(16, best["elements"])
+
+    def test_optimize_slim_static(self):
+        self.prefetch("prefetch")
+        status = self.run_cli(
+            "--offline",
+            "--slim-static",
+            "optimize",
+            self.team_file,
+            "--candidates",
+            self.candidates_file,
+            "--gameweek",
+            "1",
+            "--epc",
+            "tests.test_cli:ElementCalculator",
+        )
+        self.assertEqual(status, 0)
+        self.assertIsNotNone(Loader._static_fields)
+        with open(self.output_file) as fd:
+            best = json.load(fd)["managers"][0]["results"][0]
+        self.assertEqual(best["transfers_in"], [{"element": 16, "name": "Sanchez"}])
+
+    def test_optimize_invalid_candidates(self):
+        self.prefetch("prefetch")
+        with open(self.candidates_file, "w") as fd:
+            json.dump(["Nobody"], fd)
+        status = self.run_cli(
+            "--offline",
+            "optimize",
+            self.team_file,
+            "--candidates",
+            self.candidates_file,
+            "--gameweek",
+            "1",
+            "--epc",
+            "tests.test_cli:ElementCalculator",
+        )
+        self.assertEqual(status, 1)
+        with open(self.output_file) as fd:
+            self.assertIn("Nobody", json.load(fd)["managers"][0]["error"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,201 @@
+"""
+Unit tests for the codec module.
+Test cases:
+- TestTeamCodec: Unit tests for the TeamCodec class.
+- TestFormationCodec: Unit tests for the FormationCodec class.
+- TestResultsCodec: Unit tests for the ResultsCodec class.
+"""
+
+import json
+import unittest
+from fpl import (
+    Formation,
+    PlayerRegistry,
+    ScoredTeam,
+    Team,
+    TeamCodec,
+    FormationCodec,
+    ResultsCodec,
+)
+
+POSITIONS = [1] * 2 + [2] * 5 + [3] * 5 + [4] * 3
+ELEMENTS = [
+    {
+        "id": i + 1,
+        "web_name": "Player{}".format(i + 1),
+        "element_type": position,
+        "team": i % 8 + 1,
+        "now_cost": 50 + i,
+    }
+    for i, position in enumerate(POSITIONS)
+]
+
+
+def make_team(registry: PlayerRegistry, money_in_bank: int = 10) -> Team:
+    """Make a team of every player of the registry, the first player with a selling price."""
+    players = [registry.get(1, cost=45)] + [registry[i] for i in range(2, 16)]
+    return Team(
+        money_in_bank=money_in_bank,
+        free_transfers=1,
+        gkps=frozenset(p for p in players if p.position == 1),
+        defs=frozenset(p for p in players if p.position == 2),
+        mids=frozenset(p for p in players if p.position == 3),
+        fwds=frozenset(p for p in players if p.position == 4),
+    )
+
+
+class TestTeamCodec(unittest.TestCase):
+    """Unit tests for the TeamCodec class."""
+
+    def setUp(self):
+        self.registry = PlayerRegistry(ELEMENTS)
+        self.team = make_team(self.registry)
+
+    def test_dict_round_trip(self):
+        data = TeamCodec.to_dict(self.team, self.registry.snapshot_id)
+        self.assertEqual(data["elements"], list(range(1, 16)))
+        self.assertEqual(data["costs"][0], 45)
+        data = json.loads(json.dumps(data))
+        team = TeamCodec.from_dict(data, self.registry)
+        self.assertEqual(team, self.team)
+        # selling prices are kept
+        self.assertEqual(min(team.gkps).cost, 45)
+        self.assertIs(max(team.fwds), self.registry[15])
+
+    def test_bytes_round_trip(self):
+        data = TeamCodec.to_bytes(self.team, self.registry.snapshot_id)
+        team = TeamCodec.from_bytes(data, self.registry)
+        self.assertEqual(team, self.team)
+        self.assertEqual(min(team.gkps).cost, 45)
+        # 3 header bytes, 7 bytes of money and transfers, 2 bytes per element id and cost
+        self.assertEqual(len(TeamCodec.to_bytes(self.team)), 70)
+
+    def test_snapshot_mismatch(self):
+        other = PlayerRegistry(ELEMENTS, snapshot_id="other")
+        with self.assertRaises(ValueError):
+            TeamCodec.from_dict(TeamCodec.to_dict(self.team, "stale"), other)
+        with self.assertRaises(ValueError):
+            TeamCodec.from_bytes(TeamCodec.to_bytes(self.team, "stale"), other)
+        # data encoded without a snapshot id is decoded with any registry
+        self.assertEqual(
+            TeamCodec.from_bytes(TeamCodec.to_bytes(self.team), other), self.team
+        )
+
+    def test_wrong_type(self):
+        with self.assertRaises(ValueError):
+            FormationCodec.from_bytes(TeamCodec.to_bytes(self.team), self.registry)
+
+    def test_snapshot_id_too_long(self):
+        # the limit is in UTF-8 bytes, "é" is 2 bytes
+        snapshot_id = "é" * 127 + "a"
+        data = TeamCodec.to_bytes(self.team, snapshot_id)
+        registry = PlayerRegistry(ELEMENTS, snapshot_id=snapshot_id)
+        self.assertEqual(TeamCodec.from_bytes(data, registry), self.team)
+        with self.assertRaises(ValueError):
+            TeamCodec.to_bytes(self.team, snapshot_id + "a")
+
+
+class TestFormationCodec(unittest.TestCase):
+    """Unit tests for the FormationCodec class."""
+
+    def setUp(self):
+        self.registry = PlayerRegistry(ELEMENTS)
+        r = self.registry
+        self.formation = Formation._from_validated(
+            total_exp_points=61.5,
+            gkps=frozenset([r[1]]),
+            defs=frozenset([r[3], r[4], r[5], r[6]]),
+            mids=frozenset([r[8], r[9], r[10], r[11]]),
+            fwds=frozenset([r[13], r[14]]),
+            captain=r[14],
+        )
+
+    def test_dict_round_trip(self):
+        data = json.loads(
+            json.dumps(
+                FormationCodec.to_dict(self.formation, self.registry.snapshot_id)
+            )
+        )
+        formation = FormationCodec.from_dict(data, self.registry)
+        self.assertEqual(formation, self.formation)
+        self.assertIs(formation.captain, self.registry[14])
+
+    def test_bytes_round_trip(self):
+        data = FormationCodec.to_bytes(self.formation, self.registry.snapshot_id)
+        self.assertEqual(FormationCodec.from_bytes(data, self.registry), self.formation)
+
+    def test_no_captain(self):
+        formation = Formation._from_validated(
+            total_exp_points=0,
+            gkps=self.formation.gkps,
+            defs=self.formation.defs,
+            mids=self.formation.mids,
+            fwds=self.formation.fwds,
+            captain=None,
+        )
+        data = FormationCodec.to_bytes(formation)
+        self.assertIsNone(FormationCodec.from_bytes(data, self.registry).captain)
+        data = FormationCodec.to_dict(formation)
+        self.assertIsNone(FormationCodec.from_dict(data, self.registry).captain)
+
+
+class TestResultsCodec(unittest.TestCase):
+    """Unit tests for the ResultsCodec class."""
+
+    def setUp(self):
+        self.registry = PlayerRegistry(ELEMENTS)
+        self.results = [
+            ScoredTeam(80.5, make_team(self.registry, 10)),
+            ScoredTeam(79.25, make_team(self.registry, 5)),
+        ]
+
+    def test_dict_round_trip(self):
+        data = json.loads(
+            json.dumps(ResultsCodec.to_dict(self.results, self.registry.snapshot_id))
+        )
+        self.assertEqual(ResultsCodec.from_dict(data, self.registry), self.results)
+
+    def test_bytes_round_trip(self):
+        data = ResultsCodec.to_bytes(self.results, self.registry.snapshot_id)
+        results = ResultsCodec.from_bytes(data, self.registry)
+        self.assertEqual(results, self.results)
+        self.assertIsInstance(results[0], ScoredTeam)
+
+    def test_transfers(self):
+        registry = PlayerRegistry(
+            ELEMENTS
+            + [
+                {
+                    "id": 16,
+                    "web_name": "Player16",
+                    "element_type": 4,
+                    "team": 8,
+                    "now_cost": 50,
+                }
+            ]
+        )
+        team = make_team(registry)
+        new_team = team.transfer_player(registry[15], registry[16])
+        data = ResultsCodec.to_dict(
+            [ScoredTeam(81, new_team), ScoredTeam(80, team)],
+            registry.snapshot_id,
+            team,
+        )
+        self.assertEqual(
+            data["results"][0]["transfers_out"], [{"element": 15, "name": "Player15"}]
+        )
+        self.assertEqual(
+            data["results"][0]["transfers_in"], [{"element": 16, "name": "Player16"}]
+        )
+        self.assertEqual(data["results"][1]["transfers_in"], [])
+        self.assertEqual(
+            ResultsCodec.from_dict(data, registry)[0], ScoredTeam(81, new_team)
+        )
+
+    def test_empty(self):
+        data = ResultsCodec.to_bytes([])
+        self.assertEqual(ResultsCodec.from_bytes(data, self.registry), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
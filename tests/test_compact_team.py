@@ -0,0 +1,158 @@
+"""
+Unit tests for the compact_team module.
+Test cases:
+- TestCompactTeam: Unit tests for the CompactTeam class.
+"""
+
+import random
+import unittest
+from fpl import CompactTeam, Team, Player
+
+
+class TestCompactTeam(unittest.TestCase):
+    """Unit tests for the CompactTeam class."""
+
+    def setUp(self):
+        players = [
+            Player.from_min_info(element=i, position=position, club=i, cost=50)
+            for i, position in enumerate([1] * 2 + [2] * 5 + [3] * 5 + [4] * 3, 1)
+        ]
+        self.team = Team(
+            money_in_bank=10,
+            free_transfers=1,
+            gkps=frozenset(players[0:2]),
+            defs=frozenset(players[2:7]),
+            mids=frozenset(players[7:12]),
+            fwds=frozenset(players[12:15]),
+        )
+        self.candidate = Player.from_min_info(element=100, position=3, club=1, cost=55)
+        self.players = {player.element: player for player in players}
+        self.players[self.candidate.element] = self.candidate
+
+    def test_round_trip(self):
+        compact_team = CompactTeam.from_team(self.team)
+        self.assertEqual(compact_team.elements, tuple(range(1, 16)))
+        self.assertEqual(compact_team.to_team(self.players), self.team)
+
+    def test_eq_and_hash(self):
+        compact_team = CompactTeam.from_team(self.team)
+        self.assertEqual(compact_team, CompactTeam(tuple(range(1, 16)), 10, 1))
+        self.assertEqual(
+            hash(compact_team), hash(CompactTeam(tuple(range(1, 16)), 10, 1))
+        )
+        self.assertNotEqual(compact_team, CompactTeam(tuple(range(1, 16)), 10, 2))
+        self.assertLess(
+            CompactTeam(tuple(range(1, 16)), 5, 2), compact_team, "Less money in bank"
+        )
+
+    def test_contains(self):
+        compact_team = CompactTeam.from_team(self.team)
+        self.assertIn(8, compact_team)
+        self.assertNotIn(100, compact_team)
+        self.assertNotIn(0, compact_team)
+
+    def test_transfer_player_matches_team(self):
+        out_player = self.players[8]
+        compact_team = CompactTeam.from_team(self.team).transfer_player(
+            out_player, self.candidate
+        )
+        self.assertEqual(
+            compact_team,
+            CompactTeam.from_team(
+                self.team.transfer_player(out_player, self.candidate)
+            ),
+        )
+        self.assertEqual(compact_team.money_in_bank, 5)
+        self.assertEqual(compact_team.free_transfers, 0)
+        self.assertEqual(compact_team.elements, tuple(sorted(compact_team.elements)))
+
+    def test_transfer_player_invalid(self):
+        compact_team = CompactTeam.from_team(self.team)
+        with self.assertRaises(ValueError, msg="Positions do not match"):
+            compact_team.transfer_player(self.players[1], self.candidate)
+        with self.assertRaises(ValueError, msg="Player not in squad"):
+            compact_team.transfer_player(self.candidate, self.players[8])
+
+    def test_is_feasible(self):
+        compact_team = CompactTeam.from_team(self.team)
+        self.assertTrue(compact_team.is_feasible(self.players))
+        self.assertFalse(
+            CompactTeam(compact_team.elements, -1, 1).is_feasible(self.players)
+        )
+        self.assertFalse(
+            CompactTeam(compact_team.elements[1:], 10, 1).is_feasible(self.players),
+            "Only one goalkeeper",
+        )
+        four_from_club_1 = {
+            element: Player.from_min_info(
+                element, player.position, 1 if element <= 4 else element, player.cost
+            )
+            for element, player in self.players.items()
+        }
+        self.assertFalse(
+            CompactTeam(compact_team.elements, 10, 1).is_feasible(four_from_club_1),
+            "Counts are taken from the players when they are not tracked",
+        )
+
+    def test_tracked_counts_match_players(self):
+        rng = random.Random(0)
+        players = dict(self.players)
+        for i in range(20):
+            player = Player.from_min_info(
+                element=200 + i,
+                position=rng.randint(1, 4),
+                club=rng.randint(1, 3),
+                cost=50,
+            )
+            players[player.element] = player
+        compact_team = CompactTeam.from_team(self.team)
+        for _ in range(200):
+            out_player = players[rng.choice(compact_team.elements)]
+            in_players = [
+                p
+                for p in players.values()
+                if p.position == out_player.position and p.element not in compact_team
+            ]
+            if not in_players:
+                continue
+            in_player = rng.choice(in_players)
+            child = compact_team.transfer_player(out_player, in_player)
+            untracked_child = CompactTeam(
+                child.elements, child.money_in_bank, child.free_transfers
+            )
+            self.assertEqual(child.is_feasible(), untracked_child.is_feasible(players))
+            if compact_team.can_transfer(out_player, in_player) is False:
+                self.assertFalse(child.is_feasible())
+            if child.is_feasible():
+                self.assertTrue(compact_team.can_transfer(out_player, in_player))
+            compact_team = child
+
+    def test_can_transfer(self):
+        compact_team = CompactTeam.from_team(self.team)
+        expensive = Player.from_min_info(element=101, position=3, club=30, cost=61)
+        self.assertFalse(compact_team.can_transfer(self.players[8], expensive))
+        self.assertTrue(
+            compact_team.can_transfer(
+                self.players[8], expensive, remaining_transfers=1
+            ),
+            "Money can be freed by a further transfer",
+        )
+        # club 1 already has player 1, so a third player from club 1 goes over the limit
+        for i in range(3):
+            club_1_player = Player.from_min_info(
+                element=110 + i, position=3, club=1, cost=50
+            )
+            self.assertEqual(
+                compact_team.can_transfer(self.players[8 + i], club_1_player), i < 2
+            )
+            compact_team = compact_team.transfer_player(
+                self.players[8 + i], club_1_player
+            )
+        self.assertFalse(compact_team.is_feasible())
+        self.assertEqual(compact_team.club_excess, 1)
+        self.assertTrue(
+            compact_team.can_transfer(
+                self.players[1], Player.from_min_info(300, 1, 40, 50)
+            ),
+            "Transferring out a club 1 player fixes the club limit",
+        )
@@ -110,6 +110,30 @@ class TestFormation(TestCase):
         ):
             formation.total_exp_points = 200
 
+    def test_from_validated(self):
+        with patch("fpl.Loader.get_position_info") as mock_get_position_info:
+            mock_get_position_info.side_effect = self.side_effect
+            formation = Formation(
+                total_exp_points=100,
+                gkps=frozenset([self.gkp]),
+                defs=frozenset([self.def1, self.def2, self.def3, self.def4]),
+                mids=frozenset([self.mids1, self.mids2, self.mids3]),
+                fwds=frozenset([self.fwd1, self.fwd2, self.fwd3]),
+                captain=self.captain,
+            )
+        trusted_formation = Formation._from_validated(
+            total_exp_points=100,
+            gkps=frozenset([self.gkp]),
+            defs=frozenset([self.def1, self.def2, self.def3, self.def4]),
+            mids=frozenset([self.mids1, self.mids2, self.mids3]),
+            fwds=frozenset([self.fwd1, self.fwd2, self.fwd3]),
+            captain=self.captain,
+        )
+        self.assertEqual(trusted_formation, formation)
+        self.assertEqual(hash(trusted_formation), hash(formation))
+        with self.assertRaises(FrozenInstanceError):
+            trusted_formation.total_exp_points = 200
+
     @skip("TODO: Implement this test")
     def test_str(self):
         pass
@@ -0,0 +1,136 @@
+"""
+Unit tests for the formation_cache module.
+Test cases:
+- TestFormationCache: Unit tests for the FormationCache class.
+"""
+
+import random
+import unittest
+from unittest.mock import patch
+from fpl import ExpectedPointsCalculator, FormationCache, Optimizer, Player, Team
+
+
+def position_info_side_effect(position_id: int) -> dict:
+    """Function to provide the side_effect for the mock of fpl.Loader.get_position_info"""
+    return {
+        1: {"squad_min_play": 1, "squad_max_play": 1},
+        2: {"squad_min_play": 3, "squad_max_play": 5},
+        3: {"squad_min_play": 2, "squad_max_play": 5},
+        4: {"squad_min_play": 1, "squad_max_play": 3},
+    }[position_id]
+
+
+class TestFormationCache(unittest.TestCase):
+    """Unit tests for the FormationCache class."""
+
+    def setUp(self):
+        patcher = patch("fpl.Loader.get_position_info")
+        self.addCleanup(patcher.stop)
+        patcher.start().side_effect = position_info_side_effect
+
+        players = [
+            Player.from_min_info(element=i, position=position, club=i, cost=50)
+            for i, position in enumerate([1] * 2 + [2] * 5 + [3] * 5 + [4] * 3, 1)
+        ]
+        self.team = Team(
+            money_in_bank=0,
+            free_transfers=1,
+            gkps=frozenset(players[0:2]),
+            defs=frozenset(players[2:7]),
+            mids=frozenset(players[7:12]),
+            fwds=frozenset(players[12:15]),
+        )
+        self.candidates = [
+            Player.from_min_info(element=100 + i, position=position, club=20, cost=50)
+            for i, position in enumerate([1, 2, 3, 4, 2, 3])
+        ]
+
+        rng = random.Random(0)
+        points = {
+            (element, gameweek): float(rng.randint(-2, 12))
+            for element in list(range(1, 16)) + [c.element for c in self.candidates]
+            for gameweek in range(1, 4)
+        }
+        self.calls = []
+
+        class MockCalculator(ExpectedPointsCalculator):
+            def get_expected_points(player_id: int, gameweek: int) -> float:
+                self.calls.append((player_id, gameweek))
+                return points[(player_id, gameweek)]
+
+        self.epc = MockCalculator
+
+    def test_matches_optimal_formation(self):
+        cache = FormationCache(self.epc)
+        squad = self.team.gkps | self.team.defs | self.team.mids | self.team.fwds
+        for candidate in self.candidates:
+            for out_player in squad:
+                if out_player.position != candidate.position:
+                    continue
+                team = self.team.transfer_player(out_player, candidate)
+                for gameweek in range(1, 4):
+                    self.assertAlmostEqual(
+                        cache.get_total_exp_points(team, gameweek),
+                        Optimizer.calc_optimal_formation(
+                            team, self.epc, gameweek
+                        ).total_exp_points,
+                    )
+
+    def test_discounted_reward_team(self):
+        cache = FormationCache(self.epc)
+        for gamma in [1, 0.5]:
+            self.assertAlmostEqual(
+                Optimizer.calc_discounted_reward_team(
+                    self.team, self.epc, 1, 3, gamma, cache=cache
+                ),
+                Optimizer.calc_discounted_reward_team(self.team, self.epc, 1, 3, gamma),
+            )
+
+    def test_hits(self):
+        cache = FormationCache(self.epc)
+        cache.get_total_exp_points(self.team, 1)
+        self.assertEqual(cache.stats().formation_misses, 1)
+        self.assertEqual(cache.stats().position_misses, 4)
+        self.assertEqual(len(self.calls), 15)
+
+        # only the money in the bank and free transfers differ so the squad is reused
+        cache.get_total_exp_points(
+            Team._from_validated(
+                5,
+                2,
+                self.team.gkps,
+                self.team.defs,
+                self.team.mids,
+                self.team.fwds,
+            ),
+            1,
+        )
+        self.assertEqual(cache.stats().formation_hits, 1)
+
+        # a transfer of a forward reuses the other three positions
+        out_player = next(iter(self.team.fwds))
+        cache.get_total_exp_points(
+            self.team.transfer_player(out_player, self.candidates[3]), 1
+        )
+        stats = cache.stats()
+        self.assertEqual((stats.formation_hits, stats.formation_misses), (1, 2))
+        self.assertEqual((stats.position_hits, stats.position_misses), (3, 5))
+        self.assertAlmostEqual(stats.formation_hit_rate, 1 / 3)
+        self.assertAlmostEqual(stats.position_hit_rate, 3 / 8)
+        # only the new forward is passed to the calculator
+        self.assertEqual(len(self.calls), 16)
+
+        cache.clear()
+        self.assertEqual(cache.stats().formation_hit_rate, 0)
+
+    def test_invalid_squad(self):
+        cache = FormationCache(self.epc)
+        team = Team._from_validated(
+            0, 1, frozenset(), self.team.defs, self.team.mids, self.team.fwds
+        )
+        with self.assertRaises(ValueError):
+            cache.get_total_exp_points(team, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
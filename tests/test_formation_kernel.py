@@ -0,0 +1,136 @@
+"""
+Unit tests for the formation_kernel module.
+Test cases:
+- TestGetValidFormations: Unit tests for the get_valid_formations function.
+- TestCalcOptimalFormationArrays: Unit tests for the calc_optimal_formation_arrays function.
+- TestCalcOptimalFormationBatch: Unit tests for the calc_optimal_formation_batch function.
+"""
+
+import unittest
+from itertools import combinations
+from unittest.mock import patch
+import numpy as np
+from fpl import calc_optimal_formation_arrays, calc_optimal_formation_batch
+from fpl.formation_kernel import get_valid_formations
+
+
+def position_info_side_effect(position_id: int) -> dict:
+    """Function to provide the side_effect for the mock of fpl.Loader.get_position_info"""
+    return {
+        1: {"squad_min_play": 1, "squad_max_play": 1},
+        2: {"squad_min_play": 3, "squad_max_play": 5},
+        3: {"squad_min_play": 2, "squad_max_play": 5},
+        4: {"squad_min_play": 1, "squad_max_play": 3},
+    }[position_id]
+
+
+POSITIONS = np.array([1] * 2 + [2] * 5 + [3] * 5 + [4] * 3)
+
+
+def brute_force_total(exp_points: np.ndarray) -> float:
+    """Find the best total of a single gameweek by trying every starting eleven."""
+    formations = set(get_valid_formations())
+    best = None
+    for starters in combinations(range(15), 11):
+        counts = tuple(int(np.sum(POSITIONS[list(starters)] == p)) for p in range(1, 5))
+        if counts not in formations:
+            continue
+        points = exp_points[list(starters)]
+        total = points.sum() + max(points.max(), 0)
+        best = total if best is None else max(best, total)
+    return best
+
+
+class TestGetValidFormations(unittest.TestCase):
+    """Unit tests for the get_valid_formations function."""
+
+    @patch("fpl.Loader.get_position_info")
+    def test_valid_formations(self, mock_get_position_info):
+        mock_get_position_info.side_effect = position_info_side_effect
+        formations = get_valid_formations()
+        self.assertEqual(len(formations), 8)
+        self.assertIn((1, 4, 4, 2), formations)
+        self.assertIn((1, 5, 2, 3), formations)
+        self.assertNotIn((1, 2, 5, 3), formations)
+
+
+class TestCalcOptimalFormationArrays(unittest.TestCase):
+    """Unit tests for the calc_optimal_formation_arrays function."""
+
+    def setUp(self):
+        patcher = patch("fpl.Loader.get_position_info")
+        self.addCleanup(patcher.stop)
+        patcher.start().side_effect = position_info_side_effect
+
+    def test_matches_brute_force(self):
+        rng = np.random.default_rng(0)
+        exp_points = rng.integers(-2, 12, size=(15, 6)).astype(float)
+        result = calc_optimal_formation_arrays(exp_points, POSITIONS)
+        self.assertEqual(result.mask.shape, (15, 6))
+        for h in range(6):
+            self.assertAlmostEqual(
+                result.total_exp_points[h], brute_force_total(exp_points[:, h])
+            )
+            self.assertEqual(result.mask[:, h].sum(), 11)
+            captain_points = exp_points[result.captain[h], h]
+            self.assertTrue(result.mask[result.captain[h], h])
+            self.assertEqual(captain_points, exp_points[result.mask[:, h], h].max())
+            starters = exp_points[result.mask[:, h], h]
+            self.assertAlmostEqual(
+                result.total_exp_points[h], starters.sum() + captain_points
+            )
+
+    def test_row_order_does_not_matter(self):
+        rng = np.random.default_rng(1)
+        exp_points = rng.random((15, 4))
+        permutation = rng.permutation(15)
+        result = calc_optimal_formation_arrays(exp_points, POSITIONS)
+        permuted = calc_optimal_formation_arrays(
+            exp_points[permutation], POSITIONS[permutation]
+        )
+        np.testing.assert_allclose(result.total_exp_points, permuted.total_exp_points)
+        np.testing.assert_array_equal(result.mask[permutation], permuted.mask)
+
+    def test_no_captain_when_no_points(self):
+        result = calc_optimal_formation_arrays(np.zeros((15, 2)), POSITIONS)
+        np.testing.assert_array_equal(result.captain, [-1, -1])
+        np.testing.assert_array_equal(result.total_exp_points, [0, 0])
+
+    def test_invalid_shapes(self):
+        with self.assertRaises(ValueError):
+            calc_optimal_formation_arrays(np.zeros((15, 2)), POSITIONS[:14])
+        with self.assertRaises(ValueError, msg="Not enough defenders"):
+            calc_optimal_formation_arrays(np.zeros((12, 1)), POSITIONS[3:])
+
+
+class TestCalcOptimalFormationBatch(unittest.TestCase):
+    """Unit tests for the calc_optimal_formation_batch function."""
+
+    def setUp(self):
+        patcher = patch("fpl.Loader.get_position_info")
+        self.addCleanup(patcher.stop)
+        patcher.start().side_effect = position_info_side_effect
+
+    def test_matches_single_squads(self):
+        rng = np.random.default_rng(2)
+        exp_points = rng.integers(-2, 12, size=(20, 15, 3)).astype(float)
+        positions = np.array([rng.permutation(POSITIONS) for _ in range(20)])
+        result = calc_optimal_formation_batch(exp_points, positions)
+        self.assertEqual(result.mask.shape, (20, 15, 3))
+        for i in range(20):
+            single = calc_optimal_formation_arrays(exp_points[i], positions[i])
+            np.testing.assert_allclose(
+                result.total_exp_points[i], single.total_exp_points
+            )
+            np.testing.assert_array_equal(result.mask[i], single.mask)
+            np.testing.assert_array_equal(result.captain[i], single.captain)
+
+    def test_invalid_shapes(self):
+        positions = np.array([POSITIONS, POSITIONS])
+        with self.assertRaises(ValueError):
+            calc_optimal_formation_batch(np.zeros((2, 15)), positions)
+        with self.assertRaises(ValueError, msg="Squads with different positions"):
+            calc_optimal_formation_batch(
+                np.zeros((2, 15, 1)),
+                np.array([POSITIONS, np.sort(POSITIONS)[::-1] % 4 + 1]),
+            )
@@ -0,0 +1,126 @@
+"""
+Unit tests for the incremental_scorer module.
+Test cases:
+- TestIncrementalScorer: Unit tests for the IncrementalScorer class.
+"""
+
+import random
+import unittest
+from unittest.mock import patch
+from fpl import ExpectedPointsCalculator, Team, Player, Optimizer, IncrementalScorer
+
+
+def position_info_side_effect(position_id: int) -> dict:
+    """Function to provide the side_effect for the mock of fpl.Loader.get_position_info"""
+    return {
+        1: {"squad_min_play": 1, "squad_max_play": 1},
+        2: {"squad_min_play": 3, "squad_max_play": 5},
+        3: {"squad_min_play": 2, "squad_max_play": 5},
+        4: {"squad_min_play": 1, "squad_max_play": 3},
+    }[position_id]
+
+
+class TestIncrementalScorer(unittest.TestCase):
+    """Unit tests for the IncrementalScorer class."""
+
+    def setUp(self):
+        patcher = patch("fpl.Loader.get_position_info")
+        self.addCleanup(patcher.stop)
+        patcher.start().side_effect = position_info_side_effect
+
+        players = [
+            Player.from_min_info(element=i, position=position, club=i, cost=50)
+            for i, position in enumerate([1] * 2 + [2] * 5 + [3] * 5 + [4] * 3, 1)
+        ]
+        self.team = Team(
+            money_in_bank=0,
+            free_transfers=1,
+            gkps=frozenset(players[0:2]),
+            defs=frozenset(players[2:7]),
+            mids=frozenset(players[7:12]),
+            fwds=frozenset(players[12:15]),
+        )
+        self.candidates = [
+            Player.from_min_info(element=100 + i, position=position, club=20, cost=50)
+            for i, position in enumerate([1, 2, 3, 4, 2, 3])
+        ]
+
+        rng = random.Random(0)
+        points = {
+            (element, gameweek): float(rng.randint(0, 12))
+            for element in list(range(1, 16)) + [c.element for c in self.candidates]
+            for gameweek in range(1, 4)
+        }
+        self.calls = []
+
+        class MockCalculator(ExpectedPointsCalculator):
+            def get_expected_points(player_id: int, gameweek: int) -> float:
+                self.calls.append((player_id, gameweek))
+                return points[(player_id, gameweek)]
+
+        self.epc = MockCalculator
+
+    def test_matches_optimal_formation(self):
+        scorer = IncrementalScorer(self.team, self.epc, gameweek=1, horizon=3)
+        for h in range(3):
+            formation = Optimizer.calc_optimal_formation(self.team, self.epc, 1 + h)
+            self.assertAlmostEqual(
+                scorer.total_exp_points(h), formation.total_exp_points
+            )
+            self.assertEqual(
+                scorer.calc_optimal_formation(h).total_exp_points,
+                scorer.total_exp_points(h),
+            )
+
+    def test_transfer_matches_rescoring_from_scratch(self):
+        scorer = IncrementalScorer(self.team, self.epc, gameweek=1, horizon=3)
+        for candidate in self.candidates:
+            out_players = {
+                1: self.team.gkps,
+                2: self.team.defs,
+                3: self.team.mids,
+                4: self.team.fwds,
+            }[candidate.position]
+            for out_player in out_players:
+                child = scorer.transfer_player(out_player, candidate)
+                self.assertEqual(
+                    child.team, self.team.transfer_player(out_player, candidate)
+                )
+                self.assertAlmostEqual(
+                    child.calc_discounted_reward(-3.2, gamma=0.5),
+                    Optimizer.calc_discounted_reward_team(
+                        child.team, self.epc, gameweek=1, horizon=3, gamma=0.5
+                    ),
+                )
+
+    def test_two_transfers_match_fresh_scorer(self):
+        scorer = IncrementalScorer(self.team, self.epc, gameweek=1, horizon=3)
+        out_mid = sorted(self.team.mids)[0]
+        out_def = sorted(self.team.defs)[0]
+        child = scorer.transfer_player(out_mid, self.candidates[2]).transfer_player(
+            out_def, self.candidates[1]
+        )
+        fresh = IncrementalScorer(child.team, self.epc, gameweek=1, horizon=3)
+        for h in range(3):
+            self.assertAlmostEqual(child.total_exp_points(h), fresh.total_exp_points(h))
+            self.assertEqual(child.captain(h), fresh.captain(h))
+            self.assertEqual(
+                child.calc_optimal_formation(h), fresh.calc_optimal_formation(h)
+            )
+
+    def test_expected_points_queried_once(self):
+        scorer = IncrementalScorer(self.team, self.epc, gameweek=1, horizon=3)
+        out_player = sorted(self.team.fwds)[0]
+        scorer.transfer_player(out_player, self.candidates[3])
+        scorer.transfer_player(out_player, self.candidates[3])
+        self.assertEqual(len(self.calls), len(set(self.calls)))
+        self.assertEqual(len(self.calls), 16 * 3)
+
+    def test_captain_not_doubled_when_no_points(self):
+        class MockCalculatorZero(ExpectedPointsCalculator):
+            def get_expected_points(player_id: int, gameweek: int) -> float:
+                return 0
+
+        scorer = IncrementalScorer(self.team, MockCalculatorZero, gameweek=1, horizon=1)
+        self.assertEqual(scorer.total_exp_points(0), 0)
+        self.assertIsNone(scorer.captain(0))
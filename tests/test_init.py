@@ -0,0 +1,38 @@
+"""
+Unit tests for the lazy imports of the fpl package.
+Test cases:
+- TestLazyImports: Unit tests for the module level __getattr__ of the fpl package.
+"""
+
+import subprocess
+import sys
+import unittest
+import fpl
+
+
+class TestLazyImports(unittest.TestCase):
+    """Unit tests for the module level __getattr__ of the fpl package."""
+
+    def test_public_names(self):
+        for name in fpl.__all__:
+            self.assertEqual(getattr(fpl, name).__name__, name)
+        self.assertTrue(set(fpl.__all__) <= set(dir(fpl)))
+        with self.assertRaises(AttributeError):
+            fpl.not_a_name
+
+    def test_core_imports_are_light(self):
+        # a fresh interpreter so that modules imported by other tests do not count
+        code = (
+            "import sys\n"
+            "from fpl import Loader, Player, Team\n"
+            "print(','.join(m for m in ('pandas', 'numpy', 'requests', 'fuzzywuzzy')"
+            " if m in sys.modules))\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        self.assertEqual(result.stdout.strip(), "")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+"""
+Unit tests for the league_picks module.
+Test cases:
+- TestPicksTable: Unit tests for the PicksTable class.
+"""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+import numpy as np
+from fpl import PicksTable
+
+
+def picks_response(elements, captain, active_chip=None, points=50, cost=0):
+    """Return a picks response of the FPL API with the first 11 elements on the pitch."""
+    return {
+        "active_chip": active_chip,
+        "entry_history": {"points": points, "event_transfers_cost": cost},
+        "picks": [
+            {
+                "element": element,
+                "position": position,
+                "multiplier": (
+                    0
+                    if position > 11
+                    else (3 if active_chip == "3xc" else 2) if element == captain else 1
+                ),
+            }
+            for position, element in enumerate(elements, 1)
+        ],
+    }
+
+
+class TestPicksTable(unittest.TestCase):
+    """Unit tests for the PicksTable class."""
+
+    def setUp(self):
+        self.picks = {
+            (20, 1): picks_response(range(1, 16), captain=1),
+            (10, 1): picks_response(range(2, 17), captain=2, cost=4),
+            (10, 2): picks_response(range(2, 17), captain=16, active_chip="3xc"),
+        }
+
+    def test_from_picks(self):
+        table = PicksTable.from_picks(self.picks)
+        self.assertEqual(table.manager_ids.tolist(), [10, 20])
+        self.assertEqual(table.gameweeks.tolist(), [1, 2])
+        self.assertEqual(table.elements.shape, (2, 2, 15))
+        self.assertEqual(table.available.tolist(), [[True, True], [True, False]])
+        self.assertEqual(table.elements[1, 0].tolist(), list(range(1, 16)))
+        self.assertEqual(table.elements[1, 1].tolist(), [0] * 15)
+        self.assertEqual(table.points.tolist(), [[46, 50], [50, 0]])
+        self.assertEqual(table.active_chips[0, 1], "3xc")
+
+    def test_aggregates(self):
+        table = PicksTable.from_picks(self.picks)
+        ownership = table.ownership()
+        effective_ownership = table.effective_ownership()
+        captaincy = table.captaincy()
+        self.assertEqual(ownership.shape, (2, 17))
+        # gameweek 1: element 1 is owned and captained by one of two managers
+        self.assertEqual(ownership[0, 1], 50)
+        self.assertEqual(effective_ownership[0, 1], 100)
+        self.assertEqual(captaincy[0, 1], 50)
+        # element 2 is captained by the other manager, element 12 is on one bench and on the pitch of the other team
+        self.assertEqual(effective_ownership[0, 2], 150)
+        self.assertEqual(ownership[0, 12], 100)
+        self.assertEqual(effective_ownership[0, 12], 50)
+        # gameweek 2: only one manager is available, who triple captains element 16 from the bench
+        self.assertEqual(ownership[1, 2], 100)
+        self.assertEqual(effective_ownership[1, 16], 0)
+        self.assertEqual(ownership[1, 1], 0)
+        self.assertEqual(table.ownership(n_elements=100).shape, (2, 100))
+
+    def test_fetch(self):
+        def get_manager_picks(manager_id, gameweek):
+            if (manager_id, gameweek) not in self.picks:
+                raise OSError("404 Client Error")
+            return self.picks[manager_id, gameweek]
+
+        with patch(
+            "fpl.loader.Loader.get_manager_picks", side_effect=get_manager_picks
+        ) as mock_get_manager_picks:
+            table = PicksTable.fetch([10, 20], [1, 2])
+        self.assertEqual(mock_get_manager_picks.call_count, 4)
+        self.assertEqual(list(table.errors), [(20, 2)])
+        np.testing.assert_array_equal(
+            table.elements, PicksTable.from_picks(self.picks).elements
+        )
+
+    def test_select_and_save(self):
+        table = PicksTable.from_picks(self.picks).select([20])
+        self.assertEqual(table.manager_ids.tolist(), [20])
+        self.assertEqual(table.effective_ownership()[0, 1], 200)
+        with self.assertRaises(KeyError):
+            table.select([10])
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = os.path.join(tmp_dir, "picks.npz")
+            table.save(filename)
+            loaded = PicksTable.load(filename)
+        np.testing.assert_array_equal(loaded.elements, table.elements)
+        np.testing.assert_array_equal(loaded.active_chips, table.active_chips)
+
+
+if __name__ == "__main__":
+    unittest.main()
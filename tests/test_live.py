@@ -0,0 +1,171 @@
+"""
+Unit tests for the live module.
+Test cases:
+- TestLiveSquads: Unit tests for the LiveSquads class.
+- TestLivePoller: Unit tests for the LivePoller class.
+"""
+
+import unittest
+from unittest.mock import patch
+import numpy as np
+from fpl import LivePoller, LiveSquads, PlayerRegistry
+from tests.test_batch_evaluator import position_info_side_effect
+
+# starters: one goalkeeper, four defenders, four midfielders and two forwards, then the bench in order
+POSITIONS = [1, 2, 2, 2, 2, 3, 3, 3, 3, 4, 4, 1, 2, 3, 4]
+
+
+def picks_response(captain: int, vice_captain: int, active_chip=None):
+    """Return a picks response of the FPL API for elements 1 to 15 in order."""
+    return {
+        "active_chip": active_chip,
+        "picks": [
+            {
+                "element": position,
+                "position": position,
+                "is_captain": position == captain,
+                "is_vice_captain": position == vice_captain,
+            }
+            for position in range(1, 16)
+        ],
+    }
+
+
+def live_response(stats):
+    """Return a live response of the FPL API from a dictionary from element id to points and minutes."""
+    return {
+        "elements": [
+            {"id": element, "stats": {"total_points": points, "minutes": minutes}}
+            for element, (points, minutes) in stats.items()
+        ]
+    }
+
+
+class TestLiveSquads(unittest.TestCase):
+    """Unit tests for the LiveSquads class."""
+
+    def setUp(self):
+        patcher = patch("fpl.Loader.get_position_info")
+        self.addCleanup(patcher.stop)
+        patcher.start().side_effect = position_info_side_effect
+
+    def squads(self, positions, active_chip=""):
+        return LiveSquads(
+            np.array([1]),
+            np.arange(1, 16)[None, :],
+            np.array([positions]),
+            np.array([9]),
+            np.array([0]),
+            np.array([active_chip]),
+        )
+
+    def test_formation(self):
+        # three defenders start, so an absent defender is replaced by the defender rather than the first substitute
+        squads = self.squads([1, 2, 2, 2, 3, 3, 3, 3, 3, 4, 4, 1, 4, 2, 3])
+        points = np.full(16, 2)
+        minutes = np.full(16, 90)
+        minutes[2] = 0
+        points[2] = 0
+        points[14] = 5
+        finished = np.ones(16, dtype=bool)
+        self.assertEqual(squads.update(points, minutes, finished).tolist(), [0])
+        self.assertEqual(squads.multipliers[0].tolist()[1:3], [0, 1])
+        self.assertEqual(squads.multipliers[0].tolist()[11:], [0, 0, 1, 0])
+        self.assertEqual(squads.totals[0], 2 * 9 + 2 * 2 + 5)
+
+        # the fixture of the defender is not finished, so they may still play
+        finished[2] = False
+        squads.update(points, minutes, finished, changed=np.array([2]))
+        self.assertEqual(squads.totals[0], 2 * 9 + 2 * 2)
+
+    def test_bench_boost(self):
+        squads = self.squads(POSITIONS, "bboost")
+        squads.update(np.full(16, 1), np.full(16, 90), np.ones(16, dtype=bool))
+        self.assertEqual(squads.totals[0], 16)
+        # squads without a changed player are not rescored
+        self.assertEqual(
+            squads.update(
+                np.full(16, 2), np.full(16, 90), np.ones(16, dtype=bool), np.array([20])
+            ).tolist(),
+            [],
+        )
+        self.assertEqual(squads.totals[0], 16)
+
+
+class TestLivePoller(unittest.TestCase):
+    """Unit tests for the LivePoller class."""
+
+    def setUp(self):
+        patcher = patch("fpl.Loader.get_position_info")
+        self.addCleanup(patcher.stop)
+        patcher.start().side_effect = position_info_side_effect
+        registry = PlayerRegistry(
+            [
+                {
+                    "id": element,
+                    "web_name": str(element),
+                    "element_type": position,
+                    # elements 1 to 8 play for club 1, the others for club 2
+                    "team": 1 if element <= 8 else 2,
+                    "now_cost": 50,
+                }
+                for element, position in enumerate(POSITIONS, 1)
+            ]
+        )
+        squads = LiveSquads.from_picks(
+            {
+                100: picks_response(captain=10, vice_captain=1),
+                200: picks_response(captain=2, vice_captain=10, active_chip="3xc"),
+            },
+            registry,
+        )
+        self.poller = LivePoller(5, squads, registry=registry)
+        self.updates = []
+        self.poller.subscribe(self.updates.append)
+
+    def poll(self, stats, finished: bool):
+        fixtures = [{"team_h": 1, "team_a": 2, "finished_provisional": finished}]
+        with patch(
+            "fpl.loader.Loader.get_live_gameweek", return_value=live_response(stats)
+        ), patch("fpl.loader.Loader.get_live_fixtures", return_value=fixtures):
+            return self.poller.poll()
+
+    def test_poll(self):
+        stats = {element: (0, 0) for element in range(1, 16)}
+        stats[10] = (5, 30)
+        update = self.poll(stats, finished=False)
+        self.assertEqual(update.elements.tolist(), [10])
+        self.assertEqual(update.points.tolist(), [5])
+        self.assertEqual(update.squad_ids.tolist(), [100, 200])
+        self.assertEqual(update.totals.tolist(), [10, 5])
+
+        # every match is finished: element 2 did not play and is replaced by the first substitute who played,
+        # element 14, and the vice captain of the second squad takes the triple captaincy
+        stats = {element: (2, 90) for element in range(1, 16)}
+        stats[2] = (0, 0)
+        stats[13] = (0, 0)
+        stats[14] = (3, 90)
+        stats[10] = (5, 90)
+        update = self.poll(stats, finished=True)
+        self.assertEqual(update.elements.tolist(), list(range(1, 16)))
+        self.assertEqual(update.totals.tolist(), [31, 36])
+        self.assertEqual(len(self.updates), 2)
+
+        # nothing changed, so the subscribers are not notified
+        update = self.poll(stats, finished=True)
+        self.assertEqual(len(update.elements), 0)
+        self.assertEqual(len(update.squad_ids), 0)
+        self.assertEqual(len(self.updates), 2)
+
+    def test_run(self):
+        with patch(
+            "fpl.loader.Loader.get_live_gameweek", side_effect=OSError("timeout")
+        ), patch("fpl.loader.Loader.get_live_fixtures", return_value=[]):
+            self.poller.interval_s = 0
+            self.poller.run(max_polls=2)
+        self.assertIsInstance(self.poller.last_error, OSError)
+        self.assertEqual(self.updates, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,8 @@
+import json
+import os
+import tempfile
 import unittest
+from datetime import datetime, timezone
 from fpl import Loader, Player
 from unittest.mock import patch
 
@@ -56,9 +60,87 @@ class TestLoader(unittest.TestCase):
         self.assertEqual(len(my_team.mids), 5)
         self.assertEqual(len(my_team.fwds), 3)
 
-    @unittest.skip("TODO: Implement this test")
-    def test_get_next_gameweek(self):
-        pass
+    @patch("fpl.loader.Loader.get_static_info")
+    def test_get_next_gameweek(self, mock_get_static_info):
+        mock_get_static_info.return_value = {
+            "events": [
+                {"id": 2, "deadline_time": "2024-08-24T10:00:00Z"},
+                {"id": 1, "deadline_time": "2024-08-16T17:30:00Z"},
+            ]
+        }
+        self.assertEqual(Loader.get_next_gameweek("2024-08-16 17:00:00"), 1)
+        self.assertEqual(Loader.get_next_gameweek("2024-08-16T17:30:00Z"), 2)
+        self.assertEqual(Loader.get_next_gameweek("2024-08-16T20:00:00+02:00"), 2)
+        self.assertEqual(Loader.get_next_gameweek("2000-01-01"), 1)
+        self.assertEqual(
+            Loader.get_next_gameweek(datetime(2024, 8, 20, tzinfo=timezone.utc)), 2
+        )
+        with self.assertRaises(ValueError):
+            Loader.get_next_gameweek("2024-08-25")
+
+    def test_configure_cache(self):
+        self.addCleanup(Loader.configure_cache)
+        with self.assertRaises(ValueError):
+            Loader.configure_cache(offline=True)
+        with tempfile.TemporaryDirectory() as cache_dir:
+            with self.assertRaises(ValueError):
+                Loader.configure_cache(cache_dir, offline=True, refresh=True)
+            Loader.configure_cache(cache_dir, offline=True)
+            self.assertEqual(
+                Loader._cache_path(
+                    "https://fantasy.premierleague.com/api/fixtures/?event=3"
+                ),
+                os.path.join(cache_dir, "fixtures_event_3.json"),
+            )
+            with patch("requests.get") as mock_get:
+                with self.assertRaises(FileNotFoundError):
+                    Loader.get_player_detailed_info(1)
+            mock_get.assert_not_called()
+
+            with open(os.path.join(cache_dir, "element-summary_1.json"), "w") as fd:
+                json.dump({"fixtures": []}, fd)
+            self.assertEqual(Loader.get_player_detailed_info(1), {"fixtures": []})
+
+    @patch("fpl.loader.Loader._request_json")
+    def test_configure_static_info(self, mock_request_json):
+        self.addCleanup(Loader.configure_static_info)
+        mock_request_json.return_value = {
+            "elements": [
+                {
+                    "id": 1,
+                    "web_name": "Raya",
+                    "element_type": 1,
+                    "team": 1,
+                    "now_cost": 55,
+                    "ict_index": "2.0",
+                    "influence": "3.0",
+                }
+            ],
+            "teams": [],
+            "element_types": [],
+            "game_settings": {},
+        }
+        Loader.configure_static_info(slim=True, fields={"elements": ["ict_index"]})
+        static_info = Loader.get_static_info()
+        self.assertNotIn("game_settings", static_info)
+        self.assertEqual(Loader.get_player_basic_info(1)["ict_index"], "2.0")
+        self.assertNotIn("influence", Loader.get_player_basic_info(1))
+        self.assertEqual(Loader.get_player_registry()[1].name, "Raya")
+        Loader.configure_static_info()
+        self.assertIn("game_settings", Loader.get_static_info())
+
+    @patch("fpl.loader.Loader._request_json")
+    def test_get_league_managers(self, mock_request_json):
+        mock_request_json.side_effect = [
+            {"standings": {"results": [{"entry": 7}, {"entry": 3}], "has_next": True}},
+            {"standings": {"results": [{"entry": 5}], "has_next": False}},
+        ]
+        self.assertEqual(Loader.get_league_managers(42), [7, 3, 5])
+        self.assertTrue(
+            mock_request_json.call_args[0][0].endswith(
+                "leagues-classic/42/standings/?page_standings=2"
+            )
+        )
 
     @unittest.skip("TODO: Implement this test")
     def test_get_my_historical_team_from_gameweek(self):
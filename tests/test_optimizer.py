@@ -5,10 +5,11 @@ Test cases:
 - TestOptimizerCalcDiscountedRewardPlayer: Unit tests for the calc_discounted_reward_player method of the Optimizer class.
 - TestOptimizerCalcDiscountedRewardTeam: Unit tests for the calc_discounted_reward_team method of the Optimizer class.
 - TestOptimizerCalcOptimalTeams: Unit tests for the calc_optimal_teams method of the Optimizer class.
+- TestOptimizerIterOptimalTeams: Unit tests for the iter_optimal_teams method of the Optimizer class.
+- TestOptimizerBeamSearch: Unit tests for the beam search mode and budgets of the calc_optimal_teams method.
 """
 
 import unittest
-import heapq
 from fpl import ExpectedPointsCalculator, Team, Player, Optimizer
 
 
@@ -534,7 +535,7 @@ class TestOptimizerCalcOptimalTeams(unittest.TestCase):
         self.assertEqual(
             len(top_three), 1, "Only one team possible because no candidates specified"
         )
-        x_score, x_team = heapq.heappop(top_three)
+        x_score, x_team = top_three[0]
         self.assertAlmostEqual(
             x_score, -2.4, "self.team has 1 free transfers corresponding to -2.4 points"
         )
@@ -560,7 +561,7 @@ class TestOptimizerCalcOptimalTeams(unittest.TestCase):
             1,
             "Invalid candidates so only the original team is feasible",
         )
-        x_score, x_team = heapq.heappop(top_three)
+        x_score, x_team = top_three[0]
         self.assertAlmostEqual(
             x_score, -2.4, "self.team has 1 free transfers corresponding to -2.4 points"
         )
@@ -588,7 +589,7 @@ class TestOptimizerCalcOptimalTeams(unittest.TestCase):
         )
         self.assertEqual(len(top_three), 3)
 
-        third_best_score, third_best_team = heapq.heappop(top_three)
+        third_best_score, third_best_team = top_three[2]
         self.assertAlmostEqual(
             third_best_score,
             -3.2,
@@ -597,7 +598,7 @@ class TestOptimizerCalcOptimalTeams(unittest.TestCase):
         self.assertEqual(third_best_team.money_in_bank, 0)
         self.assertEqual(third_best_team.free_transfers, 0)
 
-        second_best_score, second_best_team = heapq.heappop(top_three)
+        second_best_score, second_best_team = top_three[1]
         self.assertAlmostEqual(
             second_best_score,
             -3.2,
@@ -606,7 +607,7 @@ class TestOptimizerCalcOptimalTeams(unittest.TestCase):
         self.assertEqual(second_best_team.money_in_bank, 10)
         self.assertEqual(second_best_team.free_transfers, 0)
 
-        first_best_score, first_best_team = heapq.heappop(top_three)
+        first_best_score, first_best_team = top_three[0]
         self.assertAlmostEqual(first_best_score, -2.4, "No transfers made")
         self.assertEqual(first_best_team.money_in_bank, 0)
         self.assertEqual(first_best_team.free_transfers, 1)
@@ -629,7 +630,7 @@ class TestOptimizerCalcOptimalTeams(unittest.TestCase):
         )
         self.assertEqual(len(top_three), 3)
 
-        third_best_score, third_best_team = heapq.heappop(top_three)
+        third_best_score, third_best_team = top_three[2]
         self.assertAlmostEqual(
             third_best_score,
             -2.4,
@@ -638,7 +639,7 @@ class TestOptimizerCalcOptimalTeams(unittest.TestCase):
         self.assertEqual(third_best_team.money_in_bank, 0)
         self.assertEqual(third_best_team.free_transfers, 1)
 
-        second_best_score, second_best_team = heapq.heappop(top_three)
+        second_best_score, second_best_team = top_three[1]
         self.assertAlmostEqual(
             second_best_score,
             -3.2 + 2 * 10,
@@ -647,7 +648,7 @@ class TestOptimizerCalcOptimalTeams(unittest.TestCase):
         self.assertEqual(second_best_team.money_in_bank, 5)
         self.assertEqual(second_best_team.free_transfers, 0)
 
-        first_best_score, first_best_team = heapq.heappop(top_three)
+        first_best_score, first_best_team = top_three[0]
         self.assertAlmostEqual(
             first_best_score,
             -3.2 + 2 * 10,
@@ -678,7 +679,7 @@ class TestOptimizerCalcOptimalTeams(unittest.TestCase):
         )
         self.assertEqual(len(top_three), 3)
 
-        third_best_score, third_best_team = heapq.heappop(top_three)
+        third_best_score, third_best_team = top_three[2]
         self.assertEqual(
             third_best_score,
             10 + 10 - 2.4,
@@ -687,7 +688,7 @@ class TestOptimizerCalcOptimalTeams(unittest.TestCase):
         self.assertEqual(third_best_team.money_in_bank, 0)
         self.assertEqual(third_best_team.free_transfers, 1)
 
-        second_best_score, second_best_team = heapq.heappop(top_three)
+        second_best_score, second_best_team = top_three[1]
         self.assertEqual(
             second_best_score,
             10 + 10 + 3 - 3.2,
@@ -696,7 +697,7 @@ class TestOptimizerCalcOptimalTeams(unittest.TestCase):
         self.assertEqual(second_best_team.money_in_bank, 5)
         self.assertEqual(second_best_team.free_transfers, 0)
 
-        first_best_score, first_best_team = heapq.heappop(top_three)
+        first_best_score, first_best_team = top_three[0]
         self.assertEqual(
             first_best_score,
             10 + 10 + 3 - 3.2,
@@ -731,17 +732,17 @@ class TestOptimizerCalcOptimalTeams(unittest.TestCase):
         )
         self.assertEqual(len(top_three), 3)
 
-        third_best_score, third_best_team = heapq.heappop(top_three)
+        third_best_score, third_best_team = top_three[2]
         self.assertEqual(third_best_score, 10 + 10 - 3.2)
         self.assertEqual(third_best_team.money_in_bank, 5)
         self.assertEqual(third_best_team.free_transfers, 0)
 
-        second_best_score, second_best_team = heapq.heappop(top_three)
+        second_best_score, second_best_team = top_three[1]
         self.assertEqual(second_best_score, 10 + 10 - 3.2)
         self.assertEqual(second_best_team.money_in_bank, 10)
         self.assertEqual(second_best_team.free_transfers, 0)
 
-        first_best_score, first_best_team = heapq.heappop(top_three)
+        first_best_score, first_best_team = top_three[0]
         self.assertEqual(first_best_score, 10 + 10 - 2.4)
         self.assertEqual(first_best_team.money_in_bank, 0)
         self.assertEqual(
@@ -761,12 +762,12 @@ class TestOptimizerCalcOptimalTeams(unittest.TestCase):
         )
         self.assertEqual(len(top_three), 3)
 
-        third_best_score, third_best_team = heapq.heappop(top_three)
+        third_best_score, third_best_team = top_three[2]
         self.assertEqual(third_best_score, 20 + 20 - 2.4 * 2)
         self.assertEqual(third_best_team.money_in_bank, 0)
         self.assertEqual(third_best_team.free_transfers, 1)
 
-        second_best_score, second_best_team = heapq.heappop(top_three)
+        second_best_score, second_best_team = top_three[1]
         self.assertEqual(second_best_score, 20 + 20 + 4 - 3.2 * 2)
         self.assertEqual(
             second_best_team.money_in_bank,
@@ -779,7 +780,7 @@ class TestOptimizerCalcOptimalTeams(unittest.TestCase):
             "Based on two week horizon you should transfer him in",
         )
 
-        first_best_score, first_best_team = heapq.heappop(top_three)
+        first_best_score, first_best_team = top_three[0]
         self.assertEqual(first_best_score, 20 + 20 + 4 - 3.2 * 2)
         self.assertEqual(
             first_best_team.money_in_bank,
@@ -816,9 +817,9 @@ class TestOptimizerCalcOptimalTeams(unittest.TestCase):
         )
         self.assertEqual(len(top_three), 3)
 
-        third_best_score, third_best_team = heapq.heappop(top_three)
-        second_best_score, second_best_team = heapq.heappop(top_three)
-        first_best_score, first_best_team = heapq.heappop(top_three)
+        third_best_score, third_best_team = top_three[2]
+        second_best_score, second_best_team = top_three[1]
+        first_best_score, first_best_team = top_three[0]
         self.assertEqual(
             first_best_score,
             5 + 5 + 5 - 4,
@@ -875,10 +876,8 @@ class TestOptimizerCalcOptimalTeams(unittest.TestCase):
         )
 
         self.assertEqual(len(top_three_one_max_transfers), 3)
-        _, _ = heapq.heappop(top_three_one_max_transfers)
-        _, _ = heapq.heappop(top_three_one_max_transfers)
         first_best_score_one_max_transfers, first_best_team_one_max_transfers = (
-            heapq.heappop(top_three_one_max_transfers)
+            top_three_one_max_transfers[0]
         )
         self.assertEqual(
             first_best_score_one_max_transfers,
@@ -893,10 +892,8 @@ class TestOptimizerCalcOptimalTeams(unittest.TestCase):
         self.assertEqual(first_best_team_one_max_transfers.free_transfers, 0)
 
         self.assertEqual(len(top_three_two_max_transfers), 3)
-        _, _ = heapq.heappop(top_three_two_max_transfers)
-        _, _ = heapq.heappop(top_three_two_max_transfers)
         first_best_score_two_max_transfers, first_best_team_two_max_transfers = (
-            heapq.heappop(top_three_two_max_transfers)
+            top_three_two_max_transfers[0]
         )
         self.assertEqual(
             first_best_score_two_max_transfers,
@@ -910,6 +907,53 @@ class TestOptimizerCalcOptimalTeams(unittest.TestCase):
         )
         self.assertEqual(first_best_team_two_max_transfers.free_transfers, -1)
 
+    def test_optimize_team_k(self):
+        candidates = [
+            Player.from_min_info(element=200, position=3, club=20, cost=70),
+            Player.from_min_info(element=300, position=4, club=20, cost=70),
+        ]
+
+        class MockCalculator(ExpectedPointsCalculator):
+            def get_expected_points(player_id: int, gameweek: int) -> float:
+                return 5 if player_id in [200, 300] else 0
+
+        top_ten = Optimizer.calc_optimal_teams(
+            team,
+            candidates,
+            epc=MockCalculator,
+            gameweek=1,
+            horizon=1,
+            max_transfers=2,
+            k=10,
+        )
+        self.assertEqual(len(top_ten), 10)
+        scores = [result.score for result in top_ten]
+        self.assertEqual(scores, sorted(scores, reverse=True), "Ordered best first")
+        self.assertEqual(top_ten[0].score, 5 + 5 + 5 - 4)
+        self.assertEqual(len(set(result.team for result in top_ten)), 10)
+
+        top_one = Optimizer.calc_optimal_teams(
+            team,
+            candidates,
+            epc=MockCalculator,
+            gameweek=1,
+            horizon=1,
+            max_transfers=2,
+            k=1,
+        )
+        self.assertEqual(top_one, top_ten[:1])
+
+        with self.assertRaises(ValueError):
+            Optimizer.calc_optimal_teams(
+                team,
+                candidates,
+                epc=MockCalculator,
+                gameweek=1,
+                horizon=1,
+                max_transfers=2,
+                k=0,
+            )
+
     @unittest.skip("TODO: Implement this test")
     def test_optimize_team_wildcard(self):
         pass
@@ -917,3 +961,145 @@ class TestOptimizerCalcOptimalTeams(unittest.TestCase):
     @unittest.skip("TODO: Implement this test")
     def test_optimize_team_gamma(self):
         pass
+
+
+class TestOptimizerIterOptimalTeams(unittest.TestCase):
+    """Unit tests for the iter_optimal_teams method of the Optimizer class."""
+
+    def setUp(self):
+        self.candidates = [
+            Player.from_min_info(element=200, position=3, club=20, cost=70),
+            Player.from_min_info(element=300, position=4, club=20, cost=70),
+        ]
+
+        class MockCalculator(ExpectedPointsCalculator):
+            def get_expected_points(player_id: int, gameweek: int) -> float:
+                return 5 if player_id in [200, 300] else 0
+
+        self.epc = MockCalculator
+
+    def test_yields_improving_results(self):
+        progresses = list(
+            Optimizer.iter_optimal_teams(
+                team,
+                self.candidates,
+                epc=self.epc,
+                gameweek=1,
+                horizon=1,
+                max_transfers=2,
+            )
+        )
+        self.assertEqual(progresses[0].nodes_explored, 1, "Starts with the team")
+        self.assertEqual(len(progresses[0].results), 1)
+        nodes_explored = [progress.nodes_explored for progress in progresses]
+        self.assertEqual(nodes_explored, sorted(nodes_explored))
+        best_scores = [progress.results[0].score for progress in progresses]
+        self.assertEqual(best_scores, sorted(best_scores), "Incumbent never worsens")
+        self.assertEqual(
+            progresses[-1].results,
+            Optimizer.calc_optimal_teams(
+                team,
+                self.candidates,
+                epc=self.epc,
+                gameweek=1,
+                horizon=1,
+                max_transfers=2,
+            ),
+        )
+
+    def test_stop_early(self):
+        generator = Optimizer.iter_optimal_teams(
+            team,
+            self.candidates,
+            epc=self.epc,
+            gameweek=1,
+            horizon=1,
+            max_transfers=2,
+            k=1,
+        )
+        first = next(generator)
+        second = next(generator)
+        generator.close()
+        self.assertGreater(second.nodes_explored, first.nodes_explored)
+        self.assertGreater(second.results[0].score, first.results[0].score)
+
+
+class TestOptimizerBeamSearch(unittest.TestCase):
+    """Unit tests for the beam search mode and budgets of the calc_optimal_teams method."""
+
+    def setUp(self):
+        self.candidates = [
+            Player.from_min_info(element=200, position=3, club=20, cost=70),
+            Player.from_min_info(element=300, position=4, club=20, cost=70),
+            Player.from_min_info(element=400, position=2, club=19, cost=50),
+            Player.from_min_info(element=500, position=3, club=18, cost=45),
+        ]
+
+        class MockCalculator(ExpectedPointsCalculator):
+            def get_expected_points(player_id: int, gameweek: int) -> float:
+                return {200: 6, 300: 5, 400: 3, 500: 2}.get(player_id, gameweek % 2)
+
+        self.epc = MockCalculator
+        self.kwargs = dict(
+            team=team,
+            candidates=self.candidates,
+            epc=self.epc,
+            gameweek=1,
+            horizon=2,
+            max_transfers=3,
+            gamma=0.9,
+        )
+
+    def test_wide_beam_matches_exhaustive_search(self):
+        exhaustive = Optimizer.calc_optimal_teams(**self.kwargs)
+        for rank_by in ["score", "bound"]:
+            beam = Optimizer.calc_optimal_teams(
+                **self.kwargs, beam_width=10000, rank_by=rank_by
+            )
+            self.assertEqual(
+                [result.score for result in beam],
+                [result.score for result in exhaustive],
+            )
+
+    def test_narrow_beam_explores_fewer_teams(self):
+        exhaustive = list(Optimizer.iter_optimal_teams(**self.kwargs))
+        for rank_by in ["score", "bound"]:
+            beam = list(
+                Optimizer.iter_optimal_teams(
+                    **self.kwargs, beam_width=2, rank_by=rank_by
+                )
+            )
+            self.assertLess(beam[-1].nodes_explored, exhaustive[-1].nodes_explored)
+            self.assertLessEqual(
+                beam[-1].results[0].score, exhaustive[-1].results[0].score
+            )
+            self.assertEqual(len(beam[-1].results), 3)
+
+    def test_node_budget(self):
+        progresses = list(Optimizer.iter_optimal_teams(**self.kwargs, node_budget=20))
+        self.assertLessEqual(progresses[-1].nodes_explored, 20)
+        results = Optimizer.calc_optimal_teams(**self.kwargs, node_budget=1)
+        self.assertEqual(len(results), 1, "Only the original team is explored")
+        self.assertEqual(results[0].team, team)
+
+    def test_time_budget(self):
+        results = Optimizer.calc_optimal_teams(**self.kwargs, time_budget_s=0)
+        self.assertEqual(len(results), 1, "Only the original team is explored")
+        self.assertEqual(results[0].team, team)
+
+    def test_stop(self):
+        results = Optimizer.calc_optimal_teams(**self.kwargs, stop=lambda: True)
+        self.assertEqual(len(results), 1, "Only the original team is explored")
+        calls = []
+        progresses = list(
+            Optimizer.iter_optimal_teams(
+                **self.kwargs, stop=lambda: calls.append(1) or len(calls) > 10
+            )
+        )
+        self.assertLessEqual(progresses[-1].nodes_explored, 11)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            Optimizer.calc_optimal_teams(**self.kwargs, beam_width=0)
+        with self.assertRaises(ValueError):
+            Optimizer.calc_optimal_teams(**self.kwargs, rank_by="potato")
@@ -0,0 +1,134 @@
+"""
+Unit tests for the optimizer_stats module.
+Test cases:
+- TestOptimizerStats: Unit tests for recording OptimizerStats during a search of the Optimizer.
+"""
+
+import json
+import random
+import unittest
+from unittest.mock import patch
+from fpl import ExpectedPointsCalculator, Optimizer, OptimizerStats, Player, Team
+
+
+def position_info_side_effect(position_id: int) -> dict:
+    """Function to provide the side_effect for the mock of fpl.Loader.get_position_info"""
+    return {
+        1: {"squad_min_play": 1, "squad_max_play": 1},
+        2: {"squad_min_play": 3, "squad_max_play": 5},
+        3: {"squad_min_play": 2, "squad_max_play": 5},
+        4: {"squad_min_play": 1, "squad_max_play": 3},
+    }[position_id]
+
+
+class TestOptimizerStats(unittest.TestCase):
+    """Unit tests for recording OptimizerStats during a search of the Optimizer."""
+
+    def setUp(self):
+        patcher = patch("fpl.Loader.get_position_info")
+        self.addCleanup(patcher.stop)
+        patcher.start().side_effect = position_info_side_effect
+
+        players = [
+            Player.from_min_info(element=i, position=position, club=i, cost=50)
+            for i, position in enumerate([1] * 2 + [2] * 5 + [3] * 5 + [4] * 3, 1)
+        ]
+        self.team = Team(
+            money_in_bank=0,
+            free_transfers=1,
+            gkps=frozenset(players[0:2]),
+            defs=frozenset(players[2:7]),
+            mids=frozenset(players[7:12]),
+            fwds=frozenset(players[12:15]),
+        )
+        # the candidates share a club so at most three of them can be transferred in
+        self.candidates = [
+            Player.from_min_info(element=100 + i, position=position, club=20, cost=50)
+            for i, position in enumerate([1, 2, 3, 4])
+        ]
+
+        rng = random.Random(0)
+        points = {
+            (element, gameweek): float(rng.randint(0, 12))
+            for element in list(range(1, 16)) + [c.element for c in self.candidates]
+            for gameweek in range(1, 4)
+        }
+        self.calls = []
+
+        class MockCalculator(ExpectedPointsCalculator):
+            def get_expected_points(player_id: int, gameweek: int) -> float:
+                self.calls.append((player_id, gameweek))
+                return points[(player_id, gameweek)]
+
+        self.epc = MockCalculator
+
+    def test_same_results(self):
+        stats = OptimizerStats()
+        self.assertEqual(
+            Optimizer.calc_optimal_teams(
+                self.team, self.candidates, self.epc, 1, 3, 2, stats=stats
+            ),
+            Optimizer.calc_optimal_teams(self.team, self.candidates, self.epc, 1, 3, 2),
+        )
+
+    def test_counts(self):
+        stats = OptimizerStats()
+        results = Optimizer.calc_optimal_teams(
+            self.team, self.candidates, self.epc, 1, 3, 4, stats=stats
+        )
+        self.assertEqual(len(results), 3)
+        self.assertEqual([layer.n_transfers for layer in stats.layers], [1, 2, 3, 4])
+
+        # every candidate can replace every player of its position in the first layer
+        first = stats.layers[0]
+        self.assertEqual(first.nodes_generated, 2 + 5 + 5 + 3)
+        self.assertEqual(first.nodes_feasible, first.nodes_generated)
+        self.assertEqual(first.nodes_pruned, 0)
+        self.assertEqual(first.nodes_expanded, first.nodes_generated)
+        # a fourth player of club 20 can never be made feasible with the last transfer
+        self.assertGreater(stats.layers[3].nodes_pruned, 0)
+        # the same team is reached by making two transfers in either order
+        self.assertGreater(stats.layers[1].dedup_hits, 0)
+        self.assertEqual(
+            stats.nodes_generated, sum(l.nodes_generated for l in stats.layers)
+        )
+
+        # each (player, gameweek) pair is only passed to the calculator once
+        self.assertEqual(stats.epc_calls, len(self.calls))
+        self.assertEqual(stats.epc_calls, 19 * 3)
+        self.assertEqual(sum(stats.epc_latency_histogram.values()), stats.epc_calls)
+        self.assertGreater(stats.points_cache_hit_rate, 0.9)
+
+        for phase in ["setup", "search", "total"]:
+            self.assertIn(phase, stats.phase_times_s)
+        self.assertGreaterEqual(
+            stats.phase_times_s["total"], stats.phase_times_s["search"]
+        )
+        # exhaustive searches have no beam selection phase
+        self.assertNotIn("beam_selection", stats.phase_times_s)
+        json.dumps(stats.to_dict())
+
+    def test_dedup_hits(self):
+        stats = OptimizerStats()
+        Optimizer.calc_optimal_teams(
+            self.team, self.candidates, self.epc, 1, 3, 2, stats=stats
+        )
+        # two transfers of different candidates reach the same squad in either order,
+        # so every squad of the second layer is generated exactly twice
+        second = stats.layers[1]
+        self.assertEqual(second.nodes_pruned, 0)
+        self.assertEqual(second.dedup_hits * 2, second.nodes_generated)
+
+    def test_on_layer(self):
+        layers = []
+        stats = OptimizerStats(on_layer=layers.append)
+        Optimizer.calc_optimal_teams(
+            self.team, self.candidates, self.epc, 1, 3, 2, beam_width=5, stats=stats
+        )
+        self.assertEqual(layers, stats.layers)
+        self.assertEqual(layers[0].nodes_expanded, 5)
+        self.assertIn("beam_selection", stats.phase_times_s)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+"""
+Unit tests for the parameter_sweep module.
+Test cases:
+- TestParameterSweep: Unit tests for the ParameterSweep class.
+"""
+
+import random
+import unittest
+from unittest.mock import patch
+from fpl import ExpectedPointsCalculator, Optimizer, ParameterSweep, Player, Team
+
+
+def position_info_side_effect(position_id: int) -> dict:
+    """Function to provide the side_effect for the mock of fpl.Loader.get_position_info"""
+    return {
+        1: {"squad_min_play": 1, "squad_max_play": 1},
+        2: {"squad_min_play": 3, "squad_max_play": 5},
+        3: {"squad_min_play": 2, "squad_max_play": 5},
+        4: {"squad_min_play": 1, "squad_max_play": 3},
+    }[position_id]
+
+
+class TestParameterSweep(unittest.TestCase):
+    """Unit tests for the ParameterSweep class."""
+
+    def setUp(self):
+        patcher = patch("fpl.Loader.get_position_info")
+        self.addCleanup(patcher.stop)
+        patcher.start().side_effect = position_info_side_effect
+
+        players = [
+            Player.from_min_info(element=i, position=position, club=i, cost=50)
+            for i, position in enumerate([1] * 2 + [2] * 5 + [3] * 5 + [4] * 3, 1)
+        ]
+        team = Team(
+            money_in_bank=0,
+            free_transfers=1,
+            gkps=frozenset(players[0:2]),
+            defs=frozenset(players[2:7]),
+            mids=frozenset(players[7:12]),
+            fwds=frozenset(players[12:15]),
+        )
+        candidates = [
+            Player.from_min_info(element=100 + i, position=position, club=20, cost=50)
+            for i, position in enumerate([1, 2, 3, 4])
+        ]
+        self.teams = [team]
+        for candidate in candidates:
+            out_player = next(p for p in players if p.position == candidate.position)
+            self.teams.append(team.transfer_player(out_player, candidate))
+
+        rng = random.Random(0)
+        points = {
+            (element, gameweek): float(rng.randint(-2, 12))
+            for element in list(range(1, 16)) + [c.element for c in candidates]
+            for gameweek in range(1, 5)
+        }
+        self.calls = []
+
+        class MockCalculator(ExpectedPointsCalculator):
+            def get_expected_points(player_id: int, gameweek: int) -> float:
+                self.calls.append((player_id, gameweek))
+                return points[(player_id, gameweek)]
+
+        self.epc = MockCalculator
+
+    def test_matches_discounted_reward_team(self):
+        results = ParameterSweep.sweep_discounted_rewards(
+            self.teams, self.epc, 1, gammas=[1, 0.5], horizons=[1, 2, 4]
+        )
+        self.assertEqual(len(results), 2 * 3 * len(self.teams))
+        # each player is queried once for the longest horizon
+        self.assertEqual(len(self.calls), 19 * 4)
+        for row in results.itertuples():
+            self.assertAlmostEqual(
+                row.discounted_reward,
+                Optimizer.calc_discounted_reward_team(
+                    self.teams[row.team], self.epc, 1, row.horizon, row.gamma
+                ),
+            )
+
+    def test_transfer_adjustment_scales(self):
+        results = ParameterSweep.sweep_discounted_rewards(
+            self.teams,
+            self.epc,
+            1,
+            gammas=[0.9],
+            horizons=[3],
+            transfer_adjustment_scales=[0, 1],
+        )
+        without = results[results.transfer_adjustment_scale == 0]
+        for row in without.itertuples():
+            self.assertAlmostEqual(
+                row.discounted_reward,
+                Optimizer.calc_discounted_reward_team(
+                    self.teams[row.team], self.epc, 1, 3, 0.9, wildcard=True
+                ),
+            )
+
+    def test_ranks(self):
+        results = ParameterSweep.sweep_discounted_rewards(
+            self.teams, self.epc, 1, gammas=[1, 0.5], horizons=[2, 3]
+        )
+        for _, setting in results.groupby(["gamma", "horizon"]):
+            self.assertEqual(sorted(setting["rank"]), list(range(1, 6)))
+            ordered = setting.sort_values("rank")["discounted_reward"].tolist()
+            self.assertEqual(ordered, sorted(ordered, reverse=True))
+
+    def test_invalid_horizon(self):
+        with self.assertRaises(ValueError):
+            ParameterSweep.sweep_discounted_rewards(
+                self.teams, self.epc, 1, gammas=[1], horizons=[0]
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
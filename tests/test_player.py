@@ -25,3 +25,14 @@ class TestPlayer(unittest.TestCase):
         self.assertEqual(player.position, 3)
         self.assertEqual(player.club, 10)
         self.assertEqual(player.cost, 100)
+
+    def test_hash(self):
+        player1 = Player(element=1, name="Player1", position=3, club=1, cost=50)
+        player2 = Player(element=1, name="Player1", position=3, club=1, cost=40)
+        self.assertEqual(hash(player1), hash(player2), "equal players have equal hashes")
+        self.assertEqual(len({player1, player2}), 1)
+
+    def test_index(self):
+        player = Player.from_min_info(element=1, position=3, club=10, cost=100)
+        self.assertEqual(player.index, -1, "players not built by a registry have no index")
+        self.assertFalse(hasattr(player, "__dict__"))
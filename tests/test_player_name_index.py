@@ -0,0 +1,166 @@
+"""
+Unit tests for the player_name_index module.
+Test cases:
+- TestNormaliseName: Unit tests for the normalise_name function.
+- TestPlayerNameIndex: Unit tests for the PlayerNameIndex class.
+- TestResolve: Unit tests for the resolve method of the PlayerNameIndex class.
+- TestLoaderGetPlayerNameIndex: Unit tests for the get_player_name_index method of the Loader class.
+"""
+
+import unittest
+from unittest.mock import patch
+from fpl import Loader, PlayerNameIndex, PlayerRegistry
+from fpl.player_name_index import normalise_name
+
+
+def element(element_id, web_name, first_name, second_name, position=3, club=None):
+    return {
+        "id": element_id,
+        "web_name": web_name,
+        "first_name": first_name,
+        "second_name": second_name,
+        "element_type": position,
+        "team": element_id if club is None else club,
+        "now_cost": 50,
+    }
+
+
+ELEMENTS = [
+    element(1, "Ødegaard", "Martin", "Ødegaard"),
+    element(2, "Fernandes", "Bruno Borges", "Fernandes"),
+    element(3, "Salah", "Mohamed", "Salah"),
+    element(4, "Saka", "Bukayo", "Saka"),
+    element(5, "Alexander-Arnold", "Trent", "Alexander-Arnold", position=2),
+    element(6, "Son", "Heung-Min", "Son"),
+]
+
+
+class TestNormaliseName(unittest.TestCase):
+    """Unit tests for the normalise_name function."""
+
+    def test_normalise_name(self):
+        self.assertEqual(normalise_name("Ødegaard"), "odegaard")
+        self.assertEqual(normalise_name("  Müller-Wohlfahrt "), "muller wohlfahrt")
+        self.assertEqual(normalise_name("N'Golo Kanté"), "n golo kante")
+        self.assertEqual(normalise_name("!!"), "")
+
+
+class TestPlayerNameIndex(unittest.TestCase):
+    """Unit tests for the PlayerNameIndex class."""
+
+    def setUp(self):
+        self.registry = PlayerRegistry(ELEMENTS)
+        self.index = PlayerNameIndex(ELEMENTS, self.registry)
+
+    def test_shared_players(self):
+        self.assertEqual(len(self.index), 6)
+        self.assertEqual(self.index.snapshot_id, self.registry.snapshot_id)
+        self.assertIs(self.index.search("salah")[0].player, self.registry[3])
+
+    def test_accents_and_case(self):
+        match = self.index.search("ODEGAARD")[0]
+        self.assertEqual(match.player.element, 1)
+        self.assertEqual(match.full_name, "Martin Ødegaard")
+        self.assertEqual(match.score, 100)
+
+    def test_prefix(self):
+        matches = self.index.search("sa", threshold=100)
+        self.assertEqual([m.player.element for m in matches], [3, 4])
+
+    def test_first_and_full_names(self):
+        self.assertEqual(self.index.search("bruno")[0].player.element, 2)
+        self.assertEqual(self.index.search("trent alexander arnold")[0].score, 100)
+
+    def test_typo(self):
+        match = self.index.search("fernandez")[0]
+        self.assertEqual(match.player.element, 2)
+        self.assertLess(match.score, 100)
+
+    def test_short_name_in_long_query(self):
+        # a short name inside the query is not a perfect match
+        matches = self.index.search("sonny heung min son", threshold=0)
+        self.assertEqual(matches[0].player.element, 6)
+        self.assertLess(self.index.search("saka bukayo")[0].score, 100)
+
+    def test_threshold_and_limit(self):
+        self.assertEqual(self.index.search("zzzz", threshold=80), [])
+        self.assertEqual(len(self.index.search("s", limit=2)), 2)
+        self.assertEqual(len(self.index.search("s")), 3)
+        self.assertEqual(self.index.search(""), [])
+
+
+class TestResolve(unittest.TestCase):
+    """Unit tests for the resolve method of the PlayerNameIndex class."""
+
+    def setUp(self):
+        # two players called Gabriel at different clubs and positions
+        elements = ELEMENTS + [
+            element(7, "Gabriel", "Gabriel", "dos Santos Magalhães", 2, club=1),
+            element(8, "Gabriel", "Gabriel Fernando", "de Jesus", 4, club=8),
+        ]
+        self.index = PlayerNameIndex(elements)
+
+    def test_resolve_in_order(self):
+        resolutions = self.index.resolve(["Salah", "odegaard", "Fernandes"])
+        self.assertEqual([r.player.element for r in resolutions], [3, 1, 2])
+        self.assertEqual(resolutions[1].query, "odegaard")
+        self.assertEqual(resolutions[1].full_name, "Martin Ødegaard")
+        self.assertEqual(resolutions[1].score, 100)
+        self.assertEqual(resolutions[1].ambiguity, 0)
+
+    def test_matches_search(self):
+        for query in ["saka", "fernandez", "trent alexander arnold", "son"]:
+            resolution = self.index.resolve([query], threshold=0)[0]
+            self.assertEqual(
+                resolution.player, self.index.search(query, threshold=0)[0].player
+            )
+
+    def test_ambiguity(self):
+        resolution = self.index.resolve(["Gabriel"])[0]
+        self.assertEqual(resolution.player.element, 7)
+        self.assertEqual(resolution.ambiguity, 1)
+        self.assertEqual([m.player.element for m in resolution.alternatives], [8])
+
+    def test_hints(self):
+        resolutions = self.index.resolve(
+            ["Gabriel", "Gabriel", "Gabriel"],
+            clubs=[8, None, None],
+            positions=[None, "def", 4],
+        )
+        self.assertEqual([r.player.element for r in resolutions], [8, 7, 8])
+        self.assertTrue(all(r.ambiguity == 0 for r in resolutions))
+
+    def test_no_match(self):
+        resolutions = self.index.resolve(
+            ["Haaland", "", "Salah"], clubs=[None, None, 1]
+        )
+        for resolution in resolutions:
+            self.assertIsNone(resolution.player)
+            self.assertEqual(resolution.score, 0)
+            self.assertEqual(resolution.alternatives, ())
+        self.assertEqual(resolutions[0].query, "Haaland")
+
+    def test_invalid_hints(self):
+        with self.assertRaises(ValueError):
+            self.index.resolve(["Salah", "Saka"], clubs=[3])
+        with self.assertRaises(ValueError):
+            self.index.resolve(["Salah"], positions=["GK"])
+        with self.assertRaises(ValueError):
+            self.index.resolve(["Salah"], positions=[5])
+
+
+class TestLoaderGetPlayerNameIndex(unittest.TestCase):
+    """Unit tests for the get_player_name_index method of the Loader class."""
+
+    @patch("fpl.loader.Loader.get_static_info")
+    def test_index_built_once_per_snapshot(self, mock_get_static_info):
+        mock_get_static_info.return_value = {"elements": ELEMENTS}
+        index = Loader.get_player_name_index()
+        self.assertIs(Loader.get_player_name_index(), index)
+        self.assertIs(index.search("salah")[0].player, Loader.get_player_registry()[3])
+        mock_get_static_info.return_value = {"elements": ELEMENTS[:2]}
+        self.assertEqual(len(Loader.get_player_name_index()), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+"""
+Unit tests for the player_registry module.
+Test cases:
+- TestPlayerRegistry: Unit tests for the PlayerRegistry class.
+- TestLoaderGetPlayerRegistry: Unit tests for the get_player_registry method of the Loader class.
+"""
+
+import pickle
+import unittest
+from unittest.mock import patch
+from fpl import Loader, Player, PlayerRegistry
+
+ELEMENTS = [
+    {"id": 7, "web_name": "Salah", "element_type": 3, "team": 12, "now_cost": 130},
+    {"id": 3, "web_name": "Raya", "element_type": 1, "team": 1, "now_cost": 55},
+    {"id": 5, "web_name": "Haaland", "element_type": 4, "team": 13, "now_cost": 150},
+]
+
+
+class TestPlayerRegistry(unittest.TestCase):
+    """Unit tests for the PlayerRegistry class."""
+
+    def setUp(self):
+        self.registry = PlayerRegistry(ELEMENTS)
+
+    def test_players(self):
+        self.assertEqual(len(self.registry), 3)
+        player = self.registry[7]
+        self.assertEqual(
+            (player.element, player.name, player.position, player.club, player.cost),
+            (7, "Salah", 3, 12, 130),
+        )
+        self.assertIn(5, self.registry)
+        self.assertNotIn(1, self.registry)
+        with self.assertRaises(KeyError):
+            self.registry[1]
+
+    def test_same_instance(self):
+        self.assertIs(self.registry[7], self.registry[7])
+        self.assertIs(self.registry.get(7), self.registry[7])
+        self.assertIs(self.registry.get(7, cost=130), self.registry[7])
+
+    def test_dense_index(self):
+        self.assertEqual([player.element for player in self.registry], [3, 5, 7])
+        self.assertEqual([player.index for player in self.registry], [0, 1, 2])
+        for player in self.registry:
+            self.assertIs(self.registry.by_index(player.index), player)
+
+    def test_selling_price(self):
+        player = self.registry.get(7, cost=125)
+        self.assertEqual(player.cost, 125)
+        self.assertEqual(player.index, self.registry[7].index)
+        self.assertEqual(player, self.registry[7])
+        self.assertIs(self.registry.get(7, cost=125), player)
+
+    def test_snapshot_id(self):
+        self.assertEqual(
+            self.registry.snapshot_id, PlayerRegistry(ELEMENTS).snapshot_id
+        )
+        changed = [dict(ELEMENTS[0], now_cost=131)] + ELEMENTS[1:]
+        self.assertNotEqual(
+            self.registry.snapshot_id, PlayerRegistry(changed).snapshot_id
+        )
+        self.assertEqual(PlayerRegistry(ELEMENTS, snapshot_id="gw1").snapshot_id, "gw1")
+
+    def test_slotted_players_pickle(self):
+        player = self.registry[5]
+        self.assertFalse(hasattr(player, "__dict__"))
+        unpickled = pickle.loads(pickle.dumps(player))
+        self.assertEqual(unpickled, player)
+        self.assertEqual(unpickled.cost, 150)
+        self.assertEqual(unpickled.index, player.index)
+
+
+class TestLoaderGetPlayerRegistry(unittest.TestCase):
+    """Unit tests for the get_player_registry method of the Loader class."""
+
+    @patch("fpl.loader.Loader.get_static_info")
+    def test_registry_built_once_per_snapshot(self, mock_get_static_info):
+        mock_get_static_info.return_value = {"elements": ELEMENTS}
+        registry = Loader.get_player_registry()
+        self.assertIs(Loader.get_player_registry(), registry)
+        mock_get_static_info.return_value = {"elements": ELEMENTS[:2]}
+        self.assertEqual(len(Loader.get_player_registry()), 2)
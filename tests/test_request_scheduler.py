@@ -0,0 +1,98 @@
+"""
+Unit tests for the request_scheduler module.
+Test cases:
+- TestRequestScheduler: Unit tests for the RequestScheduler class.
+"""
+
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+from fpl import Loader
+from fpl.request_scheduler import BULK, INTERACTIVE, NORMAL, RequestScheduler
+
+
+def response(status_code: int, retry_after=None) -> MagicMock:
+    """Return a response with a status code and optionally a Retry-After header."""
+    result = MagicMock()
+    result.status_code = status_code
+    result.headers = {} if retry_after is None else {"Retry-After": retry_after}
+    return result
+
+
+class TestRequestScheduler(unittest.TestCase):
+    """Unit tests for the RequestScheduler class."""
+
+    def test_token_bucket(self):
+        scheduler = RequestScheduler(rate=20, burst=2)
+        start = time.monotonic()
+        delays = [scheduler.acquire() for _ in range(4)]
+        # the burst is served at once, then one request every 50ms
+        self.assertLess(max(delays[:2]), 0.02)
+        self.assertGreater(time.monotonic() - start, 0.08)
+        stats = scheduler.stats()
+        self.assertEqual(stats.requests, (0, 4, 0))
+        self.assertAlmostEqual(stats.mean_queue_delay_s(NORMAL), sum(delays) / 4)
+        self.assertEqual(stats.max_queue_delay_s[NORMAL], max(delays))
+        scheduler.reset_stats()
+        self.assertEqual(scheduler.stats().requests, (0, 0, 0))
+        with self.assertRaises(ValueError):
+            RequestScheduler(rate=0)
+
+    def test_priorities(self):
+        scheduler = RequestScheduler(rate=5, burst=1)
+        scheduler.acquire()
+        order = []
+
+        def acquire(priority: int):
+            with scheduler.priority(priority):
+                scheduler.acquire()
+            order.append(priority)
+
+        threads = [threading.Thread(target=acquire, args=(BULK,))]
+        threads[0].start()
+        time.sleep(0.05)
+        # the interactive request arrives later but is served first
+        threads.append(threading.Thread(target=acquire, args=(INTERACTIVE,)))
+        threads[1].start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(order, [INTERACTIVE, BULK])
+        self.assertEqual(scheduler.stats().requests, (1, 1, 1))
+
+    def test_backoff(self):
+        scheduler = RequestScheduler(rate=100, burst=5)
+        send = MagicMock(side_effect=[response(429, "0.1"), response(200)])
+        start = time.monotonic()
+        self.assertEqual(scheduler.request(send).status_code, 200)
+        self.assertGreaterEqual(time.monotonic() - start, 0.1)
+        self.assertEqual(send.call_count, 2)
+        stats = scheduler.stats()
+        self.assertEqual(stats.throttled, 1)
+        # the rate is halved, then recovers by a sixteenth of the maximum rate per successful request
+        self.assertAlmostEqual(stats.rate, 50 + 100 / 16)
+
+        scheduler = RequestScheduler(max_retries=1, backoff_s=0.01)
+        send = MagicMock(return_value=response(429))
+        self.assertEqual(scheduler.request(send).status_code, 429)
+        self.assertEqual(send.call_count, 2)
+
+    def test_loader_queries(self):
+        self.addCleanup(Loader.configure_requests)
+        self.addCleanup(Loader.clear_cache)
+        scheduler = Loader.configure_requests(rate=100, backoff_s=0.01)
+        self.assertIs(Loader.get_request_scheduler(), scheduler)
+        throttled = response(429, "0.01")
+        ok = response(200)
+        ok.json.return_value = {"fixtures": []}
+        with patch("requests.get", side_effect=[throttled, ok]) as mock_get:
+            with scheduler.priority(BULK):
+                self.assertEqual(
+                    Loader.get_player_detailed_info(9999), {"fixtures": []}
+                )
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertEqual(scheduler.stats().requests, (0, 0, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
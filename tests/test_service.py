@@ -0,0 +1,184 @@
+"""
+Unit tests for the service module, run against a local stand-in for the FPL API.
+Test cases:
+- TestOptimizationService: Unit tests for the OptimizationService class and its HTTP server.
+"""
+
+import json
+import threading
+import time
+import unittest
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from fpl import Loader
+from fpl.service import OptimizationService, make_server
+from tests.test_cli import static_info
+
+
+class SlowCalculator:
+    """Expected points calculator returning the element id after a delay, so that jobs stay in flight."""
+
+    @staticmethod
+    def get_expected_points(player_id: int, gameweek: int) -> float:
+        time.sleep(0.02)
+        return float(player_id)
+
+
+class FakeApiHandler(BaseHTTPRequestHandler):
+    """Local stand-in for the endpoints of the FPL API read by the service."""
+
+    def do_GET(self):
+        if self.path.endswith("/bootstrap-static/"):
+            payload = static_info()
+        elif "/element-summary/" in self.path:
+            payload = {"fixtures": [], "history": [], "history_past": []}
+        else:
+            payload = []
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(server: ThreadingHTTPServer, test_class) -> str:
+    """Serve in a thread until the tests of a class have run and return the base URL of the server."""
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    test_class.addClassCleanup(server.server_close)
+    test_class.addClassCleanup(server.shutdown)
+    return "http://{}:{}".format(*server.server_address)
+
+
+class TestOptimizationService(unittest.TestCase):
+    """Unit tests for the OptimizationService class and its HTTP server."""
+
+    @classmethod
+    def setUpClass(cls):
+        # the service and its workers are shared by the tests, so the static information is only loaded once
+        cls.addClassCleanup(Loader.configure_api)
+        api_url = start_server(
+            ThreadingHTTPServer(("127.0.0.1", 0), FakeApiHandler), cls
+        )
+        cls.service = OptimizationService(
+            "tests.test_service:SlowCalculator",
+            workers=2,
+            job_timeout_s=30,
+            api_url=api_url + "/api/",
+        )
+        cls.addClassCleanup(cls.service.close)
+        cls.url = start_server(make_server(cls.service, port=0), cls)
+
+    def setUp(self):
+        self.request = {
+            "team": {
+                "picks": [{"element": i, "selling_price": 50} for i in range(1, 16)],
+                "transfers": {"bank": 0, "limit": 1},
+            },
+            "candidates": [16, 17, "Semenyo", "Watkins"],
+            "gameweek": 1,
+            "horizon": 1,
+            "k": 2,
+        }
+
+    def call(self, method: str, path: str, data=None):
+        request = urllib.request.Request(
+            self.url + path,
+            data=None if data is None else json.dumps(data).encode(),
+            method=method,
+        )
+        try:
+            with urllib.request.urlopen(request) as response:
+                return response.status, json.load(response)
+        except urllib.error.HTTPError as e:
+            return e.code, json.load(e)
+
+    def test_job(self):
+        status, job = self.call("POST", "/jobs", self.request)
+        self.assertEqual(status, 202)
+        self.assertFalse(job["coalesced"])
+        status, job = self.call("GET", "/jobs/{}?wait=20".format(job["job_id"]))
+        self.assertEqual(status, 200)
+        self.assertEqual(job["status"], "done")
+        results = job["result"]["results"]
+        self.assertEqual(len(results), 2)
+        # the candidate goalkeeper replaces the goalkeeper with the fewest points
+        self.assertEqual(
+            results[0]["transfers_in"], [{"element": 16, "name": "Sanchez"}]
+        )
+        self.assertEqual(results[0]["transfers_out"], [{"element": 1, "name": "Raya"}])
+
+    def test_coalescing(self):
+        _, first = self.call("POST", "/jobs", self.request)
+        # the same request with the candidates given by element id
+        _, second = self.call(
+            "POST", "/jobs", {**self.request, "candidates": [16, 17, 18, 19]}
+        )
+        self.assertTrue(second["coalesced"])
+        self.assertEqual(first["job_id"], second["job_id"])
+        _, job = self.call("GET", "/jobs/{}?wait=20".format(first["job_id"]))
+        self.assertEqual(job["status"], "done")
+        # finished jobs are not coalesced
+        _, third = self.call("POST", "/jobs", self.request)
+        self.assertFalse(third["coalesced"])
+        self.call("GET", "/jobs/{}?wait=20".format(third["job_id"]))
+
+    def test_cancel(self):
+        # gameweeks whose expected points are not yet resident in the workers, so the job takes seconds
+        _, job = self.call(
+            "POST", "/jobs", {**self.request, "gameweek": 20, "horizon": 5}
+        )
+        status, _ = self.call("DELETE", "/jobs/{}".format(job["job_id"]))
+        self.assertEqual(status, 200)
+        _, job = self.call("GET", "/jobs/{}?wait=20".format(job["job_id"]))
+        self.assertEqual(job["status"], "cancelled")
+        self.assertEqual(self.call("GET", "/health")[1]["jobs_in_flight"], 0)
+
+    def test_resubmit_after_cancel(self):
+        request = {**self.request, "gameweek": 30, "horizon": 5}
+        _, first = self.call("POST", "/jobs", request)
+        self.call("DELETE", "/jobs/{}".format(first["job_id"]))
+        # the identical request is not joined to the cancelled job, even while it is still running
+        _, second = self.call("POST", "/jobs", request)
+        self.assertFalse(second["coalesced"])
+        self.assertNotEqual(second["job_id"], first["job_id"])
+        _, job = self.call("GET", "/jobs/{}?wait=20".format(second["job_id"]))
+        self.assertEqual(job["status"], "done")
+        _, job = self.call("GET", "/jobs/{}?wait=20".format(first["job_id"]))
+        self.assertEqual(job["status"], "cancelled")
+
+    def test_timeout(self):
+        _, job = self.call(
+            "POST",
+            "/jobs",
+            {**self.request, "gameweek": 10, "horizon": 5, "timeout_s": 0.5},
+        )
+        _, job = self.call("GET", "/jobs/{}?wait=20".format(job["job_id"]))
+        self.assertEqual(job["status"], "timed_out")
+        self.assertLess(job["finished_at"] - job["submitted_at"], 10)
+
+    def test_invalid_requests(self):
+        for request in [
+            {**self.request, "candidates": ["Nobody"]},
+            {**self.request, "horizon": "3"},
+            {**self.request, "unknown": 1},
+            {**self.request, "timeout_s": 0},
+            {**self.request, "horizon": True},
+            {**self.request, "k": False},
+            {**self.request, "max_transfers": True},
+            {**self.request, "gamma": True},
+            {**self.request, "timeout_s": True},
+        ]:
+            status, body = self.call("POST", "/jobs", request)
+            self.assertEqual(status, 400)
+            self.assertIn("error", body)
+        self.assertEqual(self.call("GET", "/jobs/missing")[0], 404)
+        self.assertEqual(self.call("DELETE", "/jobs/missing")[0], 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
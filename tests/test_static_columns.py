@@ -0,0 +1,93 @@
+"""
+Unit tests for the static_columns module.
+Test cases:
+- TestSlimStaticInfo: Unit tests for the SlimStaticInfo, ColumnTable and RowView classes.
+"""
+
+import json
+import unittest
+import numpy as np
+from fpl.static_columns import ColumnTable, SlimStaticInfo
+
+
+class TestSlimStaticInfo(unittest.TestCase):
+    """Unit tests for the SlimStaticInfo, ColumnTable and RowView classes."""
+
+    def setUp(self):
+        self.static_info = {
+            "elements": [
+                {
+                    "id": element,
+                    "web_name": "Player {}".format(element),
+                    "element_type": 1 + element % 4,
+                    "team": 1 + element % 20,
+                    "now_cost": 40 + element,
+                    "form": "{:.1f}".format(element / 10),
+                    "in_dreamteam": element % 2 == 0,
+                    "chance_of_playing_next_round": None if element % 3 else 75,
+                    "ict_index": "1.0",
+                }
+                for element in range(1, 31)
+            ],
+            "teams": [{"id": 1, "name": "Arsenal", "strength_overall_home": 1300}],
+            "events": [{"id": 1, "deadline_time": "2024-08-16T17:30:00Z"}],
+            "element_types": [{"id": 1, "squad_min_play": 1}],
+            "game_settings": {"squad_squadsize": 15},
+        }
+
+    def test_projection(self):
+        slim = SlimStaticInfo(self.static_info)
+        self.assertEqual(set(slim), {"elements", "teams", "events", "element_types"})
+        self.assertIs(slim["element_types"], self.static_info["element_types"])
+        elements = slim["elements"]
+        self.assertEqual(len(elements), 30)
+        self.assertNotIn("ict_index", elements[0])
+        self.assertNotIn("in_dreamteam", elements[0])
+        self.assertEqual(elements.column("now_cost").dtype, np.int32)
+        self.assertEqual(elements.column("form").dtype, object)
+
+        # rows read like the raw dictionaries, with Python values
+        raw = {
+            key: value
+            for key, value in self.static_info["elements"][2].items()
+            if key in elements[2]
+        }
+        self.assertEqual(dict(elements[2]), raw)
+        self.assertEqual(elements[-1]["id"], 30)
+        self.assertEqual(elements.find(3), raw)
+        self.assertEqual(json.loads(json.dumps(dict(elements.find(3)))), raw)
+        self.assertEqual(float(elements.find(3)["form"]), 0.3)
+        self.assertIsNone(elements.find(1)["chance_of_playing_next_round"])
+        self.assertEqual(elements.find(3).get("ict_index", "0.0"), "0.0")
+        self.assertEqual(sorted(info["id"] for info in elements)[:2], [1, 2])
+        with self.assertRaises(KeyError):
+            elements.find(31)
+        with self.assertRaises(IndexError):
+            elements[30]
+
+    def test_fields(self):
+        slim = SlimStaticInfo(
+            self.static_info,
+            {"elements": ("id", "ict_index", "missing"), "teams": None},
+        )
+        self.assertEqual(set(slim), {"elements", "teams"})
+        self.assertEqual(slim["elements"].fields, ["id", "ict_index"])
+        self.assertEqual(slim["elements"][0]["ict_index"], "1.0")
+        # strings are interned, so equal strings are stored once
+        column = slim["elements"].column("ict_index")
+        self.assertIs(column[0], column[1])
+
+    def test_column_types(self):
+        table = ColumnTable(
+            [{"a": True, "b": 2**40, "c": 1, "d": "x"}, {"a": False, "b": 1, "c": 1.5}],
+            ["a", "b", "c", "d"],
+        )
+        self.assertEqual(table.column("a").dtype, bool)
+        self.assertEqual(table.column("b").dtype, np.int64)
+        self.assertEqual(table.column("c").dtype, np.float64)
+        self.assertIsNone(table[1]["d"])
+        self.assertFalse(table.column("a").flags.writeable)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -308,3 +308,30 @@ class TestTeam(unittest.TestCase):
         self.assertFalse(team_too_many_from_one_club.is_feasible, "Team should not be feasible with too many players from one club")
         self.assertTrue(another_mid_club_1 in team_too_many_from_one_club.mids, "New midfielder should be in the team")
         self.assertTrue(self.mid_club_5 not in team_too_many_from_one_club.mids, "Old midfielder should be out of the team")
+
+    def test_transfer_player_is_validated(self):
+        with self.assertRaises(TypeError, msg="Expected TypeError when the player transferred in is not a Player"):
+            self.team_1.transfer_player(self.gkp_club_1, 1)
+        new_team = self.team_1.transfer_player(self.gkp_club_1, self.gkp_club_2)
+        rebuilt_team = Team(
+            money_in_bank=new_team.money_in_bank,
+            free_transfers=new_team.free_transfers,
+            gkps=new_team.gkps,
+            defs=new_team.defs,
+            mids=new_team.mids,
+            fwds=new_team.fwds,
+        )
+        self.assertEqual(new_team, rebuilt_team, "Teams from transfers equal teams built by the public constructor")
+
+    def test_hash(self):
+        team_copy = Team(
+            money_in_bank=self.team_1.money_in_bank,
+            free_transfers=self.team_1.free_transfers,
+            gkps=self.team_1.gkps,
+            defs=self.team_1.defs,
+            mids=self.team_1.mids,
+            fwds=self.team_1.fwds,
+        )
+        self.assertEqual(hash(self.team_1), hash(team_copy), "Equal teams have equal hashes")
+        self.assertEqual(hash(self.team_1), hash(self.team_1), "Hash is stable once cached")
+        self.assertEqual(len({self.team_1, team_copy}), 1)
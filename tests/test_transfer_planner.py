@@ -0,0 +1,145 @@
+"""
+Unit tests for the transfer_planner module.
+Test cases:
+- TestTransferPlannerCalcTransferPlan: Unit tests for the calc_transfer_plan method of the TransferPlanner class.
+"""
+
+import unittest
+from unittest.mock import patch
+from fpl import ExpectedPointsCalculator, Team, Player, TransferPlanner
+
+
+def position_info_side_effect(position_id: int) -> dict:
+    """Function to provide the side_effect for the mock of fpl.Loader.get_position_info"""
+    return {
+        1: {"squad_min_play": 1, "squad_max_play": 1},
+        2: {"squad_min_play": 3, "squad_max_play": 5},
+        3: {"squad_min_play": 2, "squad_max_play": 5},
+        4: {"squad_min_play": 1, "squad_max_play": 3},
+    }[position_id]
+
+
+class TestTransferPlannerCalcTransferPlan(unittest.TestCase):
+    """Unit tests for the calc_transfer_plan method of the TransferPlanner class."""
+
+    def setUp(self):
+        patcher = patch("fpl.Loader.get_position_info")
+        self.addCleanup(patcher.stop)
+        patcher.start().side_effect = position_info_side_effect
+
+        players = [
+            Player.from_min_info(element=i, position=position, club=i, cost=50)
+            for i, position in enumerate([1] * 2 + [2] * 5 + [3] * 5 + [4] * 3, 1)
+        ]
+        self.players = players
+        self.team = Team(
+            money_in_bank=0,
+            free_transfers=1,
+            gkps=frozenset(players[0:2]),
+            defs=frozenset(players[2:7]),
+            mids=frozenset(players[7:12]),
+            fwds=frozenset(players[12:15]),
+        )
+        self.star = Player.from_min_info(element=100, position=4, club=20, cost=50)
+        self.other_star = Player.from_min_info(
+            element=200, position=3, club=19, cost=50
+        )
+
+    def plan(self, points, **kwargs):
+        class MockCalculator(ExpectedPointsCalculator):
+            def get_expected_points(player_id: int, gameweek: int) -> float:
+                return points(player_id, gameweek)
+
+        arguments = dict(
+            team=self.team,
+            candidates=[self.star, self.other_star],
+            epc=MockCalculator,
+            gameweek=1,
+            horizon=3,
+        )
+        arguments.update(kwargs)
+        return TransferPlanner.calc_transfer_plan(**arguments)
+
+    def test_no_transfers_when_candidates_are_worse(self):
+        plan = self.plan(lambda player_id, gameweek: 0 if player_id >= 100 else 2)
+        self.assertEqual(len(plan.gameweeks), 3)
+        for gameweek_plan in plan.gameweeks:
+            self.assertEqual(gameweek_plan.transfers_in, frozenset())
+            self.assertEqual(gameweek_plan.hits, 0)
+        self.assertEqual(
+            [gameweek_plan.free_transfers for gameweek_plan in plan.gameweeks],
+            [1, 2, 3],
+            "Unused free transfers are banked",
+        )
+        self.assertAlmostEqual(plan.discounted_reward, 3 * 24)
+
+    def test_transfer_made_in_the_right_gameweek(self):
+        # the star only plays from gameweek 2 and we only have free transfers for one transfer a week
+        def points(player_id, gameweek):
+            if player_id == 100:
+                return 10 if gameweek >= 2 else 0
+            if player_id == 200:
+                return 10 if gameweek >= 3 else 0
+            return 1
+
+        plan = self.plan(points, max_transfers_per_gameweek=1)
+        transfers_in = [gameweek_plan.transfers_in for gameweek_plan in plan.gameweeks]
+        self.assertIn(self.star, transfers_in[0] | transfers_in[1])
+        self.assertIn(
+            self.other_star, transfers_in[0] | transfers_in[1] | transfers_in[2]
+        )
+        self.assertEqual(sum(gameweek_plan.hits for gameweek_plan in plan.gameweeks), 0)
+        self.assertEqual(plan.gameweeks[-1].team.money_in_bank, 0)
+        self.assertEqual(
+            [gameweek_plan.exp_points for gameweek_plan in plan.gameweeks],
+            [12, 10 + 10 + 10, 10 + 10 + 9 + 10],
+        )
+        self.assertAlmostEqual(plan.discounted_reward, 12 + 30 + 39)
+
+    def test_free_transfers_are_banked_instead_of_taking_hits(self):
+        # both stars only play in the last gameweek, so two free transfers can be banked
+        def points(player_id, gameweek):
+            if player_id >= 100:
+                return 10 if gameweek == 3 else 0
+            return 1
+
+        team = Team(
+            money_in_bank=0,
+            free_transfers=0,
+            gkps=self.team.gkps,
+            defs=self.team.defs,
+            mids=self.team.mids,
+            fwds=self.team.fwds,
+        )
+        plan = self.plan(points, team=team)
+        self.assertEqual(
+            plan.gameweeks[0].transfers_in, frozenset(), "No free transfer"
+        )
+        self.assertEqual(
+            plan.gameweeks[2].transfers_in | plan.gameweeks[1].transfers_in,
+            frozenset([self.star, self.other_star]),
+        )
+        self.assertEqual(sum(gameweek_plan.hits for gameweek_plan in plan.gameweeks), 0)
+        self.assertAlmostEqual(plan.discounted_reward, 12 + 12 + 39)
+
+    def test_hit_taken_when_worth_it(self):
+        def points(player_id, gameweek):
+            return 20 if player_id >= 100 else 1
+
+        plan = self.plan(points, horizon=1)
+        self.assertEqual(
+            plan.gameweeks[0].transfers_in, frozenset([self.star, self.other_star])
+        )
+        self.assertEqual(plan.gameweeks[0].hits, 4)
+        self.assertAlmostEqual(plan.discounted_reward, 20 + 20 + 9 + 20 - 4)
+        # the team two transfers away is scored even when the single transfers already fill the beam
+        plan = self.plan(points, horizon=1, beam_width=1)
+        self.assertAlmostEqual(plan.discounted_reward, 20 + 20 + 9 + 20 - 4)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            self.plan(lambda player_id, gameweek: 0, candidates=[self.players[0]])
+        with self.assertRaises(ValueError):
+            self.plan(lambda player_id, gameweek: 0, horizon=0)
+        with self.assertRaises(ValueError):
+            self.plan(lambda player_id, gameweek: 0, beam_width=0)
@@ -1,7 +1,13 @@
 import pandas as pd
 from unittest import TestCase
 from unittest.mock import patch
-from fpl import find_matching_players, compute_points_per_game, compute_form, Player
+from fpl import (
+    find_matching_players,
+    resolve_players,
+    compute_points_per_game,
+    compute_form,
+    Player,
+)
 
 
 class TestUtils(TestCase):
@@ -9,9 +15,33 @@ class TestUtils(TestCase):
 
     def setUp(self):
         self.mock_elements = [
-            {"id": 1, "web_name": "John"},
-            {"id": 2, "web_name": "Jane"},
-            {"id": 3, "web_name": "Johnny"},
+            {
+                "id": 1,
+                "web_name": "John",
+                "first_name": "John",
+                "second_name": "Doe",
+                "element_type": 3,
+                "team": "Team A",
+                "now_cost": 100,
+            },
+            {
+                "id": 2,
+                "web_name": "Jane",
+                "first_name": "Jane",
+                "second_name": "Smith",
+                "element_type": 3,
+                "team": "Team B",
+                "now_cost": 90,
+            },
+            {
+                "id": 3,
+                "web_name": "Johnny",
+                "first_name": "Johnny",
+                "second_name": "Doesmith",
+                "element_type": 3,
+                "team": "Team C",
+                "now_cost": 110,
+            },
         ]
         # in the static info these are all the rounds - i.e. length 38
         self.mock_events = [
@@ -117,6 +147,14 @@ class TestUtils(TestCase):
         with self.assertRaises(ValueError):
             find_matching_players(search_name="Alice", threshold=80)
 
+    @patch("fpl.loader.Loader.get_static_info")
+    def test_resolve_players(self, mock_get_static_info):
+        mock_get_static_info.return_value = self.mock_static_info
+        result = resolve_players(["John Doe", "Alice"])
+        self.assertEqual(result[0].player.element, 1)
+        self.assertEqual(result[0].full_name, "John Doe")
+        self.assertIsNone(result[1].player)
+
     @patch("fpl.loader.Loader.get_player_historical_info_for_gameweek")
     def test_compute_points_per_game(
         self, mock_get_player_historical_info_for_gameweek